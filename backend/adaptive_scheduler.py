@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+사용자별 적응형 자동화 주기
+- 마감이 24시간 이내인 미완료 과제가 있으면 자주, 오래 앱을 쓰지 않은 사용자는 드물게 갱신
+- 최근 실행에서 결과가 얼마나 자주 바뀌었는지(변경 이력)로 기본 주기 조절
+- 스케줄러는 매 실행마다 '갱신 시점이 된' 사용자만 수집하고, 나머지는 마지막 결과 유지
+- 상태 파일에는 결과 해시와 가장 가까운 마감만 저장 (과제 목록 자체는 결과 저장소에 있음)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from result_store import ResultStore, get_result_store
+
+logger = logging.getLogger(__name__)
+
+ADAPTIVE_SCHEDULING_ENABLED = os.environ.get('ADAPTIVE_SCHEDULING_ENABLED', 'false').lower() == 'true'
+ADAPTIVE_STATE_PATH = os.environ.get('ADAPTIVE_STATE_PATH', 'adaptive_schedule.json')
+# 앱에서 기록하는 마지막 접속 시간 필드 (FirebaseService.markLearnUsSeen, lastUsedAt은 스케줄러가 갱신하므로 사용하지 않음)
+LAST_SEEN_FIELD = os.environ.get('ADAPTIVE_LAST_SEEN_FIELD', 'lastSeenAt')
+
+# 갱신 주기 (분)
+URGENT_INTERVAL = int(os.environ.get('ADAPTIVE_URGENT_INTERVAL', '15'))
+BASE_INTERVAL = int(os.environ.get('ADAPTIVE_BASE_INTERVAL', '60'))
+IDLE_INTERVAL = int(os.environ.get('ADAPTIVE_IDLE_INTERVAL', '360'))
+RETRY_INTERVAL = int(os.environ.get('ADAPTIVE_RETRY_INTERVAL', '10'))
+
+URGENT_WINDOW_HOURS = 24
+SOON_WINDOW_HOURS = 72
+IDLE_AFTER_DAYS = 7
+CHANGE_HISTORY_SIZE = 10
+
+COMPLETED_STATUSES = ('✅ 완료', '완료', 'completed')
+# 수집기가 과목 페이지의 활동 기간 표시에서 채우는 마감 필드 (extract_activity_due_date)
+DEADLINE_FIELDS = ('due_date', 'deadline')
+DEADLINE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d')
+
+
+def _to_timestamp(value) -> Optional[float]:
+    """datetime / Firestore Timestamp / 문자열 / 숫자를 epoch 초로 변환"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        text = value.strip().replace('T', ' ').replace('Z', '')
+        try:
+            return datetime.fromisoformat(text).timestamp()
+        except ValueError:
+            pass
+        for fmt in DEADLINE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+            # 날짜만 있으면 그날 자정 직전 마감으로 간주
+            if fmt == '%Y-%m-%d':
+                parsed = parsed.replace(hour=23, minute=59)
+            return parsed.timestamp()
+    return None
+
+
+def nearest_deadline(assignments: List[Dict], now: Optional[float] = None) -> Optional[float]:
+    """아직 지나지 않은 미완료 과제 중 가장 가까운 마감 시각"""
+    now = now or time.time()
+    deadlines = []
+    for assignment in assignments:
+        if not isinstance(assignment, dict) or assignment.get('status') in COMPLETED_STATUSES:
+            continue
+        for field in DEADLINE_FIELDS:
+            due = _to_timestamp(assignment.get(field))
+            if due and due > now:
+                deadlines.append(due)
+                break
+    return min(deadlines) if deadlines else None
+
+
+def _assignments_digest(assignments: List[Dict]) -> str:
+    """결과 변경 여부 판단용 해시 (순서 무관)"""
+    items = sorted(json.dumps(a, ensure_ascii=False, sort_keys=True, default=str) for a in assignments)
+    return hashlib.sha256('\n'.join(items).encode('utf-8')).hexdigest()
+
+
+class AdaptiveScheduler:
+    """사용자별 다음 실행 시각 계산 및 상태 저장"""
+
+    def __init__(self, state_path: str = ADAPTIVE_STATE_PATH):
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._users: Dict[str, Dict] = self._load()
+
+    # ------------------------------------------------------------------
+    # 실행 대상 선택
+    # ------------------------------------------------------------------
+    def select_due_users(self, users: List[Dict], key_func: Callable[[Dict], str],
+                         now: Optional[float] = None) -> Tuple[List[Dict], List[Dict]]:
+        """(이번에 수집할 사용자, 건너뛸 사용자) - 처음 보는 사용자는 바로 수집"""
+        now = now or time.time()
+        due, skipped = [], []
+        with self._lock:
+            for user in users:
+                entry = self._users.setdefault(key_func(user), {})
+                last_seen = _to_timestamp(user.get(LAST_SEEN_FIELD))
+                if last_seen:
+                    entry['last_seen'] = last_seen
+                if entry.get('next_run', 0) <= now:
+                    due.append(user)
+                else:
+                    skipped.append(user)
+
+        logger.info(f"🗓️ [ADAPTIVE] 사용자 {len(users)}명 중 {len(due)}명 갱신, {len(skipped)}명 건너뜀")
+        return due, skipped
+
+    def carry_over(self, users: List[Dict], key_func: Callable[[Dict], str],
+                   store: Optional[ResultStore] = None) -> List[Dict]:
+        """건너뛴 사용자들의 마지막 수집 결과 (결과 저장소에서 읽음)"""
+        if not users:
+            return []
+        store = store or get_result_store()
+        assignments = []
+        for user in users:
+            assignments.extend(store.get_assignments(key_func(user)))
+        return assignments
+
+    # ------------------------------------------------------------------
+    # 실행 결과 기록
+    # ------------------------------------------------------------------
+    def record_run(self, key: str, assignments: List[Dict], now: Optional[float] = None) -> float:
+        """성공한 수집 결과 기록 후 다음 실행 시각 반환"""
+        now = now or time.time()
+        digest = _assignments_digest(assignments)
+        with self._lock:
+            entry = self._users.setdefault(key, {})
+            history = entry.get('history', [])
+            if entry.get('digest') is not None:
+                history = (history + [int(digest != entry['digest'])])[-CHANGE_HISTORY_SIZE:]
+            entry.update({
+                'digest': digest,
+                'history': history,
+                'deadline': nearest_deadline(assignments, now),
+                'last_run': now,
+                'failures': 0,
+            })
+            interval, reason = self.compute_interval(entry, now)
+            entry['next_run'] = now + interval * 60
+            entry['reason'] = reason
+
+        logger.info(f"🗓️ [ADAPTIVE] {key} 다음 갱신 {interval:.0f}분 후 ({reason})")
+        return entry['next_run']
+
+    def record_failure(self, key: str, now: Optional[float] = None) -> float:
+        """실패한 사용자는 이전 결과를 유지하고 짧은 간격으로 재시도 (연속 실패 시 점점 늘림)"""
+        now = now or time.time()
+        with self._lock:
+            entry = self._users.setdefault(key, {})
+            entry['failures'] = entry.get('failures', 0) + 1
+            interval = min(RETRY_INTERVAL * 2 ** (entry['failures'] - 1), IDLE_INTERVAL)
+            entry['next_run'] = now + interval * 60
+            entry['reason'] = f"실패 {entry['failures']}회 재시도"
+        return entry['next_run']
+
+    def next_interval(self, key: str, now: Optional[float] = None) -> Tuple[float, str]:
+        """사용자의 현재 상태 기준 갱신 간격(분)과 이유"""
+        with self._lock:
+            entry = dict(self._users.get(key, {}))
+        return self.compute_interval(entry, now)
+
+    def compute_interval(self, entry: Dict, now: Optional[float] = None) -> Tuple[float, str]:
+        """다음 실행까지 간격(분)과 이유"""
+        now = now or time.time()
+
+        # 1) 마감 임박: 접속 여부와 무관하게 자주 갱신
+        deadline = entry.get('deadline')
+        if deadline and deadline > now:
+            hours_left = (deadline - now) / 3600
+            if hours_left <= URGENT_WINDOW_HOURS:
+                # 마감 직후 상태까지 반영되도록 마감 시각을 넘기지 않음
+                return max(min(URGENT_INTERVAL, (deadline - now) / 60 + 1), 1), f"마감 {hours_left:.1f}시간 전"
+            if hours_left <= SOON_WINDOW_HOURS:
+                return BASE_INTERVAL / 2, f"마감 {hours_left:.0f}시간 전"
+
+        # 2) 오래 접속하지 않은 사용자
+        last_seen = entry.get('last_seen')
+        if last_seen and now - last_seen > IDLE_AFTER_DAYS * 86400:
+            return IDLE_INTERVAL, f"{(now - last_seen) / 86400:.0f}일 미접속"
+
+        # 3) 최근 변경 빈도: 자주 바뀌면 0.5배, 거의 안 바뀌면 2배까지
+        history = entry.get('history', [])
+        if not history:
+            return BASE_INTERVAL, "기본 주기"
+        change_rate = sum(history) / len(history)
+        interval = BASE_INTERVAL * (2 - 1.5 * change_rate)
+        return min(interval, IDLE_INTERVAL), f"최근 변경률 {change_rate * 100:.0f}%"
+
+    # ------------------------------------------------------------------
+    # 상태 저장
+    # ------------------------------------------------------------------
+    def get_stats(self, now: Optional[float] = None) -> Dict:
+        now = now or time.time()
+        with self._lock:
+            users = dict(self._users)
+        entries = list(users.values())
+        return {
+            'users': len(entries),
+            'due_now': sum(1 for e in entries if e.get('next_run', 0) <= now),
+            'urgent': sum(1 for e in entries
+                          if e.get('deadline') and 0 < e['deadline'] - now <= URGENT_WINDOW_HOURS * 3600),
+            'next_runs': sorted(
+                ({'user': key[:8], 'in_minutes': round(max(e.get('next_run', 0) - now, 0) / 60, 1),
+                  'reason': e.get('reason', '')} for key, e in users.items()),
+                key=lambda item: item['in_minutes'])[:20],
+        }
+
+    def save(self):
+        """상태 파일 저장 (원자적 교체)"""
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with self._lock:
+                data = json.dumps(self._users, ensure_ascii=False, default=str)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"⚠️ [ADAPTIVE] 스케줄 상태 저장 실패: {e}")
+
+    def _load(self) -> Dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                users = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ [ADAPTIVE] 스케줄 상태 파일 손상, 전체 사용자 갱신: {e}")
+            return {}
+        # 이전 형식 상태 파일의 과제 목록 사본은 버림 (다음 저장 때 파일 크기도 줄어듦)
+        for entry in users.values():
+            entry.pop('assignments', None)
+        return users
+
+
+_adaptive_scheduler = None
+
+
+def get_adaptive_scheduler() -> Optional[AdaptiveScheduler]:
+    """적응형 스케줄링이 켜져 있으면 전역 인스턴스 반환"""
+    global _adaptive_scheduler
+    if not ADAPTIVE_SCHEDULING_ENABLED:
+        return None
+    if _adaptive_scheduler is None:
+        _adaptive_scheduler = AdaptiveScheduler()
+    return _adaptive_scheduler
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+시간 예산 기반 배치 자동화
+- 사용자별 소요 시간을 이전 실행 기록(EWMA)으로 추정하여 남은 시간 안에 들어가는 사용자만 실행
+- 사용자가 끝날 때마다 체크포인트 저장 -> 중간에 종료되어도 다음 실행에서 이어서 처리
+- 시간 안에 못 끝낸 사용자는 다음 실행으로 미루고 보고 (다음 실행에서 먼저 처리)
+"""
+
+import os
+import json
+import time
+import logging
+import statistics
+from typing import Callable, Dict, List, Optional
+
+from result_store import user_key
+
+logger = logging.getLogger(__name__)
+
+BATCH_CHECKPOINT_PATH = os.environ.get('BATCH_CHECKPOINT_PATH', 'batch_checkpoint.json')
+BATCH_COST_PATH = os.environ.get('BATCH_COST_PATH', 'batch_user_costs.json')
+BATCH_REPORT_PATH = os.environ.get('BATCH_REPORT_PATH', 'batch_report.json')
+# 이보다 오래된 체크포인트는 새 주기로 간주 (초)
+BATCH_CHECKPOINT_TTL = float(os.environ.get('BATCH_CHECKPOINT_TTL', str(6 * 3600)))
+
+# 기록이 없는 사용자의 기본 추정 소요 시간 (초)
+DEFAULT_USER_COST = float(os.environ.get('BATCH_DEFAULT_USER_COST', '120'))
+# 추정치 여유 배수 (실제 소요 시간 편차 대비)
+COST_SAFETY_FACTOR = 1.25
+EWMA_ALPHA = 0.3
+# 배치 시작/종료 오버헤드 (워커 프로세스 생성 등, 초)
+BATCH_OVERHEAD = 10
+
+
+def _extract_assignments(user_result) -> List[Dict]:
+    """사용자 결과에서 과제 목록 추출 (리스트/딕셔너리/bool)"""
+    if isinstance(user_result, list):
+        return user_result
+    if isinstance(user_result, dict):
+        return user_result.get('assignments') or user_result.get('lectures') or []
+    return []
+
+
+def _load_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ [BATCH] {path} 읽기 실패: {e}")
+        return default
+
+
+def _save_json(path: str, data):
+    """원자적 교체로 저장 (저장 중 종료되어도 이전 파일 유지)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"⚠️ [BATCH] {path} 저장 실패: {e}")
+
+
+class BatchAutomationScheduler:
+    """Cloud Run 요청 시간 안에서 사용자를 배치로 나누어 실행"""
+
+    def __init__(self, max_runtime_minutes: float = 50, batch_size: int = 3,
+                 checkpoint_path: str = BATCH_CHECKPOINT_PATH, cost_path: str = BATCH_COST_PATH):
+        self.budget = max_runtime_minutes * 60
+        self.batch_size = max(1, batch_size)
+        self.checkpoint_path = checkpoint_path
+        self.cost_path = cost_path
+        self.costs: Dict[str, float] = _load_json(cost_path, {})
+        self.checkpoint = self._load_checkpoint()
+
+    # ------------------------------------------------------------------
+    # 소요 시간 추정
+    # ------------------------------------------------------------------
+    def estimate_cost(self, user: Dict) -> float:
+        """사용자 한 명의 추정 소요 시간 (초, 여유 포함)"""
+        cost = self.costs.get(user_key(user))
+        if cost is None:
+            cost = statistics.median(self.costs.values()) if self.costs else DEFAULT_USER_COST
+        return cost * COST_SAFETY_FACTOR
+
+    def record_cost(self, user: Dict, elapsed: float):
+        key = user_key(user)
+        previous = self.costs.get(key)
+        self.costs[key] = elapsed if previous is None else EWMA_ALPHA * elapsed + (1 - EWMA_ALPHA) * previous
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def run_batch_automation(self, users: Optional[List[Dict]] = None,
+                             on_user_result: Optional[Callable[[Dict, Optional[List[Dict]]], None]] = None,
+                             resume_completed: bool = True) -> Dict:
+        """남은 시간 안에 들어가는 사용자만 배치로 실행하고 나머지는 다음 실행으로 미룸
+
+        resume_completed=False면 체크포인트에 완료로 남은 사용자도 다시 수집
+        (적응형 스케줄이 갱신 시점이 됐다고 고른 사용자에게 이전 결과를 돌려주지 않도록)
+        """
+        # 순환 import 방지를 위해 실행 시점에 import
+        from parallel_automation import iter_parallel_automation
+
+        if users is None:
+            from firebase_service import get_all_active_users
+            users = get_all_active_users()
+
+        started = time.time()
+        completed = self.checkpoint['completed']
+        if not resume_completed:
+            for user in users:
+                completed.pop(user_key(user), None)
+        resumed = [user for user in users if user_key(user) in completed]
+        pending = self._order_pending([user for user in users if user_key(user) not in completed])
+        if resumed:
+            logger.info(f"♻️ [BATCH] 체크포인트에서 이어서 실행: 완료 {len(resumed)}명 건너뜀, 남은 사용자 {len(pending)}명")
+
+        successful_users = failed_users = 0
+        estimated_total = 0.0
+        while pending:
+            remaining = self.budget - (time.time() - started) - BATCH_OVERHEAD
+            # 남은 시간에 들어가는 사용자로 배치 구성 (동시 실행이므로 배치 비용 = 가장 긴 사용자)
+            batch = [user for user in pending if self.estimate_cost(user) <= remaining]
+            if not (successful_users + failed_users) and pending[0] not in batch:
+                # 첫 배치에는 맨 앞 사용자(이전에 연기된 사용자 우선)를 항상 포함
+                # -> 추정치가 예산 전체보다 큰 사용자도 계속 연기되지 않음
+                logger.warning(f"⚠️ [BATCH] 사용자 {pending[0].get('username', 'Unknown')} 추정 소요 시간 "
+                               f"{self.estimate_cost(pending[0]):.0f}초가 남은 시간 {remaining:.0f}초보다 길지만 실행")
+                batch.insert(0, pending[0])
+            batch = batch[:self.batch_size]
+            if not batch:
+                break
+            batch_estimate = max(self.estimate_cost(user) for user in batch)
+            estimated_total += batch_estimate
+            logger.info(f"📦 [BATCH] 사용자 {len(batch)}명 실행 (추정 {batch_estimate:.0f}초, 남은 시간 {remaining:.0f}초)")
+
+            for user, user_result, error, elapsed in iter_parallel_automation(batch, self.batch_size):
+                username = user.get('username', 'Unknown')
+                self.record_cost(user, elapsed)
+                if error is None and user_result:
+                    assignments = _extract_assignments(user_result)
+                    completed[user_key(user)] = {
+                        'username': username,
+                        'assignments': assignments,
+                        'elapsed': round(elapsed, 1),
+                        'finished_at': time.time(),
+                    }
+                    successful_users += 1
+                    logger.info(f"✅ [BATCH] 사용자 {username} 완료: {len(assignments)}개 과제 ({elapsed:.1f}초)")
+                else:
+                    assignments = None
+                    self.checkpoint['failed'][user_key(user)] = str(error or "결과 없음")
+                    failed_users += 1
+                    logger.error(f"❌ [BATCH] 사용자 {username} 실패: {error or '결과 없음'} ({elapsed:.1f}초)")
+
+                # 사용자마다 체크포인트 저장 (중간 종료 시에도 완료분 유지)
+                self._save_checkpoint()
+                if on_user_result:
+                    try:
+                        on_user_result(user, assignments)
+                    except Exception as callback_error:
+                        logger.warning(f"⚠️ [BATCH] 사용자 {username} 결과 처리 실패: {callback_error}")
+
+            batch_keys = {user_key(user) for user in batch}
+            pending = [user for user in pending if user_key(user) not in batch_keys]
+
+        deferred = pending
+        self.checkpoint['deferred'] = [user_key(user) for user in deferred]
+        if deferred:
+            logger.warning(f"⏭️ [BATCH] 시간 예산 부족으로 {len(deferred)}명 다음 실행으로 연기: "
+                           f"{', '.join(user.get('username', 'Unknown') for user in deferred)}")
+            self._save_checkpoint()
+        else:
+            # 모든 사용자 처리 완료 -> 다음 실행은 새 주기
+            self._clear_checkpoint()
+
+        all_assignments = []
+        for user in users:
+            entry = completed.get(user_key(user))
+            if entry:
+                all_assignments.extend(entry['assignments'])
+
+        execution_time = time.time() - started
+        return {
+            'assignments': all_assignments,
+            'total_count': len(all_assignments),
+            'users_processed': successful_users + failed_users,
+            'successful_users': successful_users,
+            'failed_users': failed_users,
+            'resumed_users': len(resumed),
+            'deferred_users': [user.get('username', 'Unknown') for user in deferred],
+            'deferred_count': len(deferred),
+            'firebase_status': 'connected',
+            'user_count': len(users),
+            'execution_time': execution_time,
+            'budget_seconds': self.budget,
+            'estimated_seconds': round(estimated_total, 1),
+        }
+
+    def save_batch_results(self, result: Dict):
+        """소요 시간 기록과 실행 보고서 저장"""
+        _save_json(self.cost_path, self.costs)
+        report = {key: value for key, value in result.items() if key != 'assignments'}
+        report['finished_at'] = time.time()
+        _save_json(BATCH_REPORT_PATH, report)
+        logger.info(f"📊 [BATCH] 실행 {result.get('execution_time', 0):.0f}초 / 예산 {self.budget:.0f}초 "
+                    f"(추정 {result.get('estimated_seconds', 0):.0f}초), 연기 {result.get('deferred_count', 0)}명")
+
+    # ------------------------------------------------------------------
+    # 내부 함수
+    # ------------------------------------------------------------------
+    def _order_pending(self, users: List[Dict]) -> List[Dict]:
+        """이전 실행에서 연기된 사용자 먼저, 그다음 오래 걸리는 사용자 순 (짧은 사용자로 남은 시간 채움)"""
+        deferred = set(self.checkpoint.get('deferred', []))
+        return sorted(users, key=lambda user: (user_key(user) not in deferred, -self.estimate_cost(user)))
+
+    def _load_checkpoint(self) -> Dict:
+        checkpoint = _load_json(self.checkpoint_path, None)
+        if not checkpoint or time.time() - checkpoint.get('cycle_started', 0) > BATCH_CHECKPOINT_TTL:
+            return {'cycle_started': time.time(), 'completed': {}, 'failed': {}, 'deferred': []}
+        return checkpoint
+
+    def _save_checkpoint(self):
+        self.checkpoint['updated_at'] = time.time()
+        _save_json(self.checkpoint_path, self.checkpoint)
+        _save_json(self.cost_path, self.costs)
+
+    def _clear_checkpoint(self):
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"⚠️ [BATCH] 체크포인트 삭제 실패: {e}")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+HTML 파서 백엔드 벤치마크
+- 저장된 LearnUs 페이지(debug_*.html)로 파싱 시간과 메모리 비교
+- 기존 방식(html.parser 전체 트리) vs lxml 전체 트리 vs lxml + 섹션만 파싱
+- 백엔드마다 별도 프로세스에서 측정하여 최대 RSS가 섞이지 않도록 함
+
+사용법: python benchmark_parsers.py [html 파일 ...] [--repeat N]
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import tracemalloc
+from multiprocessing import get_context
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (이름, 트리 빌더, 섹션만 파싱 여부)
+CASES = [
+    ('html.parser (기존)', 'html.parser', False),
+    ('lxml', 'lxml', False),
+    ('lxml + li.section', 'lxml', True),
+]
+
+
+def _peak_rss_mb():
+    """현재 프로세스 최대 RSS (MB)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 byte 단위
+        return peak / 1024 if sys.platform != 'darwin' else peak / (1024 * 1024)
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+
+def _run_case(builder, sections_only, html, repeat):
+    """자식 프로세스에서 한 가지 방식 측정"""
+    from html_parsing import make_soup, COURSE_SECTIONS
+    from status_optimizer import build_completion_index
+
+    baseline_rss = _peak_rss_mb()
+    tracemalloc.start()
+    started = time.perf_counter()
+    sections = modules = 0
+    for _ in range(repeat):
+        soup = make_soup(html, parse_only=COURSE_SECTIONS if sections_only else None, backend=builder)
+        sections = len(soup.select('li.section.main'))
+        modules = len(build_completion_index(soup))
+    elapsed = (time.perf_counter() - started) / repeat
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'parse_ms': elapsed * 1000,
+        'peak_alloc_mb': peak_alloc / (1024 * 1024),
+        'peak_rss_mb': _peak_rss_mb(),
+        'rss_growth_mb': _peak_rss_mb() - baseline_rss,
+        'sections': sections,
+        'modules': modules,
+    }
+
+
+def benchmark_file(path, repeat):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        html = f.read()
+
+    print(f"\n📄 {os.path.basename(path)} ({len(html) / 1024:.0f}KB, {repeat}회 평균)")
+    print(f"   {'방식':<22}{'파싱(ms)':>10}{'할당 최대(MB)':>15}{'최대 RSS(MB)':>14}{'섹션':>6}{'활동':>6}")
+
+    ctx = get_context('spawn')
+    baseline = None
+    for name, builder, sections_only in CASES:
+        if builder == 'lxml':
+            try:
+                import lxml  # noqa: F401
+            except ImportError:
+                print(f"   {name:<22}{'lxml 미설치 - 건너뜀':>30}")
+                continue
+        with ctx.Pool(1) as pool:
+            result = pool.apply(_run_case, (builder, sections_only, html, repeat))
+        baseline = baseline or result
+        speedup = baseline['parse_ms'] / result['parse_ms'] if result['parse_ms'] else 0
+        print(f"   {name:<22}{result['parse_ms']:>10.1f}{result['peak_alloc_mb']:>15.1f}"
+              f"{result['peak_rss_mb']:>14.1f}{result['sections']:>6}{result['modules']:>6}  x{speedup:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 파서 백엔드 벤치마크")
+    parser.add_argument('files', nargs='*', help="측정할 HTML 파일 (기본: backend/debug_*.html)")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(BACKEND_DIR, 'debug_*.html')))
+    if not files:
+        print("❌ 측정할 HTML 파일이 없습니다")
+        return
+
+    print("🚀 HTML 파서 백엔드 벤치마크")
+    print("=" * 60)
+    for path in files:
+        benchmark_file(path, args.repeat)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, BACKEND_DIR)
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+LearnUs 수집 경로 오프라인 벤치마크 (실제 LearnUs 접속 없음)
+- replay_server로 fixtures/learnus 코퍼스를 로컬 HTTP로 제공하고 수집 경로를 처음부터 끝까지 실행
+  - http: HTTPLectureExtractor.extract_all_lectures (과목 목록 + 과목 페이지 동시 요청 + 완료 상태)
+  - status: StatusOptimizer 활동 추출 + batch_status_check (과목 페이지 HTML만, 네트워크 없음)
+  - parser: LearnUsParser.parse_learnus_assignments (Chrome 필요)
+  - selenium: collect_this_week_lectures_hybrid (Chrome 필요)
+- 경로마다 별도 프로세스에서 측정: 과목당 지연 시간, tracemalloc 할당 최대, 최대 RSS
+  (브라우저 프로세스 메모리는 포함되지 않음)
+- 기본적으로 INFO 로그는 끄고 측정 (--verbose로 켜기)
+
+사용법: python benchmark_replay.py [--cases http,status,parser,selenium] [--repeat N] [--latency-ms 0]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tracemalloc
+from multiprocessing import get_context
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CASES = ['http', 'status', 'parser', 'selenium']
+BROWSER_CASES = ('parser', 'selenium')
+
+
+def _run_http(base_url, corpus):
+    from http_lecture_extractor import HTTPLectureExtractor
+    extractor = HTTPLectureExtractor(base_url=base_url)
+    return len(extractor.extract_all_lectures(max_courses=None, with_status=True))
+
+
+def _run_status(base_url, corpus):
+    from html_parsing import make_soup
+    from status_optimizer import StatusOptimizer
+    optimizer = StatusOptimizer(None)
+    total = 0
+    for course_id in corpus.course_ids():
+        html = corpus.read(f"/course/view.php?id={course_id}")
+        activities = optimizer.optimize_activity_extraction(make_soup(html), course_id)
+        total += len(optimizer.batch_status_check(activities, page=html))
+    return total
+
+
+def _run_parser(base_url, corpus, driver):
+    from services.learnus_parser import LearnUsParser
+    driver.get(f"{base_url}/")
+    return len(asyncio.run(LearnUsParser().parse_learnus_assignments(driver, 'benchmark')))
+
+
+def _run_selenium(base_url, corpus, driver):
+    from page_waits import PageWaiter
+    from test_real_automation_hybrid import collect_this_week_lectures_hybrid
+    driver.get(f"{base_url}/")
+    waiter = PageWaiter(driver)
+    waiter.dom_ready("main_page")
+    return len(collect_this_week_lectures_hybrid(driver, waiter=waiter) or [])
+
+
+RUNNERS = {'http': _run_http, 'status': _run_status, 'parser': _run_parser, 'selenium': _run_selenium}
+
+
+def _run_case(case, base_url, fixture_dir, repeat, verbose):
+    """자식 프로세스에서 수집 경로 하나 측정"""
+    from benchmark_parsers import _peak_rss_mb
+    from replay_server import FixtureCorpus
+
+    corpus = FixtureCorpus(fixture_dir)
+    driver = None
+    if case in BROWSER_CASES:
+        from test_real_automation_hybrid import setup_driver
+        driver = setup_driver()
+        if driver is None:
+            return {'skipped': "Chrome 드라이버 초기화 실패"}
+    if not verbose:
+        logging.disable(logging.INFO)
+
+    runner = RUNNERS[case]
+    args = (base_url, corpus, driver) if driver else (base_url, corpus)
+    try:
+        # 첫 실행은 import/연결 준비 비용이 섞이므로 측정에서 제외
+        runner(*args)
+
+        baseline_rss = _peak_rss_mb()
+        tracemalloc.start()
+        started = time.perf_counter()
+        items = 0
+        for _ in range(repeat):
+            items = runner(*args)
+        elapsed = (time.perf_counter() - started) / repeat
+        _, peak_alloc = tracemalloc.get_traced_memory()
+        live_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+        tracemalloc.stop()
+    finally:
+        if driver:
+            driver.quit()
+
+    courses = max(len(corpus.course_ids()), 1)
+    return {
+        'total_ms': elapsed * 1000,
+        'per_course_ms': elapsed * 1000 / courses,
+        'peak_alloc_mb': peak_alloc / (1024 * 1024),
+        'peak_alloc_per_course_mb': peak_alloc / (1024 * 1024) / courses,
+        'live_blocks': live_blocks,
+        'peak_rss_mb': _peak_rss_mb(),
+        'rss_growth_mb': _peak_rss_mb() - baseline_rss,
+        'items': items,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LearnUs 수집 경로 오프라인 벤치마크")
+    parser.add_argument('--cases', default=','.join(CASES), help=f"측정할 경로 (쉼표 구분, 기본: {','.join(CASES)})")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=None, help="요청마다 추가할 지연 (기본: REPLAY_LATENCY_MS)")
+    parser.add_argument('--fixtures', default=None, help="코퍼스 디렉터리 (기본: backend/fixtures/learnus)")
+    parser.add_argument('--verbose', action='store_true', help="수집 로그 출력")
+    args = parser.parse_args()
+
+    from replay_server import ReplayServer, FixtureCorpus, FIXTURE_DIR, REPLAY_LATENCY_MS
+
+    cases = [c.strip() for c in args.cases.split(',') if c.strip()]
+    unknown = [c for c in cases if c not in RUNNERS]
+    if unknown:
+        print(f"❌ 알 수 없는 경로: {', '.join(unknown)} (가능: {', '.join(CASES)})")
+        return 1
+
+    fixture_dir = args.fixtures or FIXTURE_DIR
+    corpus = FixtureCorpus(fixture_dir)
+    if not corpus.course_ids():
+        print(f"❌ 코퍼스에 과목 페이지가 없습니다: {fixture_dir}")
+        return 1
+
+    latency_ms = REPLAY_LATENCY_MS if args.latency_ms is None else args.latency_ms
+    with ReplayServer(corpus, latency_ms=latency_ms) as server:
+        # 자식 프로세스의 수집기(LEARNUS_BASE_URL 사용)도 재현 서버를 보도록
+        os.environ['LEARNUS_BASE_URL'] = server.base_url
+
+        print("🚀 LearnUs 오프라인 재현 벤치마크")
+        print("=" * 60)
+        print(f"📼 {server.base_url} (페이지 {len(corpus.pages)}개, 과목 {len(corpus.course_ids())}개, "
+              f"지연 {latency_ms:.0f}ms, {args.repeat}회 평균)")
+        print(f"\n   {'경로':<10}{'전체(ms)':>10}{'과목당(ms)':>12}{'할당 최대(MB)':>15}"
+              f"{'과목당(MB)':>12}{'최대 RSS(MB)':>14}{'결과':>6}")
+
+        ctx = get_context('spawn')
+        for case in cases:
+            requests_before = server.stats['requests']
+            with ctx.Pool(1) as pool:
+                result = pool.apply(_run_case, (case, server.base_url, fixture_dir, args.repeat, args.verbose))
+            if 'skipped' in result:
+                print(f"   {case:<10}{result['skipped']:>30} - 건너뜀")
+                continue
+            requests_made = server.stats['requests'] - requests_before
+            print(f"   {case:<10}{result['total_ms']:>10.1f}{result['per_course_ms']:>12.1f}"
+                  f"{result['peak_alloc_mb']:>15.2f}{result['peak_alloc_per_course_mb']:>12.2f}"
+                  f"{result['peak_rss_mb']:>14.1f}{result['items']:>6}"
+                  f"  (요청 {requests_made}개, 잔여 할당 블록 {result['live_blocks']})")
+
+        print(f"\n📶 재현 서버: 요청 {server.stats['requests']}개, 전송 {server.stats['bytes_sent'] / 1024:.1f}KB, "
+              f"304 {server.stats['not_modified']}개, 없는 페이지 {server.stats['not_found']}개")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, BACKEND_DIR)
+    sys.exit(main())
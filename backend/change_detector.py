@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+과목 페이지 변경 감지
+- 사용자별로 과목마다 ETag/Last-Modified와 '이번주 강의' 섹션 HTML 해시 저장
+- 변경되지 않은 과목은 이전 수집 결과를 그대로 사용 (파싱 생략)
+- 이전 실행 대비 추가/삭제/상태 변경된 활동만 변경 내역으로 제공
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHANGE_DETECTION_ENABLED = os.environ.get('CHANGE_DETECTION_ENABLED', 'true').lower() == 'true'
+COURSE_FINGERPRINT_DIR = os.environ.get('COURSE_FINGERPRINT_DIR', 'course_fingerprints')
+
+
+def section_fingerprint(section) -> str:
+    """'이번주 강의' 섹션 HTML 해시 (완료 아이콘 포함 -> 상태 변경도 감지)"""
+    return hashlib.sha256(str(section).encode('utf-8')).hexdigest()
+
+
+def course_key(course_url: str, course_id: Optional[str] = None) -> str:
+    """변경 감지용 과목 키 (Selenium/HTTP 수집 모두 과목 ID 기준, ID가 없으면 URL)"""
+    if not course_id:
+        match = re.search(r'[?&]id=(\d+)', course_url or '')
+        course_id = match.group(1) if match else None
+    return f"course:{course_id or course_url}"
+
+
+def _store_path(university: str, username: str, cache_dir: str) -> str:
+    digest = hashlib.sha256(f"{university}:{username}".encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.json")
+
+
+def _activity_key(activity: Dict) -> str:
+    return activity.get('url') or f"{activity.get('course', '')}:{activity.get('activity', '')}"
+
+
+class CourseFingerprintStore:
+    """사용자 한 명의 과목별 페이지 지문과 마지막 수집 결과"""
+
+    def __init__(self, university: str, username: str, cache_dir: str = COURSE_FINGERPRINT_DIR):
+        self.path = _store_path(university, username, cache_dir)
+        self.cache_dir = cache_dir
+        self._courses = self._load()
+        # 이번 실행에서 확인한 과목: course_key -> (이전 활동, 현재 활동)
+        self._seen: Dict[str, tuple] = {}
+        self.stats = {'unchanged': 0, 'not_modified': 0, 'changed': 0}
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def validators(self, course_key: str) -> Dict[str, str]:
+        """조건부 요청 헤더 (이전 결과가 있을 때만)"""
+        entry = self._courses.get(course_key)
+        if not entry or entry.get('activities') is None:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def not_modified(self, course_key: str) -> Optional[List[Dict]]:
+        """서버가 304를 준 과목의 이전 수집 결과"""
+        activities = self._cached(course_key)
+        if activities is not None:
+            self.stats['not_modified'] += 1
+            self._seen[course_key] = (activities, activities)
+        return activities
+
+    def unchanged_activities(self, course_key: str, section_hash: str) -> Optional[List[Dict]]:
+        """섹션 해시가 같으면 이전 수집 결과, 다르면 None"""
+        entry = self._courses.get(course_key)
+        if not entry or entry.get('section_hash') != section_hash:
+            return None
+        activities = self._cached(course_key)
+        if activities is not None:
+            self.stats['unchanged'] += 1
+            self._seen[course_key] = (activities, activities)
+        return activities
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+    def update(self, course_key: str, activities: List[Dict], section_hash: Optional[str] = None,
+               etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """새로 파싱한 과목 결과 기록"""
+        previous = self._cached(course_key) or []
+        self._courses[course_key] = {
+            'section_hash': section_hash,
+            'etag': etag,
+            'last_modified': last_modified,
+            'activities': [dict(activity) for activity in activities],
+            'updated_at': time.time(),
+        }
+        self.stats['changed'] += 1
+        self._seen[course_key] = (previous, activities)
+
+    def build_changes(self) -> Dict:
+        """이번 실행에서 확인한 과목들의 이전 실행 대비 변경 내역"""
+        added, removed, status_changed = [], [], []
+        for previous, current in self._seen.values():
+            before = {_activity_key(a): a for a in previous}
+            after = {_activity_key(a): a for a in current}
+            for key, activity in after.items():
+                if key not in before:
+                    added.append(activity)
+                elif activity.get('status') != before[key].get('status'):
+                    status_changed.append({**activity, 'previous_status': before[key].get('status')})
+            removed.extend(activity for key, activity in before.items() if key not in after)
+
+        return {
+            'added': added,
+            'removed': removed,
+            'status_changed': status_changed,
+            'courses_checked': len(self._seen),
+            'courses_unchanged': self.stats['unchanged'] + self.stats['not_modified'],
+            'courses_not_modified': self.stats['not_modified'],
+            'courses_changed': self.stats['changed'],
+        }
+
+    def save(self):
+        """사용자 파일에 저장 (원자적 교체)
+
+        이번 실행에서 확인하지 않은 과목(수강 취소/학기 종료)은 삭제.
+        과목을 하나도 확인하지 못한 실행(과목 목록 실패 등)이면 기존 기록 유지
+        """
+        if self._seen:
+            dropped = [key for key in self._courses if key not in self._seen]
+            for key in dropped:
+                del self._courses[key]
+            if dropped:
+                logger.info(f"🧹 [CHANGES] 이번 실행에 없는 과목 {len(dropped)}개 지문 삭제")
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._courses, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ [CHANGES] 과목 지문 저장 실패: {e}")
+
+    def log_summary(self, username: str = ""):
+        changes = self.build_changes()
+        logger.info(f"🔎 [CHANGES] {username} 과목 {changes['courses_checked']}개 확인: "
+                    f"변경 {changes['courses_changed']}개, 변경 없음 {changes['courses_unchanged']}개 | "
+                    f"추가 {len(changes['added'])}, 삭제 {len(changes['removed'])}, 상태 변경 {len(changes['status_changed'])}")
+        return changes
+
+    # ------------------------------------------------------------------
+    # 내부 함수
+    # ------------------------------------------------------------------
+    def _cached(self, course_key: str) -> Optional[List[Dict]]:
+        entry = self._courses.get(course_key)
+        if not entry or entry.get('activities') is None:
+            return None
+        return [dict(activity) for activity in entry['activities']]
+
+    def _load(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ [CHANGES] 과목 지문 파일 손상, 전체 수집: {e}")
+            return {}
+
+
+def get_fingerprint_store(university: str, username: str) -> Optional[CourseFingerprintStore]:
+    """변경 감지가 켜져 있으면 사용자별 지문 저장소 반환"""
+    if not CHANGE_DETECTION_ENABLED:
+        return None
+    return CourseFingerprintStore(university, username)
+
+
+def prune_fingerprint_stores(active_users: Iterable[Dict], cache_dir: str = COURSE_FINGERPRINT_DIR) -> int:
+    """활성 사용자 목록에 없는(비활성화/삭제된) 사용자의 지문 파일 삭제, 삭제 수 반환"""
+    if not os.path.isdir(cache_dir):
+        return 0
+    keep = {os.path.basename(_store_path(user.get('university', '연세대학교'), user.get('username', ''), cache_dir))
+            for user in active_users}
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.endswith('.json') and name not in keep:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+                removed += 1
+            except OSError as e:
+                logger.warning(f"⚠️ [CHANGES] 지문 파일 삭제 실패 ({name}): {e}")
+    return removed
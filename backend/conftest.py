@@ -0,0 +1,13 @@
+"""
+pytest 설정
+- test_*.py 중 실제 LearnUs/Firebase에 접속하는 수동 실행 스크립트는 수집하지 않음
+"""
+
+collect_ignore = [
+    "test_connection.py",
+    "test_credentials.py",
+    "test_firebase_connection.py",
+    "test_lecture.py",
+    "test_real_automation_hybrid.py",
+    "test_real_automation_hybrid_backup_backup.py",
+]
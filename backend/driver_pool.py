@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Chrome 드라이버 풀
+- 미리 띄워둔 headless 브라우저를 사용자 간에 재사용
+- 대여 시 쿠키/스토리지 초기화 (사용자별 새 프로필과 동일한 상태)
+- K회 사용 후 또는 크래시 시 브라우저 재생성
+- 히트/미스, 대여 대기 시간 지표 제공
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from urllib3.exceptions import HTTPError as DriverConnectionError
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', '2'))
+DEFAULT_MAX_USES = int(os.environ.get('DRIVER_MAX_USES', '20'))
+DEFAULT_LEASE_TIMEOUT = float(os.environ.get('DRIVER_LEASE_TIMEOUT', '300'))
+
+# 대여 시 스토리지를 비울 출처 (LearnUs + 연세포털 SSO)
+RESET_ORIGINS = (
+    'https://ys.learnus.org',
+    'https://infra.yonsei.ac.kr',
+)
+
+
+# 브라우저/세션이 죽었을 때 WebDriverException 메시지 (Chrome이 종료되거나 탭이 크래시한 경우)
+SESSION_ERROR_MARKERS = (
+    'invalid session id',
+    'session deleted',
+    'chrome not reachable',
+    'disconnected',
+    'tab crashed',
+    'target window already closed',
+)
+
+
+class DriverPoolTimeout(Exception):
+    """드라이버 대여 대기 시간 초과"""
+
+
+def is_session_error(error: BaseException) -> bool:
+    """드라이버를 버려야 하는 오류인지 (세션 만료, 브라우저 종료, chromedriver 연결 실패)
+
+    NoSuchElement/Timeout 같은 페이지 오류는 드라이버 상태와 무관하므로 False (풀에서 계속 사용)
+    """
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    # chromedriver 프로세스에 연결할 수 없음 (urllib3 MaxRetryError/ProtocolError, 연결 거부/끊김)
+    if isinstance(error, (DriverConnectionError, ConnectionError)):
+        return True
+    if isinstance(error, WebDriverException):
+        message = (error.msg or '').lower()
+        return any(marker in message for marker in SESSION_ERROR_MARKERS)
+    return False
+
+
+class _PooledDriver:
+    """풀에서 관리하는 드라이버와 사용 횟수"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+
+
+class ChromeDriverPool:
+    """N개의 Chrome 드라이버를 유지하는 제한된 크기의 풀"""
+
+    def __init__(self, driver_factory: Optional[Callable] = None,
+                 size: int = DEFAULT_POOL_SIZE, max_uses: int = DEFAULT_MAX_USES):
+        if driver_factory is None:
+            # 순환 import 방지 (test_real_automation_hybrid가 이 모듈을 사용)
+            from test_real_automation_hybrid import setup_driver
+            driver_factory = setup_driver
+        self._factory = driver_factory
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+
+        self._idle: List[_PooledDriver] = []
+        self._leased: Dict[int, _PooledDriver] = {}
+        self._launching = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self._stats = {
+            'leases': 0,
+            'hits': 0,
+            'misses': 0,
+            'launch_failures': 0,
+            'recycled_max_uses': 0,
+            'recycled_crash': 0,
+            'lease_wait_total': 0.0,
+            'lease_wait_max': 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # 생성 / 종료
+    # ------------------------------------------------------------------
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """브라우저를 미리 띄워 둠 (최대 풀 크기까지)"""
+        target = self.size if count is None else min(count, self.size)
+        launched = 0
+        while True:
+            with self._cond:
+                if self._closed or len(self._idle) + len(self._leased) + self._launching >= target:
+                    break
+                self._launching += 1
+            entry = self._launch()
+            with self._cond:
+                self._launching -= 1
+                if entry:
+                    self._idle.append(entry)
+                    launched += 1
+                self._cond.notify()
+            if not entry:
+                break
+        logger.info(f"🔥 [POOL] 드라이버 {launched}개 예열 완료 (풀 크기: {self.size})")
+        return launched
+
+    def close(self):
+        """풀의 모든 드라이버 종료"""
+        with self._cond:
+            self._closed = True
+            entries = self._idle + list(self._leased.values())
+            self._idle = []
+            self._leased = {}
+            self._cond.notify_all()
+        for entry in entries:
+            self._quit(entry)
+        logger.info(f"🔚 [POOL] 드라이버 풀 종료 ({len(entries)}개 브라우저 정리)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 대여 / 반납
+    # ------------------------------------------------------------------
+    def acquire(self, timeout: float = DEFAULT_LEASE_TIMEOUT):
+        """드라이버 대여 (깨끗한 세션 상태로 반환)"""
+        started = time.time()
+        deadline = started + timeout
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise DriverPoolTimeout("드라이버 풀이 이미 종료되었습니다")
+
+                if self._idle:
+                    entry = self._idle.pop()
+                    hit = True
+                elif len(self._leased) + self._launching < self.size:
+                    self._launching += 1
+                    entry = None
+                    hit = False
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise DriverPoolTimeout(f"{timeout:.0f}초 안에 드라이버를 대여하지 못했습니다")
+                    self._cond.wait(remaining)
+                    continue
+
+            if entry is None:
+                entry = self._launch()
+                with self._cond:
+                    self._launching -= 1
+                    self._cond.notify()
+                if entry is None:
+                    raise WebDriverException("Chrome 드라이버 생성 실패")
+            elif not self._reset(entry):
+                # 초기화 실패 = 크래시된 브라우저, 버리고 다시 시도
+                self._bump('recycled_crash')
+                self._quit(entry)
+                continue
+
+            waited = time.time() - started
+            with self._cond:
+                entry.uses += 1
+                self._leased[id(entry.driver)] = entry
+                self._stats['leases'] += 1
+                self._stats['hits' if hit else 'misses'] += 1
+                self._stats['lease_wait_total'] += waited
+                self._stats['lease_wait_max'] = max(self._stats['lease_wait_max'], waited)
+
+            logger.info(f"🚗 [POOL] 드라이버 대여 ({'히트' if hit else '미스'}, 대기 {waited:.2f}초, 사용 {entry.uses}회)")
+            return entry.driver
+
+    def release(self, driver, broken: bool = False):
+        """드라이버 반납 (사용 횟수 초과/크래시 시 재생성)"""
+        with self._cond:
+            entry = self._leased.pop(id(driver), None)
+            closed = self._closed
+
+        if entry is None:
+            # 풀 소속이 아닌 드라이버는 그대로 종료
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return
+
+        if not broken and not self._is_alive(entry):
+            broken = True
+
+        if closed:
+            self._quit(entry)
+        elif broken:
+            self._bump('recycled_crash')
+            logger.warning("♻️ [POOL] 크래시된 드라이버 폐기")
+            self._quit(entry)
+        elif entry.uses >= self.max_uses:
+            self._bump('recycled_max_uses')
+            logger.info(f"♻️ [POOL] 최대 사용 횟수({self.max_uses}) 도달, 드라이버 재생성")
+            self._quit(entry)
+        else:
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._cond.notify()
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+    def get_stats(self) -> Dict:
+        """풀 히트/미스 및 대여 대기 지표"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['size'] = self.size
+            stats['idle'] = len(self._idle)
+            stats['leased'] = len(self._leased)
+        leases = stats['leases']
+        stats['hit_rate'] = round(stats['hits'] / leases, 3) if leases else 0.0
+        stats['lease_wait_avg'] = round(stats['lease_wait_total'] / leases, 3) if leases else 0.0
+        stats['lease_wait_total'] = round(stats['lease_wait_total'], 3)
+        stats['lease_wait_max'] = round(stats['lease_wait_max'], 3)
+        return stats
+
+    # ------------------------------------------------------------------
+    # 내부 함수
+    # ------------------------------------------------------------------
+    def _bump(self, key: str):
+        with self._cond:
+            self._stats[key] += 1
+
+    def _launch(self) -> Optional[_PooledDriver]:
+        try:
+            driver = self._factory()
+        except Exception as e:
+            logger.error(f"❌ [POOL] 드라이버 생성 오류: {e}")
+            driver = None
+        if not driver:
+            self._bump('launch_failures')
+            return None
+        return _PooledDriver(driver)
+
+    def _reset(self, entry: _PooledDriver) -> bool:
+        """이전 사용자의 쿠키/스토리지/캐시 제거"""
+        driver = entry.driver
+        try:
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+                for origin in RESET_ORIGINS:
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                        'origin': origin,
+                        'storageTypes': 'local_storage,session_storage,indexeddb,cache_storage,service_workers',
+                    })
+            except WebDriverException as cdp_error:
+                # CDP 미지원 드라이버: 현재 도메인 쿠키만이라도 제거
+                logger.debug(f"CDP 초기화 실패, 기본 방식 사용: {cdp_error}")
+                driver.delete_all_cookies()
+            driver.get('about:blank')
+            return True
+        except WebDriverException as e:
+            logger.warning(f"⚠️ [POOL] 드라이버 초기화 실패: {e}")
+            return False
+
+    def _is_alive(self, entry: _PooledDriver) -> bool:
+        try:
+            entry.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, entry: _PooledDriver):
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logger.debug(f"드라이버 종료 실패 (무시): {e}")
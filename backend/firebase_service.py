@@ -7,18 +7,34 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 import json
 import os
+import time
+import hashlib
+import threading
 from typing import List, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+# WriteBatch 한 번에 커밋할 최대 쓰기 수 (Firestore 제한 500)
+FIRESTORE_BATCH_SIZE = min(int(os.environ.get('FIRESTORE_BATCH_SIZE', '500')), 500)
+
+# 활성 사용자 목록 캐시 (스냅샷 리스너로 갱신, ROSTER_TTL마다 전체 조회로 보정)
+ROSTER_CACHE_ENABLED = os.environ.get('ROSTER_CACHE_ENABLED', 'true').lower() == 'true'
+ROSTER_TTL = float(os.environ.get('ROSTER_TTL', '900'))
+# 리스너를 쓸 수 없을 때 updatedAt 기준 변경분 조회 간격 (초)
+ROSTER_POLL_INTERVAL = float(os.environ.get('ROSTER_POLL_INTERVAL', '60'))
+# 변경분 기준 시각을 앞당기는 여유 (초, 서버 타임스탬프와 로컬 시계 차이 대비)
+ROSTER_CLOCK_SKEW = float(os.environ.get('ROSTER_CLOCK_SKEW', '60'))
+
 class FirebaseService:
     """Firebase Firestore 서비스"""
     
-    def __init__(self):
-        self.db = None
-        self._initialize_firebase()
+    def __init__(self, db=None):
+        # db를 직접 넘기면 초기화 생략 (에뮬레이터 테스트용)
+        self.db = db
+        if db is None:
+            self._initialize_firebase()
     
     def _initialize_firebase(self):
         """Firebase 초기화"""
@@ -194,14 +210,13 @@ class FirebaseService:
             return None
     
     def update_last_used_time(self, uid: str) -> bool:
-        """마지막 사용 시간 업데이트"""
+        """마지막 사용 시간 업데이트 (updatedAt은 인증 정보/활성 상태가 바뀔 때만 갱신)"""
         if not self.db:
             return False
         
         try:
             self.db.collection('learnus_credentials').document(uid).update({
-                'lastUsedAt': firestore.SERVER_TIMESTAMP,
-                'updatedAt': firestore.SERVER_TIMESTAMP
+                'lastUsedAt': firestore.SERVER_TIMESTAMP
             })
             logger.info(f"사용자 {uid}의 마지막 사용 시간 업데이트 완료")
             return True
@@ -226,12 +241,307 @@ class FirebaseService:
         except Exception as e:
             logger.error(f"사용자 {uid}의 인증 정보 비활성화 실패: {e}")
             return False
+    
+    def create_write_buffer(self) -> Optional['FirestoreWriteBuffer']:
+        """실행 단위 쓰기 버퍼 (Firebase가 없으면 None)"""
+        if not self.db:
+            return None
+        return FirestoreWriteBuffer(self.db)
+
+def assignment_doc_id(course: str, activity_id: str) -> str:
+    """과제 문서 ID (LearnUs 모듈 ID는 그대로, 이름 기반 ID는 과목과 함께 해시)"""
+    if activity_id.isdigit():
+        return activity_id
+    return hashlib.sha1(f"{course}:{activity_id}".encode('utf-8')).hexdigest()[:20]
+
+class FirestoreWriteBuffer:
+    """실행 중 Firestore 쓰기를 모아 WriteBatch 단위로 커밋 (사용자 수가 아닌 배치 수만큼 왕복)"""
+    
+    def __init__(self, db, batch_size: int = FIRESTORE_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self._ops = []
+        self._lock = threading.Lock()
+        self.stats = {'writes': 0, 'batches': 0, 'failed_batches': 0, 'skipped_missing': 0, 'flush_seconds': 0.0}
+    
+    def __len__(self):
+        return len(self._ops)
+    
+    def set(self, ref, data: Dict, merge: bool = True):
+        self._add(('set', ref, data, merge))
+    
+    def update(self, ref, data: Dict):
+        """기존 문서만 수정 (문서가 없으면 커밋 실패 -> flush에서 없는 문서를 빼고 재시도)"""
+        self._add(('update', ref, data, False))
+    
+    def delete(self, ref):
+        self._add(('delete', ref, None, False))
+    
+    def update_last_used(self, uid: str):
+        """마지막 사용 시간 (삭제된 사용자의 인증 정보 문서를 새로 만들지 않도록 update 사용)
+
+        updatedAt은 건드리지 않음: 활성 사용자 캐시가 updatedAt으로 변경분을 찾으므로
+        실행마다 갱신하면 모든 사용자가 매번 변경된 것으로 보인다.
+        """
+        self.update(self.db.collection('learnus_credentials').document(uid), {
+            'lastUsedAt': firestore.SERVER_TIMESTAMP
+        })
+    
+    def upsert_assignments(self, uid: str, changed_items: List, removed_items: List, total_count: int):
+        """바뀐 과제만 learnus_assignments/{uid}/items에 반영"""
+        user_ref = self.db.collection('learnus_assignments').document(uid)
+        items = user_ref.collection('items')
+        for course, activity_id, assignment in changed_items:
+            data = dict(assignment)
+            data['course'] = course
+            data['updatedAt'] = firestore.SERVER_TIMESTAMP
+            self.set(items.document(assignment_doc_id(course, activity_id)), data, merge=False)
+        for course, activity_id in removed_items:
+            self.delete(items.document(assignment_doc_id(course, activity_id)))
+        self.set(user_ref, {'itemCount': total_count, 'updatedAt': firestore.SERVER_TIMESTAMP})
+    
+    def log_run(self, summary: Dict):
+        """자동화 실행 기록 (automation_runs)"""
+        data = {key: value for key, value in summary.items()
+                if key != 'assignments' and isinstance(value, (str, int, float, bool, type(None)))}
+        if isinstance(summary.get('stage_timings'), dict):
+            # 단계별 소요 시간 요약 (pipeline_metrics.MetricsRegistry.end_run)
+            data['stage_timings'] = summary['stage_timings']
+        data['createdAt'] = firestore.SERVER_TIMESTAMP
+        self.set(self.db.collection('automation_runs').document(), data, merge=False)
+    
+    def flush(self) -> Dict:
+        """모은 쓰기를 batch_size 단위 WriteBatch로 커밋"""
+        with self._lock:
+            ops, self._ops = self._ops, []
+        if not ops:
+            return dict(self.stats)
+        
+        started = time.time()
+        for start in range(0, len(ops), self.batch_size):
+            self._commit(ops[start:start + self.batch_size])
+        
+        elapsed = time.time() - started
+        self.stats['flush_seconds'] += elapsed
+        logger.info(f"🔥 Firestore 쓰기 {len(ops)}건 -> 배치 {(len(ops) + self.batch_size - 1) // self.batch_size}개 "
+                    f"({elapsed:.2f}초)")
+        return dict(self.stats)
+    
+    def _commit(self, chunk: List):
+        """배치 하나 커밋 (실패하면 대상 문서 경로를 남기고, 없는 문서 update를 빼고 한 번 재시도)"""
+        for attempt in (1, 2):
+            batch = self.db.batch()
+            for op, ref, data, merge in chunk:
+                if op == 'delete':
+                    batch.delete(ref)
+                elif op == 'update':
+                    batch.update(ref, data)
+                else:
+                    batch.set(ref, data, merge=merge)
+            try:
+                batch.commit()
+                self.stats['writes'] += len(chunk)
+                self.stats['batches'] += 1
+                return
+            except Exception as e:
+                paths = ', '.join(ref.path for _, ref, _, _ in chunk)
+                if attempt == 2:
+                    self.stats['failed_batches'] += 1
+                    logger.error(f"❌ Firestore 배치 쓰기 재시도 실패 ({len(chunk)}건): {e} | 문서: {paths}")
+                    return
+                logger.warning(f"⚠️ Firestore 배치 쓰기 실패, 1회 재시도 ({len(chunk)}건): {e} | 문서: {paths}")
+                chunk = self._without_missing_updates(chunk)
+                if not chunk:
+                    return
+    
+    def _without_missing_updates(self, chunk: List) -> List:
+        """update 대상 중 이미 삭제된 문서는 제외 (한 번의 get_all로 확인)"""
+        refs = [ref for op, ref, _, _ in chunk if op == 'update']
+        if not refs:
+            return chunk
+        try:
+            existing = {snapshot.reference.path for snapshot in self.db.get_all(refs) if snapshot.exists}
+        except Exception as e:
+            logger.warning(f"⚠️ Firestore 문서 존재 확인 실패: {e}")
+            return chunk
+        missing = [ref.path for ref in refs if ref.path not in existing]
+        if missing:
+            self.stats['skipped_missing'] += len(missing)
+            logger.warning(f"⚠️ 없는 문서 {len(missing)}건 update 제외: {', '.join(missing)}")
+        return [op for op in chunk if op[0] != 'update' or op[1].path in existing]
+    
+    def _add(self, op):
+        with self._lock:
+            self._ops.append(op)
+            full = len(self._ops) >= self.batch_size
+        # 한 배치 분량이 모이면 바로 커밋 (메모리 사용량 제한)
+        if full:
+            self.flush()
+
+class ActiveUserRoster:
+    """활성 사용자 목록 메모리 캐시
+    
+    - 전체 조회 후에는 updatedAt이 그 이후인 문서만 추적 (인증 정보 저장/비활성화 때만 updatedAt 갱신)
+      - 리스너: where('updatedAt', '>', 기준 시각) 쿼리에 on_snapshot 등록
+        (실행마다 쓰는 lastUsedAt은 변경되지 않은 사용자 문서를 리스너 결과에 넣지 않음)
+      - 리스너를 쓸 수 없으면 같은 조건으로 주기적으로 조회
+    - ROSTER_TTL이 지나면 전체 조회로 다시 맞추고 기준 시각을 옮김 (리스너가 조용히 끊긴 경우 대비)
+    """
+    
+    def __init__(self, service: FirebaseService, ttl: float = ROSTER_TTL):
+        self.service = service
+        self.ttl = ttl
+        self._users: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._listen = False
+        self._watch = None
+        self._last_full_sync = 0.0
+        self._last_poll = 0.0
+        self._last_change = None
+        self.stats = {'snapshots': 0, 'delta_polls': 0, 'full_syncs': 0, 'changes': 0, 'listener': False}
+    
+    def start(self):
+        """변경분 리스너 사용 (첫 get_users의 전체 조회 후 등록, 블로킹하지 않음)"""
+        if self.service.db:
+            self._listen = True
+    
+    def stop(self):
+        self._listen = False
+        self._unsubscribe()
+    
+    def get_users(self) -> List[Dict]:
+        """캐시된 활성 사용자 목록 (필요할 때만 Firestore 조회)"""
+        if not self.service.db:
+            # 테스트 모드: 더미 사용자
+            return self.service.get_all_active_learnus_credentials()
+        
+        now = time.time()
+        if not self._ready.is_set() or now - self._last_full_sync > self.ttl:
+            self._full_sync()
+        elif self._watch is None and now - self._last_poll > ROSTER_POLL_INTERVAL:
+            self._poll_changes()
+        
+        with self._lock:
+            return [dict(user) for user in self._users.values()]
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            count = len(self._users)
+        return {**self.stats, 'users': count,
+                'age_seconds': round(time.time() - self._last_full_sync, 1) if self._last_full_sync else None}
+    
+    # ------------------------------------------------------------------
+    # 내부 함수
+    # ------------------------------------------------------------------
+    def _changes_query(self):
+        """기준 시각 이후 인증 정보/활성 상태가 바뀐 문서 (비활성화된 사용자 포함)"""
+        return self.service.db.collection('learnus_credentials').where('updatedAt', '>', self._last_change)
+    
+    def _subscribe(self):
+        self._unsubscribe()
+        if not self._listen or self._last_change is None:
+            return
+        try:
+            self._watch = self._changes_query().on_snapshot(self._on_snapshot)
+            self.stats['listener'] = True
+            logger.info("👂 [ROSTER] 사용자 변경분 리스너 등록")
+        except Exception as e:
+            logger.warning(f"⚠️ [ROSTER] 스냅샷 리스너 등록 실패, 변경분 조회 사용: {e}")
+            self._watch = None
+    
+    def _unsubscribe(self):
+        if self._watch is not None:
+            try:
+                self._watch.unsubscribe()
+            except Exception as e:
+                logger.debug(f"스냅샷 리스너 해제 실패: {e}")
+            self._watch = None
+            self.stats['listener'] = False
+    
+    def _on_snapshot(self, docs, changes, read_time):
+        """리스너 콜백 (Firestore 스레드에서 호출, 삭제된 문서는 REMOVED)"""
+        updated = [change.document for change in changes if change.type.name != 'REMOVED']
+        removed = [change.document.id for change in changes if change.type.name == 'REMOVED']
+        self._apply(updated, removed)
+        self.stats['snapshots'] += 1
+    
+    def _apply(self, docs, removed_ids=()):
+        """바뀐 문서 반영 (비활성화/삭제된 사용자는 제거)"""
+        with self._lock:
+            for doc in docs:
+                user = self._to_user(doc)
+                if user.get('isActive'):
+                    self._users[doc.id] = user
+                else:
+                    self._users.pop(doc.id, None)
+            for uid in removed_ids:
+                self._users.pop(uid, None)
+        count = len(docs) + len(removed_ids)
+        if count:
+            self.stats['changes'] += count
+            logger.info(f"🔄 [ROSTER] 사용자 변경 {count}건 반영")
+    
+    def _full_sync(self):
+        # 서버 타임스탬프와의 시계 차이만큼 여유 (여유 구간의 변경은 한 번 더 반영될 뿐)
+        synced_at = datetime.now(timezone.utc) - timedelta(seconds=ROSTER_CLOCK_SKEW)
+        users = self.service.get_all_active_learnus_credentials()
+        with self._lock:
+            self._users = {user['uid']: user for user in users}
+            self._last_full_sync = self._last_poll = time.time()
+            # 이후 변경분 기준: 조회 시작 시각 (조회 중 바뀐 문서는 변경분에서 다시 받음)
+            self._last_change = synced_at
+        self.stats['full_syncs'] += 1
+        self._ready.set()
+        self._subscribe()
+    
+    def _poll_changes(self):
+        """updatedAt이 기준 시각 이후인 문서만 조회"""
+        self._last_poll = time.time()
+        if self._last_change is None:
+            return
+        try:
+            docs = list(self._changes_query().get())
+        except Exception as e:
+            logger.warning(f"⚠️ [ROSTER] 변경분 조회 실패: {e}")
+            return
+        self._apply(docs)
+        with self._lock:
+            for doc in docs:
+                updated_at = (doc.to_dict() or {}).get('updatedAt')
+                if updated_at and updated_at > self._last_change:
+                    self._last_change = updated_at
+        self.stats['delta_polls'] += 1
+    
+    @staticmethod
+    def _to_user(doc) -> Dict:
+        data = doc.to_dict()
+        data['uid'] = doc.id
+        return data
 
 # 전역 Firebase 서비스 인스턴스
 firebase_service = FirebaseService()
+_active_user_roster: Optional[ActiveUserRoster] = None
+_active_user_roster_lock = threading.Lock()
+
+def start_active_user_roster() -> Optional[ActiveUserRoster]:
+    """활성 사용자 캐시 시작 (스케줄러 시작 시 호출, 블로킹하지 않음, 여러 번 호출해도 하나만)"""
+    global _active_user_roster
+    if not ROSTER_CACHE_ENABLED:
+        return None
+    with _active_user_roster_lock:
+        if _active_user_roster is None:
+            _active_user_roster = ActiveUserRoster(firebase_service)
+            _active_user_roster.start()
+    return _active_user_roster
+
+def get_active_user_roster() -> Optional[ActiveUserRoster]:
+    return _active_user_roster
 
 def get_all_active_users() -> List[Dict]:
-    """모든 활성화된 사용자 정보 가져오기 (스케줄러용)"""
+    """모든 활성화된 사용자 정보 가져오기 (스케줄러용, 캐시가 시작되었으면 캐시에서)"""
+    if _active_user_roster is not None:
+        return _active_user_roster.get_users()
     return firebase_service.get_all_active_learnus_credentials()
 
 def get_user_credentials(uid: str) -> Optional[Dict]:
@@ -242,6 +552,10 @@ def update_user_last_used(uid: str) -> bool:
     """사용자 마지막 사용 시간 업데이트"""
     return firebase_service.update_last_used_time(uid)
 
+def create_write_buffer() -> Optional[FirestoreWriteBuffer]:
+    """실행 단위 Firestore 쓰기 버퍼 (스케줄러용)"""
+    return firebase_service.create_write_buffer()
+
 if __name__ == "__main__":
     # 테스트 실행
     print("Firebase 서비스 테스트 시작...")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+HTML 파서 백엔드 선택
+- PARSER_BACKEND=auto(기본)면 lxml이 설치되어 있을 때 lxml, 없으면 html.parser
+- 과목 페이지는 필요한 부분(li.section)만 파싱하는 SoupStrainer 제공
+"""
+
+import os
+import re
+import logging
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+PARSER_BACKEND = os.environ.get('PARSER_BACKEND', 'auto').lower()
+
+# 과목 페이지: 주차별 섹션(li.section.main)과 그 안의 활동(li.activity)만 필요
+# (파싱 중에는 class가 "section main clearfix" 문자열 그대로라 단어 단위 정규식으로 비교)
+COURSE_SECTIONS = SoupStrainer('li', class_=re.compile(r'(?:^|\s)section(?:\s|$)'))
+# 메인 페이지: 과목 목록은 링크만 필요
+LINKS_ONLY = SoupStrainer('a', href=True)
+
+
+def _lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """사용할 BeautifulSoup 트리 빌더 이름"""
+    backend = (backend or PARSER_BACKEND).lower()
+    if backend == 'auto':
+        return 'lxml' if _lxml_available() else 'html.parser'
+    if backend == 'lxml' and not _lxml_available():
+        logger.warning("⚠️ lxml이 설치되어 있지 않아 html.parser 사용")
+        return 'html.parser'
+    return backend
+
+
+DEFAULT_BACKEND = resolve_backend()
+
+
+def make_soup(html, parse_only: Optional[SoupStrainer] = None, backend: Optional[str] = None) -> BeautifulSoup:
+    """설정된 백엔드로 HTML 파싱 (parse_only로 필요한 요소만 트리 생성)"""
+    builder = resolve_backend(backend) if backend else DEFAULT_BACKEND
+    return BeautifulSoup(html, builder, parse_only=parse_only)
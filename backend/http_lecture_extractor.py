@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os
 import requests
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from bs4 import BeautifulSoup
 import json
@@ -20,9 +25,142 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 로깅 설정 이후 import (status_optimizer의 basicConfig가 파일 로그 설정을 덮지 않도록)
+from status_optimizer import lookup_completion_status, build_completion_index
+from change_detector import course_key, section_fingerprint
+from html_parsing import make_soup, COURSE_SECTIONS, LINKS_ONLY
+from pipeline_metrics import StageTimer
+
+# 활동 URL -> (타입, 기본 상태, 완료 아이콘 확인 필요 여부) - Selenium/HTTP 수집 공통
+_ACTIVITY_TYPES = [
+    (("mod/assign/",), "과제", None),
+    (("mod/vod/",), "동영상", None),
+    (("mod/resource/", "mod/ubfile/"), "PDF 자료", "다운로드 가능"),
+    (("mod/ubboard/",), "게시판", "접근 가능"),
+    (("mod/quiz/",), "퀴즈", None),
+    (("mod/forum/",), "토론", "참여 가능"),
+    (("mod/lesson/",), "강의", "학습 가능"),
+    (("mod/page/",), "페이지", "접근 가능"),
+]
+# 활동이 없는 과목도 과목명은 남기는 자리 표시 행
+NO_ACTIVITY = '이번주 강의 활동 없음'
+NO_SECTION_ACTIVITY = '이번주 강의 섹션 없음'
+# 활동이 아닌 링크 (링크 텍스트에 포함되면 제외)
+SKIP_LINK_TEXTS = ("더보기", "more", "자세히", "detail", "보기", "view")
+
+# 호스트당 동시 요청 수 (서버 부하 방지, keep-alive 연결 풀 크기와 동일)
+MAX_CONCURRENCY_PER_HOST = int(os.environ.get('HTTP_MAX_CONCURRENCY_PER_HOST', '4'))
+# 연결 풀을 유지할 호스트 수 (urllib3 pool_connections, 동시 요청 수와 무관)
+# 세션은 LearnUs와 로그인 리다이렉트 호스트 몇 개만 쓰므로 고정값, 호스트당 연결 수는 MAX_CONCURRENCY_PER_HOST
+POOL_HOSTS = 4
+# 과목 페이지 요청 타임아웃 (초)
+REQUEST_TIMEOUT = float(os.environ.get('HTTP_REQUEST_TIMEOUT', '15'))
+# LearnUs 주소 (오프라인 벤치마크에서는 replay_server 주소로 바꿔서 사용)
+LEARNUS_BASE_URL = os.environ.get('LEARNUS_BASE_URL', 'https://ys.learnus.org').rstrip('/')
+
+
+def is_logged_in_page(html):
+    """LearnUs 페이지가 로그인된 상태인지 확인 (로그아웃 링크 존재 / SSO 로그인 버튼 없음)"""
+    if not html:
+        return False
+    if 'login/logout.php' in html:
+        return True
+    return 'btn-sso' not in html and 'loginId' not in html and '/course/view.php?id=' in html
+
+
+# 과목 페이지 활동의 기간 표시 (예: "2025-09-22 00:00:00 ~ 2025-09-28 23:59:59")의 종료 시각
+_ACTIVITY_PERIOD_END = re.compile(r'~\s*(\d{4}-\d{2}-\d{2}(?:\s+\d{2}:\d{2}(?::\d{2})?)?)')
+
+
+def extract_activity_due_date(link):
+    """활동 링크가 속한 li.activity의 기간 표시에서 마감 시각 문자열 (표시가 없으면 None)
+
+    활동 페이지를 따로 열지 않고 과목 페이지에 이미 있는 정보만 사용한다.
+    """
+    activity = link.find_parent('li', class_='activity')
+    if activity is None:
+        return None
+    period = activity.select_one('.displayoptions, .text-ubstrap')
+    if period is None:
+        return None
+    match = _ACTIVITY_PERIOD_END.search(period.get_text(' ', strip=True))
+    return re.sub(r'\s+', ' ', match.group(1)) if match else None
+
+def classify_activity(activity_url):
+    """활동 타입 판별 (기본 상태가 None이면 완료 아이콘으로 상태 확인 필요)"""
+    for markers, activity_type, status in _ACTIVITY_TYPES:
+        if any(marker in activity_url for marker in markers):
+            return activity_type, status
+    return "기타", "상태 불명"
+
+
+def placeholder_activity(course_name, activity):
+    """활동/섹션이 없는 과목의 자리 표시 행 (NO_ACTIVITY / NO_SECTION_ACTIVITY)"""
+    return {
+        'course': course_name,
+        'activity': activity,
+        'type': '정보 없음',
+        'url': ''
+    }
+
+
+def collect_section_activities(section, course_name, base_url=None):
+    """이번주 강의 섹션의 활동 링크 -> (활동 목록, 완료 아이콘으로 상태를 확인할 활동)
+
+    Selenium/HTTP 수집이 같은 결과를 내도록 두 방식 모두 이 함수로 활동을 만든다.
+    확인 전 상태는 "상태 확인 불가", 활동 링크가 하나도 없으면 자리 표시 행 하나만 돌려준다.
+    '더보기'/'view' 같은 링크(SKIP_LINK_TEXTS)는 활동이 아니므로 제외
+    """
+    links = section.find_all('a', href=True)
+    logger.info(f"   📚 {course_name}: {len(links)}개 활동 발견")
+    if not links:
+        logger.info(f"   📝 {course_name}: 이번주 강의 활동 없음, 과목명만 기록")
+        return [placeholder_activity(course_name, NO_ACTIVITY)], []
+    
+    activities, pending_status = [], []
+    for link in links:
+        try:
+            activity_name = link.get_text().strip()
+            activity_url = link.get('href', '')
+            if not activity_name or not activity_url:
+                continue
+            # 의미없는 링크 제외
+            if any(skip in activity_name.lower() for skip in SKIP_LINK_TEXTS):
+                continue
+            if base_url and not activity_url.startswith('http'):
+                activity_url = f"{base_url}{activity_url}"
+            
+            activity_type, completion_status = classify_activity(activity_url)
+            activity = {
+                'course': course_name,
+                'activity': activity_name,
+                'type': activity_type,
+                'url': activity_url,
+                'status': completion_status or "상태 확인 불가"
+            }
+            # 수강 기간 종료 시각 (적응형 스케줄링의 마감 임박 판단에 사용)
+            due_date = extract_activity_due_date(link)
+            if due_date:
+                activity['due_date'] = due_date
+            activities.append(activity)
+            if completion_status is None:
+                pending_status.append(activity)
+            logger.info(f"      ✅ {activity_name} ({activity_type})")
+        except Exception as e:
+            logger.debug(f"      활동 정보 추출 실패: {e}")
+    if not activities:
+        logger.info(f"   📝 {course_name}: 이번주 강의 활동 없음, 과목명만 기록")
+        return [placeholder_activity(course_name, NO_ACTIVITY)], []
+    return activities, pending_status
+
 class HTTPLectureExtractor:
-    def __init__(self):
+    def __init__(self, base_url=None, timer=None):
+        self.base_url = (base_url or LEARNUS_BASE_URL).rstrip('/')
+        # 단계별 소요 시간 (course_list / course_fetch / course_parse, run()은 http_login / save 포함)
+        self.timer = timer or StageTimer()
         self.session = requests.Session()
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
         self.setup_session()
         
     def setup_session(self):
@@ -42,13 +180,90 @@ class HTTPLectureExtractor:
             'Cache-Control': 'max-age=0',
         })
         
+        # 동시 요청이 연결을 재사용하도록 호스트당 연결 풀 크기를 동시 요청 수에 맞춤 (keep-alive)
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=MAX_CONCURRENCY_PER_HOST)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def load_cookies(self, cookies):
+        """쿠키 목록(Selenium/CDP/저장소 형식)을 HTTP 세션에 추가"""
+        for cookie in cookies:
+            expires = cookie.get('expires', cookie.get('expiry'))
+            self.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/'),
+                secure=cookie.get('secure', False),
+                expires=int(expires) if expires and expires > 0 else None,
+            )
+    
+    def export_cookies(self):
+        """HTTP 세션 쿠키를 저장소/브라우저로 넘길 수 있는 형식으로 반환"""
+        return [
+            {
+                'name': cookie.name,
+                'value': cookie.value,
+                'domain': cookie.domain,
+                'path': cookie.path,
+                'secure': cookie.secure,
+                'expires': cookie.expires,
+            }
+            for cookie in self.session.cookies
+        ]
+    
+    def is_session_valid(self):
+        """현재 쿠키로 LearnUs 메인 페이지에 로그인 상태로 접근되는지 확인"""
+        try:
+            response = self.session.get(f"{self.base_url}/", timeout=REQUEST_TIMEOUT)
+            return response.status_code == 200 and "login" not in response.url.lower() and is_logged_in_page(response.text)
+        except Exception as e:
+            logger.warning(f"세션 확인 실패: {e}")
+            return False
+    
+    def _host_slot(self, url):
+        """호스트별 동시 요청 제한용 세마포어"""
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(MAX_CONCURRENCY_PER_HOST)
+                self._host_slots[host] = slot
+        return slot
+    
+    def import_cookies_from_driver(self, driver):
+        """브라우저(Selenium)에서 로그인한 세션 쿠키를 HTTP 세션으로 복사"""
+        try:
+            try:
+                # CDP로 SSO 도메인을 포함한 전체 쿠키 조회
+                cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+            except Exception:
+                cookies = driver.get_cookies()
+            
+            self.load_cookies(cookies)
+            
+            # 서버가 세션을 User-Agent와 묶어두는 경우를 위해 브라우저 UA 사용
+            try:
+                user_agent = driver.execute_script("return navigator.userAgent")
+                if user_agent:
+                    self.session.headers['User-Agent'] = user_agent
+            except Exception:
+                pass
+            
+            logger.info(f"🍪 브라우저 쿠키 {len(cookies)}개를 HTTP 세션으로 복사")
+            return len(cookies) > 0
+            
+        except Exception as e:
+            logger.error(f"❌ 쿠키 복사 실패: {e}")
+            return False
+        
     def login_to_learnus(self, username, password):
         """LearnUs 로그인 (HTTP Request 방식)"""
         try:
             logger.info("🔐 LearnUs 로그인 시도...")
             
             # 1단계: 메인 페이지 접속
-            main_url = "https://ys.learnus.org/"
+            main_url = f"{self.base_url}/"
             response = self.session.get(main_url)
             logger.info(f"메인 페이지 응답: {response.status_code}")
             
@@ -57,16 +272,16 @@ class HTTPLectureExtractor:
                 return False
             
             # 2단계: 로그인 링크 찾기
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             login_link = soup.find('a', href=lambda x: x and 'login' in x.lower())
             
             if not login_link:
                 # 직접 로그인 페이지 시도
-                login_url = "https://ys.learnus.org/login/index.php"
+                login_url = f"{self.base_url}/login/index.php"
             else:
                 login_url = login_link.get('href')
                 if not login_url.startswith('http'):
-                    login_url = "https://ys.learnus.org" + login_url
+                    login_url = self.base_url + login_url
             
             logger.info(f"로그인 URL: {login_url}")
             
@@ -79,7 +294,7 @@ class HTTPLectureExtractor:
                 return False
             
             # 4단계: 로그인 폼 데이터 추출
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             login_form = soup.find('form', {'id': 'login'}) or soup.find('form')
             
             if not login_form:
@@ -107,7 +322,7 @@ class HTTPLectureExtractor:
             # 5단계: 로그인 요청
             action_url = login_form.get('action', login_url)
             if not action_url.startswith('http'):
-                action_url = "https://ys.learnus.org" + action_url
+                action_url = self.base_url + action_url
             
             login_response = self.session.post(action_url, data=form_data, allow_redirects=True)
             logger.info(f"로그인 응답: {login_response.status_code}")
@@ -139,26 +354,31 @@ class HTTPLectureExtractor:
             logger.info("📚 과목 목록 수집 중...")
             
             # 메인 페이지에서 과목 목록 가져오기
-            main_url = "https://ys.learnus.org/"
+            main_url = f"{self.base_url}/"
             response = self.session.get(main_url)
             
             if response.status_code != 200:
                 logger.error(f"메인 페이지 접속 실패: {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text, parse_only=LINKS_ONLY)
             
-            # 과목 링크 찾기
+            # 과목 링크 찾기 (같은 과목의 중복 링크는 한 번만)
             course_links = []
+            seen_course_ids = set()
             for link in soup.find_all('a', href=True):
                 href = link.get('href', '')
                 if '/course/view.php?id=' in href:
                     course_name = link.get_text().strip()
                     if course_name and len(course_name) > 3:
+                        course_id = re.search(r'id=(\d+)', href).group(1) if re.search(r'id=(\d+)', href) else None
+                        if course_id and course_id in seen_course_ids:
+                            continue
+                        seen_course_ids.add(course_id)
                         course_links.append({
                             'name': course_name,
-                            'url': href if href.startswith('http') else f"https://ys.learnus.org{href}",
-                            'course_id': re.search(r'id=(\d+)', href).group(1) if re.search(r'id=(\d+)', href) else None
+                            'url': href if href.startswith('http') else f"{self.base_url}{href}",
+                            'course_id': course_id
                         })
             
             logger.info(f"📚 {len(course_links)}개 과목 발견")
@@ -169,15 +389,34 @@ class HTTPLectureExtractor:
             return []
     
     def get_course_content(self, course_url):
-        """과목 페이지 내용 가져오기"""
+        """과목 페이지 내용 가져오기 (호스트당 동시 요청 수 제한)"""
+        page = self.fetch_course_page(course_url)
+        return page['soup'] if page else None
+    
+    def fetch_course_page(self, course_url, validators=None):
+        """과목 페이지 조건부 요청
+
+        validators(If-None-Match/If-Modified-Since)를 보내 304를 받으면 파싱하지 않는다.
+        반환: {'soup', 'not_modified', 'etag', 'last_modified'} 또는 실패 시 None
+        """
         try:
-            response = self.session.get(course_url)
+            with self._host_slot(course_url), self.timer.span('course_fetch'):
+                response = self.session.get(course_url, headers=validators or None, timeout=REQUEST_TIMEOUT)
+            
+            if response.status_code == 304:
+                return {'soup': None, 'not_modified': True, 'etag': None, 'last_modified': None}
             
             if response.status_code != 200:
                 logger.warning(f"과목 페이지 접속 실패: {response.status_code}")
                 return None
             
-            return BeautifulSoup(response.text, 'html.parser')
+            return {
+                # 주차 섹션만 파싱 (헤더/사이드바/스크립트 제외)
+                'soup': make_soup(response.text, parse_only=COURSE_SECTIONS),
+                'not_modified': False,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }
             
         except Exception as e:
             logger.error(f"❌ 과목 페이지 로드 오류: {e}")
@@ -187,7 +426,7 @@ class HTTPLectureExtractor:
         """이번주 강의 섹션 찾기"""
         try:
             # 섹션 찾기
-            sections = soup.find_all('li', class_='section main')
+            sections = soup.select('li.section.main')
             logger.info(f"   {course_name}: {len(sections)}개 섹션 발견")
             
             for idx, section in enumerate(sections):
@@ -235,119 +474,122 @@ class HTTPLectureExtractor:
             logger.error(f"❌ 섹션 찾기 오류: {e}")
             return None
     
-    def extract_activities_from_section(self, section, course_name):
-        """섹션에서 활동 추출"""
-        activities = []
-        
+    def extract_activities_from_section(self, section, course_name, completion_index=None):
+        """섹션에서 활동 추출 (completion_index가 주어지면 완료 상태도 기록)"""
         try:
-            # 모든 링크 찾기
-            links = section.find_all('a', href=True)
-            logger.info(f"   {len(links)}개 링크 발견")
-            
-            for link in links:
-                try:
-                    activity_name = link.get_text().strip()
-                    activity_url = link.get('href', '')
-                    
-                    if not activity_name or not activity_url:
-                        continue
-                    
-                    # 의미없는 링크 제외
-                    if any(skip in activity_name.lower() for skip in [
-                        "더보기", "more", "자세히", "detail", "보기", "view"
-                    ]):
-                        continue
-                    
-                    # URL 완성
-                    if not activity_url.startswith('http'):
-                        activity_url = f"https://ys.learnus.org{activity_url}"
-                    
-                    # 활동 타입 판별
-                    activity_type = "기타"
-                    if "mod/assign/" in activity_url:
-                        activity_type = "과제"
-                    elif "mod/vod/" in activity_url:
-                        activity_type = "동영상"
-                    elif "mod/resource/" in activity_url or "mod/ubfile/" in activity_url:
-                        activity_type = "PDF 자료"
-                    elif "mod/ubboard/" in activity_url:
-                        activity_type = "게시판"
-                    elif "mod/quiz/" in activity_url:
-                        activity_type = "퀴즈"
-                    
-                    activity_info = {
-                        "course": course_name,
-                        "activity": activity_name,
-                        "type": activity_type,
-                        "url": activity_url
-                    }
-                    
-                    activities.append(activity_info)
-                    logger.info(f"     ✅ {activity_name} ({activity_type})")
-                    
-                except Exception as e:
-                    logger.debug(f"     링크 처리 실패: {e}")
-                    continue
-                    
+            activities, pending_status = collect_section_activities(section, course_name, self.base_url)
         except Exception as e:
             logger.error(f"   활동 추출 실패: {e}")
+            return []
         
+        if completion_index is not None:
+            for activity in pending_status:
+                activity['status'] = lookup_completion_status(completion_index, activity['url'])
         return activities
     
-    def extract_all_lectures(self):
-        """모든 과목의 이번주 강의 추출"""
+    def extract_all_lectures(self, max_courses=5, with_status=False, fingerprints=None):
+        """모든 과목의 이번주 강의 추출 (max_courses=None이면 전체 과목)
+
+        과목 페이지는 호스트당 동시 요청 수 제한 안에서 동시에 가져오고,
+        도착하는 순서대로 분석한다. 결과는 과목 목록 순서를 유지한다.
+        fingerprints(CourseFingerprintStore)가 주어지면 변경되지 않은 과목은 이전 결과를 사용한다.
+        """
         try:
             logger.info("🔍 이번주 강의 정보 수집 시작...")
             
             # 과목 목록 가져오기
-            courses = self.get_course_list()
+            with self.timer.span('course_list'):
+                courses = self.get_course_list()
             if not courses:
                 logger.warning("과목 목록을 가져올 수 없습니다")
                 return []
             
-            all_lectures = []
+            targets = courses[:max_courses]
+            course_results = {}
+            started = time.time()
+            
+            workers = max(1, min(len(targets), MAX_CONCURRENCY_PER_HOST))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self.fetch_course_page, course['url'],
+                                    fingerprints.validators(self._course_key(course)) if fingerprints else None): (i, course)
+                    for i, course in enumerate(targets)
+                }
+                for future in as_completed(futures):
+                    i, course = futures[future]
+                    try:
+                        page = future.result()
+                        with self.timer.span('course_parse'):
+                            course_results[i] = self.extract_course_lectures(
+                                i, course, page, with_status, fingerprints)
+                    except Exception as e:
+                        logger.warning(f"   ❌ 과목 {i+1} 처리 실패: {e}")
             
-            for i, course in enumerate(courses[:5]):  # 처음 5개 과목만 테스트
-                try:
-                    course_name = course['name']
-                    course_url = course['url']
-                    
-                    logger.info(f"\n📖 과목 {i+1}: {course_name}")
-                    
-                    # 과목 페이지 가져오기
-                    soup = self.get_course_content(course_url)
-                    if not soup:
-                        logger.warning(f"   ⚠️ {course_name} 페이지 로드 실패")
-                        continue
-                    
-                    # 이번주 강의 섹션 찾기
-                    this_week_section = self.find_this_week_section(soup, course_name)
-                    
-                    if this_week_section:
-                        # 섹션에서 활동 추출
-                        course_activities = self.extract_activities_from_section(this_week_section, course_name)
-                        
-                        if course_activities:
-                            all_lectures.extend(course_activities)
-                            logger.info(f"   📚 {len(course_activities)}개 활동 발견")
-                        else:
-                            logger.info(f"   📭 활동 없음")
-                    else:
-                        logger.info(f"   📭 '이번주 강의' 섹션 없음")
-                    
-                    # 요청 간격 조절 (서버 부하 방지)
-                    time.sleep(1)
-                        
-                except Exception as e:
-                    logger.warning(f"   ❌ 과목 {i+1} 처리 실패: {e}")
-                    continue
+            all_lectures = []
+            for i in range(len(targets)):
+                all_lectures.extend(course_results.get(i, []))
             
+            logger.info(f"⚡ {len(targets)}개 과목 페이지 수집 완료 ({time.time() - started:.2f}초, 동시 요청 {workers}개)")
             return all_lectures
             
         except Exception as e:
             logger.error(f"❌ 강의 추출 오류: {e}")
             return []
     
+    def extract_course_lectures(self, index, course, page, with_status=False, fingerprints=None):
+        """가져온 과목 페이지 하나에서 이번주 강의 활동 추출"""
+        course_name = course['name']
+        course_key = self._course_key(course)
+        logger.info(f"\n📖 과목 {index+1}: {course_name}")
+        
+        if page and page['not_modified'] and fingerprints:
+            cached = fingerprints.not_modified(course_key)
+            if cached is not None:
+                logger.info(f"   ⏭️ 변경 없음 (304), 이전 결과 {len(cached)}개 사용")
+                return cached
+        
+        soup = page['soup'] if page else None
+        # 주차 섹션이 하나도 없는 페이지는 부분 파싱 결과가 비어 있음 (로드 실패와 구분)
+        if soup is None:
+            logger.warning(f"   ⚠️ {course_name} 페이지 로드 실패")
+            return []
+        
+        # 이번주 강의 섹션 찾기
+        this_week_section = self.find_this_week_section(soup, course_name)
+        if not this_week_section:
+            logger.info(f"   📭 {course_name}: '이번주 강의' 섹션 없음, 과목명만 기록")
+            course_activities = [placeholder_activity(course_name, NO_SECTION_ACTIVITY)]
+            if fingerprints:
+                fingerprints.update(course_key, course_activities, etag=page['etag'], last_modified=page['last_modified'])
+            return course_activities
+        
+        # 섹션 HTML이 이전과 같으면 활동 추출 생략
+        section_hash = section_fingerprint(this_week_section) if fingerprints else None
+        if fingerprints:
+            cached = fingerprints.unchanged_activities(course_key, section_hash)
+            if cached is not None:
+                logger.info(f"   ⏭️ 이번주 강의 변경 없음, 이전 결과 {len(cached)}개 사용")
+                return cached
+        
+        # 섹션에서 활동 추출 (완료 상태는 같은 페이지 스냅샷에서 판별)
+        completion_index = build_completion_index(soup) if with_status else None
+        course_activities = self.extract_activities_from_section(
+            this_week_section, course_name, completion_index)
+        
+        if fingerprints:
+            fingerprints.update(course_key, course_activities, section_hash=section_hash,
+                                etag=page['etag'], last_modified=page['last_modified'])
+        
+        if course_activities:
+            logger.info(f"   📚 {len(course_activities)}개 활동 발견")
+        else:
+            logger.info(f"   📭 활동 없음")
+        return course_activities
+    
+    def _course_key(self, course):
+        """변경 감지용 과목 키 (Selenium 수집과 같은 키)"""
+        return course_key(course['url'], course.get('course_id'))
+    
     def save_to_file(self, lectures):
         """결과를 파일로 저장"""
         try:
@@ -415,17 +657,23 @@ class HTTPLectureExtractor:
             print("❌ 로그인 정보가 누락되었습니다")
             return False
         
+        outcome = 'failed'
         try:
             # 로그인
-            if not self.login_to_learnus(username, password):
+            with self.timer.span('http_login'):
+                logged_in = self.login_to_learnus(username, password)
+            if not logged_in:
                 print("❌ 로그인 실패")
                 return False
             
             # 이번주 강의 정보 수집
             lectures = self.extract_all_lectures()
+            outcome = 'success'
             
             # 결과 저장
-            if self.save_to_file(lectures):
+            with self.timer.span('save'):
+                saved = self.save_to_file(lectures)
+            if saved:
                 print(f"\n✅ 총 {len(lectures)}개 이번주 강의 활동 수집 완료!")
                 print("📄 assignment.txt 파일을 확인하세요.")
                 print("⚡ HTTP Request 방식으로 훨씬 빠르게 처리되었습니다!")
@@ -437,6 +685,8 @@ class HTTPLectureExtractor:
         except Exception as e:
             logger.error(f"❌ 실행 오류: {e}")
             return False
+        finally:
+            self.timer.finish(outcome, username)
 
 def main():
     extractor = HTTPLectureExtractor()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+SQLite 기반 자동화 작업 큐
+- 사용자별 수집 작업을 디스크에 저장 (서버 재시작에도 유지)
+- 우선순위, 지수 백오프 재시도, 대여 만료(visibility timeout), 데드레터
+- 여러 워커 프로세스가 같은 DB 파일에서 작업을 가져감 (queue_worker.py)
+"""
+
+import os
+import json
+import time
+import random
+import sqlite3
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUE_DB_PATH = os.environ.get('AUTOMATION_QUEUE_DB', 'automation_queue.db')
+# 워커가 작업을 잡고 있을 수 있는 시간 (하트비트로 연장, 만료 시 다른 워커가 재시도)
+DEFAULT_VISIBILITY_TIMEOUT = float(os.environ.get('QUEUE_VISIBILITY_TIMEOUT', '600'))
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get('QUEUE_MAX_ATTEMPTS', '3'))
+# 재시도 대기 시간: BACKOFF_BASE * 2^(시도 횟수 - 1), 최대 BACKOFF_MAX
+BACKOFF_BASE = float(os.environ.get('QUEUE_BACKOFF_BASE', '30'))
+BACKOFF_MAX = float(os.environ.get('QUEUE_BACKOFF_MAX', '1800'))
+
+# 작업 상태
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+DEAD = 'dead'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_key TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at REAL NOT NULL,
+    leased_until REAL,
+    worker_id TEXT,
+    last_error TEXT,
+    result TEXT,
+    collected INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, priority DESC, available_at, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs (user_key, status);
+"""
+
+
+def backoff_delay(attempts: int) -> float:
+    """재시도 대기 시간 (지수 백오프 + 10% 지터)"""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** max(0, attempts - 1)))
+    return delay + random.uniform(0, delay * 0.1)
+
+
+class JobQueue:
+    """사용자별 수집 작업 큐 (프로세스마다 인스턴스 생성)"""
+
+    def __init__(self, db_path: str = QUEUE_DB_PATH, encrypt_payloads: bool = True):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        # 작업 내용에 비밀번호가 들어가므로 CredentialManager 키로 암호화
+        self._cipher = None
+        if encrypt_payloads:
+            from services.credential_manager import CredentialManager
+            self._cipher = CredentialManager()
+
+    def close(self):
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # 생산자
+    # ------------------------------------------------------------------
+    def enqueue(self, user_key: str, payload: Dict, priority: int = 0,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS, dedupe: bool = True) -> Optional[int]:
+        """작업 추가 (같은 사용자의 작업이 이미 대기/실행 중이면 추가하지 않음)"""
+        now = time.time()
+        with self._transaction():
+            if dedupe:
+                existing = self._conn.execute(
+                    "SELECT id FROM jobs WHERE user_key = ? AND status IN (?, ?) LIMIT 1",
+                    (user_key, PENDING, LEASED)).fetchone()
+                if existing:
+                    # 이미 대기 중인 작업은 우선순위만 올림
+                    self._conn.execute(
+                        "UPDATE jobs SET priority = MAX(priority, ?), updated_at = ? WHERE id = ? AND status = ?",
+                        (priority, now, existing['id'], PENDING))
+                    return None
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (user_key, payload, priority, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user_key, self._encode(payload), priority, max_attempts, now, now, now))
+            return cursor.lastrowid
+
+    # ------------------------------------------------------------------
+    # 소비자
+    # ------------------------------------------------------------------
+    def lease(self, worker_id: str, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT) -> Optional[Dict]:
+        """실행 가능한 작업 하나를 대여 (만료된 대여는 회수하여 재시도)"""
+        now = time.time()
+        with self._transaction():
+            self._reclaim_expired(now)
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = ? AND available_at <= ? "
+                "ORDER BY priority DESC, available_at, id LIMIT 1",
+                (PENDING, now)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, leased_until = ?, worker_id = ?, updated_at = ? "
+                "WHERE id = ?",
+                (LEASED, now + visibility_timeout, worker_id, now, row['id']))
+
+        job = dict(row)
+        job['attempts'] += 1
+        job['payload'] = self._decode(row['payload'])
+        return job
+
+    def heartbeat(self, job_id: int, worker_id: str,
+                  visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT) -> bool:
+        """실행 중인 작업의 대여 시간 연장 (대여를 잃었으면 False)"""
+        now = time.time()
+        cursor = self._conn.execute(
+            "UPDATE jobs SET leased_until = ?, updated_at = ? WHERE id = ? AND status = ? AND worker_id = ?",
+            (now + visibility_timeout, now, job_id, LEASED, worker_id))
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict] = None) -> bool:
+        """작업 완료 처리"""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, leased_until = NULL, last_error = NULL, updated_at = ? "
+            "WHERE id = ? AND status = ? AND worker_id = ?",
+            (DONE, json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id, LEASED, worker_id))
+        if cursor.rowcount != 1:
+            logger.warning(f"⚠️ [QUEUE] 작업 {job_id} 완료 보고 무시 (대여 만료)")
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> Optional[str]:
+        """작업 실패 처리 (재시도 예약 또는 데드레터), 새 상태 반환"""
+        now = time.time()
+        with self._transaction():
+            row = self._conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? AND worker_id = ?",
+                (job_id, LEASED, worker_id)).fetchone()
+            if row is None:
+                return None
+            if row['attempts'] >= row['max_attempts']:
+                status, available_at = DEAD, now
+                logger.error(f"💀 [QUEUE] 작업 {job_id} 데드레터 이동 ({row['attempts']}회 실패): {error}")
+            else:
+                status, available_at = PENDING, now + backoff_delay(row['attempts'])
+                logger.warning(f"🔁 [QUEUE] 작업 {job_id} {available_at - now:.0f}초 후 재시도 "
+                               f"({row['attempts']}/{row['max_attempts']}): {error}")
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, leased_until = NULL, worker_id = NULL, "
+                "last_error = ?, updated_at = ? WHERE id = ?",
+                (status, available_at, str(error)[:1000], now, job_id))
+        return status
+
+    # ------------------------------------------------------------------
+    # 결과 / 관리
+    # ------------------------------------------------------------------
+    def collect_results(self) -> List[Dict]:
+        """아직 가져가지 않은 완료/데드레터 작업 결과 (한 번만 반환)"""
+        with self._transaction():
+            rows = self._conn.execute(
+                "SELECT id, user_key, status, attempts, last_error, result, created_at, updated_at FROM jobs "
+                "WHERE status IN (?, ?) AND collected = 0 ORDER BY updated_at",
+                (DONE, DEAD)).fetchall()
+            if rows:
+                self._conn.execute(
+                    f"UPDATE jobs SET collected = 1 WHERE id IN ({','.join('?' * len(rows))})",
+                    [row['id'] for row in rows])
+        results = []
+        for row in rows:
+            job = dict(row)
+            job['result'] = json.loads(row['result']) if row['result'] else None
+            results.append(job)
+        return results
+
+    def dead_letters(self, limit: int = 50) -> List[Dict]:
+        """데드레터 작업 목록 (비밀번호가 든 payload 제외)"""
+        rows = self._conn.execute(
+            "SELECT id, user_key, attempts, last_error, updated_at FROM jobs WHERE status = ? "
+            "ORDER BY updated_at DESC LIMIT ?", (DEAD, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def requeue_dead(self, job_id: int) -> bool:
+        """데드레터 작업을 다시 대기열로"""
+        now = time.time()
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = ?, attempts = 0, available_at = ?, collected = 0, updated_at = ? "
+            "WHERE id = ? AND status = ?", (PENDING, now, now, job_id, DEAD))
+        return cursor.rowcount == 1
+
+    def purge(self, older_than_seconds: float = 7 * 24 * 3600) -> int:
+        """오래된 완료 작업 삭제 (데드레터는 유지)"""
+        cursor = self._conn.execute(
+            "DELETE FROM jobs WHERE status = ? AND collected = 1 AND updated_at < ?",
+            (DONE, time.time() - older_than_seconds))
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict:
+        """상태별 작업 수"""
+        stats = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        for row in self._conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"):
+            stats[row['status']] = row['count']
+        oldest = self._conn.execute(
+            "SELECT MIN(created_at) FROM jobs WHERE status = ?", (PENDING,)).fetchone()[0]
+        stats['oldest_pending_age'] = round(time.time() - oldest, 1) if oldest else 0.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # 내부 함수
+    # ------------------------------------------------------------------
+    def _reclaim_expired(self, now: float):
+        """대여 시간이 지난 작업 (워커 종료/멈춤) 회수"""
+        expired = self._conn.execute(
+            "SELECT id, attempts, max_attempts, worker_id FROM jobs WHERE status = ? AND leased_until < ?",
+            (LEASED, now)).fetchall()
+        for row in expired:
+            if row['attempts'] >= row['max_attempts']:
+                status = DEAD
+            else:
+                status = PENDING
+            logger.warning(f"⌛ [QUEUE] 작업 {row['id']} 대여 만료 (워커 {row['worker_id']}) -> {status}")
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, leased_until = NULL, worker_id = NULL, "
+                "last_error = '대여 시간 초과', updated_at = ? WHERE id = ?",
+                (status, now, row['id']))
+
+    def _transaction(self):
+        return _ImmediateTransaction(self._conn)
+
+    def _encode(self, payload: Dict) -> bytes:
+        if self._cipher:
+            return self._cipher.encrypt_json(payload)
+        return json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+
+    def _decode(self, data: bytes) -> Optional[Dict]:
+        if self._cipher:
+            return self._cipher.decrypt_json(data)
+        return json.loads(data)
+
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE 트랜잭션 (여러 워커가 같은 작업을 대여하지 않도록 쓰기 잠금 선점)"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __enter__(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self._conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+자동화 파이프라인 부하 테스트 (LearnUs/SSO mock 서버 사용, 실제 LearnUs 접속 없음)
+- mock_learnus_server를 띄우고 가상 사용자 N명의 자동화를 스케줄러와 같은 경로로 실행
+  - selenium / hybrid: parallel_automation.iter_parallel_automation -> run_automation_for_user
+    (run_automation_job의 병렬 실행 경로와 동일, Chrome 필요)
+  - http: HTTPLectureExtractor 로그인 + 과목 수집만 (브라우저 없이 서버 측 한계 확인용)
+- 처리량(사용자/분), 사용자별 소요 시간 p50/p95/p99, 실패 수, mock 서버 통계 출력
+- 기본은 매번 새로 로그인 (--warm: 세션 캐시/변경 감지 사용, --rounds 2 이상이면 두 번째 라운드부터 로그인 생략)
+  캐시 파일은 임시 디렉터리에 만들고 끝나면 삭제
+
+사용법:
+    python load_test.py [--users 200] [--mode selenium|hybrid|http] [--workers N]
+                        [--latency-ms 50] [--error-rate 0.01] [--login-failure-rate 0.02] [--warm --rounds 2]
+"""
+
+import os
+import sys
+import math
+import time
+import functools
+import logging
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from mock_learnus_server import (MockLearnUsServer, synthetic_users, MOCK_LATENCY_MS, MOCK_LATENCY_JITTER_MS,
+                                 MOCK_SLOW_RATE, MOCK_SLOW_MS, MOCK_ERROR_RATE, MOCK_LOGIN_FAILURE_RATE)
+
+MODES = ('selenium', 'hybrid', 'http')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """최근접 순위 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _run_http_user(user: Dict):
+    """브라우저 없이 HTTP 로그인 + 과목 수집"""
+    from http_lecture_extractor import HTTPLectureExtractor
+    extractor = HTTPLectureExtractor()
+    if not extractor.login_to_learnus(user['username'], user['password']):
+        return False
+    lectures = extractor.extract_all_lectures(max_courses=None, with_status=True)
+    return {"lectures": lectures, "count": len(lectures), "success": True}
+
+
+def _iter_http_automation(users: List[Dict], workers: int) -> Iterator[Tuple[Dict, object, Optional[Exception], float]]:
+    """iter_parallel_automation과 같은 형태로 http 모드 실행 (스레드)"""
+    def timed(user):
+        started = time.time()
+        return _run_http_user(user), time.time() - started
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(timed, user): (user, time.time()) for user in users}
+        for future in as_completed(futures):
+            user, submitted_at = futures[future]
+            try:
+                result, elapsed = future.result()
+                yield user, result, None, elapsed
+            except Exception as e:
+                yield user, None, e, time.time() - submitted_at
+
+
+def _succeeded(result) -> bool:
+    if isinstance(result, dict):
+        return bool(result.get('success', True))
+    return bool(result)
+
+
+def _activity_count(result) -> int:
+    if isinstance(result, dict):
+        return len(result.get('lectures') or result.get('assignments') or [])
+    return 0
+
+
+def _prepare_environment(base_url: str, mode: str, warm: bool, work_dir: str):
+    """워커 프로세스가 import 시 읽는 설정 (mock 서버 주소, 캐시 위치)"""
+    os.environ['LEARNUS_BASE_URL'] = base_url
+    os.environ['AUTOMATION_MODE'] = 'hybrid' if mode == 'hybrid' else 'selenium'
+    os.environ['SESSION_CACHE_ENABLED'] = 'true' if warm else 'false'
+    os.environ['CHANGE_DETECTION_ENABLED'] = 'true' if warm else 'false'
+    os.environ['SESSION_CACHE_DIR'] = os.path.join(work_dir, 'session_cache')
+    os.environ['COURSE_FINGERPRINT_DIR'] = os.path.join(work_dir, 'course_fingerprints')
+
+
+def run_load_test(args) -> int:
+    server = MockLearnUsServer(users=args.users, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               slow_rate=args.slow_rate, slow_ms=args.slow_ms, error_rate=args.error_rate,
+                               login_failure_rate=args.login_failure_rate, seed=args.seed)
+    users = synthetic_users(args.users)
+    rounds = max(1, args.rounds)
+    total = len(users) * rounds
+
+    with server, tempfile.TemporaryDirectory(prefix='learnus_load_') as work_dir:
+        _prepare_environment(server.base_url, args.mode, args.warm, work_dir)
+
+        print("🚀 자동화 파이프라인 부하 테스트")
+        print("=" * 60)
+        print(f"🎭 mock 서버 {server.base_url}: 사용자 {args.users}명 x {rounds}라운드, 모드 {args.mode}, "
+              f"지연 {args.latency_ms:.0f}+{args.jitter_ms:.0f}ms, 느린 응답 {args.slow_rate:.1%}, "
+              f"오류 {args.error_rate:.1%}, 로그인 실패 {args.login_failure_rate:.1%}, "
+              f"{'세션 재사용' if args.warm else '매번 로그인'}")
+
+        if args.mode == 'http':
+            workers = max(1, args.workers or 8)
+            run_round = functools.partial(_iter_http_automation, users, workers)
+        else:
+            from parallel_automation import iter_parallel_automation, resolve_max_workers
+            workers = resolve_max_workers(args.workers, len(users))
+            run_round = functools.partial(iter_parallel_automation, users, max_workers=workers)
+        print(f"   동시 실행 {workers}개")
+
+        started = time.time()
+        latencies, success_latencies = [], []
+        succeeded = failed = errors = activities = done = 0
+        for round_number in range(1, rounds + 1):
+            # 라운드는 순서대로 실행 (이전 라운드가 모두 끝난 뒤 시작)
+            # -> 같은 사용자가 동시에 두 번 실행되지 않고, --warm은 이전 라운드의 세션/과목 지문을 사용
+            round_started = time.time()
+            round_latencies = []
+            for user, result, error, elapsed in run_round():
+                done += 1
+                latencies.append(elapsed)
+                round_latencies.append(elapsed)
+                if error is not None:
+                    errors += 1
+                    logging.getLogger(__name__).warning(f"⚠️ {user['username']} 실행 오류: {error}")
+                elif _succeeded(result):
+                    succeeded += 1
+                    success_latencies.append(elapsed)
+                    activities += _activity_count(result)
+                else:
+                    failed += 1
+                if done % max(1, total // 10) == 0 or done == total:
+                    minutes = (time.time() - started) / 60
+                    print(f"   ⏱️ {done}/{total}명 완료 ({done / minutes if minutes else 0:.1f}명/분)")
+            if rounds > 1:
+                print(f"   🔁 라운드 {round_number}/{rounds}: {time.time() - round_started:.1f}초, "
+                      f"p50 {percentile(round_latencies, 50):.2f}초, p95 {percentile(round_latencies, 95):.2f}초")
+        wall_seconds = time.time() - started
+
+    print(f"\n📊 결과 ({wall_seconds:.1f}초)")
+    print(f"   처리량: {len(latencies) / wall_seconds * 60 if wall_seconds else 0:.1f}명/분 "
+          f"(성공 {succeeded / wall_seconds * 60 if wall_seconds else 0:.1f}명/분)")
+    print(f"   성공 {succeeded}명, 실패 {failed}명, 오류 {errors}명, 수집 활동 {activities}개")
+    for label, values in (("전체", latencies), ("성공", success_latencies)):
+        if values:
+            print(f"   {label} 사용자별 소요 시간: p50 {percentile(values, 50):.2f}초, "
+                  f"p95 {percentile(values, 95):.2f}초, p99 {percentile(values, 99):.2f}초, "
+                  f"최대 {max(values):.2f}초")
+    stats = server.get_stats()
+    print(f"🎭 mock 서버: 요청 {stats['requests']}개, 로그인 {stats['logins']}회, "
+          f"로그인 거부 {stats['login_rejected']}회, 주입된 로그인 실패 {stats['injected_login_failures']}회, "
+          f"주입된 500 {stats['injected_errors']}회, 느린 응답 {stats['slow_responses']}회, "
+          f"전송 {stats['bytes_sent'] / (1024 * 1024):.1f}MB")
+    return 0 if succeeded else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="자동화 파이프라인 부하 테스트 (LearnUs mock 서버)")
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--mode', choices=MODES, default='selenium')
+    parser.add_argument('--workers', type=int, default=None, help="동시 실행 수 (기본: AUTOMATION_MAX_WORKERS / http는 8)")
+    parser.add_argument('--latency-ms', type=float, default=MOCK_LATENCY_MS)
+    parser.add_argument('--jitter-ms', type=float, default=MOCK_LATENCY_JITTER_MS)
+    parser.add_argument('--slow-rate', type=float, default=MOCK_SLOW_RATE)
+    parser.add_argument('--slow-ms', type=float, default=MOCK_SLOW_MS)
+    parser.add_argument('--error-rate', type=float, default=MOCK_ERROR_RATE)
+    parser.add_argument('--login-failure-rate', type=float, default=MOCK_LOGIN_FAILURE_RATE)
+    parser.add_argument('--seed', type=int, default=None, help="지연/오류 주입 난수 시드")
+    parser.add_argument('--rounds', type=int, default=1, help="사용자 목록을 반복 실행할 횟수 (라운드는 순서대로 실행)")
+    parser.add_argument('--warm', action='store_true', help="세션 캐시/변경 감지 사용 (두 번째 라운드부터 로그인 생략)")
+    parser.add_argument('--verbose', action='store_true', help="수집 로그 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    if not args.verbose:
+        logging.disable(logging.INFO)
+    return run_load_test(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,8 @@
 Flutter 앱과 통신하여 실제 로그인 및 과제 정보 수집
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
@@ -17,6 +18,8 @@ from services.school_automation import SchoolAutomationService
 from services.assignment_parser import AssignmentParser
 from services.notification_service import NotificationService
 from services.schedule_parser import ScheduleParser
+from services.assignment_cache import compute_etag
+from services.session_registry import SessionRegistry, SessionLimitError, UserSession, SESSION_SINGLE_USER_FALLBACK
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -33,8 +36,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 서비스 인스턴스
-automation_service = SchoolAutomationService()
+# 서비스 인스턴스 (자동화 서비스는 사용자별 세션으로 관리)
+session_registry = SessionRegistry()
 assignment_parser = AssignmentParser()
 notification_service = NotificationService()
 schedule_parser = ScheduleParser()
@@ -74,6 +77,32 @@ class AutomationStatus(BaseModel):
     new_assignments_count: int = 0
     upcoming_assignments_count: int = 0
 
+@app.on_event("startup")
+async def startup_event():
+    session_registry.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await session_registry.shutdown()
+
+def _find_session(request: Request) -> Optional[UserSession]:
+    """요청의 세션 (X-Session-Token, 토큰이 없으면 None)
+
+    SESSION_SINGLE_USER_FALLBACK=true(단일 사용자 로컬 실행)일 때만 토큰 없는 요청을 최근 로그인 세션으로 처리한다.
+    """
+    token = request.headers.get("x-session-token")
+    if token:
+        return session_registry.get(token)
+    if SESSION_SINGLE_USER_FALLBACK:
+        return session_registry.latest()
+    return None
+
+def _get_service(request: Request) -> SchoolAutomationService:
+    session = _find_session(request)
+    if session is None:
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다")
+    return session.service
+
 # 헬스 체크
 @app.get("/health")
 async def health_check():
@@ -82,40 +111,50 @@ async def health_check():
 
 # 학사일정 관련 API
 @app.get("/schedules")
-async def get_all_schedules():
+async def get_all_schedules(university: Optional[str] = None, semester: Optional[str] = None):
     """모든 학사일정 조회"""
     try:
-        schedules = schedule_parser.get_all_schedules()
+        schedules = schedule_parser.get_all_schedules(university, semester)
         return {"success": True, "data": schedules, "count": len(schedules)}
     except Exception as e:
         logger.error(f"학사일정 조회 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/schedules/semesters")
+async def get_schedule_semesters(university: Optional[str] = None):
+    """조회 가능한 대학교/학기 목록"""
+    try:
+        semesters = schedule_parser.get_semesters(university)
+        return {"success": True, "data": semesters, "count": len(semesters)}
+    except Exception as e:
+        logger.error(f"학사일정 학기 목록 조회 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/schedules/upcoming")
-async def get_upcoming_schedules(days: int = 30):
+async def get_upcoming_schedules(days: int = 30, university: Optional[str] = None, semester: Optional[str] = None):
     """다가오는 학사일정 조회"""
     try:
-        schedules = schedule_parser.get_upcoming_schedules(days)
+        schedules = schedule_parser.get_upcoming_schedules(days, university, semester)
         return {"success": True, "data": schedules, "count": len(schedules)}
     except Exception as e:
         logger.error(f"다가오는 학사일정 조회 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/schedules/important")
-async def get_important_schedules():
+async def get_important_schedules(university: Optional[str] = None, semester: Optional[str] = None):
     """중요한 학사일정 조회"""
     try:
-        schedules = schedule_parser.get_important_schedules()
+        schedules = schedule_parser.get_important_schedules(university, semester)
         return {"success": True, "data": schedules, "count": len(schedules)}
     except Exception as e:
         logger.error(f"중요 학사일정 조회 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/schedules/type/{schedule_type}")
-async def get_schedules_by_type(schedule_type: str):
+async def get_schedules_by_type(schedule_type: str, university: Optional[str] = None, semester: Optional[str] = None):
     """타입별 학사일정 조회"""
     try:
-        schedules = schedule_parser.get_schedules_by_type(schedule_type)
+        schedules = schedule_parser.get_schedules_by_type(schedule_type, university, semester)
         return {"success": True, "data": schedules, "count": len(schedules)}
     except Exception as e:
         logger.error(f"타입별 학사일정 조회 오류: {e}")
@@ -124,31 +163,56 @@ async def get_schedules_by_type(schedule_type: str):
 # 로그인
 @app.post("/login")
 async def login(credentials: LoginRequest):
-    """학교 홈페이지에 로그인"""
+    """학교 홈페이지에 로그인 (사용자별 세션 생성, 이후 요청은 X-Session-Token 헤더로 세션 지정)"""
     try:
-        success = await automation_service.login(
+        session = await session_registry.login(
             university=credentials.university,
             username=credentials.username,
             password=credentials.password,
             student_id=credentials.studentId
         )
-        
-        if success:
-            return {"message": "로그인 성공", "success": True}
-        else:
-            raise HTTPException(status_code=401, detail="로그인 실패")
-            
+    except SessionLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"로그인 오류: {e}")
         raise HTTPException(status_code=500, detail=f"로그인 오류: {str(e)}")
+    
+    if session is None:
+        raise HTTPException(status_code=401, detail="로그인 실패")
+    return {"message": "로그인 성공", "success": True, "session_token": session.token}
+
+def _cached_assignment_response(request: Request, automation_service: SchoolAutomationService,
+                                field: str, select=None) -> Response:
+    """캐시된 과제로 응답 (브라우저 구동 없음, ETag가 같으면 304)"""
+    entry = automation_service.get_cached_assignments()
+    assignments = entry.value if entry else []
+    if select is not None:
+        assignments = select(assignments)
+    payload = {field: [assignment.to_dict() for assignment in assignments]}
+    
+    cache = automation_service.assignment_cache
+    if entry is None:
+        state = "MISS"
+    else:
+        state = "HIT" if entry.is_fresh(cache.ttl) else "STALE"
+    etag = compute_etag(payload)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={cache.max_age(entry)}",
+        "X-Cache": state,
+        "Vary": "X-Session-Token",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=payload, headers=headers)
 
 # 모든 과제 조회
 @app.get("/assignments")
-async def get_assignments():
-    """모든 과제 정보 조회"""
+async def get_assignments(request: Request):
+    """모든 과제 정보 조회 (캐시)"""
+    automation_service = _get_service(request)
     try:
-        assignments = await automation_service.get_all_assignments()
-        return {"assignments": [assignment.to_dict() for assignment in assignments]}
+        return _cached_assignment_response(request, automation_service, "assignments")
         
     except Exception as e:
         logger.error(f"과제 조회 오류: {e}")
@@ -156,11 +220,12 @@ async def get_assignments():
 
 # 새로운 과제 조회
 @app.get("/assignments/new")
-async def get_new_assignments():
-    """새로운 과제 조회"""
+async def get_new_assignments(request: Request):
+    """새로운 과제 조회 (캐시)"""
+    automation_service = _get_service(request)
     try:
-        new_assignments = await automation_service.get_new_assignments()
-        return {"new_assignments": [assignment.to_dict() for assignment in new_assignments]}
+        return _cached_assignment_response(
+            request, automation_service, "new_assignments", SchoolAutomationService.filter_new_assignments)
         
     except Exception as e:
         logger.error(f"새로운 과제 조회 오류: {e}")
@@ -168,11 +233,12 @@ async def get_new_assignments():
 
 # 마감 임박 과제 조회
 @app.get("/assignments/upcoming")
-async def get_upcoming_assignments():
-    """마감 임박 과제 조회"""
+async def get_upcoming_assignments(request: Request):
+    """마감 임박 과제 조회 (캐시)"""
+    automation_service = _get_service(request)
     try:
-        upcoming_assignments = await automation_service.get_upcoming_assignments()
-        return {"upcoming_assignments": [assignment.to_dict() for assignment in upcoming_assignments]}
+        return _cached_assignment_response(
+            request, automation_service, "upcoming_assignments", SchoolAutomationService.filter_upcoming_assignments)
         
     except Exception as e:
         logger.error(f"마감 임박 과제 조회 오류: {e}")
@@ -180,8 +246,9 @@ async def get_upcoming_assignments():
 
 # 자동화 시작
 @app.post("/automation/start")
-async def start_automation():
+async def start_automation(request: Request):
     """자동화 작업 시작"""
+    automation_service = _get_service(request)
     try:
         success = await automation_service.start_automation()
         if success:
@@ -195,8 +262,9 @@ async def start_automation():
 
 # 자동화 중지
 @app.post("/automation/stop")
-async def stop_automation():
+async def stop_automation(request: Request):
     """자동화 작업 중지"""
+    automation_service = _get_service(request)
     try:
         success = await automation_service.stop_automation()
         if success:
@@ -210,8 +278,9 @@ async def stop_automation():
 
 # 자동화 상태 확인
 @app.get("/automation/status")
-async def get_automation_status():
+async def get_automation_status(request: Request):
     """자동화 상태 확인"""
+    automation_service = _get_service(request)
     try:
         status = await automation_service.get_status()
         return status
@@ -222,8 +291,9 @@ async def get_automation_status():
 
 # 수동 과제 업데이트
 @app.post("/assignments/refresh")
-async def refresh_assignments():
+async def refresh_assignments(request: Request):
     """수동으로 과제 정보 업데이트"""
+    automation_service = _get_service(request)
     try:
         success = await automation_service.refresh_assignments()
         if success:
@@ -249,16 +319,17 @@ async def test_login(request: TestLoginRequest):
         logger.info(f"🧪 자동화 로그인 테스트 시작: {request.university}")
         
         # 로그인 시도
-        success = await automation_service.login(request.university, request.username, request.password, request.student_id)
+        session = await session_registry.login(request.university, request.username, request.password, request.student_id)
         
-        if success:
+        if session:
             # 로그인 성공 시 과제 정보 수집 테스트
-            assignments = await automation_service.get_all_assignments()
+            assignments = await session.service.get_all_assignments()
             
             return {
                 "success": True,
                 "message": "로그인 및 과제 수집 성공",
                 "login_status": "성공",
+                "session_token": session.token,
                 "assignments_count": len(assignments),
                 "assignments": [
                     {
@@ -289,8 +360,9 @@ async def test_login(request: TestLoginRequest):
 
 # 자동화 디버그 정보
 @app.get("/automation/debug")
-async def get_automation_debug():
-    """자동화 시스템 디버그 정보"""
+async def get_automation_debug(request: Request):
+    """자동화 시스템 디버그 정보 (요청한 사용자의 세션)"""
+    automation_service = _get_service(request)
     try:
         return {
             "automation_running": automation_service.automation_running,
@@ -298,6 +370,7 @@ async def get_automation_debug():
             "current_university": automation_service.current_university,
             "current_student_id": automation_service.current_student_id,
             "driver_status": "활성" if automation_service.driver else "비활성",
+            "sessions": session_registry.get_stats(),
             "supported_universities": [
                 "연세대학교", "고려대학교", "서울대학교", 
                 "한국과학기술원", "포스텍"
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+부하 테스트용 LearnUs/SSO mock 서버 (실제 LearnUs 접속 없음)
+- 비로그인 메인 페이지(연세포털 로그인 버튼), SSO 로그인 폼, 로그인 처리, 과목/활동 페이지 흉내
+  - login_to_learnus / test_direct_selenium (loginId, loginPasswd) 와
+    HTTPLectureExtractor.login_to_learnus (username, password) 폼 제출 모두 처리
+  - 로그인하면 MoodleSession 쿠키 발급, 쿠키 없이 과목 페이지 요청 시 로그인 페이지로 이동
+- 과목/활동 페이지는 replay_server 코퍼스(fixtures/learnus)를 그대로 사용
+- 응답 지연(고정 + 지터 + 가끔 느린 응답), 오류 주입(500, 로그인 실패), 등록 사용자 수 설정
+
+사용법:
+    python mock_learnus_server.py [--port 8766] [--users 100] [--latency-ms 50] [--error-rate 0.01]
+    LEARNUS_BASE_URL=http://127.0.0.1:8766 python load_test.py ...
+"""
+
+import os
+import sys
+import time
+import random
+import secrets
+import logging
+import argparse
+from http.cookies import SimpleCookie
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+from replay_server import ReplayServer, FixtureCorpus, _ReplayHandler
+
+logger = logging.getLogger(__name__)
+
+# 등록된 가상 사용자 수
+MOCK_USERS = int(os.environ.get('MOCK_USERS', '100'))
+# 응답 지연 (ms): 고정 지연 + 0~지터 사이 임의 지연
+MOCK_LATENCY_MS = float(os.environ.get('MOCK_LATENCY_MS', '50'))
+MOCK_LATENCY_JITTER_MS = float(os.environ.get('MOCK_LATENCY_JITTER_MS', '20'))
+# 느린 응답 비율과 지연 (ms, 꼬리 지연 재현)
+MOCK_SLOW_RATE = float(os.environ.get('MOCK_SLOW_RATE', '0'))
+MOCK_SLOW_MS = float(os.environ.get('MOCK_SLOW_MS', '2000'))
+# 페이지 요청 500 오류 비율 / 올바른 계정이어도 로그인이 거부되는 비율
+MOCK_ERROR_RATE = float(os.environ.get('MOCK_ERROR_RATE', '0'))
+MOCK_LOGIN_FAILURE_RATE = float(os.environ.get('MOCK_LOGIN_FAILURE_RATE', '0'))
+
+SSO_LOGIN_PATHS = ('/passni/sso/spLogin2.php', '/login/index.php')
+SSO_PROCESS_PATH = '/passni/sso/spLoginProcess.php'
+SESSION_COOKIE = 'MoodleSession'
+
+GUEST_PAGE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>LearnUs YONSEI</title></head>
+<body id="page-site-index">
+<div class="login-wrap">
+    <h2>LearnUs YONSEI</h2>
+    <a class="btn btn-sso" href="{base_url}/passni/sso/spLogin2.php">연세포털 로그인</a>
+</div>
+</body></html>
+"""
+
+SSO_LOGIN_PAGE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>연세대학교 로그인</title></head>
+<body>
+<form id="login" method="post" action="{process_path}">
+    <input type="hidden" name="logintoken" value="{token}">
+    <input type="text" id="loginId" name="loginId" placeholder="아이디">
+    <input type="password" id="loginPasswd" name="loginPasswd" placeholder="비밀번호">
+    <input type="submit" value="로그인">
+</form>
+<p class="error">{error}</p>
+</body></html>
+"""
+
+
+def synthetic_users(count: int) -> List[Dict]:
+    """가상 사용자 목록 (Firebase 활성 사용자와 같은 형식)"""
+    users = []
+    for i in range(count):
+        student_id = f"2099{i:06d}"
+        users.append({
+            'uid': f"loadtest_{student_id}",
+            'username': student_id,
+            'password': f"mock-{i:06d}",
+            'studentId': student_id,
+            'university': '연세대학교',
+            'isActive': True,
+        })
+    return users
+
+
+class _MockHandler(_ReplayHandler):
+    server_version = 'LearnUsMock/1.0'
+
+    def do_GET(self):
+        mock = self.server.replay
+        mock.count('requests')
+        time.sleep(mock.delay())
+        path = urlparse(self.path).path
+
+        if path in SSO_LOGIN_PATHS:
+            self._send(200, mock.login_page())
+            return
+        if path == '/login/logout.php':
+            mock.logout(self.headers.get('Cookie'))
+            self._redirect('/', clear_session=True)
+            return
+        if mock.roll(mock.error_rate):
+            mock.count('injected_errors')
+            self._send(500, b'<html><body>Internal Server Error</body></html>')
+            return
+
+        user = mock.session_user(self.headers.get('Cookie'))
+        if user is None:
+            if path == '/':
+                self._send(200, mock.guest_page())
+            else:
+                mock.count('redirected_to_login')
+                self._redirect(SSO_LOGIN_PATHS[1])
+            return
+
+        page = mock.page(self.path)
+        if page is None:
+            mock.count('not_found')
+            self._send(404, b'<html><body>fixture not found</body></html>')
+            return
+        body, etag = page
+        if self.headers.get('If-None-Match') == etag:
+            mock.count('not_modified')
+            self._send(304, b'', etag=etag)
+            return
+        self._send(200, body, etag=etag)
+
+    def do_POST(self):
+        mock = self.server.replay
+        form = parse_qs(self.rfile.read(int(self.headers.get('Content-Length', 0) or 0)).decode('utf-8', 'replace'))
+        mock.count('requests')
+        time.sleep(mock.delay())
+        if urlparse(self.path).path != SSO_PROCESS_PATH:
+            self._send(404, b'<html><body>not found</body></html>')
+            return
+
+        username = (form.get('loginId') or form.get('username') or [''])[0]
+        password = (form.get('loginPasswd') or form.get('password') or [''])[0]
+        if mock.roll(mock.login_failure_rate):
+            mock.count('injected_login_failures')
+            self._send(200, mock.login_page("일시적인 오류로 로그인할 수 없습니다."))
+            return
+        token = mock.authenticate(username, password)
+        if token is None:
+            mock.count('login_rejected')
+            self._send(200, mock.login_page("아이디 또는 비밀번호가 올바르지 않습니다."))
+            return
+        self._redirect('/', session_token=token)
+
+    def _redirect(self, location: str, session_token: Optional[str] = None, clear_session: bool = False):
+        self.send_response(303)
+        self.send_header('Location', location)
+        if session_token:
+            self.send_header('Set-Cookie', f"{SESSION_COOKIE}={session_token}; Path=/; HttpOnly")
+        elif clear_session:
+            self.send_header('Set-Cookie', f"{SESSION_COOKIE}=deleted; Path=/; Max-Age=0")
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+class MockLearnUsServer(ReplayServer):
+    """로그인/세션/오류 주입을 더한 재현 서버"""
+
+    handler_class = _MockHandler
+
+    def __init__(self, users: int = MOCK_USERS, corpus: Optional[FixtureCorpus] = None, host: str = '127.0.0.1',
+                 port: int = 0, latency_ms: float = MOCK_LATENCY_MS, jitter_ms: float = MOCK_LATENCY_JITTER_MS,
+                 slow_rate: float = MOCK_SLOW_RATE, slow_ms: float = MOCK_SLOW_MS, error_rate: float = MOCK_ERROR_RATE,
+                 login_failure_rate: float = MOCK_LOGIN_FAILURE_RATE, seed: Optional[int] = None):
+        super().__init__(corpus, host=host, port=port, latency_ms=latency_ms)
+        self.jitter_ms = jitter_ms
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.error_rate = error_rate
+        self.login_failure_rate = login_failure_rate
+        self.accounts = {user['username']: user['password'] for user in synthetic_users(users)}
+        self.sessions: Dict[str, str] = {}
+        self._random = random.Random(seed)
+        self.stats.update({'logins': 0, 'login_rejected': 0, 'injected_login_failures': 0,
+                           'injected_errors': 0, 'slow_responses': 0, 'redirected_to_login': 0})
+
+    def roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def delay(self) -> float:
+        """이번 응답에 줄 지연 (초)"""
+        with self._lock:
+            delay_ms = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            slow = self.slow_rate > 0 and self._random.random() < self.slow_rate
+        if slow:
+            self.count('slow_responses')
+            delay_ms += self.slow_ms
+        return delay_ms / 1000
+
+    def authenticate(self, username: str, password: str) -> Optional[str]:
+        """계정이 맞으면 세션 토큰 발급"""
+        if not username or self.accounts.get(username) != password:
+            return None
+        token = secrets.token_hex(16)
+        with self._lock:
+            self.sessions[token] = username
+            self.stats['logins'] += 1
+        return token
+
+    def session_user(self, cookie_header: Optional[str]) -> Optional[str]:
+        token = self._session_token(cookie_header)
+        with self._lock:
+            return self.sessions.get(token) if token else None
+
+    def logout(self, cookie_header: Optional[str]):
+        token = self._session_token(cookie_header)
+        with self._lock:
+            self.sessions.pop(token, None)
+
+    @staticmethod
+    def _session_token(cookie_header: Optional[str]) -> Optional[str]:
+        if not cookie_header:
+            return None
+        cookie = SimpleCookie()
+        try:
+            cookie.load(cookie_header)
+        except Exception:
+            return None
+        morsel = cookie.get(SESSION_COOKIE)
+        return morsel.value if morsel else None
+
+    def guest_page(self) -> bytes:
+        return GUEST_PAGE.format(base_url=self.base_url).encode('utf-8')
+
+    def login_page(self, error: str = '') -> bytes:
+        return SSO_LOGIN_PAGE.format(process_path=SSO_PROCESS_PATH, token=secrets.token_hex(8),
+                                     error=error).encode('utf-8')
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self.stats, 'active_sessions': len(self.sessions), 'accounts': len(self.accounts)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부하 테스트용 LearnUs/SSO mock 서버")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--users', type=int, default=MOCK_USERS)
+    parser.add_argument('--latency-ms', type=float, default=MOCK_LATENCY_MS)
+    parser.add_argument('--jitter-ms', type=float, default=MOCK_LATENCY_JITTER_MS)
+    parser.add_argument('--slow-rate', type=float, default=MOCK_SLOW_RATE)
+    parser.add_argument('--slow-ms', type=float, default=MOCK_SLOW_MS)
+    parser.add_argument('--error-rate', type=float, default=MOCK_ERROR_RATE)
+    parser.add_argument('--login-failure-rate', type=float, default=MOCK_LOGIN_FAILURE_RATE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = MockLearnUsServer(users=args.users, port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               slow_rate=args.slow_rate, slow_ms=args.slow_ms, error_rate=args.error_rate,
+                               login_failure_rate=args.login_failure_rate)
+    server.start()
+    sample = synthetic_users(1)[0]
+    print(f"🎭 LearnUs mock 서버 실행 중: {server.base_url} (가상 사용자 {args.users}명, "
+          f"지연 {args.latency_ms:.0f}+{args.jitter_ms:.0f}ms, 오류 {args.error_rate:.1%}, "
+          f"로그인 실패 {args.login_failure_rate:.1%})")
+    print(f"   계정 예시: {sample['username']} / {sample['password']}")
+    print(f"   LEARNUS_BASE_URL={server.base_url} 로 수집기를 실행하세요 (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"📊 {server.get_stats()}")
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
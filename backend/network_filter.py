@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+브라우저 네트워크 필터 + 전송량 측정
+- --disable-images는 최신 Chromium에서 무시되므로 이미지 차단은 콘텐츠 설정(prefs)으로
+- 이미지/폰트/동영상/분석 스크립트는 CDP Network.setBlockedURLs로 차단
+  (문서/XHR 요청은 패턴에 걸리지 않도록 확장자/호스트 기준으로만 차단)
+- 성능 로그(CDP Network 이벤트)로 실행당 전송 바이트, 차단 요청 수, 페이지별 로딩 시간 기록
+"""
+
+import os
+import json
+import logging
+from typing import Dict, List
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+NETWORK_FILTER_ENABLED = os.environ.get('NETWORK_FILTER_ENABLED', 'true').lower() == 'true'
+
+# 수집에 필요 없는 리소스 (Network.setBlockedURLs 패턴, * 와일드카드)
+BLOCKED_URL_PATTERNS = [
+    # 이미지
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp',
+    '*/theme/image.php*', '*/pluginfile.php/*/user/icon/*',
+    # 폰트
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # 동영상 / 플레이어
+    '*.mp4', '*.m3u8', '*.webm', '*.mp3', '*videojs*', '*jwplayer*',
+    # 분석 / 광고
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*connect.facebook.*', '*analytics.js*', '*gtag/js*',
+]
+# 추가 차단 패턴 (쉼표 구분)
+EXTRA_BLOCKED_URL_PATTERNS = [p.strip() for p in os.environ.get('NETWORK_BLOCKED_URLS', '').split(',') if p.strip()]
+
+
+def blocked_url_patterns() -> List[str]:
+    return BLOCKED_URL_PATTERNS + EXTRA_BLOCKED_URL_PATTERNS
+
+
+def configure_options(chrome_options):
+    """드라이버 생성 전 옵션 설정 (이미지 로딩 끄기)"""
+    if not NETWORK_FILTER_ENABLED:
+        return chrome_options
+    prefs = dict(chrome_options.experimental_options.get('prefs', {}))
+    prefs['profile.managed_default_content_settings.images'] = 2
+    chrome_options.add_experimental_option('prefs', prefs)
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    return chrome_options
+
+
+def apply_network_filter(driver) -> bool:
+    """드라이버 생성 직후 CDP로 리소스 차단 설정"""
+    if not NETWORK_FILTER_ENABLED:
+        return False
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_url_patterns()})
+        logger.info(f"🚫 [NETWORK] 리소스 차단 패턴 {len(blocked_url_patterns())}개 적용")
+        return True
+    except WebDriverException as e:
+        # CDP 미지원 드라이버: 이미지 prefs만 적용된 상태로 진행
+        logger.warning(f"⚠️ [NETWORK] 리소스 차단 설정 실패: {e}")
+        return False
+
+
+class NetworkMeter:
+    """드라이버 하나의 네트워크 사용량 (성능 로그 기반)
+
+    성능 로그는 읽으면 사라지므로 PageWaiter.network_idle이 읽은 항목도 observe로 넘겨받는다.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._types: Dict[str, str] = {}
+        self.bytes_total = 0
+        self.bytes_by_type: Dict[str, int] = {}
+        self.requests = 0
+        self.blocked = 0
+        self.failed = 0
+        self.blocked_needed: List[str] = []
+        self.pages: List[Dict] = []
+
+    def observe(self, message: Dict):
+        """CDP Network 이벤트 하나 반영"""
+        method = message.get('method', '')
+        params = message.get('params', {})
+        request_id = params.get('requestId')
+        if method == 'Network.requestWillBeSent':
+            self.requests += 1
+            self._types[request_id] = params.get('type', 'Other')
+        elif method == 'Network.responseReceived':
+            self._types[request_id] = params.get('type', self._types.get(request_id, 'Other'))
+        elif method == 'Network.loadingFinished':
+            size = int(params.get('encodedDataLength', 0) or 0)
+            resource_type = self._types.pop(request_id, 'Other')
+            self.bytes_total += size
+            self.bytes_by_type[resource_type] = self.bytes_by_type.get(resource_type, 0) + size
+        elif method == 'Network.loadingFailed':
+            resource_type = self._types.pop(request_id, params.get('type', 'Other'))
+            if params.get('blockedReason') or 'ERR_BLOCKED_BY_CLIENT' in params.get('errorText', ''):
+                self.blocked += 1
+                # 문서/XHR이 차단되었다면 패턴이 너무 넓은 것
+                if resource_type in ('Document', 'XHR', 'Fetch'):
+                    self.blocked_needed.append(resource_type)
+            else:
+                self.failed += 1
+
+    def drain(self):
+        """아직 읽지 않은 성능 로그 반영"""
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception:
+            return
+        for entry in entries:
+            try:
+                self.observe(json.loads(entry['message']).get('message', {}))
+            except (KeyError, ValueError):
+                continue
+
+    def page_loaded(self, step: str):
+        """페이지 준비 직후 호출: Navigation Timing으로 로딩 시간 기록"""
+        self.drain()
+        try:
+            timing = self.driver.execute_script(
+                "const n = performance.getEntriesByType('navigation')[0];"
+                "return n ? {url: n.name, load: n.loadEventEnd || n.domContentLoadedEventEnd || n.duration,"
+                " transfer: n.transferSize} : null;")
+        except WebDriverException:
+            timing = None
+        if timing:
+            self.pages.append({
+                'step': step,
+                'url': timing.get('url'),
+                'load_ms': round(float(timing.get('load') or 0), 1),
+                'document_bytes': int(timing.get('transfer') or 0),
+            })
+
+    def get_report(self) -> Dict:
+        self.drain()
+        return {
+            'filter_enabled': NETWORK_FILTER_ENABLED,
+            'requests': self.requests,
+            'blocked': self.blocked,
+            'failed': self.failed,
+            'bytes_total': self.bytes_total,
+            'bytes_by_type': dict(self.bytes_by_type),
+            'pages': list(self.pages),
+            'avg_page_load_ms': round(sum(p['load_ms'] for p in self.pages) / len(self.pages), 1) if self.pages else 0.0,
+        }
+
+    def log_report(self, label: str = "") -> Dict:
+        report = self.get_report()
+        logger.info(f"📶 [NETWORK] {label} 요청 {report['requests']}개, 전송 {report['bytes_total'] / 1024:.1f}KB, "
+                    f"차단 {report['blocked']}개, 페이지 평균 로딩 {report['avg_page_load_ms']:.0f}ms")
+        top = sorted(report['bytes_by_type'].items(), key=lambda item: item[1], reverse=True)[:5]
+        if top:
+            logger.info("   " + ", ".join(f"{resource_type} {size / 1024:.1f}KB" for resource_type, size in top))
+        if self.blocked_needed:
+            logger.warning(f"⚠️ [NETWORK] 필요한 요청이 차단됨: {', '.join(sorted(set(self.blocked_needed)))} "
+                           f"(NETWORK_BLOCKED_URLS/차단 패턴 확인)")
+        return report
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+조건 기반 페이지 대기
+- 고정 time.sleep 대신 준비 조건이 충족되는 즉시 진행
+  (DOM 로딩 완료, 선택자 존재, URL 변경, CDP 기반 네트워크 유휴)
+- 단계별 대기 시간을 기록하여 사용자당 순수 대기(idle) 시간 보고
+- 페이지별 로딩 시간/전송량은 NetworkMeter로 함께 보고
+"""
+
+import json
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from network_filter import NetworkMeter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10
+POLL_INTERVAL = 0.1
+
+
+class PageWaiter:
+    """드라이버 하나에 대한 조건 기반 대기 + 단계별 타이밍 기록"""
+
+    def __init__(self, driver, timeout: float = DEFAULT_TIMEOUT, meter: Optional[NetworkMeter] = None):
+        self.driver = driver
+        self.timeout = timeout
+        self.steps: List[Dict] = []
+        # 이전 사용자 세션에서 쌓인 성능 로그 비우기 (풀에서 재사용된 드라이버)
+        try:
+            self.driver.get_log('performance')
+        except Exception:
+            pass
+        # 성능 로그는 한 번 읽으면 사라지므로 대기 중 읽은 항목도 meter에 전달
+        self.meter = meter or NetworkMeter(driver)
+
+    # ------------------------------------------------------------------
+    # 준비 조건
+    # ------------------------------------------------------------------
+    def dom_ready(self, step: str, timeout: Optional[float] = None, legacy_sleep: float = 0) -> bool:
+        """document.readyState == 'complete' 까지 대기"""
+        ready = self._wait(step, 'dom_ready', legacy_sleep, timeout,
+                           lambda d: d.execute_script("return document.readyState") == "complete")
+        if ready:
+            self.meter.page_loaded(step)
+        return ready
+
+    def selector(self, step: str, css_selector: str, timeout: Optional[float] = None,
+                 legacy_sleep: float = 0) -> bool:
+        """CSS 선택자에 해당하는 요소가 나타날 때까지 대기"""
+        return self._wait(step, 'selector', legacy_sleep, timeout,
+                          EC.presence_of_element_located((By.CSS_SELECTOR, css_selector)))
+
+    def url_matches(self, step: str, predicate: Callable[[str], bool], timeout: Optional[float] = None,
+                    legacy_sleep: float = 0) -> bool:
+        """현재 URL이 조건을 만족할 때까지 대기 (SSO 리다이렉트 체인 등)"""
+        return self._wait(step, 'url', legacy_sleep, timeout,
+                          lambda d: predicate(d.current_url))
+
+    def navigation(self, step: str, action: Callable[[], None], css_selector: Optional[str] = None,
+                   timeout: Optional[float] = None, legacy_sleep: float = 0) -> bool:
+        """클릭/뒤로가기 등 페이지 이동을 일으키는 동작 실행 후 새 페이지 준비까지 대기"""
+        timeout = timeout or self.timeout
+        try:
+            old_root = self.driver.find_element(By.TAG_NAME, "html")
+        except WebDriverException:
+            old_root = None
+
+        action()
+
+        started = time.time()
+        ready = True
+        try:
+            wait = WebDriverWait(self.driver, timeout, poll_frequency=POLL_INTERVAL)
+            if old_root is not None:
+                # 이전 문서가 사라져야 새 문서의 readyState를 신뢰할 수 있음
+                wait.until(EC.staleness_of(old_root))
+            wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+            if css_selector:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, css_selector)))
+        except TimeoutException:
+            ready = False
+        except WebDriverException as e:
+            logger.debug(f"페이지 이동 대기 중 오류: {e}")
+            ready = False
+
+        self._record(step, 'navigation', time.time() - started, ready, legacy_sleep)
+        if ready:
+            self.meter.page_loaded(step)
+        return ready
+
+    def network_idle(self, step: str, idle_time: float = 0.5, timeout: Optional[float] = None,
+                     legacy_sleep: float = 0) -> bool:
+        """진행 중인 네트워크 요청이 idle_time 동안 없을 때까지 대기
+
+        Chrome 성능 로그(CDP Network 이벤트)를 사용하고, 로그를 쓸 수 없으면
+        Resource Timing 항목 수가 안정될 때까지 기다린다.
+        """
+        timeout = timeout or self.timeout
+        started = time.time()
+        deadline = started + timeout
+        inflight = set()
+        last_activity = started
+        use_cdp = True
+        resource_count = -1
+        idle = False
+
+        while time.time() < deadline:
+            now = time.time()
+            if use_cdp:
+                try:
+                    for entry in self.driver.get_log('performance'):
+                        message = json.loads(entry['message']).get('message', {})
+                        self.meter.observe(message)
+                        method = message.get('method', '')
+                        request_id = message.get('params', {}).get('requestId')
+                        if method == 'Network.requestWillBeSent':
+                            inflight.add(request_id)
+                            last_activity = now
+                        elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                            inflight.discard(request_id)
+                            last_activity = now
+                except Exception:
+                    use_cdp = False
+                    continue
+                if not inflight and now - last_activity >= idle_time:
+                    idle = True
+                    break
+            else:
+                try:
+                    count = self.driver.execute_script(
+                        "return document.readyState === 'complete' ? "
+                        "performance.getEntriesByType('resource').length : -1")
+                except WebDriverException:
+                    break
+                if count != resource_count:
+                    resource_count = count
+                    last_activity = now
+                elif count >= 0 and now - last_activity >= idle_time:
+                    idle = True
+                    break
+            time.sleep(POLL_INTERVAL)
+
+        self._record(step, 'network_idle', time.time() - started, idle, legacy_sleep)
+        return idle
+
+    # ------------------------------------------------------------------
+    # 타이밍 보고
+    # ------------------------------------------------------------------
+    def get_report(self) -> Dict:
+        """단계별 대기 시간과 기존 고정 sleep 대비 절감량"""
+        waited = sum(step['waited'] for step in self.steps)
+        legacy = sum(step['legacy_sleep'] for step in self.steps)
+        return {
+            'steps': list(self.steps),
+            'wait_count': len(self.steps),
+            'timeouts': sum(1 for step in self.steps if not step['ready']),
+            'idle_seconds': round(waited, 3),
+            'legacy_sleep_seconds': round(legacy, 3),
+            'saved_seconds': round(legacy - waited, 3),
+            'network': self.meter.get_report(),
+        }
+
+    def log_report(self, label: str = ""):
+        """단계별 대기 시간 로그 출력"""
+        report = self.get_report()
+        logger.info(f"⏱️ [WAIT] {label} 대기 {report['wait_count']}회, 순수 대기 {report['idle_seconds']:.2f}초 "
+                    f"(기존 고정 sleep {report['legacy_sleep_seconds']:.2f}초, 타임아웃 {report['timeouts']}회)")
+        for step in report['steps']:
+            mark = "✅" if step['ready'] else "⌛"
+            logger.info(f"   {mark} {step['step']} [{step['kind']}] {step['waited']:.2f}초")
+        self.meter.log_report(label)
+        return report
+
+    # ------------------------------------------------------------------
+    # 내부 함수
+    # ------------------------------------------------------------------
+    def _wait(self, step, kind, legacy_sleep, timeout, condition) -> bool:
+        started = time.time()
+        ready = True
+        try:
+            WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=POLL_INTERVAL).until(condition)
+        except TimeoutException:
+            ready = False
+        except WebDriverException as e:
+            logger.debug(f"{step} 대기 중 오류: {e}")
+            ready = False
+        self._record(step, kind, time.time() - started, ready, legacy_sleep)
+        return ready
+
+    def _record(self, step, kind, waited, ready, legacy_sleep):
+        self.steps.append({
+            'step': step,
+            'kind': kind,
+            'waited': round(waited, 3),
+            'ready': ready,
+            'legacy_sleep': legacy_sleep,
+        })
+        if not ready:
+            logger.debug(f"⌛ [WAIT] {step} 조건 대기 시간 초과 ({waited:.2f}초)")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+다중 사용자 병렬 자동화
+- 프로세스 풀에서 여러 사용자의 자동화(AUTOMATION_MODE)를 동시에 실행
+- 동시 실행 수는 설정값과 Chromium 1개당 메모리 기준으로 제한
+- 사용자별 결과를 끝나는 순서대로 스트리밍
+"""
+
+import os
+import time
+import logging
+import multiprocessing
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pipeline_metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# 동시에 실행할 최대 사용자 수 (AUTOMATION_MAX_WORKERS)
+DEFAULT_MAX_WORKERS = int(os.environ.get('AUTOMATION_MAX_WORKERS', '3'))
+# Chromium + chromedriver 1세트가 차지하는 메모리 (MB)
+CHROME_MEMORY_MB = int(os.environ.get('CHROME_MEMORY_MB', '450'))
+# 워커 프로세스 내에서 드라이버 재사용 여부
+WORKER_DRIVER_POOL_ENABLED = os.environ.get('DRIVER_POOL_ENABLED', 'true').lower() == 'true'
+# 워커 프로세스 시작 방식 (spawn/forkserver)
+# 스케줄러 프로세스에는 이미 스케줄러/uvicorn/Firestore 리스너 스레드가 돌고 있어서 fork하면
+# fork 시점에 잡혀 있던 락(logging, grpc 클라이언트 등) 때문에 워커가 멈출 수 있음
+WORKER_START_METHOD = os.environ.get('AUTOMATION_WORKER_START_METHOD', 'spawn')
+
+# 워커 프로세스 전역 드라이버 풀 (프로세스마다 1개)
+_worker_driver_pool = None
+
+
+def resolve_max_workers(requested: Optional[int] = None, user_count: Optional[int] = None) -> int:
+    """설정값, 사용 가능 메모리, 사용자 수를 고려한 동시 실행 수 계산"""
+    workers = requested or DEFAULT_MAX_WORKERS
+
+    try:
+        import psutil
+        available_mb = psutil.virtual_memory().available / (1024 * 1024)
+        memory_cap = int(available_mb // CHROME_MEMORY_MB)
+        if memory_cap < workers:
+            logger.info(f"🧠 사용 가능 메모리 {available_mb:.0f}MB 기준으로 동시 실행 수 제한: {workers} -> {memory_cap}")
+        workers = min(workers, memory_cap)
+    except Exception as e:
+        logger.debug(f"메모리 확인 실패 (설정값 사용): {e}")
+
+    if user_count is not None:
+        workers = min(workers, user_count)
+
+    return max(1, workers)
+
+
+def _init_worker(use_driver_pool: bool):
+    """워커 프로세스 초기화 (프로세스 전용 드라이버 풀 생성)
+
+    spawn으로 시작한 새 인터프리터에서 실행되므로 부모의 상태는 인자(피클 가능한 값)와 환경 변수로만 전달
+    """
+    global _worker_driver_pool
+    if not use_driver_pool:
+        return
+    try:
+        from driver_pool import ChromeDriverPool
+        _worker_driver_pool = ChromeDriverPool(size=1)
+        # 워커 종료 시 브라우저 정리
+        multiprocessing.util.Finalize(_worker_driver_pool, _worker_driver_pool.close, exitpriority=10)
+    except Exception as e:
+        logger.warning(f"⚠️ 워커 드라이버 풀 생성 실패: {e}")
+        _worker_driver_pool = None
+
+
+def run_user_automation(user: Dict):
+    """사용자 한 명의 자동화 실행 (워커 프로세스에서 호출)"""
+    from test_real_automation_hybrid import run_automation_for_user
+
+    return run_automation_for_user(
+        user.get('university', '연세대학교'),
+        user.get('username', ''),
+        user.get('password', ''),
+        user.get('studentId', ''),
+        driver_pool=_worker_driver_pool
+    )
+
+
+def _timed_run(user: Dict) -> Tuple[object, float]:
+    started = time.time()
+    result = run_user_automation(user)
+    return result, time.time() - started
+
+
+def iter_parallel_automation(active_users: List[Dict],
+                             max_workers: Optional[int] = None) -> Iterator[Tuple[Dict, object, Optional[Exception], float]]:
+    """사용자별 자동화를 병렬 실행하고 끝나는 순서대로 (user, result, error, elapsed) 반환"""
+    if not active_users:
+        return
+
+    workers = resolve_max_workers(max_workers, len(active_users))
+    logger.info(f"🚀 병렬 자동화 시작: 사용자 {len(active_users)}명, 동시 실행 {workers}개")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+                             initializer=_init_worker, initargs=(WORKER_DRIVER_POOL_ENABLED,)) as executor:
+        futures = {executor.submit(_timed_run, user): (user, time.time()) for user in active_users}
+        for future in as_completed(futures):
+            user, submitted_at = futures[future]
+            try:
+                result, elapsed = future.result()
+            except Exception as e:
+                elapsed = time.time() - submitted_at
+                get_metrics_registry().merge_remote(None, 'error', elapsed)
+                yield user, None, e, elapsed
+                continue
+            # 워커 프로세스의 단계별 소요 시간을 이 프로세스(/metrics)에 합침
+            report = result.get('stage_timings') if isinstance(result, dict) else None
+            get_metrics_registry().merge_remote(report, 'success' if result else 'failed', elapsed)
+            yield user, result, None, elapsed
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+수집 파이프라인 단계별 소요 시간 측정
+- StageTimer: 사용자 한 명의 실행 안에서 단계(span)별 소요 시간을 히스토그램으로 모음
+  (driver_start, sso_login, course_list, course_navigation, status_check ...)
+- MetricsRegistry: 프로세스 전체 누적 + 스케줄 실행(run_automation_job) 단위 히스토그램
+  - 워커 프로세스의 결과(stage_timings)는 merge_remote로 합침
+  - /metrics (Prometheus 텍스트 형식)로 내보내고, 실행이 끝나면 단계별 요약을 로그에 기록
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 상한 (초)
+STAGE_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+class Histogram:
+    """버킷별 관측 수 + 합계/개수/최대 (버킷 카운트는 누적 아님)"""
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def merge(self, data: Dict):
+        """to_dict() 결과 합치기 (버킷 구성이 다르면 합계/개수만)"""
+        counts = data.get('counts') or []
+        if len(counts) == len(self.counts):
+            self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += float(data.get('sum', 0))
+        self.count += int(data.get('count', 0))
+        self.max = max(self.max, float(data.get('max', 0)))
+
+    def to_dict(self) -> Dict:
+        return {'counts': list(self.counts), 'sum': round(self.sum, 4), 'count': self.count, 'max': round(self.max, 4)}
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_seconds': round(self.sum, 2),
+            'avg_seconds': round(self.sum / self.count, 3) if self.count else 0.0,
+            'max_seconds': round(self.max, 3),
+        }
+
+
+class Span:
+    """단계 하나의 측정 (with 문 또는 stop() 호출, 여러 번 stop해도 한 번만 기록)"""
+
+    def __init__(self, timer: 'StageTimer', stage: str):
+        self.timer = timer
+        self.stage = stage
+        self.started = time.perf_counter()
+        self.seconds: Optional[float] = None
+
+    def stop(self) -> float:
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self.started
+            self.timer.record(self.stage, self.seconds)
+        return self.seconds
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class StageTimer:
+    """사용자 한 명의 수집 실행 단계별 소요 시간 (스레드 안전, HTTP 동시 요청에서도 사용)"""
+
+    def __init__(self, label: str = ''):
+        self.label = label
+        self.started = time.perf_counter()
+        self.stages: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._finished = False
+
+    def span(self, stage: str) -> Span:
+        return Span(self, stage)
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.observe(seconds)
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def get_report(self) -> Dict:
+        """결과에 담아 다른 프로세스로 넘길 수 있는 형태 (merge_remote 입력)"""
+        with self._lock:
+            stages = {stage: histogram.to_dict() for stage, histogram in self.stages.items()}
+        return {'pid': os.getpid(), 'total_seconds': round(self.total_seconds, 3), 'stages': stages}
+
+    def log_report(self, label: Optional[str] = None, outcome: str = 'success') -> Dict:
+        report = self.get_report()
+        with self._lock:
+            parts = []
+            for stage, histogram in sorted(self.stages.items(), key=lambda item: item[1].sum, reverse=True):
+                detail = f" ({histogram.count}회, 최대 {histogram.max:.1f}초)" if histogram.count > 1 else ""
+                parts.append(f"{stage} {histogram.sum:.1f}초{detail}")
+        logger.info(f"⏱️ [STAGE] {label or self.label} {outcome} 총 {report['total_seconds']:.1f}초"
+                    + (f" | {', '.join(parts)}" if parts else ""))
+        return report
+
+    def finish(self, outcome: str = 'success', label: Optional[str] = None) -> Dict:
+        """실행 종료: 로그에 기록하고 이 프로세스의 레지스트리에 반영 (한 번만)"""
+        report = self.log_report(label, outcome)
+        if not self._finished:
+            self._finished = True
+            get_metrics_registry().observe_report(report, outcome)
+        return report
+
+
+class _HistogramSet:
+    def __init__(self):
+        self.stages: Dict[str, Histogram] = {}
+        self.run_duration = Histogram()
+        self.outcomes: Dict[str, int] = {}
+
+    def observe(self, report: Optional[Dict], outcome: str, seconds: Optional[float]):
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        if seconds is not None:
+            self.run_duration.observe(seconds)
+        for stage, data in ((report or {}).get('stages') or {}).items():
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.merge(data)
+
+    def summary(self) -> Dict:
+        return {
+            'runs': dict(self.outcomes),
+            'run': self.run_duration.summary(),
+            'stages': {stage: histogram.summary() for stage, histogram in sorted(self.stages.items())},
+        }
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
+
+
+class MetricsRegistry:
+    """프로세스 전체 단계별 히스토그램 (누적 + 현재 스케줄 실행)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = _HistogramSet()
+        self._run: Optional[_HistogramSet] = None
+        self._run_started: Optional[float] = None
+
+    def observe_report(self, report: Optional[Dict], outcome: str = 'success', seconds: Optional[float] = None):
+        """사용자 실행 하나 반영 (report가 없으면 결과/소요 시간만)"""
+        if seconds is None and report:
+            seconds = report.get('total_seconds')
+        with self._lock:
+            self.total.observe(report, outcome, seconds)
+            if self._run is not None:
+                self._run.observe(report, outcome, seconds)
+
+    def merge_remote(self, report: Optional[Dict], outcome: str = 'success', seconds: Optional[float] = None):
+        """워커 프로세스가 결과에 담아 보낸 stage_timings 반영 (같은 프로세스에서 이미 반영한 것은 건너뜀)"""
+        if report and report.get('pid') == os.getpid():
+            return
+        self.observe_report(report, outcome, seconds)
+
+    def begin_run(self):
+        with self._lock:
+            self._run = _HistogramSet()
+            self._run_started = time.time()
+
+    def end_run(self) -> Dict:
+        """스케줄 실행 하나의 단계별 요약 (로그에 기록)"""
+        with self._lock:
+            run, self._run = self._run, None
+            started, self._run_started = self._run_started, None
+        if run is None:
+            return {}
+        summary = run.summary()
+        summary['wall_seconds'] = round(time.time() - started, 2) if started else None
+        runs = ", ".join(f"{outcome} {count}" for outcome, count in sorted(summary['runs'].items()))
+        logger.info(f"⏱️ [STAGE] 이번 실행 사용자 {sum(summary['runs'].values())}명 ({runs or '없음'}), "
+                    f"사용자당 평균 {summary['run']['avg_seconds']:.1f}초, 최대 {summary['run']['max_seconds']:.1f}초")
+        for stage, stats in sorted(summary['stages'].items(), key=lambda item: item[1]['total_seconds'], reverse=True):
+            logger.info(f"   {stage}: 합계 {stats['total_seconds']:.1f}초, {stats['count']}회, "
+                        f"평균 {stats['avg_seconds']:.2f}초, 최대 {stats['max_seconds']:.2f}초")
+        return summary
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return self.total.summary()
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 형식 (누적)"""
+        lines = []
+
+        def histogram_lines(name: str, histogram: Histogram, labels: str = ''):
+            cumulative = 0
+            prefix = f"{labels}," if labels else ""
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{prefix}le="{_format_bound(bound)}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{name}_sum{suffix} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{suffix} {histogram.count}")
+
+        with self._lock:
+            lines.append("# HELP learnus_stage_duration_seconds Time spent in each scrape pipeline stage.")
+            lines.append("# TYPE learnus_stage_duration_seconds histogram")
+            for stage, histogram in sorted(self.total.stages.items()):
+                histogram_lines('learnus_stage_duration_seconds', histogram, f'stage="{_escape_label(stage)}"')
+
+            lines.append("# HELP learnus_user_run_duration_seconds Total scrape time per user run.")
+            lines.append("# TYPE learnus_user_run_duration_seconds histogram")
+            histogram_lines('learnus_user_run_duration_seconds', self.total.run_duration)
+
+            lines.append("# HELP learnus_user_runs_total User scrape runs by outcome.")
+            lines.append("# TYPE learnus_user_runs_total counter")
+            for outcome, count in sorted(self.total.outcomes.items()):
+                lines.append(f'learnus_user_runs_total{{outcome="{_escape_label(outcome)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """프로세스 전역 레지스트리"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
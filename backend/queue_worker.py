@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+자동화 작업 큐 워커
+- job_queue의 작업을 하나씩 대여하여 사용자별 수집 실행 (AUTOMATION_MODE)
+- 실행 중에는 하트비트로 대여 시간 연장, 실패 시 백오프 재시도/데드레터는 큐가 처리
+- 워커 수를 늘리면 처리량이 늘어남 (각 워커는 독립 프로세스 + 자체 드라이버 풀)
+
+사용법: python queue_worker.py --workers 3
+"""
+
+import os
+import sys
+import time
+import socket
+import signal
+import logging
+import argparse
+import threading
+import multiprocessing
+from typing import Dict, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_WORKERS = int(os.environ.get('AUTOMATION_QUEUE_WORKERS', '2'))
+# 대기 작업이 없을 때 다시 확인하는 간격 (초)
+POLL_INTERVAL = float(os.environ.get('QUEUE_POLL_INTERVAL', '5'))
+
+_stop_requested = False
+
+
+def _request_stop(signum, frame):
+    global _stop_requested
+    _stop_requested = True
+    logger.info("🛑 [WORKER] 종료 요청 수신, 현재 작업 후 종료")
+
+
+def _result_payload(result) -> Optional[Dict]:
+    """수집 결과를 큐에 저장할 수 있는 형태로 변환 (실패면 None)"""
+    if not result:
+        return None
+    if isinstance(result, dict):
+        return {key: value for key, value in result.items() if key != 'wait_report'}
+    if isinstance(result, list):
+        return {'assignments': result, 'success': True}
+    return {'lectures': [], 'success': True}
+
+
+class _Heartbeat(threading.Thread):
+    """작업 실행 중 대여 시간 주기적 연장"""
+
+    def __init__(self, queue, job_id, worker_id, visibility_timeout):
+        super().__init__(daemon=True)
+        self._queue_path = queue.db_path
+        self._job_id = job_id
+        self._worker_id = worker_id
+        self._timeout = visibility_timeout
+        self._stopped = threading.Event()
+
+    def run(self):
+        from job_queue import JobQueue
+        # SQLite 연결은 스레드 간 공유하지 않음
+        queue = JobQueue(self._queue_path, encrypt_payloads=False)
+        try:
+            while not self._stopped.wait(self._timeout / 3):
+                if not queue.heartbeat(self._job_id, self._worker_id, self._timeout):
+                    logger.warning(f"⚠️ [WORKER] 작업 {self._job_id} 대여를 잃었습니다")
+                    break
+        finally:
+            queue.close()
+
+    def stop(self):
+        self._stopped.set()
+
+
+def run_worker(worker_index: int = 0, max_jobs: Optional[int] = None):
+    """워커 루프 (작업이 없으면 POLL_INTERVAL마다 확인)"""
+    from job_queue import JobQueue, DEFAULT_VISIBILITY_TIMEOUT
+    from test_real_automation_hybrid import run_automation_for_user
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+    queue = JobQueue()
+
+    driver_pool = None
+    if os.environ.get('DRIVER_POOL_ENABLED', 'true').lower() == 'true':
+        try:
+            from driver_pool import ChromeDriverPool
+            driver_pool = ChromeDriverPool(size=1)
+        except Exception as e:
+            logger.warning(f"⚠️ [WORKER] 드라이버 풀 생성 실패: {e}")
+
+    logger.info(f"👷 [WORKER] {worker_id} 시작")
+    processed = 0
+    try:
+        while not _stop_requested and (max_jobs is None or processed < max_jobs):
+            job = queue.lease(worker_id, DEFAULT_VISIBILITY_TIMEOUT)
+            if job is None:
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            user = job['payload'] or {}
+            username = user.get('username', 'Unknown')
+            logger.info(f"📥 [WORKER] 작업 {job['id']} 시작: {username} (시도 {job['attempts']}/{job['max_attempts']})")
+
+            heartbeat = _Heartbeat(queue, job['id'], worker_id, DEFAULT_VISIBILITY_TIMEOUT)
+            heartbeat.start()
+            started = time.time()
+            try:
+                result = run_automation_for_user(
+                    user.get('university', '연세대학교'),
+                    username,
+                    user.get('password', ''),
+                    user.get('studentId', ''),
+                    driver_pool=driver_pool
+                )
+                payload = _result_payload(result)
+                if payload is None:
+                    queue.fail(job['id'], worker_id, "로그인 또는 수집 실패")
+                else:
+                    payload['elapsed'] = round(time.time() - started, 2)
+                    queue.complete(job['id'], worker_id, payload)
+                    logger.info(f"✅ [WORKER] 작업 {job['id']} 완료: {username} ({payload['elapsed']:.1f}초)")
+            except Exception as e:
+                logger.error(f"❌ [WORKER] 작업 {job['id']} 오류: {e}")
+                queue.fail(job['id'], worker_id, str(e))
+            finally:
+                heartbeat.stop()
+            processed += 1
+    finally:
+        if driver_pool:
+            driver_pool.close()
+        queue.close()
+        logger.info(f"👋 [WORKER] {worker_id} 종료 (처리 {processed}건)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="자동화 작업 큐 워커")
+    parser.add_argument('--workers', type=int, default=DEFAULT_QUEUE_WORKERS, help="워커 프로세스 수")
+    parser.add_argument('--max-jobs', type=int, default=None, help="워커당 처리 후 종료할 작업 수")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    if args.workers <= 1:
+        run_worker(0, args.max_jobs)
+        return
+
+    # 부모는 신호만 전달하고 자식 종료를 기다림
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(i, args.max_jobs), name=f"queue-worker-{i}")
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"🚀 [WORKER] 워커 {len(processes)}개 시작")
+
+    try:
+        while any(process.is_alive() for process in processes):
+            if _stop_requested:
+                for process in processes:
+                    if process.is_alive():
+                        process.terminate()
+            time.sleep(1)
+    finally:
+        for process in processes:
+            process.join(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+LearnUs 오프라인 재현 서버
+- fixtures/learnus의 저장된 페이지(메인/과목/활동)를 로컬 HTTP로 제공
+- 페이지 안의 LearnUs 주소(https://ys.learnus.org)는 재현 서버 주소로 바꿔서 응답
+  (링크를 따라가도 실제 LearnUs로 나가지 않음)
+- ETag/If-None-Match 지원 (HTTPLectureExtractor 조건부 요청 304 재현)
+- LEARNUS_FIXTURE_RECORD_DIR를 지정하고 수집을 실행하면 방문한 페이지를 코퍼스로 저장
+  (저장된 페이지에는 이름/학번 등 개인정보가 들어 있으므로 저장소에 올리지 말 것)
+
+사용법:
+    python replay_server.py [--port 8765] [--latency-ms 0] [--fixtures 디렉터리]
+    LEARNUS_BASE_URL=http://127.0.0.1:8765 python benchmark_replay.py
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BACKEND_DIR, 'fixtures', 'learnus')
+# 응답마다 추가할 지연 (ms, 실제 네트워크 왕복 시간 흉내)
+REPLAY_LATENCY_MS = float(os.environ.get('REPLAY_LATENCY_MS', '0'))
+# 지정하면 수집 중 방문한 페이지를 이 디렉터리에 코퍼스로 저장
+FIXTURE_RECORD_DIR = os.environ.get('LEARNUS_FIXTURE_RECORD_DIR', '')
+
+DEFAULT_ORIGIN = 'https://ys.learnus.org'
+
+
+def fixture_key(url: str) -> str:
+    """URL -> 코퍼스 키 (경로 + id 파라미터만, forceview 등 나머지 파라미터 무시)"""
+    parsed = urlparse(url)
+    path = parsed.path or '/'
+    ids = parse_qs(parsed.query).get('id')
+    return f"{path}?id={ids[0]}" if ids else path
+
+
+def fixture_filename(key: str) -> str:
+    """코퍼스 키 -> 저장 파일명 (/course/view.php?id=1 -> course_1.html)"""
+    path, _, query = key.partition('?id=')
+    if path == '/':
+        return 'main.html'
+    parts = [p for p in path.split('/') if p and p not in ('view.php', 'index.php', 'mod')]
+    name = '_'.join(parts + ([query] if query else [])) or 'page'
+    return f"{name.replace('.php', '')}.html"
+
+
+class FixtureCorpus:
+    """저장된 LearnUs 페이지 모음 (manifest.json: 코퍼스 키 -> 파일명)"""
+
+    def __init__(self, fixture_dir: str = FIXTURE_DIR):
+        self.fixture_dir = fixture_dir
+        self.origin = DEFAULT_ORIGIN
+        self.pages: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        manifest_path = os.path.join(fixture_dir, 'manifest.json')
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            self.origin = manifest.get('origin', DEFAULT_ORIGIN).rstrip('/')
+            self.pages = manifest.get('pages', {})
+
+    def lookup(self, url: str) -> Optional[str]:
+        """URL에 해당하는 페이지 파일 경로 (없으면 None)"""
+        filename = self.pages.get(fixture_key(url))
+        return os.path.join(self.fixture_dir, filename) if filename else None
+
+    def read(self, url: str) -> Optional[str]:
+        path = self.lookup(url)
+        if not path:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def course_ids(self) -> List[str]:
+        return [key.split('?id=')[1] for key in self.pages if key.startswith('/course/view.php?id=')]
+
+    def record(self, url: str, html: str) -> str:
+        """방문한 페이지를 코퍼스에 추가 (같은 키는 덮어씀)"""
+        key = fixture_key(url)
+        filename = fixture_filename(key)
+        with self._lock:
+            os.makedirs(self.fixture_dir, exist_ok=True)
+            with open(os.path.join(self.fixture_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(html)
+            self.pages[key] = filename
+            with open(os.path.join(self.fixture_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump({'origin': self.origin, 'pages': self.pages}, f, ensure_ascii=False, indent=2)
+                f.write('\n')
+        return filename
+
+
+_recorder: Optional[FixtureCorpus] = None
+
+
+def record_fixture(url: str, html: str):
+    """LEARNUS_FIXTURE_RECORD_DIR가 지정된 경우에만 페이지 저장 (수집 흐름에서 호출)"""
+    global _recorder
+    if not FIXTURE_RECORD_DIR or not html:
+        return
+    try:
+        if _recorder is None:
+            _recorder = FixtureCorpus(FIXTURE_RECORD_DIR)
+        filename = _recorder.record(url, html)
+        logger.info(f"📼 [REPLAY] 페이지 저장: {fixture_key(url)} -> {filename}")
+    except Exception as e:
+        logger.warning(f"⚠️ [REPLAY] 페이지 저장 실패: {e}")
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server_version = 'LearnUsReplay/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        replay = self.server.replay
+        replay.count('requests')
+        if replay.latency_ms:
+            time.sleep(replay.latency_ms / 1000)
+
+        page = replay.page(self.path)
+        if page is None:
+            replay.count('not_found')
+            self._send(404, b'<html><body>fixture not found</body></html>')
+            return
+
+        body, etag = page
+        if self.headers.get('If-None-Match') == etag:
+            replay.count('not_modified')
+            self._send(304, b'', etag=etag)
+            return
+        self._send(200, body, etag=etag)
+
+    def do_POST(self):
+        # 로그인 폼 제출 등: 본문은 버리고 메인 페이지로 이동
+        self.rfile.read(int(self.headers.get('Content-Length', 0) or 0))
+        self.server.replay.count('requests')
+        self.send_response(303)
+        self.send_header('Location', '/')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _send(self, status: int, body: bytes, etag: Optional[str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+            self.server.replay.count('bytes_sent', len(body))
+
+    def log_message(self, format, *args):
+        logger.debug(f"[REPLAY] {self.address_string()} {format % args}")
+
+
+class ReplayServer:
+    """코퍼스를 로컬 HTTP로 제공하는 재현 서버 (별도 스레드, with 문으로 사용)"""
+
+    handler_class = _ReplayHandler
+
+    def __init__(self, corpus: Optional[FixtureCorpus] = None, host: str = '127.0.0.1', port: int = 0,
+                 latency_ms: float = REPLAY_LATENCY_MS):
+        self.corpus = corpus or FixtureCorpus()
+        self.latency_ms = latency_ms
+        self._httpd = ThreadingHTTPServer((host, port), self.handler_class)
+        self._httpd.daemon_threads = True
+        self._httpd.replay = self
+        self._thread: Optional[threading.Thread] = None
+        self._bodies: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'not_found': 0, 'not_modified': 0, 'bytes_sent': 0}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page(self, url: str) -> Optional[tuple]:
+        """(응답 본문, ETag) - 주소 치환 결과는 파일별로 한 번만 만들어 둠"""
+        path = self.corpus.lookup(url)
+        if not path:
+            return None
+        with self._lock:
+            cached = self._bodies.get(path)
+            if cached is None:
+                with open(path, 'r', encoding='utf-8') as f:
+                    body = f.read().replace(self.corpus.origin, self.base_url).encode('utf-8')
+                cached = (body, f'"{hashlib.md5(body).hexdigest()}"')
+                self._bodies[path] = cached
+        return cached
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def start(self) -> 'ReplayServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='learnus-replay', daemon=True)
+        self._thread.start()
+        logger.info(f"📼 [REPLAY] {self.base_url} 에서 페이지 {len(self.corpus.pages)}개 제공")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LearnUs 오프라인 재현 서버")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=REPLAY_LATENCY_MS)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = ReplayServer(FixtureCorpus(args.fixtures), port=args.port, latency_ms=args.latency_ms)
+    server.start()
+    print(f"📼 재현 서버 실행 중: {server.base_url} (페이지 {len(server.corpus.pages)}개, 지연 {args.latency_ms:.0f}ms)")
+    print(f"   LEARNUS_BASE_URL={server.base_url} 로 수집기를 실행하세요 (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+사용자별 수집 결과 저장소 (SQLite)
+- (사용자, 과목, 활동 ID) 단위로 저장하고 바뀐 항목만 upsert/삭제
+- assignment.txt 전체를 다시 읽고 쓰는 대신 변경량에 비례한 쓰기
+- WAL 모드라 읽는 쪽은 항상 커밋된 상태만 봄 (쓰는 중인 파일을 읽지 않음)
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RESULT_STORE_PATH = os.environ.get('RESULT_STORE_PATH', 'assignments.db')
+
+
+def user_key(user: Dict) -> str:
+    """사용자 식별 키 (결과 저장소, 작업 큐, 적응형 스케줄, 배치 체크포인트 공통)"""
+    return user.get('uid') or f"{user.get('university', '연세대학교')}:{user.get('username', '')}"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assignments (
+    user_key TEXT NOT NULL,
+    course TEXT NOT NULL,
+    activity_id TEXT NOT NULL,
+    activity TEXT,
+    type TEXT,
+    url TEXT,
+    status TEXT,
+    data TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_key, course, activity_id)
+);
+CREATE INDEX IF NOT EXISTS idx_assignments_status ON assignments (user_key, status);
+CREATE TABLE IF NOT EXISTS users (
+    user_key TEXT PRIMARY KEY,
+    username TEXT,
+    item_count INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+"""
+
+# LearnUs 활동 URL의 모듈 ID (mod/vod/view.php?id=123)
+_MODULE_ID = re.compile(r'[?&]id=(\d+)')
+
+
+def activity_id(assignment: Dict) -> str:
+    """활동 식별자 (URL의 모듈 ID, 없으면 활동 이름 해시)"""
+    match = _MODULE_ID.search(assignment.get('url') or '')
+    if match:
+        return match.group(1)
+    name = assignment.get('activity') or assignment.get('title') or ''
+    return 'name:' + hashlib.sha1(name.encode('utf-8')).hexdigest()[:16]
+
+
+def _digest(assignment: Dict) -> str:
+    return hashlib.sha1(json.dumps(assignment, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class ResultStore:
+    """사용자별 과제/강의 수집 결과 (스레드마다 연결 사용)"""
+
+    def __init__(self, db_path: str = RESULT_STORE_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def replace_user(self, user_key: str, assignments: List[Dict], username: Optional[str] = None) -> Dict:
+        """사용자의 최신 수집 결과 반영 (바뀐 항목만 upsert, 사라진 항목 삭제)
+
+        반환값의 changed_items/removed_items는 다른 저장소(Firestore)에 같은 변경만 반영할 때 사용
+        """
+        now = time.time()
+        current = {}
+        for assignment in assignments:
+            course = assignment.get('course', '알 수 없음')
+            current[(course, activity_id(assignment))] = assignment
+
+        conn = self._conn()
+        counts = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+        changed_items = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing = {
+                (row['course'], row['activity_id']): row['digest']
+                for row in conn.execute(
+                    "SELECT course, activity_id, digest FROM assignments WHERE user_key = ?", (user_key,))
+            }
+            for (course, item_id), assignment in current.items():
+                digest = _digest(assignment)
+                previous = existing.get((course, item_id))
+                if previous == digest:
+                    counts['unchanged'] += 1
+                    continue
+                conn.execute(
+                    "INSERT INTO assignments (user_key, course, activity_id, activity, type, url, status, "
+                    "data, digest, first_seen, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (user_key, course, activity_id) DO UPDATE SET activity = excluded.activity, "
+                    "type = excluded.type, url = excluded.url, status = excluded.status, data = excluded.data, "
+                    "digest = excluded.digest, updated_at = excluded.updated_at",
+                    (user_key, course, item_id,
+                     assignment.get('activity') or assignment.get('title'), assignment.get('type'),
+                     assignment.get('url'), assignment.get('status'),
+                     json.dumps(assignment, ensure_ascii=False, default=str), digest, now, now))
+                counts['inserted' if previous is None else 'updated'] += 1
+                changed_items.append((course, item_id, assignment))
+
+            removed = [key for key in existing if key not in current]
+            conn.executemany(
+                "DELETE FROM assignments WHERE user_key = ? AND course = ? AND activity_id = ?",
+                [(user_key, course, item_id) for course, item_id in removed])
+            counts['deleted'] = len(removed)
+
+            conn.execute(
+                "INSERT INTO users (user_key, username, item_count, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (user_key) DO UPDATE SET username = COALESCE(excluded.username, users.username), "
+                "item_count = excluded.item_count, updated_at = excluded.updated_at",
+                (user_key, username, len(current), now))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        logger.info(f"💾 [STORE] {username or user_key}: 추가 {counts['inserted']}, 변경 {counts['updated']}, "
+                    f"삭제 {counts['deleted']}, 유지 {counts['unchanged']}")
+        counts['changed_items'] = changed_items
+        counts['removed_items'] = removed
+        counts['total'] = len(current)
+        return counts
+
+    def remove_user(self, user_key: str):
+        """사용자의 저장된 결과 전체 삭제 (활성 사용자 목록에서 빠졌을 때)"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM assignments WHERE user_key = ?", (user_key,))
+            conn.execute("DELETE FROM users WHERE user_key = ?", (user_key,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def get_assignments(self, user_key: Optional[str] = None) -> List[Dict]:
+        """저장된 항목 (user_key가 없으면 전체 사용자)"""
+        query = "SELECT data FROM assignments"
+        params = ()
+        if user_key:
+            query += " WHERE user_key = ?"
+            params = (user_key,)
+        query += " ORDER BY user_key, course, first_seen"
+        return [json.loads(row['data']) for row in self._conn().execute(query, params)]
+
+    def user_keys(self) -> List[str]:
+        """결과가 저장된 사용자 키 목록"""
+        return [row['user_key'] for row in self._conn().execute("SELECT user_key FROM users")]
+
+    def last_updated(self, user_key: Optional[str] = None) -> Optional[float]:
+        if user_key:
+            row = self._conn().execute("SELECT updated_at FROM users WHERE user_key = ?", (user_key,)).fetchone()
+        else:
+            row = self._conn().execute("SELECT MAX(updated_at) AS updated_at FROM users").fetchone()
+        return row['updated_at'] if row else None
+
+    def get_stats(self) -> Dict:
+        conn = self._conn()
+        return {
+            'users': conn.execute("SELECT COUNT(*) FROM users").fetchone()[0],
+            'items': conn.execute("SELECT COUNT(*) FROM assignments").fetchone()[0],
+            'last_updated': self.last_updated(),
+        }
+
+
+_result_store = None
+_result_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """전역 결과 저장소"""
+    global _result_store
+    with _result_store_lock:
+        if _result_store is None:
+            _result_store = ResultStore()
+        return _result_store
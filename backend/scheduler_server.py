@@ -5,6 +5,7 @@ LearnUs에서 주기적으로 정보를 수집하여 assignment.txt 파일에 
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import asyncio
@@ -16,7 +17,13 @@ import json
 import os
 import subprocess
 import signal
+import sys
 from datetime import datetime
+from typing import Optional
+
+from pipeline_metrics import get_metrics_registry
+from result_store import user_key as _user_key
+from change_detector import prune_fingerprint_stores
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -31,13 +38,34 @@ logger = logging.getLogger(__name__)
 logger.info("🔧 [SCHEDULER] 핵심 모듈 로딩 시작...")
 try:
     logger.info("🔧 [SCHEDULER] test_real_automation_hybrid 모듈 로딩 중...")
-    from test_real_automation_hybrid import test_direct_selenium
+    from test_real_automation_hybrid import test_direct_selenium, run_automation_for_user
     logger.info("✅ [SCHEDULER] test_real_automation_hybrid 모듈 로드 성공")
     
     logger.info("🔧 [SCHEDULER] firebase_service 모듈 로딩 중...")
-    from firebase_service import get_all_active_users, update_user_last_used
+    from firebase_service import get_all_active_users, update_user_last_used, create_write_buffer
+    from firebase_service import start_active_user_roster, get_active_user_roster
     logger.info("✅ [SCHEDULER] firebase_service 모듈 로드 성공")
     
+    logger.info("🔧 [SCHEDULER] driver_pool 모듈 로딩 중...")
+    from driver_pool import ChromeDriverPool
+    logger.info("✅ [SCHEDULER] driver_pool 모듈 로드 성공")
+    
+    logger.info("🔧 [SCHEDULER] parallel_automation 모듈 로딩 중...")
+    from parallel_automation import iter_parallel_automation
+    logger.info("✅ [SCHEDULER] parallel_automation 모듈 로드 성공")
+    
+    logger.info("🔧 [SCHEDULER] adaptive_scheduler 모듈 로딩 중...")
+    from adaptive_scheduler import get_adaptive_scheduler
+    logger.info("✅ [SCHEDULER] adaptive_scheduler 모듈 로드 성공")
+    
+    logger.info("🔧 [SCHEDULER] result_store 모듈 로딩 중...")
+    from result_store import get_result_store
+    logger.info("✅ [SCHEDULER] result_store 모듈 로드 성공")
+    
+    logger.info("🔧 [SCHEDULER] job_queue 모듈 로딩 중...")
+    from job_queue import JobQueue
+    logger.info("✅ [SCHEDULER] job_queue 모듈 로드 성공")
+    
     CORE_MODULES_AVAILABLE = True
     logger.info("✅ [SCHEDULER] 모든 핵심 모듈들 로드 성공")
 except ImportError as e:
@@ -47,21 +75,31 @@ except ImportError as e:
     import traceback
     logger.error(f"🔍 [SCHEDULER] ImportError 스택 트레이스:\n{traceback.format_exc()}")
     test_direct_selenium = None
+    run_automation_for_user = None
     get_all_active_users = None
     update_user_last_used = None
+    create_write_buffer = None
+    start_active_user_roster = None
+    get_active_user_roster = None
+    ChromeDriverPool = None
+    iter_parallel_automation = None
+    get_adaptive_scheduler = None
+    get_result_store = None
+    JobQueue = None
     CORE_MODULES_AVAILABLE = False
 
-# 최적화된 모듈들 (선택적 import) - 임시 비활성화
+# 최적화된 모듈들 (선택적 import)
 logger.info("🔧 [SCHEDULER] 최적화된 모듈들 로딩 시작...")
 try:
     logger.info("🔧 [SCHEDULER] batch_automation_scheduler 모듈 로딩 시도...")
-    # from batch_automation_scheduler import BatchAutomationScheduler
+    # 자동화 모듈은 실행 시점에 import (순환 import 방지)
+    from batch_automation_scheduler import BatchAutomationScheduler
     logger.info("🔧 [SCHEDULER] optimized_hybrid_automation 모듈 로딩 시도...")
     # from optimized_hybrid_automation import OptimizedHybridAutomation
-    BatchAutomationScheduler = None
     OptimizedHybridAutomation = None
-    OPTIMIZED_MODULES_AVAILABLE = False
-    logger.info("⚠️ [SCHEDULER] 최적화된 모듈들 임시 비활성화 (순환 import 방지)")
+    # 시간 예산 배치 실행은 BATCH_AUTOMATION_ENABLED=true일 때만 사용
+    OPTIMIZED_MODULES_AVAILABLE = os.environ.get('BATCH_AUTOMATION_ENABLED', 'false').lower() == 'true'
+    logger.info(f"✅ [SCHEDULER] batch_automation_scheduler 모듈 로드 성공 (사용: {OPTIMIZED_MODULES_AVAILABLE})")
 except ImportError as e:
     logger.warning(f"⚠️ [SCHEDULER] 최적화된 모듈들 로드 실패: {e}")
     logger.warning(f"🔍 [SCHEDULER] ImportError 상세: {type(e).__name__}")
@@ -97,6 +135,20 @@ os.environ['CHROMEDRIVER_PATH'] = '/usr/bin/chromedriver'
 # Cloud Run 환경에서 Chrome 실행 비활성화 (디버깅용)
 CHROME_DISABLED = os.environ.get('CHROME_DISABLED', 'false').lower() == 'true'
 
+# 사용자 간 Chrome 드라이버 재사용 (DRIVER_POOL_SIZE, DRIVER_MAX_USES로 크기/재생성 주기 조절)
+DRIVER_POOL_ENABLED = os.environ.get('DRIVER_POOL_ENABLED', 'true').lower() == 'true'
+
+# 여러 사용자 동시 실행 (AUTOMATION_MAX_WORKERS, CHROME_MEMORY_MB로 동시 실행 수 조절)
+PARALLEL_AUTOMATION_ENABLED = os.environ.get('PARALLEL_AUTOMATION_ENABLED', 'false').lower() == 'true'
+
+# 작업 큐 + 별도 워커 프로세스로 실행 (AUTOMATION_QUEUE_WORKERS로 워커 수 조절)
+AUTOMATION_QUEUE_ENABLED = os.environ.get('AUTOMATION_QUEUE_ENABLED', 'false').lower() == 'true'
+AUTOMATION_QUEUE_WORKERS = int(os.environ.get('AUTOMATION_QUEUE_WORKERS', '2'))
+# 한 번의 스케줄 실행에서 작업 결과를 기다리는 최대 시간 (남은 작업은 다음 실행에서 수집)
+QUEUE_COLLECT_WAIT = float(os.environ.get('QUEUE_COLLECT_WAIT', '240'))
+# 결과를 가져간 완료 작업 보관 기간 (일, 매 실행마다 지난 작업 삭제)
+QUEUE_RETENTION_DAYS = float(os.environ.get('QUEUE_RETENTION_DAYS', '7'))
+
 def run_basic_automation(active_users):
     """기본 자동화 실행 (최적화된 모듈이 없을 때 사용)"""
     all_assignments = []
@@ -126,6 +178,7 @@ def run_basic_automation(active_users):
                 }
             ]
             all_assignments.extend(dummy_assignments)
+            _record_user_run(user, dummy_assignments)
             successful_users += 1
             logger.info(f"사용자 {username} 더미 자동화 완료: {len(dummy_assignments)}개 과제")
         
@@ -141,71 +194,229 @@ def run_basic_automation(active_users):
     
     # 실제 Chrome 자동화 실행
     logger.info("🌐 실제 Chrome 자동화 실행...")
+    session_counts = {'logins': 0, 'sessions_reused': 0}
     
-    for user in active_users:
+    # 사용자 간 공유하는 드라이버 풀 (배치 단위로 생성/종료)
+    global _driver_pool_stats
+    driver_pool = None
+    if DRIVER_POOL_ENABLED and CORE_MODULES_AVAILABLE and ChromeDriverPool:
         try:
-            username = user.get('username', 'Unknown')
-            university = user.get('university', '연세대학교')
-            student_id = user.get('studentId', '')
-            
-            logger.info(f"🔄 사용자 {username} 자동화 시작...")
-            logger.info(f"   대학교: {university}")
-            logger.info(f"   학번: {student_id}")
+            driver_pool = ChromeDriverPool()
+            driver_pool.warm_up(len(active_users))
+        except Exception as pool_error:
+            logger.warning(f"⚠️ 드라이버 풀 생성 실패, 사용자별 드라이버 사용: {pool_error}")
+            driver_pool = None
+    
+    try:
+        for user in active_users:
+            try:
+                username = user.get('username', 'Unknown')
+                university = user.get('university', '연세대학교')
+                student_id = user.get('studentId', '')
             
-            # 사용자별 자동화 실행 (모듈 사용 가능한 경우에만)
-            if CORE_MODULES_AVAILABLE and test_direct_selenium:
-                logger.info(f"🌐 Chrome 자동화 시작 - 사용자: {username}")
+                logger.info(f"🔄 사용자 {username} 자동화 시작...")
                 logger.info(f"   대학교: {university}")
                 logger.info(f"   학번: {student_id}")
+            
+                # 사용자별 자동화 실행 (모듈 사용 가능한 경우에만)
+                if CORE_MODULES_AVAILABLE and run_automation_for_user:
+                    logger.info(f"🌐 Chrome 자동화 시작 - 사용자: {username}")
+                    logger.info(f"   대학교: {university}")
+                    logger.info(f"   학번: {student_id}")
                 
-                try:
-                    user_result = test_direct_selenium(
-                        university,
-                        username,
-                        user.get('password', ''),
-                        student_id
-                    )
-                    logger.info(f"✅ Chrome 자동화 완료 - 사용자: {username}")
-                except Exception as chrome_error:
-                    logger.error(f"❌ Chrome 자동화 실패 - 사용자: {username}: {chrome_error}")
-                    user_result = None
-            else:
-                logger.warning("핵심 모듈이 사용 불가능 - 더미 데이터 생성")
-                user_result = [
-                    {
-                        'title': f'{username}의 더미 과제',
-                        'status': '미완료',
-                        'deadline': '2024-12-31',
-                        'course': '테스트 과목'
-                    }
-                ]
+                    try:
+                        # AUTOMATION_MODE=hybrid면 브라우저는 로그인에만 사용
+                        user_result = run_automation_for_user(
+                            university,
+                            username,
+                            user.get('password', ''),
+                            student_id,
+                            driver_pool=driver_pool
+                        )
+                        logger.info(f"✅ Chrome 자동화 완료 - 사용자: {username}")
+                    except Exception as chrome_error:
+                        logger.error(f"❌ Chrome 자동화 실패 - 사용자: {username}: {chrome_error}")
+                        user_result = None
+                else:
+                    logger.warning("핵심 모듈이 사용 불가능 - 더미 데이터 생성")
+                    user_result = [
+                        {
+                            'title': f'{username}의 더미 과제',
+                            'status': '미완료',
+                            'deadline': '2024-12-31',
+                            'course': '테스트 과목'
+                        }
+                    ]
             
-            if user_result:
-                # user_result가 리스트인지 딕셔너리인지 확인
-                if isinstance(user_result, list):
-                    user_assignments = user_result
-                    all_assignments.extend(user_assignments)
-                elif isinstance(user_result, dict):
-                    user_assignments = user_result.get('assignments', [])
+                if user_result:
+                    # user_result가 리스트인지 딕셔너리인지 확인
+                    user_assignments = _extract_user_assignments(user_result)
                     all_assignments.extend(user_assignments)
+                    _count_session_reuse(user_result, session_counts)
                 
-                # 마지막 사용 시간 업데이트
-                try:
-                    update_user_last_used(user.get('uid', ''))
-                    logger.info(f"사용자 {username} 마지막 사용 시간 업데이트 완료")
-                except Exception as update_error:
-                    logger.warning(f"사용자 {username} 마지막 사용 시간 업데이트 실패: {update_error}")
+                    # 마지막 사용 시간 업데이트
+                    _mark_user_used(user)
+                    _record_user_run(user, user_assignments)
+                    successful_users += 1
+                    logger.info(f"사용자 {username} 자동화 완료: {len(user_assignments)}개 과제")
+                else:
+                    _record_user_run(user, None)
+                    failed_users += 1
+                    logger.warning(f"사용자 {username} 자동화 결과 없음")
                 
-                successful_users += 1
-                logger.info(f"사용자 {username} 자동화 완료: {len(user_assignments)}개 과제")
-            else:
+            except Exception as user_error:
+                _record_user_run(user, None)
                 failed_users += 1
-                logger.warning(f"사용자 {username} 자동화 결과 없음")
-                
-        except Exception as user_error:
+                logger.error(f"사용자 {user.get('username', 'Unknown')} 자동화 실패: {user_error}")
+                continue
+    
+    finally:
+        if driver_pool:
+            _driver_pool_stats = driver_pool.get_stats()
+            logger.info(f"📊 드라이버 풀 지표: {_driver_pool_stats}")
+            driver_pool.close()
+    
+    return {
+        'assignments': all_assignments,
+        'total_count': len(all_assignments),
+        'users_processed': len(active_users),
+        'successful_users': successful_users,
+        'failed_users': failed_users,
+        'firebase_status': 'connected',
+        'user_count': len(active_users),
+        'driver_pool': _driver_pool_stats if driver_pool else None,
+        'session_cache': _session_summary(session_counts)
+    }
+
+def _extract_user_assignments(user_result):
+    """사용자별 자동화 결과에서 과제 목록 추출 (리스트/딕셔너리/bool 모두 처리)"""
+    if isinstance(user_result, list):
+        return user_result
+    if isinstance(user_result, dict):
+        # test_direct_selenium은 'lectures' 키로 수집 결과를 반환
+        return user_result.get('assignments') or user_result.get('lectures') or []
+    return []
+
+def _count_session_reuse(user_result, session_counts):
+    """사용자 결과의 세션 재사용 여부 집계 (재사용 = SSO 로그인 생략)"""
+    if isinstance(user_result, dict) and user_result.get('session_reused'):
+        session_counts['sessions_reused'] += 1
+    else:
+        session_counts['logins'] += 1
+
+def _session_summary(session_counts):
+    """로그인 횟수와 세션 재사용률"""
+    total = session_counts['logins'] + session_counts['sessions_reused']
+    summary = dict(session_counts)
+    summary['session_reuse_rate'] = round(session_counts['sessions_reused'] / total, 3) if total else 0.0
+    logger.info(f"🔐 로그인 {summary['logins']}회, 세션 재사용 {summary['sessions_reused']}회 "
+                f"(재사용률 {summary['session_reuse_rate'] * 100:.0f}%)")
+    return summary
+
+def _mark_user_used(user):
+    """마지막 사용 시간 업데이트 (실행 중이면 Firestore 쓰기 버퍼에 모았다가 배치로 커밋)"""
+    uid = user.get('uid', '')
+    if not uid:
+        return
+    try:
+        if _firestore_writes is not None:
+            _firestore_writes.update_last_used(uid)
+        else:
+            update_user_last_used(uid)
+    except Exception as update_error:
+        logger.warning(f"사용자 {user.get('username', uid)} 마지막 사용 시간 업데이트 실패: {update_error}")
+
+def _record_user_run(user, user_assignments):
+    """사용자별 결과를 결과 저장소와 적응형 스케줄에 기록 (user_assignments가 None이면 실패)"""
+    key = user if isinstance(user, str) else _user_key(user)
+    if get_result_store and user_assignments is not None:
+        try:
+            username = None if isinstance(user, str) else user.get('username')
+            changes = get_result_store().replace_user(key, user_assignments, username)
+            # 바뀐 과제만 Firestore에 반영
+            uid = None if isinstance(user, str) else user.get('uid')
+            if _firestore_writes is not None and uid and (changes['changed_items'] or changes['removed_items']):
+                _firestore_writes.upsert_assignments(uid, changes['changed_items'], changes['removed_items'],
+                                                     changes['total'])
+        except Exception as e:
+            logger.warning(f"⚠️ [STORE] 사용자 {key} 결과 저장 실패: {e}")
+    
+    adaptive = get_adaptive_scheduler() if get_adaptive_scheduler else None
+    if not adaptive:
+        return
+    try:
+        if user_assignments is None:
+            adaptive.record_failure(key)
+        else:
+            adaptive.record_run(key, user_assignments)
+    except Exception as e:
+        logger.warning(f"⚠️ [ADAPTIVE] 사용자 {key} 스케줄 기록 실패: {e}")
+
+def _prune_removed_users(active_users):
+    """활성 사용자 목록에서 빠진(비활성화/삭제된) 사용자의 저장된 결과/과목 지문 삭제"""
+    if not active_users:
+        return
+    if get_result_store:
+        try:
+            store = get_result_store()
+            active_keys = {_user_key(user) for user in active_users}
+            removed = [key for key in store.user_keys() if key not in active_keys]
+            for key in removed:
+                store.remove_user(key)
+            if removed:
+                logger.info(f"🧹 [STORE] 활성 목록에서 빠진 사용자 {len(removed)}명의 결과 삭제")
+        except Exception as e:
+            logger.warning(f"⚠️ [STORE] 빠진 사용자 결과 정리 실패: {e}")
+    try:
+        removed_stores = prune_fingerprint_stores(active_users)
+        if removed_stores:
+            logger.info(f"🧹 [CHANGES] 활성 목록에서 빠진 사용자 {removed_stores}명의 과목 지문 삭제")
+    except Exception as e:
+        logger.warning(f"⚠️ [CHANGES] 빠진 사용자 과목 지문 정리 실패: {e}")
+
+def _on_batch_user_result(user, user_assignments):
+    """배치 실행에서 사용자 한 명이 끝날 때마다 호출 (None이면 실패)"""
+    if user_assignments is not None:
+        _mark_user_used(user)
+    _record_user_run(user, user_assignments)
+
+def run_parallel_automation(active_users, max_workers=None):
+    """병렬 자동화 실행 (프로세스 풀, 사용자별 결과를 끝나는 순서대로 집계)"""
+    if CHROME_DISABLED or not (CORE_MODULES_AVAILABLE and iter_parallel_automation):
+        logger.info("🔄 병렬 실행 불가 - 기본 자동화 방식 사용")
+        return run_basic_automation(active_users)
+    
+    all_assignments = []
+    successful_users = 0
+    failed_users = 0
+    session_counts = {'logins': 0, 'sessions_reused': 0}
+    started = time.time()
+    
+    for user, user_result, error, elapsed in iter_parallel_automation(active_users, max_workers):
+        username = user.get('username', 'Unknown')
+        if error is not None:
+            _record_user_run(user, None)
             failed_users += 1
-            logger.error(f"사용자 {user.get('username', 'Unknown')} 자동화 실패: {user_error}")
+            logger.error(f"❌ Chrome 자동화 실패 - 사용자: {username}: {error} ({elapsed:.1f}초)")
             continue
+        
+        if user_result:
+            user_assignments = _extract_user_assignments(user_result)
+            all_assignments.extend(user_assignments)
+            _count_session_reuse(user_result, session_counts)
+            
+            # 마지막 사용 시간 업데이트 (Firebase 클라이언트는 메인 프로세스에서만 사용)
+            _mark_user_used(user)
+            
+            _record_user_run(user, user_assignments)
+            successful_users += 1
+            logger.info(f"✅ 사용자 {username} 자동화 완료: {len(user_assignments)}개 과제 ({elapsed:.1f}초)")
+        else:
+            _record_user_run(user, None)
+            failed_users += 1
+            logger.warning(f"사용자 {username} 자동화 결과 없음 ({elapsed:.1f}초)")
+    
+    logger.info(f"🏁 병렬 자동화 완료: 성공 {successful_users}명, 실패 {failed_users}명, {time.time() - started:.1f}초")
     
     return {
         'assignments': all_assignments,
@@ -214,9 +425,124 @@ def run_basic_automation(active_users):
         'successful_users': successful_users,
         'failed_users': failed_users,
         'firebase_status': 'connected',
-        'user_count': len(active_users)
+        'user_count': len(active_users),
+        'session_cache': _session_summary(session_counts)
     }
 
+def _job_payload(user):
+    """작업 큐에 넣을 사용자 정보 (워커가 쓰는 인증 정보만, Firestore 타임스탬프 등 제외)"""
+    return {key: user.get(key) for key in ('uid', 'university', 'username', 'password', 'studentId')}
+
+def run_queued_automation(active_users):
+    """작업 큐에 사용자별 작업을 넣고, 워커가 끝낸 결과를 수집하여 집계"""
+    global _queue_stats
+    if CHROME_DISABLED or not (CORE_MODULES_AVAILABLE and JobQueue):
+        logger.info("🔄 작업 큐 사용 불가 - 기본 자동화 방식 사용")
+        return run_basic_automation(active_users)
+    
+    queue = JobQueue()
+    successful_users = 0
+    failed_users = 0
+    session_counts = {'logins': 0, 'sessions_reused': 0}
+    users_by_key = {_user_key(user): user for user in active_users}
+    
+    try:
+        # 이미 대기/실행 중인 사용자는 중복 추가하지 않음 (이전 실행이 길어져도 누락 없음)
+        enqueued = sum(1 for key, user in users_by_key.items() if queue.enqueue(key, _job_payload(user)))
+        logger.info(f"📬 [QUEUE] 작업 {enqueued}개 추가 (중복 {len(users_by_key) - enqueued}개 건너뜀)")
+        
+        deadline = time.time() + QUEUE_COLLECT_WAIT
+        while True:
+            for job in queue.collect_results():
+                user = users_by_key.get(job['user_key'], {})
+                username = user.get('username', job['user_key'])
+                if job['status'] != 'done':
+                    _record_user_run(user or job['user_key'], None)
+                    get_metrics_registry().merge_remote(None, 'failed')
+                    failed_users += 1
+                    logger.error(f"💀 [QUEUE] 사용자 {username} 작업 실패 ({job['attempts']}회): {job['last_error']}")
+                    continue
+                
+                user_result = job['result']
+                # 워커 프로세스의 단계별 소요 시간을 /metrics에 합침
+                if isinstance(user_result, dict):
+                    get_metrics_registry().merge_remote(user_result.get('stage_timings'), 'success')
+                _queue_user_assignments[job['user_key']] = _extract_user_assignments(user_result)
+                _record_user_run(user or job['user_key'], _queue_user_assignments[job['user_key']])
+                _count_session_reuse(user_result, session_counts)
+                _mark_user_used(user)
+                successful_users += 1
+            
+            _queue_stats = queue.get_stats()
+            if _queue_stats['pending'] + _queue_stats['leased'] == 0 or time.time() >= deadline:
+                break
+            time.sleep(5)
+        
+        logger.info(f"📊 [QUEUE] 큐 상태: {_queue_stats}")
+        
+        # 오래된 완료 작업 정리 (결과에 수집 데이터가 들어 있어 DB가 계속 커짐)
+        purged = queue.purge(QUEUE_RETENTION_DAYS * 86400)
+        if purged:
+            logger.info(f"🧹 [QUEUE] 지난 완료 작업 {purged}개 삭제")
+    finally:
+        queue.close()
+    
+    # 이번에 끝나지 않은 사용자는 마지막 결과 유지
+    all_assignments = []
+    for key in users_by_key:
+        all_assignments.extend(_queue_user_assignments.get(key, []))
+    
+    return {
+        'assignments': all_assignments,
+        'total_count': len(all_assignments),
+        'users_processed': successful_users + failed_users,
+        'successful_users': successful_users,
+        'failed_users': failed_users,
+        'firebase_status': 'connected',
+        'user_count': len(active_users),
+        'session_cache': _session_summary(session_counts),
+        'queue': _queue_stats
+    }
+
+# 작업 큐 워커 프로세스 관리 (시작 이벤트가 여러 번 호출되어도 워커는 한 벌만)
+queue_worker_process = None
+_queue_workers_lock = threading.Lock()
+
+def start_queue_workers():
+    """작업 큐 워커 프로세스 시작 (이미 실행 중이면 그대로 사용)"""
+    global queue_worker_process
+    with _queue_workers_lock:
+        if queue_worker_process and queue_worker_process.poll() is None:
+            logger.info("👷 [SCHEDULER] 큐 워커 이미 실행 중")
+            return True
+        try:
+            backend_dir = os.path.dirname(os.path.abspath(__file__))
+            logger.info(f"👷 [SCHEDULER] 큐 워커 {AUTOMATION_QUEUE_WORKERS}개 시작...")
+            queue_worker_process = subprocess.Popen(
+                [sys.executable, os.path.join(backend_dir, 'queue_worker.py'), '--workers', str(AUTOMATION_QUEUE_WORKERS)],
+                cwd=os.getcwd()
+            )
+            logger.info("✅ [SCHEDULER] 큐 워커 시작 완료")
+            return True
+        except Exception as e:
+            logger.error(f"❌ [SCHEDULER] 큐 워커 시작 실패: {e}")
+            return False
+
+def stop_queue_workers():
+    """작업 큐 워커 종료 (현재 작업을 마칠 때까지 대기)"""
+    global queue_worker_process
+    with _queue_workers_lock:
+        if queue_worker_process and queue_worker_process.poll() is None:
+            try:
+                logger.info("🔧 [SCHEDULER] 큐 워커 종료 중...")
+                queue_worker_process.send_signal(signal.SIGTERM)
+                queue_worker_process.wait(timeout=60)
+                logger.info("✅ [SCHEDULER] 큐 워커 종료 완료")
+            except Exception as e:
+                logger.error(f"❌ [SCHEDULER] 큐 워커 종료 실패: {e}")
+                queue_worker_process.kill()
+        queue_worker_process = None
+
 # Xvfb 프로세스 관리
 xvfb_process = None
 
@@ -330,6 +656,14 @@ def start_scheduler_optimized():
     logger.info("Cloud Run 최적화 스케줄러 시작")
     
     try:
+        # 활성 사용자 캐시: 스냅샷 리스너 등록만 하고 바로 진행 (첫 실행 시 캐시에서 조회)
+        if start_active_user_roster:
+            start_active_user_roster()
+        
+        # 작업 큐 모드: 수집은 별도 워커 프로세스가 담당
+        if AUTOMATION_QUEUE_ENABLED:
+            start_queue_workers()
+        
         # 즉시 첫 실행
         print("🚀 즉시 자동화 실행 시작...")
         logger.info("🚀 즉시 자동화 실행 시작...")
@@ -395,10 +729,16 @@ app.add_middleware(
 _automation_running = False
 _last_update_time = None
 _assignment_data = []
+_driver_pool_stats = None
+_queue_stats = None
+# 실행 중 Firestore 쓰기 버퍼 (실행이 끝날 때 배치로 커밋)
+_firestore_writes = None
+_firestore_write_stats = None
+_queue_user_assignments = {}
 
 def run_automation_job():
     """주기적으로 실행되는 자동화 작업 (최적화된 버전)"""
-    global _automation_running, _last_update_time, _assignment_data
+    global _automation_running, _last_update_time, _assignment_data, _firestore_writes, _firestore_write_stats
     
     if _automation_running:
         logger.info("⏳ 자동화가 이미 실행 중입니다. 건너뜁니다.")
@@ -407,6 +747,9 @@ def run_automation_job():
     try:
         _automation_running = True
         logger.info("🤖 최적화된 자동화 시작...")
+        _firestore_writes = create_write_buffer() if create_write_buffer else None
+        # 이번 실행의 단계별 소요 시간 히스토그램 (사용자 실행이 끝날 때마다 반영)
+        get_metrics_registry().begin_run()
         
         # 상세한 환경 정보 로깅
         logger.info("🔍 환경 변수 확인:")
@@ -456,8 +799,27 @@ def run_automation_job():
             else:
                 logger.info(f"{len(active_users)}명의 활성화된 사용자 발견")
                 
+                _prune_removed_users(active_users)
+                
+                # 적응형 스케줄: 갱신 시점이 된 사용자만 수집
+                adaptive = get_adaptive_scheduler() if get_adaptive_scheduler else None
+                skipped_users = []
+                if adaptive:
+                    active_users, skipped_users = adaptive.select_due_users(active_users, _user_key)
+                
+                if not active_users:
+                    logger.info("💤 [ADAPTIVE] 이번 실행에서 갱신할 사용자가 없습니다")
+                    result = {
+                        'assignments': [],
+                        'total_count': 0,
+                        'users_processed': 0,
+                        'successful_users': 0,
+                        'failed_users': 0,
+                        'firebase_status': 'connected',
+                        'user_count': 0
+                    }
                 # 🚀 최적화된 배치 자동화 실행 (가능한 경우)
-                if OPTIMIZED_MODULES_AVAILABLE and BatchAutomationScheduler:
+                elif OPTIMIZED_MODULES_AVAILABLE and BatchAutomationScheduler and not CHROME_DISABLED:
                     logger.info("🚀 최적화된 배치 자동화 시작...")
                     try:
                         scheduler = BatchAutomationScheduler(
@@ -465,7 +827,9 @@ def run_automation_job():
                             batch_size=3  # 한 번에 3명씩 처리
                         )
                         
-                        result = scheduler.run_batch_automation()
+                        # 적응형 스케줄이 고른 사용자는 갱신 대상이므로 체크포인트의 이전 결과를 다시 쓰지 않음
+                        result = scheduler.run_batch_automation(active_users, on_user_result=_on_batch_user_result,
+                                                                resume_completed=adaptive is None)
                         scheduler.save_batch_results(result)
                         
                         logger.info(f"🎉 최적화된 배치 자동화 완료:")
@@ -474,14 +838,31 @@ def run_automation_job():
                         logger.info(f"   실패: {result.get('failed_users', 0)}명")
                         logger.info(f"   총 과제: {result.get('total_count', 0)}개")
                         logger.info(f"   실행 시간: {result.get('execution_time', 0):.2f}초")
+                        logger.info(f"   이어서 처리: {result.get('resumed_users', 0)}명, 다음 실행으로 연기: {result.get('deferred_count', 0)}명")
                     except Exception as optimized_error:
                         logger.error(f"❌ 최적화된 배치 자동화 실패: {optimized_error}")
                         logger.info("🔄 기본 자동화 방식으로 전환...")
                         result = run_basic_automation(active_users)
+                elif AUTOMATION_QUEUE_ENABLED:
+                    logger.info("📬 작업 큐 방식 사용...")
+                    result = run_queued_automation(active_users)
+                elif PARALLEL_AUTOMATION_ENABLED:
+                    logger.info("🔀 병렬 자동화 방식 사용...")
+                    result = run_parallel_automation(active_users)
                 else:
                     logger.info("🔄 기본 자동화 방식 사용...")
                     result = run_basic_automation(active_users)
                 
+                if adaptive:
+                    # 건너뛴 사용자는 마지막 결과 유지
+                    carried = adaptive.carry_over(skipped_users, _user_key)
+                    result['assignments'] = result.get('assignments', []) + carried
+                    result['total_count'] = len(result['assignments'])
+                    result['user_count'] = len(active_users) + len(skipped_users)
+                    result['users_skipped'] = len(skipped_users)
+                    result['adaptive'] = adaptive.get_stats()
+                    adaptive.save()
+                
         except Exception as firebase_error:
             logger.error(f"Firebase 연결 실패: {firebase_error}")
             result = {
@@ -493,40 +874,34 @@ def run_automation_job():
                 'user_count': 0
             }
         
+        # 단계별 소요 시간 요약을 로그와 실행 기록에 남김
+        result['stage_timings'] = get_metrics_registry().end_run()
+        
         # 결과를 assignment.txt 파일에 저장
         save_assignment_data(result)
         
+        # 이번 실행의 Firestore 쓰기(마지막 사용 시간, 과제, 실행 기록)를 배치로 커밋
+        if _firestore_writes is not None:
+            _firestore_writes.log_run(result)
+            _firestore_write_stats = _firestore_writes.flush()
+        
         _last_update_time = datetime.now()
         logger.info("최적화된 자동화 완료")
         
     except Exception as e:
         logger.error(f"자동화 실행 실패: {e}")
     finally:
+        if _firestore_writes is not None and len(_firestore_writes):
+            # 실패로 중단되어도 모은 쓰기는 커밋
+            _firestore_write_stats = _firestore_writes.flush()
+        _firestore_writes = None
         _automation_running = False
 
 def save_assignment_data(automation_result):
-    """자동화 결과를 assignment.txt 파일에 저장"""
+    """자동화 결과 반영 (사용자별 결과는 실행 중 결과 저장소에 이미 upsert됨)"""
     try:
         logger.info(f"🔍 save_assignment_data 호출됨")
         logger.info(f"🔍 automation_result 타입: {type(automation_result)}")
-        logger.info(f"🔍 automation_result 내용: {automation_result}")
-        
-        # assignment.txt 파일 경로 (backend 디렉토리에 저장)
-        backend_dir = os.path.dirname(os.path.abspath(__file__))
-        assignment_file = os.path.join(backend_dir, "assignment.txt")
-        logger.info(f"🔍 저장 경로: {assignment_file}")
-        
-        # 파일이 존재하면 읽어서 기존 데이터와 병합
-        existing_data = []
-        if os.path.exists(assignment_file):
-            try:
-                with open(assignment_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # 간단한 파싱 (실제로는 더 정교한 파싱 필요)
-                    if "이번주 해야 할 과제 목록" in content:
-                        existing_data = parse_assignment_file(content)
-            except Exception as e:
-                logger.warning(f"기존 파일 읽기 실패: {e}")
         
         # automation_result에서 실제 과제 데이터 추출
         new_assignments = []
@@ -546,27 +921,45 @@ def save_assignment_data(automation_result):
         global _assignment_data
         _assignment_data = new_assignments
         
-        # 파일에 저장
-        with open(assignment_file, 'w', encoding='utf-8') as f:
-            f.write(f"=== LearnUs 과제 정보 업데이트 ===\n")
-            f.write(f"업데이트 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            if _assignment_data:
-                f.write("이번주 해야 할 과제 목록:\n")
-                for assignment in _assignment_data:
-                    course = assignment.get('course', '알 수 없음')
-                    # title 키를 우선 사용 (실제 데이터 구조에 맞춤)
-                    activity = assignment.get('title') or assignment.get('activity', '알 수 없음')
-                    status = assignment.get('status', '상태 불명')
-                    f.write(f"  • {course}: {activity} - {status}\n")
-            else:
-                f.write("이번주 과제가 없습니다.\n")
+        if get_result_store:
+            logger.info(f"💾 [STORE] 결과 저장소 상태: {get_result_store().get_stats()}")
+            return
+        
+        # 결과 저장소를 쓸 수 없을 때만 assignment.txt에 저장 (임시 파일에 쓴 뒤 교체)
+        assignment_file = _assignment_file()
+        tmp_file = f"{assignment_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(format_assignment_text(_assignment_data))
+        os.replace(tmp_file, assignment_file)
         
         logger.info(f"assignment.txt 파일 업데이트 완료")
         
     except Exception as e:
         logger.error(f"파일 저장 실패: {e}")
 
+def _assignment_file():
+    """결과 저장소를 쓸 수 없을 때 사용하는 assignment.txt 경로 (backend 디렉토리)"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "assignment.txt")
+
+def format_assignment_text(assignments):
+    """과제 목록을 assignment.txt 형식 문자열로 변환"""
+    lines = [
+        "=== LearnUs 과제 정보 업데이트 ===",
+        f"업데이트 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        ""
+    ]
+    if assignments:
+        lines.append("이번주 해야 할 과제 목록:")
+        for assignment in assignments:
+            course = assignment.get('course', '알 수 없음')
+            # title 키를 우선 사용 (실제 데이터 구조에 맞춤)
+            activity = assignment.get('title') or assignment.get('activity', '알 수 없음')
+            status = assignment.get('status', '상태 불명')
+            lines.append(f"  • {course}: {activity} - {status}")
+    else:
+        lines.append("이번주 과제가 없습니다.")
+    return "\n".join(lines) + "\n"
+
 def parse_assignment_file(content):
     """assignment.txt 파일을 파싱하여 구조화된 데이터로 변환"""
     assignments = []
@@ -609,24 +1002,30 @@ async def health_check():
         "automation_running": _automation_running
     }
 
+def _load_assignments(user_key=None):
+    """결과 저장소(없으면 assignment.txt)에서 과제 목록 로드"""
+    global _assignment_data
+    if get_result_store:
+        return get_result_store().get_assignments(user_key)
+    
+    # assignment.txt 파일에서 최신 데이터 로드 (backend 디렉토리)
+    assignment_file = _assignment_file()
+    if os.path.exists(assignment_file):
+        with open(assignment_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+            _assignment_data = parse_assignment_file(content)
+    return _assignment_data
+
 @app.get("/assignments")
-async def get_assignments():
-    """현재 저장된 과제 정보 조회"""
+async def get_assignments(user: Optional[str] = None):
+    """현재 저장된 과제 정보 조회 (user: 특정 사용자 uid만 조회)"""
     try:
-        global _assignment_data
-        
-        # assignment.txt 파일에서 최신 데이터 로드 (backend 디렉토리)
-        backend_dir = os.path.dirname(os.path.abspath(__file__))
-        assignment_file = os.path.join(backend_dir, "assignment.txt")
-        if os.path.exists(assignment_file):
-            with open(assignment_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                _assignment_data = parse_assignment_file(content)
+        assignments = _load_assignments(user)
         
         return {
-            "assignments": _assignment_data,
-            "total_count": len(_assignment_data),
-            "incomplete_count": len([a for a in _assignment_data if "미완료" in a.get('status', '')]),
+            "assignments": assignments,
+            "total_count": len(assignments),
+            "incomplete_count": len([a for a in assignments if "미완료" in a.get('status', '')]),
             "last_update": _last_update_time.isoformat() if _last_update_time else None
         }
     except Exception as e:
@@ -635,10 +1034,13 @@ async def get_assignments():
 
 @app.get("/assignments/raw")
 async def get_raw_assignments():
-    """assignment.txt 파일 내용을 직접 반환"""
+    """assignment.txt 형식의 과제 목록 (결과 저장소가 있으면 저장소 내용으로 생성)"""
     try:
-        # Docker 컨테이너 내부의 assignment.txt 파일 경로
-        assignment_file = "/app/assignment.txt"
+        if get_result_store:
+            return {"content": format_assignment_text(_load_assignments()), "status": "success"}
+        
+        # 결과 저장소를 쓸 수 없을 때 save_assignment_data가 쓰는 파일
+        assignment_file = _assignment_file()
         if os.path.exists(assignment_file):
             with open(assignment_file, "r", encoding="utf-8") as f:
                 content = f.read()
@@ -664,19 +1066,37 @@ async def run_automation_now():
         logger.error(f"자동화 실행 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+async def get_metrics():
+    """단계별 소요 시간 히스토그램 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(get_metrics_registry().render_prometheus(),
+                             media_type="text/plain; version=0.0.4")
+
 @app.get("/status")
 async def get_status():
     """서버 상태 및 자동화 상태 조회"""
-    backend_dir = os.path.dirname(os.path.abspath(__file__))
-    assignment_file = os.path.join(backend_dir, "assignment.txt")
+    # 결과 저장소가 있으면 assignment.txt는 쓰지 않으므로 저장소 기준으로 보고
+    store_stats = get_result_store().get_stats() if get_result_store else None
+    if store_stats is not None:
+        assignment_file = get_result_store().db_path
+        assignment_file_exists = store_stats['last_updated'] is not None
+    else:
+        assignment_file = _assignment_file()
+        assignment_file_exists = os.path.exists(assignment_file)
     
     return {
         "server_status": "running",
         "automation_running": _automation_running,
         "last_update": _last_update_time.isoformat() if _last_update_time else None,
         "next_scheduled": "매일 09:00, 18:00 (개발용: 5분마다)",
-        "assignment_file_exists": os.path.exists(assignment_file),
-        "assignment_file_path": assignment_file
+        "assignment_file_exists": assignment_file_exists,
+        "assignment_file_path": assignment_file,
+        "driver_pool": _driver_pool_stats,
+        "queue": _queue_stats,
+        "result_store": store_stats,
+        "firestore_writes": _firestore_write_stats,
+        "stage_timings": get_metrics_registry().get_stats(),
+        "user_roster": get_active_user_roster().get_stats() if get_active_user_roster and get_active_user_roster() else None
     }
 
 # 앱 시작 시 실행
@@ -707,6 +1127,7 @@ async def startup_event():
 async def shutdown_event():
     """앱 종료 시 실행"""
     logger.info("🛑 애플리케이션 종료...")
+    stop_queue_workers()
 
 # Cloud Run에서는 uvicorn이 자동으로 실행됨
 # 로컬 테스트용 (개발 시에만 사용)
@@ -15,6 +15,8 @@ import time
 from typing import List, Dict, Optional
 import logging
 
+from adaptive_scheduler import AdaptiveScheduler
+
 # FastAPI 앱 초기화
 app = FastAPI(title="LearnUs Automation Server", version="1.0.0")
 
@@ -88,6 +90,7 @@ class AutomationScheduler:
     def __init__(self):
         self.running = False
         self.tasks = {}
+        self.adaptive = AdaptiveScheduler()
     
     async def start_scheduler(self):
         """스케줄러 시작"""
@@ -101,12 +104,18 @@ class AutomationScheduler:
         """스케줄러 중지"""
         self.running = False
     
-    def schedule_user_automation(self, user_id: int, interval_hours: int = 6):
-        """특정 사용자의 자동화 작업 스케줄링"""
-        schedule.every(interval_hours).hours.do(
+    def schedule_user_automation(self, user_id: int, interval_hours: Optional[float] = None):
+        """특정 사용자의 자동화 작업 스케줄링 (interval_hours가 없으면 마감/변경 이력 기반 적응형 주기)"""
+        tag = f"user-{user_id}"
+        schedule.clear(tag)
+        if interval_hours is None:
+            interval_minutes, reason = self.adaptive.next_interval(str(user_id))
+        else:
+            interval_minutes, reason = interval_hours * 60, "고정 주기"
+        schedule.every(max(int(interval_minutes), 1)).minutes.do(
             self.run_automation_for_user, user_id
-        )
-        logger.info(f"사용자 {user_id}의 자동화 작업이 {interval_hours}시간마다 실행되도록 스케줄링됨")
+        ).tag(tag)
+        logger.info(f"사용자 {user_id}의 자동화 작업이 {interval_minutes:.0f}분마다 실행되도록 스케줄링됨 ({reason})")
     
     async def run_automation_for_user(self, user_id: int):
         """특정 사용자의 자동화 작업 실행"""
@@ -160,6 +169,11 @@ class AutomationScheduler:
                     message=f"자동화 작업 완료: {len(result.get('assignments', []))}개 활동 처리"
                 )
                 db.add(log)
+                
+                # 이번 결과로 다음 실행 주기 재계산
+                self.adaptive.record_run(str(user_id), result.get('assignments', []))
+                self.adaptive.save()
+                self.schedule_user_automation(user_id)
             else:
                 # 실패 로그 저장
                 log = AutomationLog(
@@ -214,7 +228,7 @@ async def register_user(
     db.refresh(user)
     
     # 자동화 작업 스케줄링
-    scheduler.schedule_user_automation(user.id, interval_hours=6)
+    scheduler.schedule_user_automation(user.id)
     
     return {"message": "사용자가 성공적으로 등록되었습니다", "user_id": user.id}
 
@@ -0,0 +1,111 @@
+"""
+과제 조회 API 캐시
+- 사용자별(대학교:학번) 키로 마지막 수집 결과 보관, 백그라운드 수집이 갱신
+- TTL이 지나도 STALE_TTL까지는 이전 결과를 바로 응답하고 백그라운드에서 한 번만 재수집 (stale-while-revalidate)
+- 응답 본문 해시로 ETag 생성 -> If-None-Match가 같으면 304
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 이 시간 동안은 재수집 없이 응답 (초)
+ASSIGNMENT_CACHE_TTL = float(os.environ.get('ASSIGNMENT_CACHE_TTL', '300'))
+# 이 시간이 지난 결과는 응답하지 않음 (초)
+ASSIGNMENT_CACHE_STALE_TTL = float(os.environ.get('ASSIGNMENT_CACHE_STALE_TTL', str(24 * 3600)))
+
+
+def compute_etag(payload: Any) -> str:
+    """응답 본문 기준 ETag"""
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return '"' + hashlib.sha1(body.encode('utf-8')).hexdigest() + '"'
+
+
+class CacheEntry:
+    """사용자 한 명의 캐시된 수집 결과"""
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.stored_at = time.time()
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def is_fresh(self, ttl: float = ASSIGNMENT_CACHE_TTL) -> bool:
+        return self.age <= ttl
+
+
+class AssignmentCache:
+    """사용자별 과제 캐시 (API 요청은 브라우저를 직접 구동하지 않음)"""
+
+    def __init__(self, ttl: float = ASSIGNMENT_CACHE_TTL, stale_ttl: float = ASSIGNMENT_CACHE_STALE_TTL):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[str, CacheEntry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'revalidations': 0}
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """캐시 조회 (STALE_TTL이 지난 결과는 None)"""
+        entry = self._entries.get(key)
+        if entry is None or entry.age > self.stale_ttl:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits' if entry.is_fresh(self.ttl) else 'stale_hits'] += 1
+        return entry
+
+    def set(self, key: str, value: Any) -> CacheEntry:
+        entry = CacheEntry(value)
+        self._entries[key] = entry
+        return entry
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def needs_revalidation(self, entry: Optional[CacheEntry]) -> bool:
+        return entry is None or not entry.is_fresh(self.ttl)
+
+    def max_age(self, entry: Optional[CacheEntry]) -> int:
+        """Cache-Control max-age (남은 TTL)"""
+        if entry is None:
+            return 0
+        return max(int(self.ttl - entry.age), 0)
+
+    def revalidate(self, key: str, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """백그라운드 재수집 (같은 키는 동시에 한 번만, await하면 수집 결과 반환)"""
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            return task
+        task = asyncio.create_task(self._run_loader(key, loader))
+        self._inflight[key] = task
+        return task
+
+    def is_revalidating(self, key: str) -> bool:
+        task = self._inflight.get(key)
+        return task is not None and not task.done()
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'keys': len(self._entries), 'revalidating': sum(
+            1 for task in self._inflight.values() if not task.done())}
+
+    async def _run_loader(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        self.stats['revalidations'] += 1
+        try:
+            value = await loader()
+            if value is not None:
+                self.set(key, value)
+                logger.info(f"🗂️ 과제 캐시 갱신: {key}")
+            return value
+        except Exception as e:
+            # 실패하면 이전 결과 유지
+            logger.error(f"과제 캐시 갱신 실패 ({key}): {e}")
+            return None
+        finally:
+            self._inflight.pop(key, None)
@@ -0,0 +1,67 @@
+"""
+브라우저 작업 전용 실행기
+- Selenium 호출은 블로킹이라 이벤트 루프에서 직접 부르면 FastAPI 전체(/health 포함)가 멈춤
+- 드라이버 하나당 전용 스레드 1개에서 순서대로 실행하고, 호출하는 쪽은 await만 함
+- 시간 초과/취소 시 on_abort(드라이버 종료)로 진행 중인 Selenium 호출을 끊음
+"""
+
+import os
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 로그인 한 번 최대 시간 (초)
+BROWSER_LOGIN_TIMEOUT = float(os.environ.get('BROWSER_LOGIN_TIMEOUT', '180'))
+# 과제 수집 한 번 최대 시간 (초)
+BROWSER_SCRAPE_TIMEOUT = float(os.environ.get('BROWSER_SCRAPE_TIMEOUT', '600'))
+
+
+class BrowserExecutor:
+    """드라이버 하나를 담당하는 단일 스레드 실행기 (WebDriver는 스레드 안전하지 않음)"""
+
+    def __init__(self, name: str = "browser", on_abort: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.on_abort = on_abort
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self.stats = {'calls': 0, 'timeouts': 0, 'cancelled': 0, 'errors': 0}
+
+    async def run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """func를 브라우저 스레드에서 실행 (timeout 초과 시 asyncio.TimeoutError)"""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        self.stats['calls'] += 1
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            logger.error(f"⏱️ [{self.name}] {func.__name__} {timeout:.0f}초 초과 - 브라우저 작업 중단")
+            self._abort()
+            raise
+        except asyncio.CancelledError:
+            self.stats['cancelled'] += 1
+            logger.warning(f"🛑 [{self.name}] {func.__name__} 취소 - 브라우저 작업 중단")
+            self._abort()
+            raise
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+
+    def _abort(self):
+        # 스레드는 강제 종료할 수 없으므로 드라이버를 닫아 블로킹 호출이 바로 실패하게 함
+        # on_abort는 이벤트 루프에서 호출되므로 블로킹 작업(driver.quit 등)은 다른 스레드로 넘겨야 함
+        if self.on_abort is None:
+            return
+        try:
+            self.on_abort()
+        except Exception as e:
+            logger.debug(f"[{self.name}] 중단 처리 오류: {e}")
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -8,8 +8,9 @@
 import os
 import json
 import base64
-from cryptography.fernet import Fernet
-from typing import Dict, Optional
+from datetime import datetime
+from cryptography.fernet import Fernet, InvalidToken
+from typing import Any, Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -81,6 +82,18 @@ class CredentialManager:
             logger.error(f"❌ 자격증명 조회 오류: {e}")
             return None
     
+    def encrypt_json(self, data: Any) -> bytes:
+        """임의의 JSON 데이터를 암호화 (세션 쿠키 저장 등)"""
+        return self._cipher.encrypt(json.dumps(data).encode())
+    
+    def decrypt_json(self, token: bytes) -> Optional[Any]:
+        """encrypt_json으로 암호화한 데이터 복호화 (키가 바뀌었거나 손상되면 None)"""
+        try:
+            return json.loads(self._cipher.decrypt(token).decode())
+        except (InvalidToken, ValueError) as e:
+            logger.warning(f"⚠️ 암호화 데이터 복호화 실패: {e}")
+            return None
+    
     def update_last_used(self, user_id: str) -> bool:
         """마지막 사용 시간 업데이트"""
         try:
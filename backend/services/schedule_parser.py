@@ -1,225 +1,349 @@
 """
 학사일정 파서 서비스
-1학기와 2학기 학사일정을 통합하여 관리
+data/ 아래 학사일정 파일을 대학교/학기별로 관리
+- 파일 목록은 data/{대학코드}_schedule_{연도}_{학기}_semester.json 이름으로 탐색 (파싱하지 않음)
+- 학기 파일은 처음 요청될 때만 파싱해서 인덱스 구성 (날짜순 배열 + bisect, 타입별/중요 일정 분류)
+- 파싱된 학기는 LRU로 최대 SCHEDULE_CACHE_MAX_SEMESTERS개만 메모리에 유지
+- 파일이 바뀌면 해당 학기만 다시 파싱
 """
 
+import os
+import re
+import sys
 import json
+import time
+import heapq
+import bisect
 import logging
+import threading
+from collections import OrderedDict, namedtuple
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# 파일 목록/변경 확인 간격 (초)
+SCHEDULE_RELOAD_CHECK_INTERVAL = float(os.environ.get('SCHEDULE_RELOAD_CHECK_INTERVAL', '5'))
+# 메모리에 유지할 학기 수
+SCHEDULE_CACHE_MAX_SEMESTERS = int(os.environ.get('SCHEDULE_CACHE_MAX_SEMESTERS', '4'))
+# 대학교를 지정하지 않았을 때 사용할 대학 코드
+DEFAULT_SCHEDULE_UNIVERSITY = os.environ.get('DEFAULT_SCHEDULE_UNIVERSITY', 'yonsei')
+
+# yonsei_schedule_2025_2nd_semester.json
+_SCHEDULE_FILE = re.compile(r'^(?P<university>[a-z0-9]+)_schedule_(?P<year>\d{4})_(?P<term>[a-z0-9]+)_semester\.json$')
+# 학기 정렬 순서
+_TERM_ORDER = {'1st': 1, 'summer': 2, '2nd': 3, 'winter': 4}
+
+_MONTHS = {f'{month}월': month for month in range(1, 13)}
+
+# 파싱된 일정 한 건 (dict 대신 튜플로 보관, 응답할 때만 dict로 변환)
+ScheduleEvent = namedtuple('ScheduleEvent', [
+    'id', 'title', 'description', 'date', 'month', 'month_en', 'type', 'priority',
+    'university', 'semester', 'is_important', 'tags',
+])
+
+
+def _event_to_dict(event: ScheduleEvent) -> Dict[str, Any]:
+    schedule = event._asdict()
+    schedule['tags'] = list(event.tags)
+    return schedule
+
+
+def _parse_schedule_date(date_str: str, month: str, year: int, term: str) -> Optional[datetime]:
+    """학사일정 날짜 파싱 (2학기/겨울학기의 1-2월은 다음 해)"""
+    try:
+        month_num = _MONTHS.get(month, 1)
+
+        # 날짜 문자열에서 일 추출
+        if '~' in date_str:
+            # 기간인 경우 시작일 사용
+            start_date = date_str.split('~')[0].strip()
+            day_str = start_date.split('(')[0].strip()
+        else:
+            day_str = date_str.split('(')[0].strip()
+
+        day = int(day_str)
+
+        if term in ('2nd', 'winter') and month_num <= 2:
+            year += 1
+
+        return datetime(year, month_num, day)
+
+    except Exception as e:
+        logger.error(f"날짜 파싱 오류: {e}")
+        return None
+
+
+class ScheduleIndex:
+    """학기 하나의 학사일정 인덱스 (읽기 전용, 다시 파싱하면 통째로 교체)"""
+
+    def __init__(self, events: List[ScheduleEvent]):
+        # 원래 순서 (get_all_schedules)
+        self.events = tuple(events)
+        # 날짜순 정렬 + bisect용 날짜 배열 (날짜를 파싱하지 못한 일정은 기간 조회에서 제외)
+        self.by_date = tuple(sorted((event for event in events if event.date), key=lambda x: x.date))
+        self.dates = [event.date for event in self.by_date]
+        # 타입별 / 중요 일정
+        by_type: Dict[str, List[ScheduleEvent]] = {}
+        for event in events:
+            by_type.setdefault(event.type, []).append(event)
+        self.by_type = {schedule_type: tuple(items) for schedule_type, items in by_type.items()}
+        self.important = tuple(event for event in events if event.is_important)
+
+    def range(self, start: datetime, end: datetime) -> Tuple[ScheduleEvent, ...]:
+        """start <= date <= end 인 일정 (날짜순)"""
+        lo = bisect.bisect_left(self.dates, start)
+        hi = bisect.bisect_right(self.dates, end)
+        return self.by_date[lo:hi]
+
+    @classmethod
+    def from_file(cls, path: Path, university_code: str, year: int, term: str) -> 'ScheduleIndex':
+        """학기 파일 하나를 파싱 (이벤트 생성/날짜 파싱/태그 생성은 여기서 한 번만)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        university = data.get('university', '')
+        semester = data.get('semester', f'{year}-{term}')
+        events = []
+        for month_data in data.get('schedule', []):
+            month = month_data.get('month', '')
+            month_en = month_data.get('month_en', '')
+
+            for event in month_data.get('events', []):
+                name = event.get('event', '')
+                event_type = event.get('type', '')
+                events.append(ScheduleEvent(
+                    id=f"{university_code}_{year}_{term}_{len(events)}",
+                    title=name,
+                    description=f"{month} {event.get('date', '')} - {name}",
+                    date=_parse_schedule_date(event.get('date', ''), month, year, term),
+                    month=month,
+                    month_en=month_en,
+                    type=sys.intern(event_type),
+                    priority=sys.intern(event.get('priority', 'medium')),
+                    university=university,
+                    semester=semester,
+                    is_important=_is_important_schedule(name),
+                    tags=tuple(sys.intern(tag) for tag in _generate_schedule_tags(name, event_type)),
+                ))
+        return cls(events)
+
+
+class ScheduleCatalogue:
+    """data/ 아래 학사일정 파일 목록 + 파싱된 학기 LRU"""
+
+    def __init__(self, data_dir: Path, max_semesters: int = SCHEDULE_CACHE_MAX_SEMESTERS):
+        self.data_dir = Path(data_dir)
+        self.max_semesters = max(max_semesters, 1)
+        # (대학코드, '2025_2nd') -> (경로, 연도, 학기)
+        self._files: Dict[Tuple[str, str], Tuple[Path, int, str]] = {}
+        self._last_scan = 0.0
+        # (대학코드, '2025_2nd') -> (mtime, 확인 시각, ScheduleIndex)
+        self._loaded: 'OrderedDict[Tuple[str, str], Tuple[int, float, ScheduleIndex]]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {'hits': 0, 'loads': 0, 'reloads': 0, 'evictions': 0}
+
+    def _scan(self):
+        """파일 이름만 보고 학기 목록 갱신"""
+        now = time.time()
+        if self._files and now - self._last_scan < SCHEDULE_RELOAD_CHECK_INTERVAL:
+            return
+        files = {}
+        try:
+            for path in self.data_dir.iterdir():
+                match = _SCHEDULE_FILE.match(path.name)
+                if match:
+                    year, term = int(match.group('year')), match.group('term')
+                    files[(match.group('university'), f"{year}_{term}")] = (path, year, term)
+        except OSError as e:
+            logger.error(f"학사일정 디렉토리 조회 오류: {e}")
+            return
+        self._files = files
+        self._last_scan = now
+        for key in [key for key in self._loaded if key not in files]:
+            del self._loaded[key]
+
+    def semesters(self, university: Optional[str] = None) -> List[Tuple[str, str]]:
+        """(대학코드, 학기) 목록 (학기 순서대로)"""
+        with self._lock:
+            self._scan()
+            files = self._files
+        keys = [key for key in files if university is None or key[0] == university]
+
+        def order(key):
+            _, year, term = files[key]
+            return key[0], year, _TERM_ORDER.get(term, 9), term
+        return sorted(keys, key=order)
+
+    def get(self, key: Tuple[str, str]) -> Optional[ScheduleIndex]:
+        """학기 인덱스 (처음 요청되거나 파일이 바뀌었을 때만 파싱)"""
+        with self._lock:
+            self._scan()
+            if key not in self._files:
+                return None
+            path, year, term = self._files[key]
+            now = time.time()
+
+            cached = self._loaded.get(key)
+            if cached is not None and now - cached[1] < SCHEDULE_RELOAD_CHECK_INTERVAL:
+                self._loaded.move_to_end(key)
+                self.stats['hits'] += 1
+                return cached[2]
+
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError as e:
+                logger.error(f"학사일정 파일 확인 오류 ({path.name}): {e}")
+                return cached[2] if cached else None
+
+            if cached is not None and cached[0] == mtime:
+                self._loaded[key] = (mtime, now, cached[2])
+                self._loaded.move_to_end(key)
+                self.stats['hits'] += 1
+                return cached[2]
+
+            try:
+                index = ScheduleIndex.from_file(path, key[0], year, term)
+            except Exception as e:
+                # 실패하면 이전 인덱스 유지
+                logger.error(f"학사일정 데이터 로드 오류 ({path.name}): {e}")
+                return cached[2] if cached else None
+
+            self.stats['reloads' if cached else 'loads'] += 1
+            logger.info(f"{path.name} 학사일정 {len(index.events)}개 로드 완료")
+            self._loaded[key] = (mtime, now, index)
+            self._loaded.move_to_end(key)
+            while len(self._loaded) > self.max_semesters:
+                evicted, _ = self._loaded.popitem(last=False)
+                self.stats['evictions'] += 1
+                logger.info(f"학사일정 캐시에서 제거: {evicted[0]} {evicted[1]}")
+            return index
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self.stats, 'files': len(self._files), 'loaded': len(self._loaded)}
+
+
 class ScheduleParser:
-    def __init__(self):
+    def __init__(self, default_university: str = DEFAULT_SCHEDULE_UNIVERSITY):
         self.data_dir = Path(__file__).parent.parent / "data"
-        self.schedule_data = {}
-        self._load_schedule_data()
-    
-    def _load_schedule_data(self):
-        """학사일정 데이터 로드"""
-        try:
-            # 1학기와 2학기 학사일정 모두 로드
-            schedule_files = [
-                "yonsei_schedule_2025_1st_semester.json",
-                "yonsei_schedule_2025_2nd_semester.json"
-            ]
-            
-            all_schedules = []
-            for filename in schedule_files:
-                schedule_file = self.data_dir / filename
-                if schedule_file.exists():
-                    with open(schedule_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        all_schedules.extend(data.get('schedule', []))
-                    logger.info(f"{filename} 학사일정 데이터 로드 완료")
-                else:
-                    logger.warning(f"{filename} 학사일정 데이터 파일을 찾을 수 없습니다")
-            
-            # 통합된 학사일정 데이터 구성
-            self.schedule_data = {
-                'university': '연세대학교',
-                'semester': '2025-1학기, 2025-2학기',
-                'schedule': all_schedules
-            }
-            
-            logger.info(f"총 {len(all_schedules)}개 월별 학사일정 로드 완료")
-            
-        except Exception as e:
-            logger.error(f"학사일정 데이터 로드 오류: {e}")
-    
-    def get_all_schedules(self) -> List[Dict[str, Any]]:
+        self.default_university = default_university
+        self.catalogue = ScheduleCatalogue(self.data_dir)
+
+    def _indexes(self, university: Optional[str] = None, semester: Optional[str] = None) -> List[ScheduleIndex]:
+        """조회 대상 학기 인덱스 (학기를 지정하지 않으면 해당 대학의 전체 학기)"""
+        university = university or self.default_university
+        keys = self.catalogue.semesters(university)
+        if semester:
+            keys = [key for key in keys if key[1] == semester]
+        indexes = [self.catalogue.get(key) for key in keys]
+        return [index for index in indexes if index is not None]
+
+    def get_semesters(self, university: Optional[str] = None) -> List[Dict[str, str]]:
+        """조회 가능한 대학교/학기 목록 (파일을 파싱하지 않음)"""
+        return [{'university': code, 'semester': semester} for code, semester in self.catalogue.semesters(university)]
+
+    def get_all_schedules(self, university: Optional[str] = None, semester: Optional[str] = None) -> List[Dict[str, Any]]:
         """모든 학사일정 반환"""
-        all_schedules = []
-        
         try:
-            for month_data in self.schedule_data.get('schedule', []):
-                month = month_data.get('month', '')
-                month_en = month_data.get('month_en', '')
-                
-                for event in month_data.get('events', []):
-                    schedule = {
-                        'id': f"yonsei_2nd_{len(all_schedules)}",
-                        'title': event.get('event', ''),
-                        'description': f"{month} {event.get('date', '')} - {event.get('event', '')}",
-                        'date': self._parse_schedule_date(event.get('date', ''), month),
-                        'month': month,
-                        'month_en': month_en,
-                        'type': event.get('type', ''),
-                        'priority': event.get('priority', 'medium'),
-                        'university': '연세대학교',
-                        'semester': '2025-2학기',
-                        'is_important': self._is_important_schedule(event.get('event', '')),
-                        'tags': self._generate_schedule_tags(event.get('event', ''), event.get('type', '')),
-                    }
-                    all_schedules.append(schedule)
-            
-            logger.info(f"2학기 학사일정 {len(all_schedules)}개 로드 완료")
-            return all_schedules
-            
+            return [_event_to_dict(event) for index in self._indexes(university, semester) for event in index.events]
         except Exception as e:
             logger.error(f"학사일정 파싱 오류: {e}")
             return []
-    
-    def get_upcoming_schedules(self, days: int = 30) -> List[Dict[str, Any]]:
-        """다가오는 학사일정 반환"""
-        all_schedules = self.get_all_schedules()
-        upcoming_schedules = []
-        
+
+    def get_upcoming_schedules(self, days: int = 30, university: Optional[str] = None,
+                               semester: Optional[str] = None) -> List[Dict[str, Any]]:
+        """다가오는 학사일정 반환 (날짜순)"""
         try:
             current_date = datetime.now()
             target_date = current_date + timedelta(days=days)
-            
-            for schedule in all_schedules:
-                schedule_date = schedule.get('date')
-                if schedule_date and current_date <= schedule_date <= target_date:
-                    upcoming_schedules.append(schedule)
-            
-            # 날짜순으로 정렬
-            upcoming_schedules.sort(key=lambda x: x.get('date', datetime.now()))
-            
+            ranges = [index.range(current_date, target_date) for index in self._indexes(university, semester)]
+            # 학기별로 이미 날짜순이므로 병합만
+            upcoming_schedules = [_event_to_dict(event) for event in heapq.merge(*ranges, key=lambda x: x.date)]
+
             logger.info(f"다가오는 학사일정 {len(upcoming_schedules)}개 반환")
             return upcoming_schedules
-            
+
         except Exception as e:
             logger.error(f"다가오는 학사일정 조회 오류: {e}")
             return []
-    
-    def get_important_schedules(self) -> List[Dict[str, Any]]:
+
+    def get_important_schedules(self, university: Optional[str] = None,
+                                semester: Optional[str] = None) -> List[Dict[str, Any]]:
         """중요한 학사일정 반환"""
-        all_schedules = self.get_all_schedules()
-        important_schedules = []
-        
         try:
-            for schedule in all_schedules:
-                if schedule.get('is_important', False):
-                    important_schedules.append(schedule)
-            
+            important_schedules = [_event_to_dict(event) for index in self._indexes(university, semester)
+                                   for event in index.important]
+
             logger.info(f"중요 학사일정 {len(important_schedules)}개 반환")
             return important_schedules
-            
+
         except Exception as e:
             logger.error(f"중요 학사일정 조회 오류: {e}")
             return []
-    
-    def get_schedules_by_type(self, schedule_type: str) -> List[Dict[str, Any]]:
+
+    def get_schedules_by_type(self, schedule_type: str, university: Optional[str] = None,
+                              semester: Optional[str] = None) -> List[Dict[str, Any]]:
         """타입별 학사일정 반환"""
-        all_schedules = self.get_all_schedules()
-        filtered_schedules = []
-        
         try:
-            for schedule in all_schedules:
-                if schedule.get('type', '') == schedule_type:
-                    filtered_schedules.append(schedule)
-            
+            filtered_schedules = [_event_to_dict(event) for index in self._indexes(university, semester)
+                                  for event in index.by_type.get(schedule_type, ())]
+
             logger.info(f"{schedule_type} 학사일정 {len(filtered_schedules)}개 반환")
             return filtered_schedules
-            
+
         except Exception as e:
             logger.error(f"타입별 학사일정 조회 오류: {e}")
             return []
+
+
+def _is_important_schedule(event_name: str) -> bool:
+    """중요한 학사일정 여부 판단"""
+    important_keywords = [
+        '수강신청', '등록', '개강', '종강', '시험', '성적', '졸업', '휴학', '복학',
+        '추가등록', '수강철회', '중간시험', '학기말', '방학', '계절제'
+    ]
     
-    def _parse_schedule_date(self, date_str: str, month: str) -> datetime:
-        """학사일정 날짜 파싱"""
-        try:
-            current_year = 2025
-            
-            # 월 번호 매핑
-            month_mapping = {
-                '8월': 8, '9월': 9, '10월': 10, '11월': 11, '12월': 12,
-                '1월': 1, '2월': 2, '3월': 3, '4월': 4, '5월': 5, '6월': 6, '7월': 7
-            }
-            
-            month_num = month_mapping.get(month, 1)
-            
-            # 날짜 문자열에서 일 추출
-            if '~' in date_str:
-                # 기간인 경우 시작일 사용
-                start_date = date_str.split('~')[0].strip()
-                day_str = start_date.split('(')[0].strip()
-            else:
-                day_str = date_str.split('(')[0].strip()
-            
-            day = int(day_str)
-            
-            # 2026년 1-2월은 2026년으로 처리
-            if month_num <= 2:
-                year = 2026
-            else:
-                year = current_year
-            
-            return datetime(year, month_num, day)
-            
-        except Exception as e:
-            logger.error(f"날짜 파싱 오류: {e}")
-            return datetime.now()
+    return any(keyword in event_name for keyword in important_keywords)
+
+
+def _generate_schedule_tags(event_name: str, event_type: str) -> List[str]:
+    """학사일정 태그 생성"""
+    tags = []
+    
+    # 이벤트 타입 기반 태그
+    type_tags = {
+        '수강신청': ['수강신청', '등록'],
+        '등록': ['등록', '수강신청'],
+        '시험': ['시험', '성적'],
+        '휴학': ['휴학', '복학'],
+        '복학': ['복학', '휴학'],
+        '졸업': ['졸업', '학위'],
+        '휴일': ['휴일', '공휴일'],
+        '전과': ['전과', '전공'],
+        '성적': ['성적', '시험'],
+    }
+    
+    if event_type in type_tags:
+        tags.extend(type_tags[event_type])
+    
+    # 이벤트명 기반 태그
+    if '수강신청' in event_name:
+        tags.append('수강신청')
+    if '등록' in event_name:
+        tags.append('등록')
+    if '시험' in event_name:
+        tags.append('시험')
+    if '휴학' in event_name:
+        tags.append('휴학')
+    if '복학' in event_name:
+        tags.append('복학')
+    if '졸업' in event_name:
+        tags.append('졸업')
     
-    def _is_important_schedule(self, event_name: str) -> bool:
-        """중요한 학사일정 여부 판단"""
-        important_keywords = [
-            '수강신청', '등록', '개강', '종강', '시험', '성적', '졸업', '휴학', '복학',
-            '추가등록', '수강철회', '중간시험', '학기말', '방학', '계절제'
-        ]
-        
-        return any(keyword in event_name for keyword in important_keywords)
+    # 기본 태그
+    if not tags:
+        tags.append('학사일정')
     
-    def _generate_schedule_tags(self, event_name: str, event_type: str) -> List[str]:
-        """학사일정 태그 생성"""
-        tags = []
-        
-        # 이벤트 타입 기반 태그
-        type_tags = {
-            '수강신청': ['수강신청', '등록'],
-            '등록': ['등록', '수강신청'],
-            '시험': ['시험', '성적'],
-            '휴학': ['휴학', '복학'],
-            '복학': ['복학', '휴학'],
-            '졸업': ['졸업', '학위'],
-            '휴일': ['휴일', '공휴일'],
-            '전과': ['전과', '전공'],
-            '성적': ['성적', '시험'],
-        }
-        
-        if event_type in type_tags:
-            tags.extend(type_tags[event_type])
-        
-        # 이벤트명 기반 태그
-        if '수강신청' in event_name:
-            tags.append('수강신청')
-        if '등록' in event_name:
-            tags.append('등록')
-        if '시험' in event_name:
-            tags.append('시험')
-        if '휴학' in event_name:
-            tags.append('휴학')
-        if '복학' in event_name:
-            tags.append('복학')
-        if '졸업' in event_name:
-            tags.append('졸업')
-        
-        # 기본 태그
-        if not tags:
-            tags.append('학사일정')
-        
-        return list(set(tags))  # 중복 제거
+    return list(set(tags))  # 중복 제거
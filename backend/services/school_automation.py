@@ -1,9 +1,14 @@
 """
 학교 홈페이지 자동화 서비스
 Selenium을 사용하여 실제 로그인 및 과제 정보 수집
+- 블로킹 Selenium 호출은 전용 브라우저 스레드(BrowserExecutor)에서 실행, async 메서드는 await만 함
+- 로그인/수집은 시간 제한이 있고 취소 가능 (초과/취소 시 드라이버 종료)
 """
 
+import os
+import time
 import asyncio
+import threading
 import logging
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
@@ -20,9 +25,15 @@ from models.assignment import Assignment, AssignmentStatus, AssignmentPriority
 from services.assignment_parser import AssignmentParser
 from services.learnus_parser import LearnUsParser
 from services.notification_service import NotificationService
+from services.assignment_cache import AssignmentCache, CacheEntry
+from network_filter import configure_options, apply_network_filter
+from services.browser_executor import BrowserExecutor, BROWSER_LOGIN_TIMEOUT, BROWSER_SCRAPE_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+# 페이지 로딩 최대 시간 (초)
+BROWSER_PAGE_LOAD_TIMEOUT = int(os.environ.get('BROWSER_PAGE_LOAD_TIMEOUT', '60'))
+
 class SchoolAutomationService:
     def __init__(self):
         self.driver: Optional[webdriver.Chrome] = None
@@ -33,9 +44,35 @@ class SchoolAutomationService:
         self.learnus_parser = LearnUsParser()
         self.notification_service = NotificationService()
         self.automation_running = False
+        self._automation_task: Optional[asyncio.Task] = None
+        # API는 캐시만 읽고, 수집은 백그라운드(자동화 루프/수동 갱신/재검증)에서만 실행
+        self.assignment_cache = AssignmentCache()
+        # 드라이버 조작은 모두 이 스레드에서
+        self.browser = BrowserExecutor("browser", on_abort=self._abort_browser)
+    
+    @property
+    def cache_key(self) -> str:
+        """사용자별 캐시 키"""
+        return f"{self.current_university}:{self.current_student_id}"
         
     async def login(self, university: str, username: str, password: str, student_id: str) -> bool:
-        """학교 홈페이지에 로그인"""
+        """학교 홈페이지에 로그인 (브라우저 스레드에서 실행, BROWSER_LOGIN_TIMEOUT 제한)"""
+        try:
+            success = await self.browser.run(
+                self._login_sync, university, username, password, student_id,
+                timeout=BROWSER_LOGIN_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"❌ 로그인 시간 초과 ({BROWSER_LOGIN_TIMEOUT:.0f}초)")
+            return False
+        
+        if success:
+            # 로그인 직후 캐시 미리 채우기 (응답은 기다리지 않음)
+            self.assignment_cache.revalidate(self.cache_key, self._fetch_assignments)
+        return success
+    
+    def _login_sync(self, university: str, username: str, password: str, student_id: str) -> bool:
+        """로그인 (블로킹, 브라우저 스레드 전용)"""
         try:
             logger.info(f"🔐 {university} 로그인 시도 중...")
             logger.info(f"   사용자: {username}")
@@ -43,7 +80,7 @@ class SchoolAutomationService:
             logger.info(f"   시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
             # Chrome 드라이버 설정
-            await self._setup_driver()
+            self._setup_driver()
             
             # 대학교별 로그인 URL 및 설정
             login_config = self._get_login_config(university)
@@ -54,7 +91,7 @@ class SchoolAutomationService:
             # 1단계: LearnUs 메인 페이지 접속
             logger.info(f"🌐 LearnUs 메인 페이지 접속: {login_config['login_url']}")
             self.driver.get(login_config['login_url'])
-            await asyncio.sleep(3)  # 페이지 로딩 대기
+            time.sleep(3)  # 페이지 로딩 대기
             
             # 연세포털 로그인 버튼 찾기 및 클릭
             logger.info("🔍 연세포털 로그인 버튼 찾는 중...")
@@ -150,7 +187,7 @@ class SchoolAutomationService:
             # 연세포털 로그인 버튼 클릭
             logger.info("🖱️ 연세포털 로그인 버튼 클릭...")
             portal_login_button.click()
-            await asyncio.sleep(3)  # 페이지 이동 대기
+            time.sleep(3)  # 페이지 이동 대기
             
             # 2단계: 연세포털 로그인 페이지에서 실제 로그인
             logger.info("🌐 연세포털 로그인 페이지로 이동...")
@@ -234,7 +271,7 @@ class SchoolAutomationService:
             login_button.click()
             
             # 로그인 결과 확인
-            await asyncio.sleep(3)  # 페이지 로딩 대기
+            time.sleep(3)  # 페이지 로딩 대기
             
             # 로그인 성공 여부 확인
             logger.info("🔍 로그인 결과 확인 중...")
@@ -243,7 +280,7 @@ class SchoolAutomationService:
             logger.info(f"📍 현재 URL: {current_url}")
             logger.info(f"📄 페이지 제목: {page_title}")
             
-            success = await self._check_login_success(login_config)
+            success = self._check_login_success(login_config)
             if success:
                 logger.info("✅ 로그인 성공!")
                 self.is_logged_in = True
@@ -272,7 +309,7 @@ class SchoolAutomationService:
                 self.driver.quit()
                 self.driver = None
     
-    async def _check_login_success(self, login_config: Dict[str, str]) -> bool:
+    def _check_login_success(self, login_config: Dict[str, str]) -> bool:
         """로그인 성공 여부 확인"""
         try:
             # 성공 지표 확인
@@ -320,65 +357,107 @@ class SchoolAutomationService:
     
     async def get_all_assignments(self) -> List[Assignment]:
         """모든 과제 정보 수집"""
+        assignments = await self._fetch_assignments()
+        return assignments if assignments is not None else []
+    
+    async def _fetch_assignments(self) -> Optional[List[Assignment]]:
+        """과제 수집 (브라우저 스레드에서 실행, 실패/시간 초과면 None -> 캐시의 이전 결과 유지)"""
         if not self.is_logged_in:
             logger.error("로그인이 필요합니다")
-            return []
+            return None
         
         try:
-            logger.info("과제 정보 수집 시작...")
-            
-            # 과제 페이지로 이동
-            assignment_config = self._get_assignment_config(self.current_university)
-            self.driver.get(assignment_config['assignment_url'])
-            
-            # 페이지 로딩 대기
-            await asyncio.sleep(3)
-            
-            # 대학교별 전용 파서 사용
-            if self.current_university == "연세대학교":
-                assignments = await self.learnus_parser.parse_learnus_assignments(
-                    self.driver, 
-                    self.current_student_id
-                )
-            else:
-                assignments = await self.assignment_parser.parse_assignments(
-                    self.driver, 
-                    self.current_university,
-                    self.current_student_id
-                )
-            
-            logger.info(f"과제 정보 수집 완료: {len(assignments)}개")
-            return assignments
-            
+            return await self.browser.run(self._collect_assignments_sync, timeout=BROWSER_SCRAPE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error(f"과제 정보 수집 시간 초과 ({BROWSER_SCRAPE_TIMEOUT:.0f}초)")
+            return None
         except Exception as e:
             logger.error(f"과제 정보 수집 오류: {e}")
-            return []
+            return None
     
-    async def get_new_assignments(self) -> List[Assignment]:
-        """새로운 과제 조회"""
-        all_assignments = await self.get_all_assignments()
+    def _collect_assignments_sync(self) -> List[Assignment]:
+        """과제 수집 (블로킹, 브라우저 스레드 전용)"""
+        logger.info("과제 정보 수집 시작...")
+        
+        # 과제 페이지로 이동
+        assignment_config = self._get_assignment_config(self.current_university)
+        self.driver.get(assignment_config['assignment_url'])
         
-        # 최근 7일 이내에 생성된 과제만 필터링
+        # 페이지 로딩 대기
+        time.sleep(3)
+        
+        # 대학교별 전용 파서 사용
+        # (파서는 코루틴이지만 내부에서 I/O를 await하지 않으므로 이 스레드의 별도 루프에서 끝까지 실행)
+        if self.current_university == "연세대학교":
+            assignments = asyncio.run(self.learnus_parser.parse_learnus_assignments(
+                self.driver, 
+                self.current_student_id
+            ))
+        else:
+            assignments = asyncio.run(self.assignment_parser.parse_assignments(
+                self.driver, 
+                self.current_university,
+                self.current_student_id
+            ))
+        
+        logger.info(f"과제 정보 수집 완료: {len(assignments)}개")
+        return assignments
+    
+    def _abort_browser(self):
+        """시간 초과/취소 시 드라이버 종료 (브라우저 스레드의 블로킹 호출이 바로 실패함)
+
+        이벤트 루프에서 호출되므로 driver.quit()은 별도 스레드에서 실행
+        (브라우저 스레드는 멈춘 호출에 묶여 있고, quit도 응답 없는 Chrome에서는 수십 초 걸릴 수 있음)
+        """
+        driver = self.driver
+        self.driver = None
+        self.is_logged_in = False
+        if driver:
+            threading.Thread(target=self._quit_detached_driver, args=(driver,), name="browser-abort", daemon=True).start()
+    
+    @staticmethod
+    def _quit_detached_driver(driver):
+        """_abort_browser에서 떼어낸 드라이버 종료 (close의 _quit_driver와 별개)"""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"중단된 드라이버 종료 오류: {e}")
+    
+    def get_cached_assignments(self) -> Optional[CacheEntry]:
+        """캐시된 과제 (오래되었으면 백그라운드 재수집만 예약하고 바로 반환)"""
+        entry = self.assignment_cache.get(self.cache_key)
+        if self.is_logged_in and self.assignment_cache.needs_revalidation(entry):
+            self.assignment_cache.revalidate(self.cache_key, self._fetch_assignments)
+        return entry
+    
+    @staticmethod
+    def filter_new_assignments(all_assignments: List[Assignment]) -> List[Assignment]:
+        """최근 7일 이내에 생성된 과제"""
         recent_date = datetime.now() - timedelta(days=7)
-        new_assignments = [
+        return [
             assignment for assignment in all_assignments
             if assignment.created_at >= recent_date
         ]
-        
-        return new_assignments
+    
+    @staticmethod
+    def filter_upcoming_assignments(all_assignments: List[Assignment]) -> List[Assignment]:
+        """3일 이내 마감 과제"""
+        now = datetime.now()
+        upcoming_date = now + timedelta(days=3)
+        return [
+            assignment for assignment in all_assignments
+            if assignment.due_date <= upcoming_date and assignment.due_date >= now
+        ]
+    
+    async def get_new_assignments(self) -> List[Assignment]:
+        """새로운 과제 조회"""
+        all_assignments = await self.get_all_assignments()
+        return self.filter_new_assignments(all_assignments)
     
     async def get_upcoming_assignments(self) -> List[Assignment]:
         """마감 임박 과제 조회 (3일 이내)"""
         all_assignments = await self.get_all_assignments()
-        
-        # 3일 이내 마감 과제 필터링
-        upcoming_date = datetime.now() + timedelta(days=3)
-        upcoming_assignments = [
-            assignment for assignment in all_assignments
-            if assignment.due_date <= upcoming_date and assignment.due_date >= datetime.now()
-        ]
-        
-        return upcoming_assignments
+        return self.filter_upcoming_assignments(all_assignments)
     
     async def start_automation(self) -> bool:
         """자동화 작업 시작"""
@@ -391,7 +470,7 @@ class SchoolAutomationService:
             logger.info("자동화 작업 시작")
             
             # 백그라운드에서 주기적으로 과제 정보 수집
-            asyncio.create_task(self._automation_loop())
+            self._automation_task = asyncio.create_task(self._automation_loop())
             
             return True
             
@@ -403,6 +482,10 @@ class SchoolAutomationService:
         """자동화 작업 중지"""
         try:
             self.automation_running = False
+            # 진행 중인 수집도 취소 (브라우저 작업은 드라이버 종료로 중단)
+            if self._automation_task and not self._automation_task.done():
+                self._automation_task.cancel()
+            self._automation_task = None
             logger.info("자동화 작업 중지")
             return True
             
@@ -411,16 +494,17 @@ class SchoolAutomationService:
             return False
     
     async def get_status(self) -> Dict[str, Any]:
-        """자동화 상태 조회"""
+        """자동화 상태 조회 (캐시 기준, 브라우저 구동 없음)"""
         try:
-            all_assignments = await self.get_all_assignments()
-            new_assignments = await self.get_new_assignments()
-            upcoming_assignments = await self.get_upcoming_assignments()
+            entry = self.get_cached_assignments()
+            all_assignments = entry.value if entry else []
+            new_assignments = self.filter_new_assignments(all_assignments)
+            upcoming_assignments = self.filter_upcoming_assignments(all_assignments)
             
             return {
                 "status": "running" if self.automation_running else "stopped",
                 "message": "자동화가 실행 중입니다" if self.automation_running else "자동화가 중지되었습니다",
-                "last_check": datetime.now().isoformat(),
+                "last_check": datetime.fromtimestamp(entry.stored_at).isoformat() if entry else None,
                 "next_check": (datetime.now() + timedelta(hours=1)).isoformat(),
                 "assignments_count": len(all_assignments),
                 "new_assignments_count": len(new_assignments),
@@ -439,16 +523,16 @@ class SchoolAutomationService:
         try:
             logger.info("과제 정보 수동 업데이트 시작...")
             
-            # 과제 정보 수집
-            assignments = await self.get_all_assignments()
+            # 과제 정보 수집 (한 번만 수집하여 캐시 갱신, 진행 중인 재수집이 있으면 그 결과 사용)
+            assignments = await self.assignment_cache.revalidate(self.cache_key, self._fetch_assignments) or []
             
             # 새로운 과제가 있으면 알림 발송
-            new_assignments = await self.get_new_assignments()
+            new_assignments = self.filter_new_assignments(assignments)
             if new_assignments:
                 await self.notification_service.send_new_assignment_notification(new_assignments)
             
             # 마감 임박 과제가 있으면 알림 발송
-            upcoming_assignments = await self.get_upcoming_assignments()
+            upcoming_assignments = self.filter_upcoming_assignments(assignments)
             if upcoming_assignments:
                 await self.notification_service.send_upcoming_deadline_notification(upcoming_assignments)
             
@@ -459,7 +543,7 @@ class SchoolAutomationService:
             logger.error(f"과제 정보 업데이트 오류: {e}")
             return False
     
-    async def _setup_driver(self):
+    def _setup_driver(self):
         """Chrome 드라이버 설정"""
         try:
             chrome_options = Options()
@@ -470,8 +554,12 @@ class SchoolAutomationService:
             chrome_options.add_argument("--window-size=1920,1080")
             chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
             
+            configure_options(chrome_options)
+            
             service = Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver.set_page_load_timeout(BROWSER_PAGE_LOAD_TIMEOUT)
+            apply_network_filter(self.driver)
             
         except Exception as e:
             logger.error(f"드라이버 설정 오류: {e}")
@@ -585,18 +673,6 @@ class SchoolAutomationService:
         
         return configs.get(university)
     
-    def _check_login_success(self) -> bool:
-        """로그인 성공 여부 확인"""
-        try:
-            # 로그인 성공 후 나타나는 요소 확인
-            # (대학교별로 다를 수 있음)
-            WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "user-info"))
-            )
-            return True
-        except TimeoutException:
-            return False
-    
     async def _automation_loop(self):
         """자동화 루프 (백그라운드 실행)"""
         while self.automation_running:
@@ -613,7 +689,23 @@ class SchoolAutomationService:
                 logger.error(f"자동화 루프 오류: {e}")
                 await asyncio.sleep(300)  # 5분 후 재시도
     
+    async def close(self):
+        """세션 종료 (자동화 중지 후 브라우저 스레드에서 드라이버 종료)"""
+        await self.stop_automation()
+        try:
+            await self.browser.run(self._quit_driver, timeout=30)
+        except asyncio.TimeoutError:
+            pass
+        self.browser.shutdown()
+    
+    def _quit_driver(self):
+        self.is_logged_in = False
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+    
     def __del__(self):
         """소멸자 - 드라이버 정리"""
         if self.driver:
             self.driver.quit()
+        self.browser.shutdown()
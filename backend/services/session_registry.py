@@ -0,0 +1,214 @@
+"""
+사용자별 자동화 세션 관리
+- 사용자(대학교:학번)마다 SchoolAutomationService 하나 (드라이버/브라우저 스레드/과제 캐시 분리)
+- 로그인하면 세션 토큰 발급, API는 X-Session-Token 헤더로 세션을 찾음 (토큰이 없으면 401)
+- 오래 사용하지 않은 세션은 정리하고, 동시 세션 수는 SESSION_MAX_SESSIONS로 제한
+"""
+
+import os
+import time
+import asyncio
+import secrets
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from services.school_automation import SchoolAutomationService
+
+logger = logging.getLogger(__name__)
+
+# 동시에 유지할 최대 세션 수 (세션마다 Chrome 하나)
+SESSION_MAX_SESSIONS = int(os.environ.get('SESSION_MAX_SESSIONS', '8'))
+# 이 시간 동안 요청이 없으면 세션 종료 (초, 자동화 실행 중인 세션은 제외)
+SESSION_IDLE_TIMEOUT = float(os.environ.get('SESSION_IDLE_TIMEOUT', '1800'))
+# 유휴 세션 정리 주기 (초)
+SESSION_SWEEP_INTERVAL = float(os.environ.get('SESSION_SWEEP_INTERVAL', '60'))
+# 토큰 없는 요청을 최근 로그인 세션으로 처리 (단일 사용자 로컬 실행 전용, 기본 꺼짐)
+SESSION_SINGLE_USER_FALLBACK = os.environ.get('SESSION_SINGLE_USER_FALLBACK', 'false').lower() == 'true'
+
+
+class SessionLimitError(Exception):
+    """모든 세션이 사용 중이라 새 세션을 만들 수 없음"""
+
+
+def session_key(university: str, student_id: str) -> str:
+    return f"{university}:{student_id}"
+
+
+class UserSession:
+    """사용자 한 명의 자동화 세션"""
+
+    def __init__(self, key: str, service: SchoolAutomationService):
+        self.key = key
+        self.token = secrets.token_urlsafe(24)
+        self.service = service
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+    def touch(self):
+        self.last_used = time.time()
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.time() - self.last_used
+
+    @property
+    def busy(self) -> bool:
+        """자동화 루프가 돌고 있으면 정리 대상에서 제외"""
+        return self.service.automation_running
+
+
+class SessionRegistry:
+    """사용자별 세션 (최근 사용 순서 유지, 가장 오래 쉬고 있는 세션부터 정리)"""
+
+    def __init__(self, factory: Callable[[], SchoolAutomationService] = SchoolAutomationService,
+                 max_sessions: int = SESSION_MAX_SESSIONS, idle_timeout: float = SESSION_IDLE_TIMEOUT):
+        self.factory = factory
+        self.max_sessions = max(max_sessions, 1)
+        self.idle_timeout = idle_timeout
+        self._sessions: 'OrderedDict[str, UserSession]' = OrderedDict()
+        self._tokens: Dict[str, str] = {}
+        self._login_locks: Dict[str, asyncio.Lock] = {}
+        self._lock = asyncio.Lock()
+        self._sweeper: Optional[asyncio.Task] = None
+        self.stats = {'logins': 0, 'login_failures': 0, 'evicted_idle': 0, 'evicted_capacity': 0, 'rejected': 0}
+
+    # ------------------------------------------------------------------
+    # 로그인 / 조회
+    # ------------------------------------------------------------------
+    async def login(self, university: str, username: str, password: str, student_id: str) -> Optional[UserSession]:
+        """로그인 성공 시 세션 반환 (같은 사용자는 기존 세션 재사용, 토큰은 새로 발급)"""
+        key = session_key(university, student_id)
+        lock = self._login_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                return await self._login_locked(key, university, username, password, student_id)
+        finally:
+            self._prune_login_lock(key)
+
+    async def _login_locked(self, key: str, university: str, username: str, password: str,
+                            student_id: str) -> Optional[UserSession]:
+        async with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                await self._make_room()
+                session = UserSession(key, self.factory())
+                self._sessions[key] = session
+                created = True
+            else:
+                created = False
+            session.touch()
+            self._sessions.move_to_end(key)
+
+        success = await session.service.login(university, username, password, student_id)
+        if not success:
+            self.stats['login_failures'] += 1
+            if created:
+                await self.close(key)
+            return None
+
+        self.stats['logins'] += 1
+        self._tokens.pop(session.token, None)
+        session.token = secrets.token_urlsafe(24)
+        self._tokens[session.token] = key
+        logger.info(f"👤 [SESSION] {key} 로그인 (세션 {len(self._sessions)}/{self.max_sessions})")
+        return session
+
+    def _prune_login_lock(self, key: str):
+        """세션이 없고 로그인 중이 아닌 사용자의 로그인 락 제거 (학번마다 락이 계속 쌓이지 않도록)"""
+        lock = self._login_locks.get(key)
+        if lock is not None and key not in self._sessions and not lock.locked():
+            del self._login_locks[key]
+
+    def get(self, token: Optional[str]) -> Optional[UserSession]:
+        """토큰으로 세션 조회 (조회하면 최근 사용으로 갱신)"""
+        key = self._tokens.get(token or '')
+        session = self._sessions.get(key) if key else None
+        if session is not None:
+            session.touch()
+            self._sessions.move_to_end(key)
+        return session
+
+    def latest(self) -> Optional[UserSession]:
+        """가장 최근에 사용된 로그인 세션 (SESSION_SINGLE_USER_FALLBACK일 때 토큰 없는 요청용)"""
+        for session in reversed(self._sessions.values()):
+            if session.service.is_logged_in:
+                session.touch()
+                return session
+        return None
+
+    def sessions(self) -> List[UserSession]:
+        return list(self._sessions.values())
+
+    # ------------------------------------------------------------------
+    # 정리
+    # ------------------------------------------------------------------
+    async def _make_room(self):
+        """최대 세션 수에 도달했으면 가장 오래 쉬고 있는 세션 종료 (self._lock 안에서 호출)"""
+        if len(self._sessions) < self.max_sessions:
+            return
+        for key, session in self._sessions.items():
+            if not session.busy:
+                logger.info(f"👤 [SESSION] 최대 세션 수 도달 - {key} 종료 ({session.idle_seconds:.0f}초 유휴)")
+                self.stats['evicted_capacity'] += 1
+                await self._close_locked(key)
+                return
+        self.stats['rejected'] += 1
+        raise SessionLimitError(f"모든 세션({self.max_sessions}개)이 자동화 실행 중입니다")
+
+    async def close(self, key: str):
+        async with self._lock:
+            await self._close_locked(key)
+
+    async def _close_locked(self, key: str):
+        session = self._sessions.pop(key, None)
+        if session is None:
+            return
+        self._tokens.pop(session.token, None)
+        self._prune_login_lock(key)
+        try:
+            await session.service.close()
+        except Exception as e:
+            logger.error(f"❌ [SESSION] {key} 종료 오류: {e}")
+
+    async def sweep(self) -> int:
+        """유휴 세션 정리, 정리한 수 반환"""
+        async with self._lock:
+            idle = [key for key, session in self._sessions.items()
+                    if not session.busy and session.idle_seconds > self.idle_timeout]
+            for key in idle:
+                await self._close_locked(key)
+        if idle:
+            self.stats['evicted_idle'] += len(idle)
+            logger.info(f"🧹 [SESSION] 유휴 세션 {len(idle)}개 종료 (남은 세션 {len(self._sessions)}개)")
+        return len(idle)
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"❌ [SESSION] 유휴 세션 정리 오류: {e}")
+
+    def start(self):
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def shutdown(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        async with self._lock:
+            for key in list(self._sessions):
+                await self._close_locked(key)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'active': len(self._sessions),
+            'max_sessions': self.max_sessions,
+            'idle_timeout': self.idle_timeout,
+            'automation_running': sum(1 for session in self._sessions.values() if session.busy),
+            'login_locks': len(self._login_locks),
+        }
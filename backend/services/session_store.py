@@ -0,0 +1,129 @@
+"""
+LearnUs 세션 쿠키 저장소
+- 사용자별 로그인 쿠키를 CredentialManager의 Fernet 키로 암호화하여 저장
+- TTL이 지난 세션은 폐기
+- 사용자마다 파일을 분리하여 여러 워커 프로세스가 동시에 써도 충돌하지 않음
+"""
+
+import os
+import time
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+from services.credential_manager import CredentialManager
+
+logger = logging.getLogger(__name__)
+
+SESSION_CACHE_DIR = os.environ.get('SESSION_CACHE_DIR', 'session_cache')
+# 저장된 세션의 유효 시간 (마지막 로그인/재사용 기준, 초)
+SESSION_CACHE_TTL = int(os.environ.get('SESSION_CACHE_TTL', str(6 * 60 * 60)))
+
+# 브라우저/HTTP 세션 간 주고받을 때 유지하는 쿠키 필드 (CDP Network.setCookies 형식)
+COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires', 'expiry')
+
+
+def normalize_cookie(cookie: Dict) -> Dict:
+    """Selenium/CDP/requests 쿠키를 저장용 공통 형식으로 변환"""
+    normalized = {key: cookie[key] for key in COOKIE_FIELDS if cookie.get(key) not in (None, '')}
+    # Selenium get_cookies()는 'expiry', CDP는 'expires' 사용
+    if 'expiry' in normalized:
+        normalized['expires'] = normalized.pop('expiry')
+    # 세션 쿠키(CDP expires=-1)는 만료 시각 없이 저장
+    if normalized.get('expires', 0) <= 0:
+        normalized.pop('expires', None)
+    return normalized
+
+
+class SessionCookieStore:
+    """사용자별 암호화 세션 쿠키 저장소"""
+
+    def __init__(self, cache_dir: str = SESSION_CACHE_DIR, ttl_seconds: int = SESSION_CACHE_TTL,
+                 credential_manager: Optional[CredentialManager] = None):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self._credentials = credential_manager or CredentialManager()
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'saved': 0, 'invalidated': 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def load(self, university: str, username: str) -> Optional[List[Dict]]:
+        """저장된 쿠키 조회 (없거나 만료되면 None)"""
+        path = self._path(university, username)
+        if not os.path.exists(path):
+            self._stats['misses'] += 1
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                entry = self._credentials.decrypt_json(f.read())
+        except OSError as e:
+            logger.warning(f"⚠️ [SESSION] 세션 파일 읽기 실패: {e}")
+            entry = None
+
+        if not entry or not entry.get('cookies'):
+            self._stats['misses'] += 1
+            self._remove(path)
+            return None
+
+        if time.time() - entry.get('saved_at', 0) > self.ttl_seconds:
+            self._stats['expired'] += 1
+            logger.info(f"⌛ [SESSION] {username} 저장된 세션 만료 (TTL {self.ttl_seconds}초)")
+            self._remove(path)
+            return None
+
+        self._stats['hits'] += 1
+        return entry['cookies']
+
+    def save(self, university: str, username: str, cookies: List[Dict]) -> bool:
+        """로그인 직후(또는 재사용 성공 후) 쿠키 저장"""
+        cookies = [normalize_cookie(cookie) for cookie in cookies if cookie.get('name')]
+        if not cookies:
+            return False
+
+        path = self._path(university, username)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(self._credentials.encrypt_json({'saved_at': time.time(), 'cookies': cookies}))
+            os.replace(tmp_path, path)
+            self._stats['saved'] += 1
+            logger.info(f"💾 [SESSION] {username} 세션 쿠키 {len(cookies)}개 저장")
+            return True
+        except OSError as e:
+            logger.warning(f"⚠️ [SESSION] 세션 저장 실패: {e}")
+            self._remove(tmp_path)
+            return False
+
+    def invalidate(self, university: str, username: str):
+        """검증에 실패한 세션 삭제"""
+        self._stats['invalidated'] += 1
+        self._remove(self._path(university, username))
+
+    def get_stats(self) -> Dict:
+        return dict(self._stats)
+
+    def _path(self, university: str, username: str) -> str:
+        # 파일명에 아이디가 그대로 남지 않도록 해시 사용
+        digest = hashlib.sha256(f"{university}:{username}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.session")
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_session_store = None
+
+
+def get_session_store() -> Optional[SessionCookieStore]:
+    """프로세스 전역 세션 저장소 (생성 실패 시 None = 세션 캐시 미사용)"""
+    global _session_store
+    if _session_store is None:
+        try:
+            _session_store = SessionCookieStore()
+        except Exception as e:
+            logger.warning(f"⚠️ [SESSION] 세션 저장소 초기화 실패, 매번 로그인: {e}")
+            return None
+    return _session_store
@@ -8,12 +8,13 @@
 
 import logging
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
+from html_parsing import make_soup, COURSE_SECTIONS
 
 # 로깅 설정
 logging.basicConfig(
@@ -22,6 +23,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 완료 상태 아이콘 판별 기준 (title/alt 문구, 아이콘 파일명)
+COMPLETED_MARKERS = ('완료함', 'completion-auto-y')
+INCOMPLETE_MARKERS = ('완료하지 못함', 'completion-auto-n')
+
+
+def build_completion_index(page: Union[str, BeautifulSoup]) -> Dict[str, str]:
+    """페이지 스냅샷 한 번으로 module-id -> 완료 상태('completed'/'incomplete') 인덱스 생성
+
+    LearnUs 구조: <li class="activity ..." id="module-4171524"> 안의
+    <span class="autocompletion"><img class="icon" title="완료하지 못함: ...">
+    """
+    soup = page if isinstance(page, BeautifulSoup) else make_soup(page, parse_only=COURSE_SECTIONS)
+    index = {}
+    for module in soup.select("li[id^='module-']"):
+        icon = module.select_one("span.autocompletion img.icon")
+        if icon is None:
+            continue
+        marker_text = " ".join([icon.get('title', ''), icon.get('alt', ''), icon.get('src', '')])
+        module_id = module['id'][len('module-'):]
+        if any(marker in marker_text for marker in COMPLETED_MARKERS):
+            index[module_id] = 'completed'
+        elif any(marker in marker_text for marker in INCOMPLETE_MARKERS):
+            index[module_id] = 'incomplete'
+    return index
+
+
+def _xpath_has_class(name: str) -> str:
+    """CSS .name과 같은 XPath 조건 (class 속성의 공백 구분 토큰 중 하나가 name)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def completion_xpaths(activity_id: str) -> Tuple[List[str], List[str]]:
+    """활동 하나의 완료/미완료 아이콘 XPath (STATUS_CHECK_MODE=per_activity에서 활동마다 조회)
+
+    module-id는 정확히 일치해야 함 (contains로 찾으면 module-12가 module-123에도 걸림)
+    """
+    module = f"li[@id='module-{activity_id}']"
+    activity_module = f"li[{_xpath_has_class('activity')} and @id='module-{activity_id}']"
+    # build_completion_index의 CSS(span.autocompletion img.icon)와 같은 기준: 클래스가 여러 개여도 일치
+    icon = f"span[{_xpath_has_class('autocompletion')}]//img[{_xpath_has_class('icon')}"
+    completed = [
+        f"//{module}//{icon} and contains(@title, '완료함')]",
+        f"//{module}//{icon} and contains(@alt, '완료함')]",
+        f"//{module}//{icon} and contains(@src, 'completion-auto-y')]",
+        f"//{activity_module}//{icon} and contains(@title, '완료함')]",
+        f"//{activity_module}//{icon} and contains(@src, 'completion-auto-y')]",
+    ]
+    incomplete = [
+        f"//{module}//{icon} and contains(@title, '완료하지 못함')]",
+        f"//{module}//{icon} and contains(@alt, '완료하지 못함')]",
+        f"//{module}//{icon} and contains(@src, 'completion-auto-n')]",
+        f"//{activity_module}//{icon} and contains(@title, '완료하지 못함')]",
+        f"//{activity_module}//{icon} and contains(@src, 'completion-auto-n')]",
+    ]
+    return completed, incomplete
+
+
+def lookup_completion_status(completion_index: Dict[str, str], activity_url: str) -> str:
+    """완료 상태 인덱스에서 활동 URL의 상태 문자열 조회 (WebDriver 호출 없음)"""
+    activity_id = activity_url.split("id=")[1].split("&")[0] if "id=" in activity_url else None
+    if not activity_id:
+        return "⏳ 대기 중"
+    state = completion_index.get(activity_id)
+    if state == 'completed':
+        return "✅ 완료"
+    if state == 'incomplete':
+        return "❌ 해야 할 과제"  # 완료하지 못함 = 해야 할 과제
+    return "⏳ 대기 중"
+
+
 class StatusOptimizer:
     def __init__(self, driver):
         self.driver = driver
@@ -58,54 +129,15 @@ class StatusOptimizer:
             return activities
     
     def collect_all_completion_icons(self):
-        """메인 페이지에서 모든 완료 상태 아이콘 수집"""
+        """메인 페이지에서 모든 완료 상태 아이콘 수집 (page_source 스냅샷 1회)"""
         try:
+            completion_index = build_completion_index(self.driver.page_source)
             completion_data = {
-                'completed': [],
-                'incomplete': [],
-                'unknown': []
+                'completed': {aid for aid, state in completion_index.items() if state == 'completed'},
+                'incomplete': {aid for aid, state in completion_index.items() if state == 'incomplete'},
+                'unknown': set()
             }
             
-            # 완료된 활동 아이콘 찾기
-            completed_selectors = [
-                "//span[@class='autocompletion']//img[@class='icon' and contains(@title, '완료함')]",
-                "//span[@class='autocompletion']//img[@class='icon' and contains(@alt, '완료함')]",
-                "//span[@class='autocompletion']//img[@class='icon' and contains(@src, 'completion-auto-y')]",
-                "//img[@class='icon' and contains(@title, '완료함')]",
-                "//img[@class='icon' and contains(@src, 'completion-auto-y')]"
-            ]
-            
-            for selector in completed_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        # 부모 요소에서 활동 ID 추출
-                        activity_id = self.extract_activity_id_from_element(element)
-                        if activity_id:
-                            completion_data['completed'].append(activity_id)
-                except:
-                    continue
-            
-            # 미완료 활동 아이콘 찾기
-            incomplete_selectors = [
-                "//span[@class='autocompletion']//img[@class='icon' and contains(@title, '완료하지 못함')]",
-                "//span[@class='autocompletion']//img[@class='icon' and contains(@alt, '완료하지 못함')]",
-                "//span[@class='autocompletion']//img[@class='icon' and contains(@src, 'completion-auto-n')]",
-                "//img[@class='icon' and contains(@title, '완료하지 못함')]",
-                "//img[@class='icon' and contains(@src, 'completion-auto-n')]"
-            ]
-            
-            for selector in incomplete_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        # 부모 요소에서 활동 ID 추출
-                        activity_id = self.extract_activity_id_from_element(element)
-                        if activity_id:
-                            completion_data['incomplete'].append(activity_id)
-                except:
-                    continue
-            
             logger.info(f"📊 완료 상태 아이콘 수집 완료:")
             logger.info(f"   완료: {len(completion_data['completed'])}개")
             logger.info(f"   미완료: {len(completion_data['incomplete'])}개")
@@ -114,7 +146,7 @@ class StatusOptimizer:
             
         except Exception as e:
             logger.error(f"❌ 완료 상태 아이콘 수집 실패: {e}")
-            return {'completed': [], 'incomplete': [], 'unknown': []}
+            return {'completed': set(), 'incomplete': set(), 'unknown': set()}
     
     def extract_activity_id(self, activity_url):
         """활동 URL에서 활동 ID 추출"""
@@ -254,24 +286,23 @@ class StatusOptimizer:
         else:
             return "기타"
     
-    def batch_status_check(self, all_activities):
-        """배치 상태 확인 (모든 활동을 한 번에)"""
+    def batch_status_check(self, all_activities, page: Optional[Union[str, BeautifulSoup]] = None):
+        """배치 상태 확인 (모든 활동을 한 번에)
+
+        page(과목 페이지 HTML/BeautifulSoup)가 주어지면 page_source를 다시 읽지 않는다.
+        상태 문자열은 활동별 XPath 확인과 같은 기준 (lookup_completion_status)
+        """
         try:
             logger.info(f"🔍 {len(all_activities)}개 활동의 배치 상태 확인 시작...")
             
-            # 메인 페이지에서 모든 완료 상태 수집
-            completion_data = self.collect_all_completion_icons()
+            # 페이지 스냅샷 한 번으로 모든 완료 상태 수집
+            completion_index = build_completion_index(page if page is not None else self.driver.page_source)
             
             # 각 활동의 상태 업데이트
             for activity in all_activities:
                 activity_url = activity.get('url', '')
                 if activity_url:
-                    activity_id = self.extract_activity_id(activity_url)
-                    if activity_id:
-                        status = self.get_completion_status_from_data(completion_data, activity_id)
-                        activity['status'] = status
-                    else:
-                        activity['status'] = '❓ 상태 확인 불가'
+                    activity['status'] = lookup_completion_status(completion_index, activity_url)
                 else:
                     activity['status'] = '❓ URL 없음'
             
@@ -282,13 +313,13 @@ class StatusOptimizer:
             logger.error(f"❌ 배치 상태 확인 실패: {e}")
             return all_activities
 
-def optimize_automation_with_status_check(driver, activities):
+def optimize_automation_with_status_check(driver, activities, page: Optional[Union[str, BeautifulSoup]] = None):
     """상태 확인 최적화를 적용한 자동화"""
     try:
         optimizer = StatusOptimizer(driver)
         
         # 모든 활동의 상태를 한 번에 확인
-        optimized_activities = optimizer.batch_status_check(activities)
+        optimized_activities = optimizer.batch_status_check(activities, page=page)
         
         return optimized_activities
         
@@ -0,0 +1,148 @@
+"""
+adaptive_scheduler 단위 테스트
+- compute_interval의 주기 단계별 (마감 임박 / 마감 근접 / 미접속 / 변경 빈도 / 기본)
+- 수집 결과의 due_date와 앱이 기록한 lastSeenAt이 실제로 주기에 반영되는지
+- 상태 파일에는 과제 목록 사본 없이 해시/마감만 저장, 건너뛴 사용자 결과는 결과 저장소에서 읽음
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from adaptive_scheduler import (
+    AdaptiveScheduler, BASE_INTERVAL, IDLE_INTERVAL, URGENT_INTERVAL, LAST_SEEN_FIELD,
+)
+from result_store import ResultStore
+
+NOW = datetime(2025, 10, 17, 12, 0).timestamp()
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'learnus')
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    return AdaptiveScheduler(state_path=str(tmp_path / 'adaptive_schedule.json'))
+
+
+def _user_key(user):
+    return user['username']
+
+
+def test_default_interval_without_history(scheduler):
+    interval, reason = scheduler.compute_interval({}, NOW)
+    assert interval == BASE_INTERVAL
+    assert reason == "기본 주기"
+
+
+def test_urgent_deadline_within_24_hours(scheduler):
+    interval, reason = scheduler.compute_interval({'deadline': NOW + 3 * 3600}, NOW)
+    assert interval == URGENT_INTERVAL
+    assert "마감" in reason
+
+
+def test_urgent_interval_does_not_pass_deadline(scheduler):
+    interval, _ = scheduler.compute_interval({'deadline': NOW + 5 * 60}, NOW)
+    assert interval == pytest.approx(6)
+
+
+def test_soon_deadline_within_72_hours(scheduler):
+    interval, _ = scheduler.compute_interval({'deadline': NOW + 48 * 3600}, NOW)
+    assert interval == BASE_INTERVAL / 2
+
+
+def test_passed_deadline_is_ignored(scheduler):
+    interval, _ = scheduler.compute_interval({'deadline': NOW - 3600}, NOW)
+    assert interval == BASE_INTERVAL
+
+
+def test_idle_user_backs_off(scheduler):
+    interval, reason = scheduler.compute_interval({'last_seen': NOW - 10 * 86400}, NOW)
+    assert interval == IDLE_INTERVAL
+    assert "미접속" in reason
+
+
+def test_deadline_wins_over_idle(scheduler):
+    entry = {'deadline': NOW + 3600, 'last_seen': NOW - 30 * 86400}
+    interval, _ = scheduler.compute_interval(entry, NOW)
+    assert interval == URGENT_INTERVAL
+
+
+@pytest.mark.parametrize('history, expected', [
+    ([1] * 10, BASE_INTERVAL * 0.5),
+    ([0] * 10, min(BASE_INTERVAL * 2, IDLE_INTERVAL)),
+    ([1, 0] * 5, BASE_INTERVAL * 1.25),
+])
+def test_change_history_scales_interval(scheduler, history, expected):
+    interval, _ = scheduler.compute_interval({'history': history}, NOW)
+    assert interval == pytest.approx(expected)
+
+
+def test_record_run_uses_collected_due_date(scheduler):
+    due = datetime.fromtimestamp(NOW) + timedelta(hours=5)
+    assignments = [
+        {'course': '데이터구조', 'activity': '7주차 과제', 'type': '과제', 'status': '❌ 해야 할 과제',
+         'due_date': due.strftime('%Y-%m-%d %H:%M:%S')},
+        {'course': '데이터구조', 'activity': '7주차 강의 1', 'type': '동영상', 'status': '✅ 완료',
+         'due_date': (due - timedelta(hours=4)).strftime('%Y-%m-%d %H:%M:%S')},
+    ]
+    next_run = scheduler.record_run('user-a', assignments, NOW)
+    assert next_run == NOW + URGENT_INTERVAL * 60
+
+
+def test_last_seen_field_drives_idle_back_off(scheduler):
+    user = {'username': 'user-a', LAST_SEEN_FIELD: datetime.fromtimestamp(NOW - 14 * 86400)}
+    due, skipped = scheduler.select_due_users([user], _user_key, NOW)
+    assert due == [user] and skipped == []
+
+    next_run = scheduler.record_run('user-a', [], NOW)
+    assert next_run == NOW + IDLE_INTERVAL * 60
+    due, skipped = scheduler.select_due_users([user], _user_key, NOW + 60)
+    assert due == [] and skipped == [user]
+
+
+def test_state_keeps_digest_and_deadline_only(scheduler):
+    due = datetime.fromtimestamp(NOW) + timedelta(hours=5)
+    assignments = [{'course': '데이터구조', 'activity': '7주차 과제', 'status': '❌ 해야 할 과제',
+                    'due_date': due.strftime('%Y-%m-%d %H:%M:%S')}]
+    scheduler.record_run('user-a', assignments, NOW)
+    scheduler.save()
+
+    with open(scheduler.state_path, encoding='utf-8') as f:
+        entry = json.load(f)['user-a']
+    assert 'assignments' not in entry
+    assert entry['digest'] and entry['deadline'] == pytest.approx(due.timestamp())
+
+
+def test_legacy_state_assignments_dropped_on_load(tmp_path):
+    path = tmp_path / 'adaptive_schedule.json'
+    path.write_text(json.dumps({'user-a': {'digest': 'd', 'assignments': [{'activity': 'a'}]}}), encoding='utf-8')
+    scheduler = AdaptiveScheduler(state_path=str(path))
+    scheduler.save()
+    assert json.loads(path.read_text(encoding='utf-8')) == {'user-a': {'digest': 'd'}}
+
+
+def test_carry_over_reads_result_store(scheduler, tmp_path):
+    store = ResultStore(str(tmp_path / 'assignments.db'))
+    kept = {'course': '데이터구조', 'activity': '7주차 과제', 'url': 'https://ys.learnus.org/mod/assign/view.php?id=1'}
+    store.replace_user('user-a', [kept])
+    store.replace_user('user-b', [{'course': '운영체제', 'activity': '1주차 강의',
+                                   'url': 'https://ys.learnus.org/mod/vod/view.php?id=2'}])
+
+    carried = scheduler.carry_over([{'username': 'user-a'}], _user_key, store=store)
+    assert carried == [kept]
+    assert scheduler.carry_over([], _user_key, store=store) == []
+
+
+def test_due_date_extracted_from_course_page():
+    pytest.importorskip('bs4')
+    pytest.importorskip('requests')
+    from bs4 import BeautifulSoup
+    from http_lecture_extractor import extract_activity_due_date
+
+    with open(os.path.join(FIXTURE_DIR, 'course_201001.html'), encoding='utf-8') as f:
+        soup = BeautifulSoup(f.read(), 'html.parser')
+    vod = soup.select_one("li#module-20100170 a[href*='mod/vod/']")
+    assignment = soup.select_one("li#module-20100172 a[href*='mod/assign/']")
+    assert extract_activity_due_date(vod) == '2025-09-28 23:59:59'
+    assert extract_activity_due_date(assignment) is None
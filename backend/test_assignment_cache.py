@@ -0,0 +1,182 @@
+"""
+과제 조회 API 캐시 테스트
+- AssignmentCache의 TTL / STALE_TTL, stale-while-revalidate, 같은 키 재수집은 한 번만 (single-flight)
+- main._cached_assignment_response의 X-Cache 상태, 오래된 결과 응답 시 재수집 예약, ETag / If-None-Match 304
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from services.assignment_cache import AssignmentCache, compute_etag
+
+
+def _age(entry, seconds):
+    entry.stored_at = time.time() - seconds
+    return entry
+
+
+def test_ttl_and_stale_ttl():
+    cache = AssignmentCache(ttl=60, stale_ttl=600)
+    entry = cache.set('user', ['a'])
+    assert cache.get('user') is entry and not cache.needs_revalidation(entry)
+
+    _age(entry, 120)
+    assert cache.get('user') is entry and cache.needs_revalidation(entry)
+    assert cache.max_age(entry) == 0
+
+    _age(entry, 1200)
+    assert cache.get('user') is None
+    assert cache.stats == {'hits': 1, 'stale_hits': 1, 'misses': 1, 'revalidations': 0}
+
+
+def test_stale_entry_returned_while_revalidating_once():
+    cache = AssignmentCache(ttl=60, stale_ttl=600)
+    _age(cache.set('user', ['old']), 120)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ['new']
+
+    async def scenario():
+        for _ in range(3):
+            entry = cache.get('user')
+            assert entry.value == ['old']
+            if cache.needs_revalidation(entry):
+                cache.revalidate('user', loader)
+        assert cache.is_revalidating('user')
+        while cache.is_revalidating('user'):
+            await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+    assert cache.get('user').value == ['new']
+
+
+def test_concurrent_revalidate_shares_one_loader():
+    cache = AssignmentCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ['value']
+
+    async def scenario():
+        tasks = [cache.revalidate('user', loader) for _ in range(5)]
+        assert all(task is tasks[0] for task in tasks)
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(scenario()) == [['value']] * 5
+    assert len(calls) == 1 and cache.stats['revalidations'] == 1
+
+
+def test_failed_revalidation_keeps_previous_value():
+    cache = AssignmentCache(ttl=0)
+    cache.set('user', ['old'])
+
+    async def loader():
+        raise RuntimeError("수집 실패")
+
+    async def scenario():
+        return await cache.revalidate('user', loader)
+
+    assert asyncio.run(scenario()) is None
+    assert cache.get('user').value == ['old'] and not cache.is_revalidating('user')
+
+
+def test_etag_depends_on_payload_only():
+    assert compute_etag({'a': 1, 'b': 2}) == compute_etag({'b': 2, 'a': 1})
+    assert compute_etag({'a': 1}) != compute_etag({'a': 2})
+
+
+# ----------------------------------------------------------------------
+# main._cached_assignment_response
+# ----------------------------------------------------------------------
+
+@pytest.fixture
+def service():
+    pytest.importorskip('fastapi')
+    pytest.importorskip('selenium')
+    pytest.importorskip('webdriver_manager')
+    from services.school_automation import SchoolAutomationService
+
+    service = SchoolAutomationService()
+    service.current_university = '연세대학교'
+    service.current_student_id = '2020000000'
+    yield service
+    service.browser.shutdown()
+
+
+def _assignment(title):
+    from models.assignment import Assignment, AssignmentPriority, AssignmentStatus
+
+    now = datetime(2025, 10, 17, 12, 0)
+    return Assignment(id=title, title=title, description='', course_name='데이터구조', course_code='',
+                      due_date=now, created_at=now, updated_at=now,
+                      status=AssignmentStatus.PENDING, priority=AssignmentPriority.MEDIUM)
+
+
+def _request(if_none_match=None):
+    from starlette.requests import Request
+
+    headers = [(b'if-none-match', if_none_match.encode())] if if_none_match else []
+    return Request({'type': 'http', 'method': 'GET', 'path': '/assignments', 'headers': headers})
+
+
+def test_response_etag_and_not_modified(service):
+    from main import _cached_assignment_response
+
+    service.assignment_cache.set(service.cache_key, [_assignment('7주차 과제')])
+    response = _cached_assignment_response(_request(), service, 'assignments')
+    assert response.status_code == 200 and response.headers['X-Cache'] == 'HIT'
+    etag = response.headers['ETag']
+
+    response = _cached_assignment_response(_request(etag), service, 'assignments')
+    assert response.status_code == 304 and response.body == b''
+    assert response.headers['ETag'] == etag
+
+    # 결과가 바뀌면 같은 If-None-Match라도 본문 응답
+    service.assignment_cache.set(service.cache_key, [_assignment('8주차 과제')])
+    response = _cached_assignment_response(_request(etag), service, 'assignments')
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+
+
+def test_stale_response_schedules_one_fetch(service):
+    from main import _cached_assignment_response
+
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [_assignment('8주차 과제')]
+
+    service._fetch_assignments = fetch
+    service.is_logged_in = True
+    _age(service.assignment_cache.set(service.cache_key, [_assignment('7주차 과제')]), service.assignment_cache.ttl + 1)
+
+    async def scenario():
+        responses = [_cached_assignment_response(_request(), service, 'assignments') for _ in range(3)]
+        while service.assignment_cache.is_revalidating(service.cache_key):
+            await asyncio.sleep(0.01)
+        return responses, _cached_assignment_response(_request(), service, 'assignments')
+
+    stale, fresh = asyncio.run(scenario())
+    assert [r.headers['X-Cache'] for r in stale] == ['STALE'] * 3
+    assert all('7주차 과제'.encode() in r.body for r in stale)
+    assert len(calls) == 1
+    assert fresh.headers['X-Cache'] == 'HIT' and '8주차 과제'.encode() in fresh.body
+
+
+def test_miss_without_login_does_not_fetch(service):
+    from main import _cached_assignment_response
+
+    response = _cached_assignment_response(_request(), service, 'assignments')
+    assert response.status_code == 200 and response.headers['X-Cache'] == 'MISS'
+    assert response.headers['Cache-Control'] == 'private, max-age=0'
+    assert not service.assignment_cache.is_revalidating(service.cache_key)
@@ -0,0 +1,85 @@
+"""
+시간 예산 배치 자동화 테스트 (실제 수집 대신 iter_parallel_automation 교체)
+- 추정 소요 시간이 예산보다 긴 사용자도 계속 연기되지 않음
+- 체크포인트 이어서 실행 / 적응형 스케줄 갱신 대상은 다시 수집
+"""
+
+import pytest
+
+import parallel_automation
+from batch_automation_scheduler import BatchAutomationScheduler
+from result_store import user_key
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """실행된 사용자 이름 기록, 결과는 사용자마다 과제 하나"""
+    executed = []
+
+    def fake_iter(batch, max_workers=None):
+        for user in batch:
+            executed.append(user['username'])
+            yield user, [{'activity': f"{user['username']} 과제"}], None, 1.0
+
+    monkeypatch.setattr(parallel_automation, 'iter_parallel_automation', fake_iter)
+    return executed
+
+
+def _scheduler(tmp_path, minutes=10):
+    return BatchAutomationScheduler(max_runtime_minutes=minutes, batch_size=2,
+                                    checkpoint_path=str(tmp_path / 'checkpoint.json'),
+                                    cost_path=str(tmp_path / 'costs.json'))
+
+
+def _users(*names):
+    return [{'uid': f"uid_{name}", 'username': name} for name in names]
+
+
+def test_user_over_budget_runs_once_per_run(tmp_path, runs):
+    users = _users('slow', 'fast')
+    scheduler = _scheduler(tmp_path, minutes=1)
+    scheduler.costs = {user_key(users[0]): 3600, user_key(users[1]): 1}
+
+    result = scheduler.run_batch_automation(users)
+
+    # 예산보다 긴 사용자도 첫 배치에 포함 (오래 걸리는 사용자가 앞에 옴)
+    assert runs == ['slow', 'fast']
+    assert result['deferred_count'] == 0
+
+
+def test_deferred_over_budget_user_is_admitted(tmp_path, runs):
+    users = _users('slow', 'fast')
+    scheduler = _scheduler(tmp_path, minutes=1)
+    scheduler.costs = {user_key(users[0]): 3600, user_key(users[1]): 1}
+    scheduler.checkpoint['deferred'] = [user_key(users[0])]
+
+    result = scheduler.run_batch_automation(users)
+
+    assert 'slow' in runs
+    assert 'slow' not in result['deferred_users']
+
+
+def test_checkpoint_resumes_completed_users(tmp_path, runs):
+    users = _users('a', 'b')
+    scheduler = _scheduler(tmp_path)
+    scheduler.checkpoint['completed'][user_key(users[0])] = {
+        'username': 'a', 'assignments': [{'activity': '이전 결과'}], 'elapsed': 1.0, 'finished_at': 0}
+
+    result = scheduler.run_batch_automation(users)
+
+    assert runs == ['b']
+    assert result['resumed_users'] == 1
+    assert {'activity': '이전 결과'} in result['assignments']
+
+
+def test_due_users_are_not_served_from_checkpoint(tmp_path, runs):
+    users = _users('a', 'b')
+    scheduler = _scheduler(tmp_path)
+    scheduler.checkpoint['completed'][user_key(users[0])] = {
+        'username': 'a', 'assignments': [{'activity': '이전 결과'}], 'elapsed': 1.0, 'finished_at': 0}
+
+    result = scheduler.run_batch_automation(users, resume_completed=False)
+
+    assert sorted(runs) == ['a', 'b']
+    assert result['resumed_users'] == 0
+    assert {'activity': '이전 결과'} not in result['assignments']
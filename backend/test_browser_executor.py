@@ -0,0 +1,76 @@
+"""
+브라우저 실행기 테스트
+- 시간 초과/취소 시 on_abort 호출, 이벤트 루프는 막히지 않음
+- SchoolAutomationService._abort_browser가 떼어낸 드라이버를 별도 스레드에서 종료
+"""
+
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+pytest.importorskip('selenium')
+pytest.importorskip('webdriver_manager')
+
+from services.browser_executor import BrowserExecutor
+from services.school_automation import SchoolAutomationService
+
+
+def test_run_returns_result_on_browser_thread():
+    executor = BrowserExecutor("test")
+    try:
+        name = asyncio.run(executor.run(lambda: threading.current_thread().name, timeout=5))
+    finally:
+        executor.shutdown()
+    assert name.startswith("test")
+    assert executor.get_stats()['calls'] == 1
+
+
+def test_timeout_calls_on_abort():
+    aborted = threading.Event()
+    release = threading.Event()
+    executor = BrowserExecutor("test", on_abort=lambda: (aborted.set(), release.set()))
+
+    def stuck():
+        release.wait(5)
+
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(executor.run(stuck, timeout=0.05))
+    finally:
+        release.set()
+        executor.shutdown()
+    assert aborted.is_set()
+    assert executor.get_stats()['timeouts'] == 1
+
+
+def test_abort_browser_quits_detached_driver():
+    service = SchoolAutomationService()
+    driver = mock.Mock()
+    quit_called = threading.Event()
+    driver.quit.side_effect = lambda: quit_called.set()
+    service.driver = driver
+    service.is_logged_in = True
+    try:
+        service._abort_browser()
+        assert service.driver is None and not service.is_logged_in
+        assert quit_called.wait(5), "driver.quit()이 호출되지 않음"
+        driver.quit.assert_called_once_with()
+    finally:
+        service.browser.shutdown()
+
+
+def test_abort_browser_does_not_block_event_loop():
+    """quit이 오래 걸려도 _abort_browser는 바로 반환"""
+    service = SchoolAutomationService()
+    driver = mock.Mock()
+    driver.quit.side_effect = lambda: time.sleep(0.5)
+    service.driver = driver
+    try:
+        started = time.time()
+        service._abort_browser()
+        assert time.time() - started < 0.2
+    finally:
+        service.browser.shutdown()
@@ -0,0 +1,55 @@
+"""
+과목 변경 감지 테스트
+- Selenium(과목 페이지 URL)과 HTTP(과목 목록의 course_id)가 같은 과목 키를 쓰는지
+- 이번 실행에서 확인하지 않은 과목 / 활성 목록에서 빠진 사용자의 지문 삭제
+"""
+
+import os
+
+from change_detector import CourseFingerprintStore, course_key, prune_fingerprint_stores
+
+COURSE_URL = "https://ys.learnus.org/course/view.php?id=201001"
+
+
+def test_course_key_same_for_selenium_and_http():
+    assert course_key(COURSE_URL) == course_key(COURSE_URL, '201001') == "course:201001"
+    assert course_key("https://ys.learnus.org/course/view.php?section=0&id=201001") == "course:201001"
+    # ID가 없는 주소는 그대로 사용
+    assert course_key("과목 A") == "course:과목 A"
+
+
+def test_save_drops_courses_not_seen(tmp_path):
+    store = CourseFingerprintStore('연세대학교', 'user', cache_dir=str(tmp_path))
+    store.update(course_key(COURSE_URL), [{'activity': 'a'}], section_hash='h1')
+    store.update("course:201002", [{'activity': 'b'}], section_hash='h2')
+    store.save()
+
+    store = CourseFingerprintStore('연세대학교', 'user', cache_dir=str(tmp_path))
+    assert store.unchanged_activities(course_key(COURSE_URL), 'h1') == [{'activity': 'a'}]
+    store.save()
+
+    store = CourseFingerprintStore('연세대학교', 'user', cache_dir=str(tmp_path))
+    assert store.unchanged_activities("course:201002", 'h2') is None
+    assert store.unchanged_activities(course_key(COURSE_URL), 'h1') == [{'activity': 'a'}]
+
+
+def test_save_without_seen_courses_keeps_entries(tmp_path):
+    store = CourseFingerprintStore('연세대학교', 'user', cache_dir=str(tmp_path))
+    store.update("course:201002", [{'activity': 'b'}], section_hash='h2')
+    store.save()
+
+    CourseFingerprintStore('연세대학교', 'user', cache_dir=str(tmp_path)).save()
+
+    store = CourseFingerprintStore('연세대학교', 'user', cache_dir=str(tmp_path))
+    assert store.unchanged_activities("course:201002", 'h2') == [{'activity': 'b'}]
+
+
+def test_prune_removed_users(tmp_path):
+    for username in ('active', 'removed'):
+        store = CourseFingerprintStore('연세대학교', username, cache_dir=str(tmp_path))
+        store.update("course:1", [], section_hash='h')
+        store.save()
+    active = CourseFingerprintStore('연세대학교', 'active', cache_dir=str(tmp_path))
+
+    assert prune_fingerprint_stores([{'username': 'active'}], cache_dir=str(tmp_path)) == 1
+    assert os.listdir(tmp_path) == [os.path.basename(active.path)]
@@ -0,0 +1,124 @@
+"""
+Selenium / HTTP 수집 결과 비교 테스트
+- 같은 과목 페이지 HTML에서 두 수집기가 같은 활동 목록(타입/상태/마감/자리 표시 행)을 만드는지
+- Selenium 쪽은 드라이버 없이 page_source 이후 단계(extract_course_page_lectures)만 실행 (STATUS_CHECK_MODE=batch)
+"""
+
+import glob
+import os
+import re
+
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('requests')
+pytest.importorskip('selenium')
+
+from html_parsing import make_soup, COURSE_SECTIONS
+from http_lecture_extractor import HTTPLectureExtractor, NO_ACTIVITY, NO_SECTION_ACTIVITY
+from test_real_automation_hybrid import extract_course_page_lectures
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'learnus')
+COURSE_PAGES = sorted(glob.glob(os.path.join(FIXTURE_DIR, 'course_*.html')))
+BASE_URL = 'https://ys.learnus.org'
+
+# 주차 섹션은 있지만 활동 링크가 없는 과목 / 주차 섹션이 없는 과목
+EMPTY_SECTION_PAGE = """
+<html><body><ul class="topics">
+  <li class="section main" id="section-0"><h3 class="sectionname">강의 개요</h3></li>
+  <li class="section main" id="section-1"><h3 class="sectionname">1주차 [9월 1일 - 9월 7일]</h3></li>
+</ul></body></html>
+"""
+NO_SECTION_PAGE = """
+<html><body><div id="region-main"><p>등록된 강의가 없습니다.</p></div></body></html>
+"""
+# 토론/강의/페이지 활동
+EXTRA_TYPES_PAGE = """
+<html><body><ul class="topics">
+  <li class="section main" id="section-1"><h3 class="sectionname">1주차</h3>
+    <ul class="section img-text">
+      <li class="activity forum modtype_forum" id="module-3001"><a href="https://ys.learnus.org/mod/forum/view.php?id=3001">질문 게시판 토론</a></li>
+      <li class="activity lesson modtype_lesson" id="module-3002"><a href="https://ys.learnus.org/mod/lesson/view.php?id=3002">1주차 학습</a></li>
+      <li class="activity page modtype_page" id="module-3003"><a href="https://ys.learnus.org/mod/page/view.php?id=3003">강의 계획서</a></li>
+      <li class="activity vod modtype_vod" id="module-3004"><a href="https://ys.learnus.org/mod/vod/view.php?id=3004">1주차 강의 영상</a>
+        <span class="autocompletion"><img class="icon" title="완료하지 못함: 1주차 강의 영상" src="/i/completion-auto-n"></span></li>
+    </ul>
+  </li>
+</ul></body></html>
+"""
+
+# 활동이 아닌 링크 ('더보기'/'자세히'/'View more')만 있는 섹션과 실제 활동이 섞인 섹션
+MORE_LINKS_PAGE = """
+<html><body><ul class="topics">
+  <li class="section main" id="section-1"><h3 class="sectionname">1주차</h3>
+    <ul class="section img-text">
+      <li class="activity assign modtype_assign" id="module-4001"><a href="https://ys.learnus.org/mod/assign/view.php?id=4001">1주차 과제</a>
+        <span class="autocompletion"><img class="icon" title="완료함: 1주차 과제" src="/i/completion-auto-y"></span></li>
+    </ul>
+    <a href="https://ys.learnus.org/course/section.php?id=1">더보기</a>
+    <a href="https://ys.learnus.org/course/section.php?id=1&amp;detail=1">자세히</a>
+    <a href="https://ys.learnus.org/course/section.php?id=1&amp;all=1">View more</a>
+  </li>
+</ul></body></html>
+"""
+ONLY_MORE_LINKS_PAGE = """
+<html><body><ul class="topics">
+  <li class="section main" id="section-1"><h3 class="sectionname">1주차</h3>
+    <a href="https://ys.learnus.org/course/section.php?id=1">더보기</a>
+  </li>
+</ul></body></html>
+"""
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def selenium_lectures(html, course_name):
+    return extract_course_page_lectures(None, make_soup(html), course_name)
+
+
+def http_lectures(html, course_name, course_id='1'):
+    extractor = HTTPLectureExtractor(base_url=BASE_URL)
+    page = {'soup': make_soup(html, parse_only=COURSE_SECTIONS), 'not_modified': False,
+            'etag': None, 'last_modified': None}
+    course = {'name': course_name, 'url': f"{BASE_URL}/course/view.php?id={course_id}", 'course_id': course_id}
+    return extractor.extract_course_lectures(0, course, page, with_status=True)
+
+
+@pytest.mark.parametrize('path', COURSE_PAGES, ids=os.path.basename)
+def test_extractors_agree_on_fixture(path):
+    html = _read(path)
+    course_id = re.search(r'course_(\d+)\.html', path).group(1)
+    selenium_result = selenium_lectures(html, '과목')
+    assert selenium_result
+    assert http_lectures(html, '과목', course_id) == selenium_result
+
+
+@pytest.mark.parametrize('html, placeholder', [
+    (EMPTY_SECTION_PAGE, NO_ACTIVITY),
+    (NO_SECTION_PAGE, NO_SECTION_ACTIVITY),
+], ids=['no_activity', 'no_section'])
+def test_extractors_agree_on_placeholders(html, placeholder):
+    expected = [{'course': '과목', 'activity': placeholder, 'type': '정보 없음', 'url': ''}]
+    assert selenium_lectures(html, '과목') == expected
+    assert http_lectures(html, '과목') == expected
+
+
+def test_extractors_agree_on_extra_types():
+    selenium_result = selenium_lectures(EXTRA_TYPES_PAGE, '과목')
+    assert [(a['type'], a['status']) for a in selenium_result] == [
+        ('토론', '참여 가능'), ('강의', '학습 가능'), ('페이지', '접근 가능'), ('동영상', '❌ 해야 할 과제'),
+    ]
+    assert http_lectures(EXTRA_TYPES_PAGE, '과목') == selenium_result
+
+
+def test_extractors_skip_more_links():
+    selenium_result = selenium_lectures(MORE_LINKS_PAGE, '과목')
+    assert [(a['activity'], a['status']) for a in selenium_result] == [('1주차 과제', '✅ 완료')]
+    assert http_lectures(MORE_LINKS_PAGE, '과목') == selenium_result
+
+    expected = [{'course': '과목', 'activity': NO_ACTIVITY, 'type': '정보 없음', 'url': ''}]
+    assert selenium_lectures(ONLY_MORE_LINKS_PAGE, '과목') == expected
+    assert http_lectures(ONLY_MORE_LINKS_PAGE, '과목') == expected
@@ -0,0 +1,40 @@
+"""
+드라이버 풀 재생성 판단 테스트
+- 세션/연결 오류만 드라이버를 버리고, 페이지 오류(요소 없음/시간 초과)는 계속 사용
+"""
+
+import pytest
+
+pytest.importorskip('selenium')
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException, NoSuchElementException, NoSuchWindowException,
+    StaleElementReferenceException, TimeoutException, WebDriverException,
+)
+from urllib3.exceptions import MaxRetryError
+
+from driver_pool import is_session_error
+
+
+@pytest.mark.parametrize('error', [
+    InvalidSessionIdException("invalid session id"),
+    NoSuchWindowException("no such window: target window already closed"),
+    WebDriverException("chrome not reachable"),
+    WebDriverException("disconnected: not connected to DevTools"),
+    WebDriverException("unknown error: session deleted because of page crash"),
+    MaxRetryError(None, '/session/abc/url', "Connection refused"),
+    ConnectionRefusedError(111, "Connection refused"),
+], ids=lambda error: type(error).__name__)
+def test_session_errors_recycle_driver(error):
+    assert is_session_error(error)
+
+
+@pytest.mark.parametrize('error', [
+    NoSuchElementException("no such element: Unable to locate element"),
+    TimeoutException("timed out waiting for element"),
+    StaleElementReferenceException("stale element reference"),
+    WebDriverException("element click intercepted"),
+    ValueError("parse error"),
+], ids=lambda error: type(error).__name__)
+def test_page_errors_keep_driver(error):
+    assert not is_session_error(error)
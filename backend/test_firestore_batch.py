@@ -0,0 +1,150 @@
+"""
+Firestore 배치 쓰기 테스트 (Firestore 에뮬레이터 사용, FIRESTORE_EMULATOR_HOST 미설정 시 건너뜀)
+- FirestoreWriteBuffer가 batch_size 단위로 커밋하는지 (왕복 횟수 = 배치 수)
+- 마지막 사용 시간은 있는 문서만 수정 (삭제된 사용자 문서를 새로 만들지 않음)
+- 과제 upsert·삭제 / 실행 기록이 제대로 저장되는지
+- 사용자별 개별 update와 배치 커밋 소요 시간 비교
+
+사용법:
+    firebase emulators:start --only firestore   (또는 gcloud emulators firestore start --host-port=localhost:8080)
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python -m pytest test_firestore_batch.py
+"""
+
+import os
+import time
+import logging
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+EMULATOR_HOST = os.environ.get('FIRESTORE_EMULATOR_HOST')
+PROJECT_ID = os.environ.get('FIRESTORE_TEST_PROJECT', 'demo-univlabs')
+
+
+def _clear_emulator(requests):
+    """에뮬레이터 데이터 전체 삭제"""
+    url = f"http://{EMULATOR_HOST}/emulator/v1/projects/{PROJECT_ID}/databases/(default)/documents"
+    requests.delete(url, timeout=10).raise_for_status()
+
+
+@pytest.fixture
+def db():
+    """에뮬레이터에 연결된 Firestore 클라이언트 (인증 없음, 테스트마다 데이터 초기화)"""
+    if not EMULATOR_HOST:
+        pytest.skip("FIRESTORE_EMULATOR_HOST가 설정되지 않음 (예: localhost:8080)")
+    requests = pytest.importorskip('requests')
+    pytest.importorskip('firebase_admin')
+    firestore = pytest.importorskip('google.cloud.firestore')
+    from google.auth.credentials import AnonymousCredentials
+
+    _clear_emulator(requests)
+    yield firestore.Client(project=PROJECT_ID, credentials=AnonymousCredentials())
+    _clear_emulator(requests)
+
+
+def _seed_users(db, count):
+    """learnus_credentials 문서 생성 (update_last_used는 있는 문서만 수정)"""
+    uids = [f"user_{i:04d}" for i in range(count)]
+    for start in range(0, count, 500):
+        batch = db.batch()
+        for uid in uids[start:start + 500]:
+            batch.set(db.collection('learnus_credentials').document(uid), {'isActive': True, 'username': uid})
+        batch.commit()
+    return uids
+
+
+def test_last_used_batches(db):
+    """사용자 1200명 -> 500개씩 3배치"""
+    from firebase_service import FirestoreWriteBuffer
+
+    uids = _seed_users(db, 1200)
+    buffer = FirestoreWriteBuffer(db, batch_size=500)
+    for uid in uids:
+        buffer.update_last_used(uid)
+    stats = buffer.flush()
+
+    assert stats['batches'] == 3
+    assert stats['writes'] == len(uids)
+    assert stats['failed_batches'] == 0
+    docs = list(db.collection('learnus_credentials').stream())
+    assert len(docs) == len(uids)
+    assert all(doc.to_dict().get('lastUsedAt') for doc in docs), "lastUsedAt 누락"
+    logger.info(f"✅ 마지막 사용 시간: {len(uids)}명 -> 배치 {stats['batches']}개 ({stats['flush_seconds']:.2f}초)")
+
+
+def test_last_used_skips_deleted_users(db):
+    """없는 사용자가 섞여 있어도 나머지는 기록하고, 없는 문서는 만들지 않음"""
+    from firebase_service import FirestoreWriteBuffer
+
+    uids = _seed_users(db, 3)
+    buffer = FirestoreWriteBuffer(db)
+    for uid in uids + ['deleted_user']:
+        buffer.update_last_used(uid)
+    stats = buffer.flush()
+
+    assert stats['writes'] == len(uids)
+    assert stats['skipped_missing'] == 1
+    assert stats['failed_batches'] == 0
+    assert not db.collection('learnus_credentials').document('deleted_user').get().exists
+    assert all(db.collection('learnus_credentials').document(uid).get().to_dict().get('lastUsedAt') for uid in uids)
+
+
+def test_assignment_upsert(db):
+    """바뀐 과제만 쓰고 사라진 과제는 삭제"""
+    from firebase_service import FirestoreWriteBuffer, assignment_doc_id
+
+    first = [
+        ('과목 A', '101', {'activity': '1주차 강의', 'type': '동영상', 'status': '❌ 해야 할 과제'}),
+        ('과목 A', '102', {'activity': '1주차 과제', 'type': '과제', 'status': '❌ 해야 할 과제'}),
+        ('과목 B', 'name:abc', {'activity': '이번주 강의 활동 없음', 'type': '정보 없음'}),
+    ]
+    buffer = FirestoreWriteBuffer(db)
+    buffer.upsert_assignments('user_0001', first, [], total_count=3)
+    buffer.flush()
+
+    # 101 완료 처리, 102 삭제
+    buffer.upsert_assignments('user_0001', [('과목 A', '101', {**first[0][2], 'status': '✅ 완료'})],
+                              [('과목 A', '102')], total_count=2)
+    stats = buffer.flush()
+
+    user_ref = db.collection('learnus_assignments').document('user_0001')
+    items = {doc.id: doc.to_dict() for doc in user_ref.collection('items').stream()}
+    assert set(items) == {'101', assignment_doc_id('과목 B', 'name:abc')}
+    assert items['101']['status'] == '✅ 완료'
+    assert user_ref.get().to_dict()['itemCount'] == 2
+    assert stats['failed_batches'] == 0
+
+
+def test_run_log(db):
+    from firebase_service import FirestoreWriteBuffer
+
+    buffer = FirestoreWriteBuffer(db)
+    buffer.log_run({'assignments': [{'activity': 'x'}], 'total_count': 1, 'successful_users': 1,
+                    'driver_pool': {'hits': 1}})
+    buffer.flush()
+    runs = [doc.to_dict() for doc in db.collection('automation_runs').stream()]
+    assert len(runs) == 1
+    assert runs[0]['total_count'] == 1 and 'assignments' not in runs[0]
+
+
+def test_batched_vs_individual_round_trips(db):
+    """사용자별 update (기존 방식) vs 배치 커밋 - 배치는 한 번 왕복"""
+    from firebase_service import FirebaseService, FirestoreWriteBuffer
+
+    uids = _seed_users(db, 200)
+    buffer = FirestoreWriteBuffer(db)
+    started = time.time()
+    for uid in uids:
+        buffer.update_last_used(uid)
+    stats = buffer.flush()
+    batched = time.time() - started
+
+    service = FirebaseService(db=db)
+    started = time.time()
+    assert all(service.update_last_used_time(uid) for uid in uids)
+    individual = time.time() - started
+
+    assert stats['batches'] == 1
+    logger.info(f"📊 사용자 {len(uids)}명: 개별 update {individual:.2f}초 ({len(uids)}회 왕복) vs "
+                f"배치 {batched:.2f}초 ({stats['batches']}회 왕복)")
@@ -0,0 +1,32 @@
+"""
+html_parsing 단위 테스트
+- COURSE_SECTIONS로 부분 파싱해도 주차 섹션과 활동(module-id)이 전체 파싱과 같게 남는지
+"""
+
+import glob
+import os
+
+import pytest
+
+pytest.importorskip('bs4')
+
+from html_parsing import make_soup, COURSE_SECTIONS, _lxml_available
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'learnus')
+COURSE_PAGES = sorted(glob.glob(os.path.join(FIXTURE_DIR, 'course_*.html')))
+BACKENDS = ['html.parser'] + (['lxml'] if _lxml_available() else [])
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('path', COURSE_PAGES, ids=os.path.basename)
+def test_course_sections_strainer_keeps_sections(path, backend):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    full = make_soup(html, backend=backend)
+    partial = make_soup(html, parse_only=COURSE_SECTIONS, backend=backend)
+
+    full_sections = [li.get('id') for li in full.select('li.section')]
+    assert full_sections
+    assert [li.get('id') for li in partial.select('li.section')] == full_sections
+    assert ([li.get('id') for li in partial.select("li[id^='module-']")]
+            == [li.get('id') for li in full.select("li[id^='module-']")])
@@ -0,0 +1,158 @@
+"""
+SQLite 작업 큐 테스트
+- 중복 추가 방지, 우선순위 순서 대여
+- 완료 결과는 한 번만 수집
+- 실패 시 백오프 재시도, 최대 시도 후 데드레터
+- 대여 만료 회수, 오래된 완료 작업 정리
+"""
+
+import pytest
+
+import job_queue
+from job_queue import JobQueue, PENDING, LEASED, DONE, DEAD
+
+
+class FakeClock:
+    """job_queue 모듈의 time.time 대체 (백오프/대여 만료를 기다리지 않고 확인)"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(job_queue.time, 'time', fake.time)
+    return fake
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    q = JobQueue(str(tmp_path / 'queue.db'), encrypt_payloads=False)
+    yield q
+    q.close()
+
+
+def _status(queue, job_id):
+    return queue._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()['status']
+
+
+def test_enqueue_dedupes_pending_user(queue):
+    job_id = queue.enqueue('user_a', {'username': 'a'})
+    assert job_id is not None
+    assert queue.enqueue('user_a', {'username': 'a'}, priority=5) is None
+    assert queue.get_stats()[PENDING] == 1
+
+    # 중복 추가는 대기 중인 작업의 우선순위만 올림
+    job = queue.lease('w1')
+    assert job['id'] == job_id and job['priority'] == 5
+    assert job['payload'] == {'username': 'a'}
+
+
+def test_lease_orders_by_priority_then_age(queue, clock):
+    low = queue.enqueue('user_low', {})
+    clock.advance(1)
+    high = queue.enqueue('user_high', {}, priority=10)
+    clock.advance(1)
+    low_later = queue.enqueue('user_low_later', {})
+
+    assert [queue.lease('w1')['id'] for _ in range(3)] == [high, low, low_later]
+    assert queue.lease('w1') is None
+    assert queue.get_stats()[LEASED] == 3
+
+
+def test_complete_result_collected_once(queue):
+    job_id = queue.enqueue('user_a', {})
+    job = queue.lease('w1')
+    assert job['attempts'] == 1
+    assert queue.complete(job_id, 'w1', {'assignments': [{'activity': 'x'}]})
+
+    results = queue.collect_results()
+    assert [(r['id'], r['status'], r['result']) for r in results] == [
+        (job_id, DONE, {'assignments': [{'activity': 'x'}]})]
+    assert queue.collect_results() == []
+
+
+def test_complete_ignored_for_other_worker(queue):
+    job_id = queue.enqueue('user_a', {})
+    queue.lease('w1')
+    assert not queue.complete(job_id, 'w2', {})
+    assert _status(queue, job_id) == LEASED
+
+
+def test_fail_retries_after_backoff(queue, clock):
+    job_id = queue.enqueue('user_a', {}, max_attempts=3)
+    queue.lease('w1')
+    assert queue.fail(job_id, 'w1', '로그인 실패') == PENDING
+
+    # 백오프 동안은 대여되지 않음
+    assert queue.lease('w1') is None
+    clock.advance(job_queue.BACKOFF_BASE * 1.1 + 1)
+    job = queue.lease('w2')
+    assert job['id'] == job_id and job['attempts'] == 2
+    assert job['last_error'] == '로그인 실패'
+
+
+def test_fail_moves_to_dead_after_max_attempts(queue, clock):
+    job_id = queue.enqueue('user_a', {}, max_attempts=2)
+    queue.lease('w1')
+    assert queue.fail(job_id, 'w1', 'err 1') == PENDING
+    clock.advance(job_queue.BACKOFF_MAX * 1.1 + 1)
+    queue.lease('w1')
+    assert queue.fail(job_id, 'w1', 'err 2') == DEAD
+
+    assert queue.lease('w1') is None
+    assert [d['id'] for d in queue.dead_letters()] == [job_id]
+    # 데드레터도 결과로 한 번 보고됨
+    assert [(r['id'], r['status']) for r in queue.collect_results()] == [(job_id, DEAD)]
+
+    # 데드레터가 남아 있어도 같은 사용자 작업은 새로 추가 가능
+    assert queue.enqueue('user_a', {}) is not None
+    assert queue.requeue_dead(job_id)
+    assert _status(queue, job_id) == PENDING
+
+
+def test_expired_lease_is_reclaimed(queue, clock):
+    job_id = queue.enqueue('user_a', {}, max_attempts=2)
+    queue.lease('w1', visibility_timeout=60)
+    assert queue.heartbeat(job_id, 'w1', visibility_timeout=60)
+
+    clock.advance(61)
+    job = queue.lease('w2', visibility_timeout=60)
+    assert job['id'] == job_id and job['attempts'] == 2
+    # 회수된 작업은 이전 워커가 완료 보고할 수 없음
+    assert not queue.complete(job_id, 'w1', {})
+    assert not queue.heartbeat(job_id, 'w1')
+
+    # 최대 시도 후 만료되면 데드레터
+    clock.advance(61)
+    assert queue.lease('w3') is None
+    assert _status(queue, job_id) == DEAD
+
+
+def test_purge_removes_only_old_collected_done(queue, clock):
+    done_id = queue.enqueue('user_done', {})
+    queue.lease('w1')
+    queue.complete(done_id, 'w1', {})
+    uncollected_id = queue.enqueue('user_uncollected', {})
+    dead_id = queue.enqueue('user_dead', {}, max_attempts=1)
+    queue.collect_results()
+
+    queue.lease('w1')
+    queue.complete(uncollected_id, 'w1', {})
+    queue.lease('w1')
+    queue.fail(dead_id, 'w1', 'err')
+    pending_id = queue.enqueue('user_pending', {})
+
+    clock.advance(3600)
+    assert queue.purge(older_than_seconds=7200) == 0
+    assert queue.purge(older_than_seconds=1800) == 1
+
+    remaining = {row['id'] for row in queue._conn.execute("SELECT id FROM jobs")}
+    assert remaining == {uncollected_id, dead_id, pending_id}
@@ -13,6 +13,7 @@ import time
 import re
 import os
 from datetime import datetime
+from urllib.parse import urlparse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -22,6 +23,10 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException
 from bs4 import BeautifulSoup
 from selenium.webdriver.chrome.service import Service
+from page_waits import PageWaiter
+from pipeline_metrics import StageTimer
+from network_filter import configure_options, apply_network_filter
+from html_parsing import make_soup
 
 # 로깅 설정
 logging.basicConfig(
@@ -34,6 +39,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 로깅 설정 이후 import (status_optimizer의 basicConfig가 파일 로그 설정을 덮지 않도록)
+from status_optimizer import StatusOptimizer, lookup_completion_status, completion_xpaths
+from http_lecture_extractor import (
+    HTTPLectureExtractor, is_logged_in_page, collect_section_activities,
+    placeholder_activity, NO_SECTION_ACTIVITY, LEARNUS_BASE_URL,
+)
+from change_detector import course_key, get_fingerprint_store, section_fingerprint
+from driver_pool import is_session_error
+try:
+    from services.session_store import get_session_store, normalize_cookie
+except ImportError as e:
+    # cryptography 미설치 시 세션 캐시 없이 매번 로그인
+    logger.warning(f"⚠️ 세션 저장소 사용 불가: {e}")
+    get_session_store = None
+
+# 페이지 준비 판단용 선택자 (메인 페이지 과목 목록 / 과목 페이지 본문)
+COURSE_LIST_SELECTOR = ".course-title h3, .my-course-lists, a[href*='course/view.php']"
+COURSE_PAGE_SELECTOR = "li.section, .course-content, #region-main"
+
+# 사용자별 수집 방식
+# - selenium: 브라우저로 로그인 + 과목 페이지 순회 (기존 방식)
+# - hybrid: 브라우저는 SSO 로그인에만 사용하고 과목 페이지는 HTTP로 수집
+AUTOMATION_MODE = os.environ.get('AUTOMATION_MODE', 'selenium').lower()
+
+# 로그인 세션 쿠키를 암호화 저장하여 다음 실행에서 재사용 (SESSION_CACHE_TTL로 유효 시간 조절)
+SESSION_CACHE_ENABLED = os.environ.get('SESSION_CACHE_ENABLED', 'true').lower() == 'true'
+
+# 활동 완료 상태 확인 방식
+# - batch: 과목별로 활동을 모두 모은 뒤 페이지 스냅샷 한 번으로 상태 확인 (StatusOptimizer.batch_status_check)
+# - per_activity: 활동마다 드라이버로 완료 아이콘 XPath 조회 (기존 방식)
+STATUS_CHECK_MODE = os.environ.get('STATUS_CHECK_MODE', 'batch').lower()
+
+# 로그인/메인 페이지 복귀 확인용 LearnUs 호스트 (LEARNUS_BASE_URL로 mock 서버를 가리킬 수 있음)
+LEARNUS_HOST = urlparse(LEARNUS_BASE_URL).netloc
+
+# 방문한 페이지를 재현 서버(replay_server) 코퍼스로 저장할 디렉터리 (지정한 경우에만 저장, 기본 꺼짐)
+FIXTURE_RECORD_DIR = os.environ.get('LEARNUS_FIXTURE_RECORD_DIR', '')
+
+def record_page(url, html):
+    """FIXTURE_RECORD_DIR가 지정된 경우에만 페이지 저장 (replay_server는 이때만 import)"""
+    if not FIXTURE_RECORD_DIR:
+        return
+    from replay_server import record_fixture
+    record_fixture(url, html)
+
 def safe_mouse_move(driver, x_offset=0, y_offset=0):
     """안전한 마우스 이동 함수"""
     try:
@@ -56,8 +106,13 @@ def safe_mouse_move(driver, x_offset=0, y_offset=0):
         logger.debug(f"마우스 이동 실패 (무시): {e}")
         return False
 
-def check_completion_status_on_main_page(driver, activity_url):
-    """메인 페이지에서 특정 활동의 완료 상태 아이콘 확인"""
+def check_completion_status_on_main_page(driver, activity_url, completion_index=None):
+    """메인 페이지에서 특정 활동의 완료 상태 아이콘 확인
+
+    completion_index(build_completion_index 결과)가 주어지면 드라이버 호출 없이 인덱스에서 조회한다.
+    """
+    if completion_index is not None:
+        return lookup_completion_status(completion_index, activity_url)
     try:
         # 활동 URL에서 활동 ID 추출
         activity_id = None
@@ -70,14 +125,7 @@ def check_completion_status_on_main_page(driver, activity_url):
         # LearnUs 실제 구조: <li class="activity assign modtype_assign" id="module-4171524">
         # 그 안에 <span class="autocompletion"><img class="icon" title="완료하지 못함: ...">
 
-        # 완료된 상태 (완료함) - 파란색 체크마크
-        completion_selectors = [
-            f"//li[@id='module-{activity_id}']//span[@class='autocompletion']//img[@class='icon' and contains(@title, '완료함')]",
-            f"//li[@id='module-{activity_id}']//span[@class='autocompletion']//img[@class='icon' and contains(@alt, '완료함')]",
-            f"//li[@id='module-{activity_id}']//span[@class='autocompletion']//img[@class='icon' and contains(@src, 'completion-auto-y')]",
-            f"//li[contains(@class, 'activity') and contains(@id, 'module-{activity_id}')]//span[@class='autocompletion']//img[@class='icon' and contains(@title, '완료함')]",
-            f"//li[contains(@class, 'activity') and contains(@id, 'module-{activity_id}')]//span[@class='autocompletion']//img[@class='icon' and contains(@src, 'completion-auto-y')]",
-        ]
+        completion_selectors, incomplete_selectors = completion_xpaths(activity_id)
 
         for selector in completion_selectors:
             try:
@@ -88,14 +136,6 @@ def check_completion_status_on_main_page(driver, activity_url):
                 continue
 
         # 미완료 상태 (완료하지 못함) - 회색 원형 아이콘 ← **이것을 "해야 할 과제"로 인식**
-        incomplete_selectors = [
-            f"//li[@id='module-{activity_id}']//span[@class='autocompletion']//img[@class='icon' and contains(@title, '완료하지 못함')]",
-            f"//li[@id='module-{activity_id}']//span[@class='autocompletion']//img[@class='icon' and contains(@alt, '완료하지 못함')]",
-            f"//li[@id='module-{activity_id}']//span[@class='autocompletion']//img[@class='icon' and contains(@src, 'completion-auto-n')]",
-            f"//li[contains(@class, 'activity') and contains(@id, 'module-{activity_id}')]//span[@class='autocompletion']//img[@class='icon' and contains(@title, '완료하지 못함')]",
-            f"//li[contains(@class, 'activity') and contains(@id, 'module-{activity_id}')]//span[@class='autocompletion']//img[@class='icon' and contains(@src, 'completion-auto-n')]",
-        ]
-
         for selector in incomplete_selectors:
             try:
                 element = driver.find_element(By.XPATH, selector)
@@ -105,12 +145,30 @@ def check_completion_status_on_main_page(driver, activity_url):
                 continue
 
         # 완료 아이콘이 없는 경우
-            return "⏳ 대기 중"
+        return "⏳ 대기 중"
         
     except Exception as e:
         logger.debug(f"완료 상태 확인 실패: {e}")
         return "❓ 상태 확인 불가"
 
+def resolve_activity_statuses(driver, activities, page=None, mode=None):
+    """과목 페이지의 활동 상태를 한 번에 확인
+
+    activities는 같은 페이지의 활동 목록 (상태 확인이 필요한 것만). mode가 batch면 페이지 스냅샷
+    한 번으로, per_activity면 활동마다 XPath로 확인한다. 두 방식의 상태 문자열은 같다.
+    """
+    mode = (mode or STATUS_CHECK_MODE).lower()
+    if not activities:
+        return activities
+    if mode == 'per_activity':
+        for activity in activities:
+            try:
+                activity['status'] = check_completion_status_on_main_page(driver, activity['url'])
+            except Exception:
+                activity['status'] = "상태 확인 불가"
+        return activities
+    return StatusOptimizer(driver).batch_status_check(activities, page=page)
+
 def check_assignment_status(driver, assignment_url):
     """과제 완료 상태 확인 (빠른 확인)"""
     try:
@@ -275,10 +333,12 @@ def setup_driver():
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--disable-extensions")
             chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument("--disable-images")
             chrome_options.add_argument("--disable-web-security")
             chrome_options.add_argument("--allow-running-insecure-content")
             chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+            # 네트워크 유휴 대기를 위한 CDP Network 이벤트 로그
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
             
             # Linux 환경 Chrome 경로
             chrome_options.binary_location = '/usr/bin/chromium'
@@ -304,21 +364,28 @@ def setup_driver():
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--disable-extensions")
             chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument("--disable-images")
             chrome_options.add_argument("--disable-web-security")
             chrome_options.add_argument("--allow-running-insecure-content")
             chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+            # 네트워크 유휴 대기를 위한 CDP Network 이벤트 로그
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
             chrome_options.add_argument("--remote-debugging-port=9222")
             
             # Windows 환경 Chrome 경로
             chrome_options.binary_location = 'C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe'
             service = Service('C:\\Users\\jaemd\\chromedriver-win64\\chromedriver.exe')
         
+        # 이미지 로딩 끄기 (--disable-images는 최신 Chromium에서 무시됨)
+        configure_options(chrome_options)
         driver = webdriver.Chrome(options=chrome_options)
         
         # 자동화 감지 방지
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
+        # 이미지/폰트/동영상/분석 스크립트 요청 차단 (CDP)
+        apply_network_filter(driver)
+        
         logger.info("✅ Chrome 드라이버 초기화 완료")
         return driver
         
@@ -326,8 +393,9 @@ def setup_driver():
         logger.error(f"❌ Chrome 드라이버 설정 실패: {e}")
         return None
 
-def login_to_learnus(driver, username, password):
+def login_to_learnus(driver, username, password, waiter=None):
     """LearnUs 로그인 함수"""
+    waiter = waiter or PageWaiter(driver)
     try:
         logger.info("🔐 [LOGIN] LearnUs 로그인 시작...")
         logger.info(f"   사용자명: {username}")
@@ -362,8 +430,8 @@ def login_to_learnus(driver, username, password):
         
         # 로그인 버튼 클릭
         logger.info("🖱️ [LOGIN] 로그인 버튼 클릭...")
-        login_button.click()
-        time.sleep(3)
+        waiter.navigation("login_page", login_button.click,
+                          css_selector="input[type='password']", legacy_sleep=3)
         
         # 로그인 페이지에서 사용자명/비밀번호 입력
         logger.info("📝 [LOGIN] 로그인 정보 입력 중...")
@@ -414,11 +482,9 @@ def login_to_learnus(driver, username, password):
         # 로그인 정보 입력
         username_field.clear()
         username_field.send_keys(username)
-        time.sleep(1)
         
         password_field.clear()
         password_field.send_keys(password)
-        time.sleep(1)
         
         # 로그인 버튼 클릭 또는 Enter 키
         try:
@@ -431,7 +497,11 @@ def login_to_learnus(driver, username, password):
             submit_button.click()
             logger.info("🖱️ [LOGIN] 로그인 버튼 클릭...")
         
-        time.sleep(5)
+        # SSO 리다이렉트가 끝나 LearnUs로 돌아올 때까지 대기
+        waiter.url_matches("login_redirect",
+                           lambda url: LEARNUS_HOST in url and "login" not in url.lower(),
+                           legacy_sleep=5)
+        waiter.dom_ready("login_landing")
         
         # 로그인 성공 확인
         logger.info("🔍 [LOGIN] 로그인 성공 확인 중...")
@@ -442,7 +512,7 @@ def login_to_learnus(driver, username, password):
         logger.info(f"📄 [LOGIN] 로그인 후 제목: {page_title}")
         
         # 로그인 성공 여부 확인
-        if "learnus.org" in current_url and "로그인" not in page_title:
+        if LEARNUS_HOST in current_url and "로그인" not in page_title:
             logger.info("✅ [LOGIN] 로그인 성공!")
             return True
         else:
@@ -453,8 +523,76 @@ def login_to_learnus(driver, username, password):
         logger.error(f"❌ [LOGIN] 로그인 중 오류 발생: {str(e)}")
         return False
 
-def test_direct_selenium(university, username, password, student_id):
-    """직접 Selenium 로그인 테스트 (기존 코드의 검증된 로직)"""
+def _get_session_store():
+    """세션 캐시 저장소 (비활성화/사용 불가 시 None)"""
+    if not SESSION_CACHE_ENABLED or get_session_store is None:
+        return None
+    return get_session_store()
+
+def export_driver_cookies(driver):
+    """브라우저의 전체 쿠키 조회 (SSO 도메인 포함)"""
+    try:
+        return driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+    except WebDriverException:
+        return driver.get_cookies()
+
+def restore_driver_session(driver, waiter, university, username):
+    """저장된 세션 쿠키를 브라우저에 주입하고 로그인 상태가 유지되는지 확인"""
+    session_store = _get_session_store()
+    if not session_store:
+        return False
+    cookies = session_store.load(university, username)
+    if not cookies:
+        return False
+    
+    try:
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': [normalize_cookie(c) for c in cookies]})
+        driver.get(f"{LEARNUS_BASE_URL}/")
+        waiter.dom_ready("session_restore")
+        if "login" not in driver.current_url.lower() and is_logged_in_page(driver.page_source):
+            logger.info(f"♻️ [SESSION] 저장된 세션 재사용, 로그인 생략: {username}")
+            return True
+        logger.info(f"⌛ [SESSION] 저장된 세션이 만료됨, 다시 로그인: {username}")
+    except WebDriverException as e:
+        logger.warning(f"⚠️ [SESSION] 세션 쿠키 주입 실패: {e}")
+    
+    session_store.invalidate(university, username)
+    try:
+        driver.delete_all_cookies()
+    except WebDriverException:
+        pass
+    return False
+
+def save_driver_session(driver, university, username):
+    """로그인된 브라우저의 세션 쿠키 저장"""
+    session_store = _get_session_store()
+    if session_store:
+        try:
+            session_store.save(university, username, export_driver_cookies(driver))
+        except WebDriverException as e:
+            logger.warning(f"⚠️ [SESSION] 세션 쿠키 조회 실패: {e}")
+
+def _collect_logged_in(driver, waiter, university, username, session_reused, timer=None):
+    """로그인된 브라우저에서 수집 후 세션 저장 및 보고 정보 추가"""
+    save_driver_session(driver, university, username)
+    fingerprints = get_fingerprint_store(university, username)
+    result = collect_this_week_lectures_hybrid(driver, waiter=waiter, fingerprints=fingerprints, timer=timer)
+    if isinstance(result, dict):
+        result['wait_report'] = waiter.get_report()
+        result['session_reused'] = session_reused
+        if timer:
+            result['stage_timings'] = timer.get_report()
+        if fingerprints and result.get('success'):
+            result['changes'] = fingerprints.log_summary(username)
+            fingerprints.save()
+    return result or True
+
+def test_direct_selenium(university, username, password, student_id, driver_pool=None):
+    """직접 Selenium 로그인 테스트 (기존 코드의 검증된 로직)
+
+    driver_pool이 주어지면 새 브라우저를 띄우는 대신 풀에서 드라이버를 대여한다.
+    로그인 성공 시 collect_this_week_lectures_hybrid의 수집 결과를, 실패 시 False를 반환한다.
+    """
     logger.info("🚀 [AUTOMATION] 직접 Selenium 테스트 시작")
     logger.info(f"   대학교: {university}")
     logger.info(f"   사용자명: {username}")
@@ -465,25 +603,39 @@ def test_direct_selenium(university, username, password, student_id):
     logger.info(f"   CHROMEDRIVER_PATH: {os.environ.get('CHROMEDRIVER_PATH', 'Not set')}")
     
     driver = None
+    driver_broken = False
+    waiter = None
+    timer = StageTimer(username)
+    outcome = 'failed'
     try:
         logger.info("🔧 [AUTOMATION] Chrome 드라이버 설정 시작...")
-        driver = setup_driver()
+        with timer.span('driver_start'):
+            if driver_pool:
+                driver = driver_pool.acquire()
+            else:
+                driver = setup_driver()
         if not driver:
             logger.error("❌ [AUTOMATION] Chrome 드라이버 설정 실패")
             return False
         logger.info("✅ [AUTOMATION] Chrome 드라이버 설정 완료")
+        waiter = PageWaiter(driver)
+        
+        # 저장된 세션이 살아 있으면 SSO 로그인 생략
+        with timer.span('session_restore'):
+            restored = restore_driver_session(driver, waiter, university, username)
+        if restored:
+            outcome = 'success'
+            return _collect_logged_in(driver, waiter, university, username, session_reused=True, timer=timer)
         
+        main_page_span = timer.span('main_page')
         logger.info("🌐 [AUTOMATION] LearnUs 메인 페이지 접속 시작...")
-        driver.get("https://ys.learnus.org/")
+        driver.get(f"{LEARNUS_BASE_URL}/")
         logger.info("✅ [AUTOMATION] LearnUs 메인 페이지 접속 완료")
-        time.sleep(2)
         
+        # 페이지 로딩 확인 (고정 대기 대신 DOM 완료 + 네트워크 유휴)
         logger.info("⏳ [AUTOMATION] 페이지 로딩 대기 중...")
-        time.sleep(2)
-        
-        # 페이지 로딩 확인 (마우스 이동 제거)
-        logger.info("📄 [AUTOMATION] 페이지 로딩 확인 중...")
-        time.sleep(1)
+        waiter.dom_ready("main_page", legacy_sleep=4)
+        waiter.network_idle("main_page_network", timeout=3, legacy_sleep=1)
         
         logger.info(f"📍 [AUTOMATION] 현재 URL: {driver.current_url}")
         logger.info(f"📄 [AUTOMATION] 페이지 제목: {driver.title}")
@@ -493,8 +645,10 @@ def test_direct_selenium(university, username, password, student_id):
         with open('debug_page_source.html', 'w', encoding='utf-8') as f:
             f.write(driver.page_source)
         logger.info("✅ [AUTOMATION] 페이지 소스 저장 완료: debug_page_source.html")
+        main_page_span.stop()
         
         # 연세포털 로그인 버튼 찾기 (기존 코드의 검증된 로직)
+        sso_login_span = timer.span('sso_login')
         login_button = None
         login_selectors = [
             "a.btn.btn-sso",
@@ -525,21 +679,16 @@ def test_direct_selenium(university, username, password, student_id):
         
         if login_button:
             logger.info("🖱️ 연세포털 로그인 버튼 클릭...")
-            login_button.click()
-            time.sleep(2)
+            waiter.navigation("login_page", login_button.click,
+                              css_selector="input[type='password']", legacy_sleep=3)
             logger.info(f"📍 클릭 후 URL: {driver.current_url}")
-            
-            # 로그인 페이지 로딩 확인
-            logger.info("📄 로그인 페이지 로딩 확인...")
-            time.sleep(1)
         else:
             logger.info("로그인 버튼을 찾을 수 없음, 직접 로그인 페이지 접속")
-            driver.get("https://ys.learnus.org/passni/sso/spLogin2.php")
-            time.sleep(2)
+            driver.get(f"{LEARNUS_BASE_URL}/passni/sso/spLogin2.php")
             
             # 로그인 페이지 로딩 확인
             logger.info("📄 로그인 페이지 로딩 확인...")
-            time.sleep(1)
+            waiter.selector("login_page", "input[type='password']", legacy_sleep=3)
         
         # 사용자명 필드 찾기 (기존 코드의 검증된 로직)
         username_field = None
@@ -603,11 +752,9 @@ def test_direct_selenium(university, username, password, student_id):
         
         username_field.clear()
         username_field.send_keys(username)
-        time.sleep(0.5)
         
         password_field.clear()
         password_field.send_keys(password)
-        time.sleep(0.5)
         
         # 로그인 버튼 찾기 및 클릭 (기존 코드의 검증된 로직)
         login_submit_button = None
@@ -642,11 +789,13 @@ def test_direct_selenium(university, username, password, student_id):
             logger.info("⌨️ Enter 키로 로그인 시도...")
             password_field.send_keys("\n")
         
-        time.sleep(3)
-        
-        # 로그인 후 페이지 로딩 확인
+        # 로그인 후 페이지 로딩 확인 (SSO 리다이렉트가 끝나 LearnUs로 돌아올 때까지)
         logger.info("📄 로그인 후 페이지 로딩 확인...")
-        time.sleep(2)
+        waiter.url_matches("login_redirect",
+                           lambda url: LEARNUS_HOST in url and "login" not in url.lower(),
+                           legacy_sleep=5)
+        waiter.dom_ready("login_landing")
+        sso_login_span.stop()
         
         # 로그인 성공 확인
         current_url = driver.current_url
@@ -654,30 +803,285 @@ def test_direct_selenium(university, username, password, student_id):
         logger.info(f"📍 로그인 후 URL: {current_url}")
         logger.info(f"📄 로그인 후 페이지 제목: {page_title}")
         
-        if "ys.learnus.org" in current_url and "login" not in current_url.lower():
+        if LEARNUS_HOST in current_url and "login" not in current_url.lower():
             logger.info("✅ 로그인 성공!")
             
             # 이번주 강의 정보 수집 (혼합 로직)
-            collect_this_week_lectures_hybrid(driver)
-            return True
+            # 수집 결과(lectures 포함 딕셔너리)를 그대로 반환하여 스케줄러가 사용자별 결과를 받을 수 있게 함
+            outcome = 'success'
+            return _collect_logged_in(driver, waiter, university, username, session_reused=False, timer=timer)
         else:
             logger.error("❌ 로그인 실패")
             return False
             
     except Exception as e:
         logger.error(f"❌ Selenium 로그인 오류: {e}")
+        # 세션/연결 오류일 때만 드라이버 재생성 (요소 없음/시간 초과는 다음 사용자에게 재사용)
+        driver_broken = is_session_error(e)
         return False
     finally:
+        if waiter:
+            # 사용자별 순수 대기 시간 보고
+            waiter.log_report(username)
+        # 단계별 소요 시간 보고 (이 프로세스의 /metrics 집계에 반영)
+        timer.finish(outcome, username)
+        if driver:
+            if driver_pool:
+                logger.info("🔁 Chrome 드라이버 풀에 반납")
+                driver_pool.release(driver, broken=driver_broken)
+            else:
+                logger.info("🔚 Chrome 드라이버 종료")
+                driver.quit()
+
+def test_hybrid_http(university, username, password, student_id, driver_pool=None):
+    """브라우저로 SSO 로그인 후 쿠키를 HTTP 세션으로 넘겨 과목 페이지를 수집
+
+    저장된 세션이 아직 유효하면 브라우저를 띄우지 않는다. 브라우저를 쓴 경우에도
+    로그인 직후 반납/종료하고, 이후 수집은 HTTPLectureExtractor가 담당한다.
+    성공 시 collect_this_week_lectures_hybrid와 같은 형태의 딕셔너리, 실패 시 False를 반환한다.
+    """
+    logger.info("🚀 [HYBRID] 브라우저 로그인 + HTTP 수집 시작")
+    logger.info(f"   대학교: {university}")
+    logger.info(f"   사용자명: {username}")
+    logger.info(f"   학번: {student_id}")
+    
+    timer = StageTimer(username)
+    extractor = HTTPLectureExtractor(timer=timer)
+    wait_report = None
+    session_store = _get_session_store()
+    session_reused = False
+    
+    # 저장된 세션 쿠키가 살아 있으면 SSO 로그인 생략
+    cookies = session_store.load(university, username) if session_store else None
+    if cookies:
+        extractor.load_cookies(cookies)
+        with timer.span('session_restore'):
+            session_valid = extractor.is_session_valid()
+        if session_valid:
+            session_reused = True
+            logger.info(f"♻️ [HYBRID] 저장된 세션 재사용, 로그인 생략: {username}")
+        else:
+            logger.info(f"⌛ [HYBRID] 저장된 세션이 만료됨, 다시 로그인: {username}")
+            session_store.invalidate(university, username)
+            extractor = HTTPLectureExtractor(timer=timer)
+    
+    if not session_reused:
+        wait_report = _browser_login_for_http(extractor, username, password, driver_pool, timer=timer)
+        if wait_report is None:
+            timer.finish('failed', username)
+            return False
+    
+    fingerprints = get_fingerprint_store(university, username)
+    lectures = extractor.extract_all_lectures(max_courses=None, with_status=True, fingerprints=fingerprints)
+    logger.info(f"✅ [HYBRID] HTTP 수집 완료: {len(lectures)}개 활동")
+    changes = None
+    if fingerprints:
+        changes = fingerprints.log_summary(username)
+        fingerprints.save()
+    
+    if session_store:
+        session_store.save(university, username, extractor.export_cookies())
+    
+    return {
+        "lectures": lectures,
+        "count": len(lectures),
+        "success": True,
+        "message": f"{len(lectures)}개 활동 수집 완료 (hybrid)",
+        "wait_report": wait_report,
+        "session_reused": session_reused,
+        "changes": changes,
+        "stage_timings": timer.finish('success', username)
+    }
+
+def _browser_login_for_http(extractor, username, password, driver_pool=None, timer=None):
+    """브라우저로 로그인하고 쿠키를 extractor로 복사 (성공 시 대기 보고서, 실패 시 None)"""
+    driver = None
+    driver_broken = False
+    waiter = None
+    timer = timer or StageTimer(username)
+    try:
+        with timer.span('driver_start'):
+            if driver_pool:
+                driver = driver_pool.acquire()
+            else:
+                driver = setup_driver()
+        if not driver:
+            logger.error("❌ [HYBRID] Chrome 드라이버 설정 실패")
+            return None
+        waiter = PageWaiter(driver)
+        
+        with timer.span('main_page'):
+            driver.get(f"{LEARNUS_BASE_URL}/")
+            waiter.dom_ready("main_page")
+        
+        with timer.span('sso_login'):
+            logged_in = login_to_learnus(driver, username, password, waiter=waiter)
+        if not logged_in:
+            return None
+        
+        if not extractor.import_cookies_from_driver(driver):
+            logger.error("❌ [HYBRID] 로그인 쿠키를 가져오지 못했습니다")
+            return None
+        
+        return waiter.get_report()
+            
+    except Exception as e:
+        logger.error(f"❌ [HYBRID] 로그인 오류: {e}")
+        driver_broken = is_session_error(e)
+        return None
+    finally:
+        if waiter:
+            waiter.log_report(username)
+        # 로그인이 끝나면 바로 브라우저 반납 (이후 수집은 HTTP)
         if driver:
-            time.sleep(2)
-            logger.info("🔚 Chrome 드라이버 종료")
-            driver.quit()
+            if driver_pool:
+                driver_pool.release(driver, broken=driver_broken)
+            else:
+                driver.quit()
+            logger.info("🔁 [HYBRID] 로그인 완료, 브라우저 반납")
+
+def run_automation_for_user(university, username, password, student_id, driver_pool=None, mode=None):
+    """AUTOMATION_MODE에 따라 사용자 한 명의 수집 실행"""
+    mode = (mode or AUTOMATION_MODE).lower()
+    if mode == 'hybrid':
+        return test_hybrid_http(university, username, password, student_id, driver_pool=driver_pool)
+    return test_direct_selenium(university, username, password, student_id, driver_pool=driver_pool)
 
-def collect_this_week_lectures_hybrid(driver):
-    """혼합 로직으로 이번주 강의 정보 수집"""
+def find_this_week_section_in_soup(current_soup):
+    """과목 페이지에서 '이번주 강의' 섹션 찾기 (5단계 강화된 로직, 못 찾으면 None)"""
+    this_week_section = None
+
+    # 1단계: 다양한 선택자로 섹션 찾기
+    section_selectors = [
+        'li.section.main',
+        'div.section',
+        'div[class*="section"]',
+        'li[class*="section"]'
+    ]
+
+    for selector in section_selectors:
+        sections = current_soup.select(selector)
+        for section in sections:
+            section_text = section.get_text().lower()
+            # 더 다양한 키워드로 검색 (주제별 학습활동 포함)
+            if any(keyword in section_text for keyword in [
+                "이번주 강의", "이번주", "current week", "current week course",
+                "이번주강의", "current week lecture", "week", "주차",
+                "이번 주", "현재 주", "current", "강의", "주제별 학습활동", "주제별학습활동"
+            ]):
+                # "강의 개요"는 제외
+                if "개요" not in section_text and "overview" not in section_text:
+                    this_week_section = section
+                    logger.info(f"   ✅ '이번주 강의' 섹션 발견: {section_text[:50]}...")
+                    break
+        if this_week_section:
+            break
+
+    # 2단계: 정확한 키워드로 찾지 못함, 두 번째 섹션을 '이번주 강의'로 시도
+    if not this_week_section:
+        logger.info(f"   🔍 정확한 키워드로 찾지 못함, 두 번째 섹션을 '이번주 강의'로 시도")
+        for selector in section_selectors:
+            sections = current_soup.select(selector)
+            if len(sections) > 1:  # 두 번째 섹션이 있는 경우
+                this_week_section = sections[1]  # 두 번째 섹션 사용
+                logger.info(f"   ✅ 두 번째 섹션을 '이번주 강의'로 설정")
+                break
+
+    # 3단계: 여전히 없으면 첫 번째 섹션 사용 (최후의 수단)
+    if not this_week_section:
+        logger.info(f"   🔍 두 번째 섹션도 없음, 첫 번째 섹션을 '이번주 강의'로 간주")
+        for selector in section_selectors:
+            sections = current_soup.select(selector)
+            if sections:
+                this_week_section = sections[0]  # 첫 번째 섹션 사용
+                logger.info(f"   ✅ 첫 번째 섹션을 '이번주 강의'로 설정")
+                break
+
+    # 4단계: 링크가 있는 섹션 찾기
+    if not this_week_section:
+        logger.info(f"   🔍 링크가 있는 섹션을 '이번주 강의'로 시도")
+        for selector in section_selectors:
+            sections = current_soup.select(selector)
+            for section in sections:
+                links = section.find_all('a', href=True)
+                if links:
+                    this_week_section = section
+                    logger.info(f"   ✅ 링크가 있는 섹션을 '이번주 강의'로 설정")
+                    break
+            if this_week_section:
+                break
+
+    # 5단계: 최후의 수단 - 모든 링크에서 부모 섹션 찾기
+    if not this_week_section:
+        logger.info(f"   🔍 최후의 수단: 모든 링크에서 부모 섹션 찾기")
+        all_links = current_soup.find_all('a', href=True)
+        for link in all_links:
+            parent_li = link.find_parent('li', class_=lambda x: x and 'section' in x)
+            if parent_li:
+                this_week_section = parent_li
+                logger.info(f"   ✅ 링크의 부모 섹션을 '이번주 강의'로 설정")
+                break
+            parent_div = link.find_parent('div', class_=lambda x: x and 'section' in x)
+            if parent_div:
+                this_week_section = parent_div
+                logger.info(f"   ✅ 링크의 부모 섹션을 '이번주 강의'로 설정")
+                break
+
+    return this_week_section
+
+def extract_course_page_lectures(driver, current_soup, course_name, fingerprints=None, timer=None, course_url=None):
+    """과목 페이지 스냅샷 하나에서 이번주 강의 활동 추출 (완료 상태 포함)
+
+    드라이버는 STATUS_CHECK_MODE=per_activity일 때만 사용한다 (batch는 스냅샷에서 판별).
+    활동 목록/자리 표시 행은 HTTP 수집기와 같은 함수로 만든다.
+    course_url(과목 페이지 주소)은 변경 감지 키로 사용 (HTTP 수집과 같은 과목 ID 기준)
+    """
+    timer = timer or StageTimer(course_name)
+    this_week_section = find_this_week_section_in_soup(current_soup)
+    fingerprint_key = course_key(course_url or course_name)
+    
+    # 섹션 HTML이 지난 실행과 같으면 이전 결과 사용 (활동 분석 생략)
+    section_hash = None
+    if this_week_section and fingerprints:
+        section_hash = section_fingerprint(this_week_section)
+        cached_activities = fingerprints.unchanged_activities(fingerprint_key, section_hash)
+        if cached_activities is not None:
+            logger.info(f"   ⏭️ {course_name}: 이번주 강의 변경 없음, 이전 결과 {len(cached_activities)}개 사용")
+            return cached_activities
+    
+    if this_week_section:
+        logger.info(f"   ✅ {course_name}에서 '이번주 강의' 섹션 발견")
+        # 1) 활동을 모두 모으고 2) 완료 상태는 페이지 단위로 한 번에 확인
+        course_activities, pending_status = collect_section_activities(this_week_section, course_name)
+        # 과제/동영상/퀴즈 완료 상태 (과목 페이지 스냅샷 재사용)
+        with timer.span('status_check'):
+            resolve_activity_statuses(driver, pending_status, page=current_soup)
+    else:
+        logger.info(f"   📭 {course_name}: '이번주 강의' 섹션 없음, 과목명만 기록")
+        course_activities = [placeholder_activity(course_name, NO_SECTION_ACTIVITY)]
+    
+    if fingerprints:
+        fingerprints.update(fingerprint_key, course_activities, section_hash=section_hash)
+    return course_activities
+
+def collect_this_week_lectures_hybrid(driver, waiter=None, fingerprints=None, timer=None):
+    """혼합 로직으로 이번주 강의 정보 수집
+
+    fingerprints(CourseFingerprintStore)가 주어지면 '이번주 강의' 섹션이 바뀌지 않은 과목은
+    이전 수집 결과를 재사용한다. timer(StageTimer)에는 과목 목록/과목 이동/페이지 분석/
+    완료 상태 확인/메인 복귀 단계별 소요 시간을 기록한다 (course_parse는 status_check 포함).
+    """
+    waiter = waiter or PageWaiter(driver)
+    timer = timer or StageTimer()
     try:
         logger.info("🔍 이번주 강의 정보 수집 시작...")
         
+        # 과목 목록이 렌더링될 때까지 대기
+        course_list_span = timer.span('course_list')
+        waiter.selector("course_list", COURSE_LIST_SELECTOR, timeout=5)
+        if FIXTURE_RECORD_DIR:
+            record_page(driver.current_url, driver.page_source)
+        
         # 실제 페이지 구조에 맞는 과목 찾기
         course_elements = []
         
@@ -747,10 +1151,7 @@ def collect_this_week_lectures_hybrid(driver):
                     break
                 else:
                     logger.info(f"❌ {selector} 선택자로 과목을 찾지 못함")
-        
-        # 과목 목록 로딩 확인
-        logger.info("📄 과목 목록 로딩 확인 중...")
-        time.sleep(1)
+        course_list_span.stop()
         
         all_lectures = []
         processed_courses = set()  # 중복 방지
@@ -808,11 +1209,8 @@ def collect_this_week_lectures_hybrid(driver):
                 logger.info(f"   ✅ 과목 {i+1}: '{course_name}' 처리 시작 (총 {len(processed_courses)}개 처리됨)")
                 
                 # Selenium으로 과목 클릭 (기존 코드의 간단한 로직)
+                navigation_span = timer.span('course_navigation')
                 try:
-                    # 과목 클릭 전 로딩 확인
-                    logger.info(f"   📄 {course_name} 과목 클릭 전 로딩 확인...")
-                    time.sleep(0.5)
-                    
                     # 정확한 선택자로 과목 요소 찾기
                     logger.info(f"   🔍 {course_name} 과목 요소 찾기 시작...")
                     selenium_course_element = None
@@ -898,208 +1296,37 @@ def collect_this_week_lectures_hybrid(driver):
                             logger.info(f"   ❌ h3 요소 검색 실패: {e}")
                         continue
                     
-                    # 과목 클릭
-                    selenium_course_element.click()
-                    time.sleep(0.5)  # 페이지 로딩 대기
+                    # 과목 클릭 후 과목 페이지 본문이 준비될 때까지 대기
+                    waiter.navigation(f"course_page:{course_name}", selenium_course_element.click,
+                                      css_selector=COURSE_PAGE_SELECTOR, legacy_sleep=1.5)
+                    navigation_span.stop()
                     logger.info(f"   ✅ {course_name} 과목 페이지 진입")
                     
-                    # 과목 페이지 로딩 확인
-                    logger.info(f"   📄 {course_name} 과목 페이지 로딩 확인...")
-                    time.sleep(1)
-                    
                 except Exception as e:
                     logger.warning(f"   ⚠️ {course_name} 과목 클릭 실패: {e}")
                     continue
                 
                 # 픽스드 버전의 향상된 요소 추출 로직
+                parse_span = timer.span('course_parse')
                 try:
                     current_page_source = driver.page_source
-                    current_soup = BeautifulSoup(current_page_source, 'html.parser')
-                    
-                    # 이번주 강의 섹션 찾기 (5단계 강화된 로직)
-                    this_week_section = None
-                    
-                    # 1단계: 다양한 선택자로 섹션 찾기
-                    section_selectors = [
-                        'li.section.main',
-                        'div.section',
-                        'div[class*="section"]',
-                        'li[class*="section"]'
-                    ]
-                    
-                    for selector in section_selectors:
-                        sections = current_soup.select(selector)
-                        for section in sections:
-                            section_text = section.get_text().lower()
-                            # 더 다양한 키워드로 검색 (주제별 학습활동 포함)
-                            if any(keyword in section_text for keyword in [
-                                "이번주 강의", "이번주", "current week", "current week course",
-                                "이번주강의", "current week lecture", "week", "주차",
-                                "이번 주", "현재 주", "current", "강의", "주제별 학습활동", "주제별학습활동"
-                            ]):
-                                # "강의 개요"는 제외
-                                if "개요" not in section_text and "overview" not in section_text:
-                                    this_week_section = section
-                                    logger.info(f"   ✅ '이번주 강의' 섹션 발견: {section_text[:50]}...")
-                                    break
-                        if this_week_section:
-                            break
-                    
-                    # 2단계: 정확한 키워드로 찾지 못함, 두 번째 섹션을 '이번주 강의'로 시도
-                    if not this_week_section:
-                        logger.info(f"   🔍 정확한 키워드로 찾지 못함, 두 번째 섹션을 '이번주 강의'로 시도")
-                        for selector in section_selectors:
-                            sections = current_soup.select(selector)
-                            if len(sections) > 1:  # 두 번째 섹션이 있는 경우
-                                this_week_section = sections[1]  # 두 번째 섹션 사용
-                                logger.info(f"   ✅ 두 번째 섹션을 '이번주 강의'로 설정")
-                                break
-                    
-                    # 3단계: 여전히 없으면 첫 번째 섹션 사용 (최후의 수단)
-                    if not this_week_section:
-                        logger.info(f"   🔍 두 번째 섹션도 없음, 첫 번째 섹션을 '이번주 강의'로 간주")
-                        for selector in section_selectors:
-                            sections = current_soup.select(selector)
-                            if sections:
-                                this_week_section = sections[0]  # 첫 번째 섹션 사용
-                                logger.info(f"   ✅ 첫 번째 섹션을 '이번주 강의'로 설정")
-                                break
-                    
-                    # 4단계: 링크가 있는 섹션 찾기
-                    if not this_week_section:
-                        logger.info(f"   🔍 링크가 있는 섹션을 '이번주 강의'로 시도")
-                        for selector in section_selectors:
-                            sections = current_soup.select(selector)
-                            for section in sections:
-                                links = section.find_all('a', href=True)
-                                if links:
-                                    this_week_section = section
-                                    logger.info(f"   ✅ 링크가 있는 섹션을 '이번주 강의'로 설정")
-                                    break
-                            if this_week_section:
-                                break
-                    
-                    # 5단계: 최후의 수단 - 모든 링크에서 부모 섹션 찾기
-                    if not this_week_section:
-                        logger.info(f"   🔍 최후의 수단: 모든 링크에서 부모 섹션 찾기")
-                        all_links = current_soup.find_all('a', href=True)
-                        for link in all_links:
-                            parent_li = link.find_parent('li', class_=lambda x: x and 'section' in x)
-                            if parent_li:
-                                this_week_section = parent_li
-                                logger.info(f"   ✅ 링크의 부모 섹션을 '이번주 강의'로 설정")
-                                break
-                            parent_div = link.find_parent('div', class_=lambda x: x and 'section' in x)
-                            if parent_div:
-                                this_week_section = parent_div
-                                logger.info(f"   ✅ 링크의 부모 섹션을 '이번주 강의'로 설정")
-                                break
+                    current_url = driver.current_url
+                    if FIXTURE_RECORD_DIR:
+                        record_page(current_url, current_page_source)
+                    current_soup = make_soup(current_page_source)
                     
-                    if this_week_section:
-                        logger.info(f"   ✅ {course_name}에서 '이번주 강의' 섹션 발견")
-                        
-                        # 활동 링크 찾기
-                        activity_links = this_week_section.find_all('a', href=True)
-                        logger.info(f"   📚 {course_name}: {len(activity_links)}개 활동 발견")
-                        
-                        if len(activity_links) > 0:
-                            for link in activity_links:
-                                try:
-                                    activity_name = link.get_text().strip()
-                                    activity_url = link.get('href', '')
-                                    
-                                    if not activity_name or not activity_url:
-                                        continue
-                                    
-                                    # 활동 타입 판별 (픽스드 버전의 향상된 로직)
-                                    activity_type = "기타"
-                                    completion_status = "상태 불명"
-                                    
-                                    if "mod/assign/" in activity_url:
-                                        activity_type = "과제"
-                                        # 과제 완료 상태 확인을 위한 추가 정보 수집
-                                        try:
-                                            # 과제 링크에서 완료 상태 확인
-                                            # 메인 페이지에서 바로 완료 상태 아이콘 확인
-                                            assignment_status = check_completion_status_on_main_page(driver, activity_url)
-                                            completion_status = assignment_status
-                                        except:
-                                            completion_status = "상태 확인 불가"
-                                    elif "mod/vod/" in activity_url:
-                                        activity_type = "동영상"
-                                        # 동영상 시청 상태 확인
-                                        try:
-                                            # 메인 페이지에서 바로 완료 상태 아이콘 확인
-                                            video_status = check_completion_status_on_main_page(driver, activity_url)
-                                            completion_status = video_status
-                                        except:
-                                            completion_status = "상태 확인 불가"
-                                    elif "mod/resource/" in activity_url or "mod/ubfile/" in activity_url:
-                                        activity_type = "PDF 자료"
-                                        completion_status = "다운로드 가능"
-                                    elif "mod/ubboard/" in activity_url:
-                                        activity_type = "게시판"
-                                        completion_status = "접근 가능"
-                                    elif "mod/quiz/" in activity_url:
-                                        activity_type = "퀴즈"
-                                        # 퀴즈 완료 상태 확인
-                                        try:
-                                            # 메인 페이지에서 바로 완료 상태 아이콘 확인
-                                            quiz_status = check_completion_status_on_main_page(driver, activity_url)
-                                            completion_status = quiz_status
-                                        except:
-                                            completion_status = "상태 확인 불가"
-                                    elif "mod/forum/" in activity_url:
-                                        activity_type = "토론"
-                                        completion_status = "참여 가능"
-                                    elif "mod/lesson/" in activity_url:
-                                        activity_type = "강의"
-                                        completion_status = "학습 가능"
-                                    elif "mod/page/" in activity_url:
-                                        activity_type = "페이지"
-                                        completion_status = "접근 가능"
-                                    
-                                    lecture_info = {
-                                        'course': course_name,
-                                        'activity': activity_name,
-                                        'type': activity_type,
-                                        'url': activity_url,
-                                        'status': completion_status
-                                    }
-                                    all_lectures.append(lecture_info)
-                                    logger.info(f"      ✅ {activity_name} ({activity_type})")
-                                    
-                                except Exception as e:
-                                    logger.debug(f"      활동 정보 추출 실패: {e}")
-                                    continue
-                        else:
-                            # 활동이 없어도 과목명은 기록
-                            logger.info(f"   📝 {course_name}: 이번주 강의 활동 없음, 과목명만 기록")
-                            lecture_info = {
-                                'course': course_name,
-                                'activity': '이번주 강의 활동 없음',
-                                'type': '정보 없음',
-                                'url': ''
-                            }
-                            all_lectures.append(lecture_info)
-                    else:
-                        logger.info(f"   📭 {course_name}: '이번주 강의' 섹션 없음, 과목명만 기록")
-                        # 섹션이 없어도 과목명은 기록
-                        lecture_info = {
-                            'course': course_name,
-                            'activity': '이번주 강의 섹션 없음',
-                            'type': '정보 없음',
-                            'url': ''
-                        }
-                        all_lectures.append(lecture_info)
+                    all_lectures.extend(extract_course_page_lectures(
+                        driver, current_soup, course_name, fingerprints, timer, course_url=current_url))
                 
                 except Exception as e:
                     logger.warning(f"   {course_name} 페이지 분석 실패: {e}")
+                parse_span.stop()
                 
                 # 메인 페이지로 돌아가기 (기존 코드의 간단한 로직)
+                back_span = timer.span('back_to_main')
                 try:
-                    driver.back()
-                    time.sleep(0.5)  # 페이지 로딩 대기
+                    waiter.navigation(f"back_to_main:{course_name}", driver.back,
+                                      css_selector=COURSE_LIST_SELECTOR, legacy_sleep=0.5)
                     logger.info(f"   ✅ {course_name} 메인 페이지 복귀 완료")
                     
                     # 메인 페이지 복귀 후 상태 확인
@@ -1107,7 +1334,7 @@ def collect_this_week_lectures_hybrid(driver):
                     logger.info(f"   📍 복귀 후 URL: {current_url}")
                     
                     # 메인 페이지인지 확인
-                    if "ys.learnus.org" in current_url and "course/view.php" not in current_url:
+                    if LEARNUS_HOST in current_url and "course/view.php" not in current_url:
                         logger.info(f"   ✅ {course_name} 메인 페이지 정상 복귀 확인")
                         
                         # 메인 페이지 복귀 후 과목 목록 다시 찾기
@@ -1169,22 +1396,19 @@ def collect_this_week_lectures_hybrid(driver):
                         logger.warning(f"   ⚠️ {course_name} 메인 페이지 복귀 실패, 아직 과목 페이지에 있음")
                         # 한 번 더 뒤로가기 시도
                         try:
-                            driver.back()
-                            time.sleep(0.5)
+                            waiter.navigation(f"back_to_main_retry:{course_name}", driver.back,
+                                              css_selector=COURSE_LIST_SELECTOR, legacy_sleep=0.5)
                             logger.info(f"   🔄 {course_name} 추가 뒤로가기 시도")
                         except:
                             pass
                     
-                    # 메인 페이지 복귀 후 로딩 확인
-                    logger.info(f"   📄 {course_name} 메인 페이지 복귀 후 로딩 확인...")
-                    time.sleep(1)
-                    
                 except Exception as e:
                     logger.warning(f"   {course_name} 메인 페이지 복귀 실패: {e}")
                     # 복귀 실패 시 메인 페이지로 직접 이동
                     try:
-                        driver.get("https://ys.learnus.org/")
-                        time.sleep(1)
+                        driver.get(f"{LEARNUS_BASE_URL}/")
+                        waiter.selector(f"main_page_reload:{course_name}", COURSE_LIST_SELECTOR,
+                                        timeout=5, legacy_sleep=1)
                         logger.info(f"   🔄 {course_name} 메인 페이지 직접 이동")
                         
                         # 직접 이동 후 상태 확인
@@ -1225,12 +1449,9 @@ def collect_this_week_lectures_hybrid(driver):
                                     logger.info(f"   ✅ {course_name} 직접 이동 후 {selector} 선택자로 {len(course_elements)}개 과목 재발견")
                                     break
                         
-                        # 직접 이동 후 로딩 확인
-                        logger.info(f"   📄 {course_name} 직접 이동 후 로딩 확인...")
-                        time.sleep(1)
-                        
                     except Exception as e2:
                         logger.error(f"   ❌ {course_name} 메인 페이지 직접 이동 실패: {e2}")
+                back_span.stop()
                 
                 # 과목 처리 완료 후 인덱스 증가
                 current_course_index += 1
@@ -1257,163 +1478,6 @@ def collect_this_week_lectures_hybrid(driver):
                 except:
                     logger.info(f"   - 과목 {i+1} (텍스트 추출 실패)")
         
-        # 최종 결과 로딩 확인
-        logger.info("📄 최종 결과 로딩 확인...")
-        time.sleep(1)
-        
-        # 결과를 파일로 저장
-        try:
-            # backend 폴더에 저장하도록 경로 설정
-            import os
-            backend_dir = os.path.dirname(os.path.abspath(__file__))
-            assignment_file_path = os.path.join(backend_dir, 'assignment.txt')
-            logger.info(f"📁 파일 저장 경로: {assignment_file_path}")
-            
-            with open(assignment_file_path, 'w', encoding='utf-8') as f:
-                f.write("📚 LearnUs 과목 및 이번주 강의 활동 목록\n")
-                f.write("=" * 60 + "\n\n")
-                f.write(f"수집 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"총 수집된 항목 수: {len(all_lectures) if all_lectures else 0}개\n")
-                f.write(f"처리된 과목 수: {len(processed_courses) if processed_courses else 0}개\n\n")
-                
-                if all_lectures:
-                    # 과목별로 그룹화
-                    course_groups = {}
-                    for lecture in all_lectures:
-                        course = lecture['course']
-                        if course not in course_groups:
-                            course_groups[course] = []
-                        course_groups[course].append(lecture)
-                    
-                    # 과목별로 출력
-                    for course, lectures in course_groups.items():
-                        f.write(f"📖 {course}\n")
-                        f.write("-" * 50 + "\n")
-                        
-                        # 활동이 있는지 확인
-                        has_activities = any(lecture.get('activity') and lecture['activity'] not in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음'] for lecture in lectures)
-                        
-                        if has_activities:
-                            f.write("📚 이번주 강의 활동:\n")
-                            for lecture in lectures:
-                                if lecture.get('activity') and lecture['activity'] not in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음']:
-                                    f.write(f"  • {lecture['activity']} ({lecture['type']}) - {lecture.get('status', '상태 불명')}\n")
-                                    if lecture['url']:
-                                        f.write(f"    URL: {lecture['url']}\n")
-                                    f.write("\n")
-                        else:
-                            f.write("📝 이번주 강의 정보: 활동 없음\n")
-                            for lecture in lectures:
-                                if lecture['activity'] in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음']:
-                                    f.write(f"  • {lecture['activity']}\n")
-                        f.write("\n")
-                    
-                    # 요약 정보 추가
-                    f.write("\n" + "=" * 60 + "\n")
-                    f.write("📊 요약 정보\n")
-                    f.write("=" * 60 + "\n")
-                    
-                    # 활동이 있는 과목과 없는 과목 분류
-                    courses_with_activities = []
-                    courses_without_activities = []
-                    
-                    for course, lectures in course_groups.items():
-                        has_activities = any(lecture.get('activity') and lecture['activity'] not in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음'] for lecture in lectures)
-                        if has_activities:
-                            courses_with_activities.append(course)
-                        else:
-                            courses_without_activities.append(course)
-                    
-                    f.write(f"✅ 이번주 강의 활동이 있는 과목: {len(courses_with_activities)}개\n")
-                    for course in courses_with_activities:
-                        f.write(f"  • {course}\n")
-                    
-                    f.write(f"\n📝 이번주 강의 활동이 없는 과목: {len(courses_without_activities)}개\n")
-                    for course in courses_without_activities:
-                        f.write(f"  • {course}\n")
-                    
-                    # 이번주 해야 할 과제만 따로 정리
-                    f.write("\n" + "=" * 60 + "\n")
-                    f.write("📋 이번주 해야 할 과제 목록\n")
-                    f.write("=" * 60 + "\n")
-                    
-                    # 완료되지 않은 과제들만 필터링
-                    incomplete_assignments = []
-                    incomplete_videos = []
-                    incomplete_other_activities = []
-                    
-                    if all_lectures:
-                        for lecture in all_lectures:
-                            if lecture.get('activity') and lecture['activity'] not in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음']:
-                                status = lecture.get('status', '상태 불명')
-                                # status가 None이거나 빈 문자열이 아닌지 확인하고 "해야 할 과제" 또는 "미완료" 상태인 것만 포함
-                                if status and isinstance(status, str) and ('해야 할 과제' in status or '미완료' in status or '미시청' in status):
-                                    if lecture['type'] == '과제':
-                                        incomplete_assignments.append(lecture)
-                                    elif lecture['type'] == '동영상':
-                                        incomplete_videos.append(lecture)
-                                    else:
-                                        incomplete_other_activities.append(lecture)
-                    
-                    if incomplete_assignments:
-                        f.write("📝 해야 할 과제:\n")
-                        for assignment in incomplete_assignments:
-                            f.write(f"  • {assignment['course']}: {assignment['activity']} - {assignment.get('status', '상태 불명')}\n")
-                            if assignment['url']:
-                                f.write(f"    URL: {assignment['url']}\n")
-                        f.write("\n")
-                    
-                    if incomplete_videos:
-                        f.write("🎥 시청해야 할 동영상:\n")
-                        for video in incomplete_videos:
-                            f.write(f"  • {video['course']}: {video['activity']} - {video.get('status', '상태 불명')}\n")
-                            if video['url']:
-                                f.write(f"    URL: {video['url']}\n")
-                        f.write("\n")
-                    
-                    if incomplete_other_activities:
-                        f.write("📚 해야 할 기타 활동:\n")
-                        for activity in incomplete_other_activities:
-                            f.write(f"  • {activity['course']}: {activity['activity']} ({activity['type']}) - {activity.get('status', '상태 불명')}\n")
-                            if activity['url']:
-                                f.write(f"    URL: {activity['url']}\n")
-                        f.write("\n")
-                    
-                    if not incomplete_assignments and not incomplete_videos and not incomplete_other_activities:
-                        f.write("📝 이번주 해야 할 과제가 없습니다.\n")
-                        
-                else:
-                    f.write("⚠️ 과목 정보를 찾을 수 없습니다\n")
-            
-            logger.info("💾 과목 및 이번주 강의 정보가 assignment.txt 파일에 저장되었습니다")
-            if all_lectures:
-                logger.info(f"📚 총 {len(all_lectures)}개 항목 수집 완료!")
-            else:
-                logger.warning("⚠️ 과목 정보를 찾을 수 없습니다")
-                
-        except Exception as e:
-            logger.error(f"❌ 파일 저장 실패: {e}")
-            logger.error(f"🔍 에러 타입: {type(e).__name__}")
-            logger.error(f"🔍 에러 상세: {str(e)}")
-            import traceback
-            logger.error(f"🔍 스택 트레이스:\n{traceback.format_exc()}")
-            
-            # 변수 상태 확인
-            logger.error(f"🔍 디버깅 정보:")
-            logger.error(f"   - all_lectures 타입: {type(all_lectures)}")
-            logger.error(f"   - all_lectures 길이: {len(all_lectures) if all_lectures else 'None'}")
-            logger.error(f"   - processed_courses 타입: {type(processed_courses)}")
-            logger.error(f"   - processed_courses 길이: {len(processed_courses) if processed_courses else 'None'}")
-            
-            if all_lectures:
-                logger.error(f"   - all_lectures 첫 번째 항목: {all_lectures[0] if len(all_lectures) > 0 else 'None'}")
-                for i, lecture in enumerate(all_lectures[:3]):  # 처음 3개만 확인
-                    logger.error(f"   - lecture[{i}] keys: {list(lecture.keys()) if isinstance(lecture, dict) else 'Not a dict'}")
-                    if isinstance(lecture, dict):
-                        for key in ['activity', 'status', 'type', 'course']:
-                            value = lecture.get(key)
-                            logger.error(f"     - {key}: {value} (타입: {type(value).__name__})")
-            
     except Exception as e:
         logger.error(f"❌ 이번주 강의 정보 수집 실패: {e}")
         logger.error(f"🔍 에러 타입: {type(e).__name__}")
@@ -1436,6 +1500,166 @@ def collect_this_week_lectures_hybrid(driver):
         "message": f"총 {len(all_lectures)}개 강의 정보 수집 완료"
     }
 
+def write_assignment_report(all_lectures):
+    """수집 결과를 backend/assignment.txt 보고서로 저장 (단독 실행 main() 디버그용)
+
+    스케줄러/워커 실행에서는 결과 저장소(result_store)만 쓰므로 호출하지 않음
+    """
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    assignment_file_path = os.path.join(backend_dir, 'assignment.txt')
+    tmp_path = f"{assignment_file_path}.{os.getpid()}.tmp"
+    processed_courses = {lecture.get('course') for lecture in all_lectures if isinstance(lecture, dict)}
+    try:
+        logger.info(f"📁 파일 저장 경로: {assignment_file_path}")
+
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("📚 LearnUs 과목 및 이번주 강의 활동 목록\n")
+            f.write("=" * 60 + "\n\n")
+            f.write(f"수집 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"총 수집된 항목 수: {len(all_lectures) if all_lectures else 0}개\n")
+            f.write(f"처리된 과목 수: {len(processed_courses) if processed_courses else 0}개\n\n")
+
+            if all_lectures:
+                # 과목별로 그룹화
+                course_groups = {}
+                for lecture in all_lectures:
+                    course = lecture['course']
+                    if course not in course_groups:
+                        course_groups[course] = []
+                    course_groups[course].append(lecture)
+
+                # 과목별로 출력
+                for course, lectures in course_groups.items():
+                    f.write(f"📖 {course}\n")
+                    f.write("-" * 50 + "\n")
+
+                    # 활동이 있는지 확인
+                    has_activities = any(lecture.get('activity') and lecture['activity'] not in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음'] for lecture in lectures)
+
+                    if has_activities:
+                        f.write("📚 이번주 강의 활동:\n")
+                        for lecture in lectures:
+                            if lecture.get('activity') and lecture['activity'] not in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음']:
+                                f.write(f"  • {lecture['activity']} ({lecture['type']}) - {lecture.get('status', '상태 불명')}\n")
+                                if lecture['url']:
+                                    f.write(f"    URL: {lecture['url']}\n")
+                                f.write("\n")
+                    else:
+                        f.write("📝 이번주 강의 정보: 활동 없음\n")
+                        for lecture in lectures:
+                            if lecture['activity'] in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음']:
+                                f.write(f"  • {lecture['activity']}\n")
+                    f.write("\n")
+
+                # 요약 정보 추가
+                f.write("\n" + "=" * 60 + "\n")
+                f.write("📊 요약 정보\n")
+                f.write("=" * 60 + "\n")
+
+                # 활동이 있는 과목과 없는 과목 분류
+                courses_with_activities = []
+                courses_without_activities = []
+
+                for course, lectures in course_groups.items():
+                    has_activities = any(lecture.get('activity') and lecture['activity'] not in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음'] for lecture in lectures)
+                    if has_activities:
+                        courses_with_activities.append(course)
+                    else:
+                        courses_without_activities.append(course)
+
+                f.write(f"✅ 이번주 강의 활동이 있는 과목: {len(courses_with_activities)}개\n")
+                for course in courses_with_activities:
+                    f.write(f"  • {course}\n")
+
+                f.write(f"\n📝 이번주 강의 활동이 없는 과목: {len(courses_without_activities)}개\n")
+                for course in courses_without_activities:
+                    f.write(f"  • {course}\n")
+
+                # 이번주 해야 할 과제만 따로 정리
+                f.write("\n" + "=" * 60 + "\n")
+                f.write("📋 이번주 해야 할 과제 목록\n")
+                f.write("=" * 60 + "\n")
+
+                # 완료되지 않은 과제들만 필터링
+                incomplete_assignments = []
+                incomplete_videos = []
+                incomplete_other_activities = []
+
+                if all_lectures:
+                    for lecture in all_lectures:
+                        if lecture.get('activity') and lecture['activity'] not in ['이번주 강의 활동 없음', '이번주 강의 섹션 없음']:
+                            status = lecture.get('status', '상태 불명')
+                            # status가 None이거나 빈 문자열이 아닌지 확인하고 "해야 할 과제" 또는 "미완료" 상태인 것만 포함
+                            if status and isinstance(status, str) and ('해야 할 과제' in status or '미완료' in status or '미시청' in status):
+                                if lecture['type'] == '과제':
+                                    incomplete_assignments.append(lecture)
+                                elif lecture['type'] == '동영상':
+                                    incomplete_videos.append(lecture)
+                                else:
+                                    incomplete_other_activities.append(lecture)
+
+                if incomplete_assignments:
+                    f.write("📝 해야 할 과제:\n")
+                    for assignment in incomplete_assignments:
+                        f.write(f"  • {assignment['course']}: {assignment['activity']} - {assignment.get('status', '상태 불명')}\n")
+                        if assignment['url']:
+                            f.write(f"    URL: {assignment['url']}\n")
+                    f.write("\n")
+
+                if incomplete_videos:
+                    f.write("🎥 시청해야 할 동영상:\n")
+                    for video in incomplete_videos:
+                        f.write(f"  • {video['course']}: {video['activity']} - {video.get('status', '상태 불명')}\n")
+                        if video['url']:
+                            f.write(f"    URL: {video['url']}\n")
+                    f.write("\n")
+
+                if incomplete_other_activities:
+                    f.write("📚 해야 할 기타 활동:\n")
+                    for activity in incomplete_other_activities:
+                        f.write(f"  • {activity['course']}: {activity['activity']} ({activity['type']}) - {activity.get('status', '상태 불명')}\n")
+                        if activity['url']:
+                            f.write(f"    URL: {activity['url']}\n")
+                    f.write("\n")
+
+                if not incomplete_assignments and not incomplete_videos and not incomplete_other_activities:
+                    f.write("📝 이번주 해야 할 과제가 없습니다.\n")
+
+            else:
+                f.write("⚠️ 과목 정보를 찾을 수 없습니다\n")
+        # 다 쓴 뒤 교체 (읽는 쪽이 쓰는 중인 파일을 보지 않도록)
+        os.replace(tmp_path, assignment_file_path)
+
+        logger.info("💾 과목 및 이번주 강의 정보가 assignment.txt 파일에 저장되었습니다")
+        if all_lectures:
+            logger.info(f"📚 총 {len(all_lectures)}개 항목 수집 완료!")
+        else:
+            logger.warning("⚠️ 과목 정보를 찾을 수 없습니다")
+
+    except Exception as e:
+        logger.error(f"❌ 파일 저장 실패: {e}")
+        logger.error(f"🔍 에러 타입: {type(e).__name__}")
+        logger.error(f"🔍 에러 상세: {str(e)}")
+        import traceback
+        logger.error(f"🔍 스택 트레이스:\n{traceback.format_exc()}")
+
+        # 변수 상태 확인
+        logger.error(f"🔍 디버깅 정보:")
+        logger.error(f"   - all_lectures 타입: {type(all_lectures)}")
+        logger.error(f"   - all_lectures 길이: {len(all_lectures) if all_lectures else 'None'}")
+        logger.error(f"   - processed_courses 타입: {type(processed_courses)}")
+        logger.error(f"   - processed_courses 길이: {len(processed_courses) if processed_courses else 'None'}")
+
+        if all_lectures:
+            logger.error(f"   - all_lectures 첫 번째 항목: {all_lectures[0] if len(all_lectures) > 0 else 'None'}")
+            for i, lecture in enumerate(all_lectures[:3]):  # 처음 3개만 확인
+                logger.error(f"   - lecture[{i}] keys: {list(lecture.keys()) if isinstance(lecture, dict) else 'Not a dict'}")
+                if isinstance(lecture, dict):
+                    for key in ['activity', 'status', 'type', 'course']:
+                        value = lecture.get(key)
+                        logger.error(f"     - {key}: {value} (타입: {type(value).__name__})")
+
+
 def main():
     """메인 함수 (자동 설정)"""
     print("🚀 완벽한 혼합 버전 자동화 스크립트")
@@ -1461,6 +1685,7 @@ def main():
         success = test_direct_selenium(university, username, password, student_id)
         
         if success:
+            write_assignment_report(success.get('lectures', []) if isinstance(success, dict) else [])
             print("✅ 테스트 완료! assignment.txt 파일을 확인하세요.")
         else:
             print("❌ 테스트 실패")
@@ -0,0 +1,54 @@
+"""
+result_store 단위 테스트 (tmp_path의 SQLite 파일 사용)
+- 바뀐 항목만 upsert, 사라진 항목 삭제, 읽기, 사용자 삭제까지 한 번에 확인
+"""
+
+import pytest
+
+from result_store import ResultStore, activity_id
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path / 'assignments.db'))
+
+
+def _assignment(module_id, status, course='데이터구조'):
+    return {'course': course, 'activity': f'활동 {module_id}', 'type': '과제', 'status': status,
+            'url': f'https://ys.learnus.org/mod/assign/view.php?id={module_id}'}
+
+
+def test_upsert_read_delete_round_trip(store):
+    first = [_assignment('101', '❌ 해야 할 과제'), _assignment('102', '❌ 해야 할 과제')]
+    counts = store.replace_user('uid-a', first, username='2024000001')
+    assert (counts['inserted'], counts['updated'], counts['deleted'], counts['unchanged']) == (2, 0, 0, 0)
+    assert store.get_assignments('uid-a') == first
+
+    # 101 완료, 102 사라짐, 103 추가
+    second = [_assignment('101', '✅ 완료'), _assignment('103', '❌ 해야 할 과제')]
+    counts = store.replace_user('uid-a', second)
+    assert (counts['inserted'], counts['updated'], counts['deleted'], counts['unchanged']) == (1, 1, 1, 0)
+    assert [item for _, item, _ in counts['changed_items']] == ['101', '103']
+    assert counts['removed_items'] == [('데이터구조', '102')]
+    assert sorted(store.get_assignments('uid-a'), key=activity_id) == second
+
+    # 같은 결과를 다시 넣으면 쓰기 없음
+    counts = store.replace_user('uid-a', second)
+    assert counts['unchanged'] == 2 and not counts['changed_items'] and not counts['removed_items']
+
+    store.replace_user('uid-b', [_assignment('201', '✅ 완료', course='선형대수학')])
+    assert sorted(store.user_keys()) == ['uid-a', 'uid-b']
+    assert store.get_stats()['items'] == 3
+
+    store.remove_user('uid-a')
+    assert store.get_assignments('uid-a') == []
+    assert store.user_keys() == ['uid-b']
+    assert store.last_updated('uid-a') is None
+    assert len(store.get_assignments()) == 1
+
+
+def test_placeholder_rows_keyed_by_name(store):
+    placeholder = {'course': '선형대수학', 'activity': '이번주 강의 활동 없음', 'type': '정보 없음', 'url': ''}
+    store.replace_user('uid-a', [placeholder])
+    assert activity_id(placeholder).startswith('name:')
+    assert store.get_assignments('uid-a') == [placeholder]
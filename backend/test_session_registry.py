@@ -0,0 +1,132 @@
+"""
+사용자별 세션 관리 테스트 (SchoolAutomationService 대신 스텁 서비스 사용, 브라우저 없음)
+- 최대 세션 수 도달 시 쉬고 있는 가장 오래된 세션 종료, 모두 자동화 중이면 SessionLimitError
+- 유휴 세션 정리는 자동화 실행 중인 세션을 건너뜀
+- 같은 사용자가 다시 로그인하면 세션은 재사용하고 토큰만 새로 발급
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('selenium')
+pytest.importorskip('webdriver_manager')
+
+from services.session_registry import SessionLimitError, SessionRegistry, session_key
+
+
+class StubService:
+    """SchoolAutomationService의 세션 관리에 필요한 부분만"""
+
+    def __init__(self, login_result=True):
+        self.login_result = login_result
+        self.is_logged_in = False
+        self.automation_running = False
+        self.logins = 0
+        self.closed = False
+
+    async def login(self, university, username, password, student_id):
+        self.logins += 1
+        self.is_logged_in = self.login_result
+        return self.login_result
+
+    async def close(self):
+        self.closed = True
+        self.is_logged_in = False
+
+
+def _registry(**kwargs):
+    services = []
+
+    def factory():
+        services.append(StubService())
+        return services[-1]
+
+    return SessionRegistry(factory=factory, **kwargs), services
+
+
+def _login(registry, student_id):
+    return registry.login('연세대학교', student_id, 'pw', student_id)
+
+
+def test_capacity_evicts_least_recently_used_idle_session():
+    registry, services = _registry(max_sessions=2)
+
+    async def scenario():
+        first = await _login(registry, '1')
+        second = await _login(registry, '2')
+        # 첫 세션을 최근에 사용 -> 두 번째 세션이 정리 대상
+        assert registry.get(first.token) is first
+        third = await _login(registry, '3')
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert [s.key for s in registry.sessions()] == [first.key, third.key]
+    assert services[1].closed and not services[0].closed
+    assert registry.get(second.token) is None
+    assert registry.stats['evicted_capacity'] == 1
+
+
+def test_capacity_skips_busy_sessions_and_rejects_when_all_busy():
+    registry, services = _registry(max_sessions=2)
+
+    async def scenario():
+        await _login(registry, '1')
+        await _login(registry, '2')
+        services[0].automation_running = True
+        await _login(registry, '3')
+        assert not services[0].closed and services[1].closed
+
+        services[2].automation_running = True
+        with pytest.raises(SessionLimitError):
+            await _login(registry, '4')
+
+    asyncio.run(scenario())
+    assert [s.key for s in registry.sessions()] == [session_key('연세대학교', '1'), session_key('연세대학교', '3')]
+    assert len(services) == 3
+    assert registry.stats['rejected'] == 1
+
+
+def test_sweep_skips_busy_sessions():
+    registry, services = _registry(idle_timeout=60)
+
+    async def scenario():
+        idle = await _login(registry, '1')
+        busy = await _login(registry, '2')
+        recent = await _login(registry, '3')
+        idle.last_used -= 120
+        busy.last_used -= 120
+        services[1].automation_running = True
+        return await registry.sweep(), idle, busy, recent
+
+    swept, idle, busy, recent = asyncio.run(scenario())
+    assert swept == 1
+    assert services[0].closed and not services[1].closed and not services[2].closed
+    assert registry.get(idle.token) is None
+    assert registry.get(busy.token) is busy and registry.get(recent.token) is recent
+    assert registry.stats['evicted_idle'] == 1
+
+
+def test_relogin_reuses_session_and_rotates_token():
+    registry, services = _registry()
+
+    async def scenario():
+        session = await _login(registry, '1')
+        old_token = session.token
+        again = await _login(registry, '1')
+        return session, old_token, again
+
+    session, old_token, again = asyncio.run(scenario())
+    assert again is session and len(services) == 1 and services[0].logins == 2
+    assert session.token != old_token
+    assert registry.get(old_token) is None
+    assert registry.get(session.token) is session
+
+
+def test_failed_first_login_closes_new_session():
+    registry = SessionRegistry(factory=lambda: StubService(login_result=False))
+
+    assert asyncio.run(_login(registry, '1')) is None
+    assert registry.sessions() == []
+    assert registry.stats['login_failures'] == 1
+    assert registry.get_stats()['login_locks'] == 0
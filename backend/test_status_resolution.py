@@ -0,0 +1,122 @@
+"""
+활동 완료 상태 확인 방식 비교 테스트
+- STATUS_CHECK_MODE=per_activity (활동마다 XPath) 와 batch (페이지 스냅샷 한 번) 결과가 같은지 확인
+- fixtures/learnus의 과목 페이지 + 경계 사례 샘플에서 모든 module-id를 비교
+- per_activity XPath는 드라이버 대신 lxml로 평가 (같은 XPath 1.0 문법)
+"""
+
+import glob
+import os
+
+import pytest
+
+lxml_html = pytest.importorskip('lxml.html')
+pytest.importorskip('bs4')
+pytest.importorskip('selenium')
+
+from status_optimizer import StatusOptimizer, completion_xpaths
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'learnus')
+COURSE_PAGES = sorted(glob.glob(os.path.join(FIXTURE_DIR, 'course_*.html')))
+
+# 완료/미완료/아이콘 없음/다른 ID를 가리키는 링크/접두사가 같은 module-id/클래스가 여러 개인 아이콘
+SAMPLE_COURSE_PAGE = """
+<html><body>
+<ul class="topics">
+  <li class="section main" id="section-1"><div class="content">
+    <h3 class="sectionname">이번주 강의</h3>
+    <ul class="section img-text">
+      <li class="activity vod modtype_vod" id="module-1001">
+        <a href="https://ys.learnus.org/mod/vod/view.php?id=1001">1주차 강의 영상</a>
+        <span class="autocompletion"><img class="icon" title="완료함: 1주차 강의 영상" alt="완료함" src="/theme/image.php/coursemosv2/core/1/i/completion-auto-y"></span>
+      </li>
+      <li class="activity vod modtype_vod" id="module-1002">
+        <a href="https://ys.learnus.org/mod/vod/view.php?id=1002">1주차 보충 영상</a>
+        <span class="autocompletion"><img class="icon" title="완료하지 못함: 1주차 보충 영상" alt="완료하지 못함" src="/theme/image.php/coursemosv2/core/1/i/completion-auto-n"></span>
+      </li>
+      <li class="activity assign modtype_assign" id="module-1003">
+        <a href="https://ys.learnus.org/mod/assign/view.php?id=1003&amp;forceview=1">1주차 과제</a>
+        <span class="autocompletion"><img class="icon" alt="완료하지 못함" src="/theme/image.php/coursemosv2/core/1/i/completion-auto-n"></span>
+      </li>
+      <li class="activity assign modtype_assign" id="module-1004">
+        <a href="https://ys.learnus.org/mod/assign/view.php?id=1004">2주차 과제 (아이콘 없음)</a>
+      </li>
+      <li class="activity quiz modtype_quiz" id="module-1005">
+        <a href="https://ys.learnus.org/mod/quiz/view.php?id=1005">쪽지 시험</a>
+        <span class="autocompletion"><img class="icon" src="/theme/image.php/coursemosv2/core/1/i/completion-auto-y"></span>
+      </li>
+      <li class="activity quiz modtype_quiz" id="module-1006">
+        <a href="https://ys.learnus.org/mod/quiz/view.php?id=9999">다른 ID를 가리키는 퀴즈</a>
+        <span class="autocompletion"><img class="icon" title="완료함"></span>
+      </li>
+      <li class="activity assign modtype_assign" id="module-10070">
+        <a href="https://ys.learnus.org/mod/assign/view.php?id=10070">접두사가 같은 과제</a>
+        <span class="autocompletion"><img class="icon" title="완료함: 접두사가 같은 과제"></span>
+      </li>
+      <li class="activity vod modtype_vod" id="module-1008">
+        <a href="https://ys.learnus.org/mod/vod/view.php?id=1008">2주차 강의 영상</a>
+        <span class="autocompletion togglecompletion"><img class="icon iconsmall" title="완료하지 못함: 2주차 강의 영상" src="/theme/image.php/coursemosv2/core/1/i/completion-auto-n"></span>
+      </li>
+      <li class="activity ubfile modtype_ubfile" id="module-1007">
+        <a href="https://ys.learnus.org/mod/ubfile/view.php?id=1007">강의 자료</a>
+      </li>
+    </ul>
+  </div></li>
+</ul>
+</body></html>
+"""
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def per_activity_status(tree, activity_id):
+    """check_completion_status_on_main_page와 같은 순서로 XPath 평가"""
+    completed, incomplete = completion_xpaths(activity_id)
+    if any(tree.xpath(selector) for selector in completed):
+        return "✅ 완료"
+    if any(tree.xpath(selector) for selector in incomplete):
+        return "❌ 해야 할 과제"
+    return "⏳ 대기 중"
+
+
+def compare_statuses(html):
+    """페이지의 모든 module-id에 대해 (module-id, per_activity, batch) 목록"""
+    tree = lxml_html.fromstring(html)
+    module_ids = sorted({li.get('id')[len('module-'):] for li in tree.xpath("//li[starts-with(@id, 'module-')]")})
+    activities = [{'url': f"https://ys.learnus.org/mod/assign/view.php?id={module_id}"} for module_id in module_ids]
+    StatusOptimizer(None).batch_status_check(activities, page=html)
+    return [(module_id, per_activity_status(tree, module_id), activity['status'])
+            for module_id, activity in zip(module_ids, activities)]
+
+
+def test_fixture_corpus_present():
+    assert COURSE_PAGES, f"과목 페이지 픽스처 없음: {FIXTURE_DIR}"
+
+
+@pytest.mark.parametrize('path', COURSE_PAGES, ids=os.path.basename)
+def test_batch_matches_per_activity_on_fixture(path):
+    results = compare_statuses(_read(path))
+    assert results
+    mismatches = [result for result in results if result[1] != result[2]]
+    assert not mismatches, f"per_activity/batch 불일치 (module-id, per_activity, batch): {mismatches}"
+
+
+def test_batch_matches_per_activity_on_sample():
+    results = {module_id: (per_activity, batch) for module_id, per_activity, batch in compare_statuses(SAMPLE_COURSE_PAGE)}
+    assert results['1001'] == ("✅ 완료", "✅ 완료")
+    assert results['1002'] == ("❌ 해야 할 과제", "❌ 해야 할 과제")
+    assert results['1003'] == ("❌ 해야 할 과제", "❌ 해야 할 과제")
+    assert results['1004'] == ("⏳ 대기 중", "⏳ 대기 중")
+    assert results['1005'] == ("✅ 완료", "✅ 완료")
+    assert results['1007'] == ("⏳ 대기 중", "⏳ 대기 중")
+    assert results['1008'] == ("❌ 해야 할 과제", "❌ 해야 할 과제")
+
+
+def test_module_id_is_not_prefix_matched():
+    """module-1007(아이콘 없음)이 module-10070(완료)의 아이콘으로 완료 처리되면 안 됨"""
+    tree = lxml_html.fromstring(SAMPLE_COURSE_PAGE)
+    assert per_activity_status(tree, '1007') == "⏳ 대기 중"
+    assert per_activity_status(tree, '10070') == "✅ 완료"
@@ -957,6 +957,9 @@ class _AssignmentsScreenState extends State<AssignmentsScreen>
       if (credentials != null && credentials.isActive) {
         // LearnUs 정보 발견
         
+        // 접속 시간 기록 (실패해도 계속 진행)
+        FirebaseService.instance.markLearnUsSeen(user.uid);
+        
         // 자동으로 로그인 상태로 설정
         setState(() {
           _isLoggedIn = true;
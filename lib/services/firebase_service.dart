@@ -337,6 +337,21 @@ class FirebaseService {
     }
   }
 
+  // 앱 접속 시간 기록 (백엔드 적응형 스케줄링의 미접속 판단용)
+  // updatedAt은 건드리지 않음: 백엔드 사용자 목록 리스너가 updatedAt 변경만 다시 읽음
+  Future<void> markLearnUsSeen(String uid) async {
+    try {
+      await _firestore
+          .collection('learnus_credentials')
+          .doc(uid)
+          .update({
+        'lastSeenAt': FieldValue.serverTimestamp(),
+      });
+    } catch (e) {
+      debugPrint('LearnUs 접속 시간 기록 오류: $e');
+    }
+  }
+
   // LearnUs 인증 정보 비활성화
   Future<void> deactivateLearnUsCredentials(String uid) async {
     try {
@@ -14,6 +14,9 @@ class SchoolAutomationService {
   
   SchoolAutomationService._();
   
+  // 로그인 응답으로 받은 세션 토큰 (백엔드가 사용자별 세션을 X-Session-Token 헤더로 구분)
+  String? _sessionToken;
+  
   // Python 백엔드 서버 URL (VM 서버용)
   static String get _backendUrl {
     if (kIsWeb) {
@@ -27,6 +30,29 @@ class SchoolAutomationService {
     }
   }
   
+  // 세션 토큰을 포함한 요청 헤더 (토큰이 없으면 저장된 자격 증명으로 먼저 로그인)
+  Future<Map<String, String>> _sessionHeaders() async {
+    if (_sessionToken == null) {
+      await loginToSchool();
+    }
+    return {
+      'Content-Type': 'application/json',
+      if (_sessionToken != null) 'X-Session-Token': _sessionToken!,
+    };
+  }
+  
+  // 세션이 만료되어 401을 받으면 다시 로그인 후 한 번 재시도
+  Future<http.Response> _withSession(
+    Future<http.Response> Function(Map<String, String> headers) send,
+  ) async {
+    var response = await send(await _sessionHeaders());
+    if (response.statusCode == 401) {
+      _sessionToken = null;
+      response = await send(await _sessionHeaders());
+    }
+    return response;
+  }
+  
   // 사용자 자격 증명 저장
   Future<void> saveUserCredentials({
     required String university,
@@ -77,6 +103,7 @@ class SchoolAutomationService {
     try {
       final prefs = await SharedPreferences.getInstance();
       await prefs.remove('school_credentials');
+      _sessionToken = null;
       debugPrint('학교 자격 증명 삭제 완료');
     } catch (e) {
       debugPrint('자격 증명 삭제 오류: $e');
@@ -105,6 +132,7 @@ class SchoolAutomationService {
       
       if (response.statusCode == 200) {
         final result = json.decode(response.body);
+        _sessionToken = result['session_token'] as String?;
         debugPrint('로그인 성공: ${result['message']}');
         return true;
       } else {
@@ -120,10 +148,10 @@ class SchoolAutomationService {
   // 과제 정보 수집 요청
   Future<List<Assignment>> fetchAssignments() async {
     try {
-      final response = await http.get(
+      final response = await _withSession((headers) => http.get(
         Uri.parse('$_backendUrl/assignments'),
-        headers: {'Content-Type': 'application/json'},
-      ).timeout(const Duration(seconds: 30));
+        headers: headers,
+      ).timeout(const Duration(seconds: 30)));
       
       if (response.statusCode == 200) {
         final data = json.decode(response.body);
@@ -170,10 +198,10 @@ class SchoolAutomationService {
   // 새로운 과제 확인
   Future<List<Assignment>> checkNewAssignments() async {
     try {
-      final response = await http.get(
+      final response = await _withSession((headers) => http.get(
         Uri.parse('$_backendUrl/assignments/new'),
-        headers: {'Content-Type': 'application/json'},
-      ).timeout(const Duration(seconds: 30));
+        headers: headers,
+      ).timeout(const Duration(seconds: 30)));
       
       if (response.statusCode == 200) {
         final data = json.decode(response.body);
@@ -198,10 +226,10 @@ class SchoolAutomationService {
   // 마감 임박 과제 확인
   Future<List<Assignment>> checkUpcomingDeadlines() async {
     try {
-      final response = await http.get(
+      final response = await _withSession((headers) => http.get(
         Uri.parse('$_backendUrl/assignments/upcoming'),
-        headers: {'Content-Type': 'application/json'},
-      ).timeout(const Duration(seconds: 30));
+        headers: headers,
+      ).timeout(const Duration(seconds: 30)));
       
       if (response.statusCode == 200) {
         final data = json.decode(response.body);
@@ -241,10 +269,10 @@ class SchoolAutomationService {
   // 자동화 작업 시작
   Future<bool> startAutomation() async {
     try {
-      final response = await http.post(
+      final response = await _withSession((headers) => http.post(
         Uri.parse('$_backendUrl/automation/start'),
-        headers: {'Content-Type': 'application/json'},
-      ).timeout(const Duration(seconds: 30));
+        headers: headers,
+      ).timeout(const Duration(seconds: 30)));
       
       if (response.statusCode == 200) {
         debugPrint('자동화 작업 시작됨');
@@ -262,10 +290,10 @@ class SchoolAutomationService {
   // 자동화 작업 중지
   Future<bool> stopAutomation() async {
     try {
-      final response = await http.post(
+      final response = await _withSession((headers) => http.post(
         Uri.parse('$_backendUrl/automation/stop'),
-        headers: {'Content-Type': 'application/json'},
-      ).timeout(const Duration(seconds: 30));
+        headers: headers,
+      ).timeout(const Duration(seconds: 30)));
       
       if (response.statusCode == 200) {
         debugPrint('자동화 작업 중지됨');
@@ -283,10 +311,10 @@ class SchoolAutomationService {
   // 자동화 상태 확인
   Future<Map<String, dynamic>> getAutomationStatus() async {
     try {
-      final response = await http.get(
+      final response = await _withSession((headers) => http.get(
         Uri.parse('$_backendUrl/automation/status'),
-        headers: {'Content-Type': 'application/json'},
-      ).timeout(const Duration(seconds: 10));
+        headers: headers,
+      ).timeout(const Duration(seconds: 10)));
       
       if (response.statusCode == 200) {
         return json.decode(response.body);
@@ -322,6 +350,9 @@ class SchoolAutomationService {
       
       if (response.statusCode == 200) {
         final result = json.decode(response.body);
+        if (result['session_token'] != null) {
+          _sessionToken = result['session_token'] as String;
+        }
         debugPrint('✅ 테스트 결과: ${result['message']}');
         return result;
       } else {
@@ -348,10 +379,10 @@ class SchoolAutomationService {
   // 자동화 디버그 정보 조회
   Future<Map<String, dynamic>> getDebugInfo() async {
     try {
-      final response = await http.get(
+      final response = await _withSession((headers) => http.get(
         Uri.parse('$_backendUrl/automation/debug'),
-        headers: {'Content-Type': 'application/json'},
-      ).timeout(const Duration(seconds: 10));
+        headers: headers,
+      ).timeout(const Duration(seconds: 10)));
       
       if (response.statusCode == 200) {
         return json.decode(response.body);